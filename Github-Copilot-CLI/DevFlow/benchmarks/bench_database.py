@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call overhead of a connection per call vs the persistent connection
+Usage: python benchmarks/bench_database.py [--calls 2000]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import Database
+
+
+class PerCallDatabase(Database):
+    """Database opening and closing a default-tuned connection on every call"""
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def _per_call_us(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def _operations(db):
+    since = datetime.now() - timedelta(days=30)
+    commit = {
+        'hash': '0' * 40, 'short_hash': '0' * 7, 'author': 'Dev', 'email': 'dev@example.com',
+        'message': 'bench', 'timestamp': datetime.now(), 'files_changed': 1,
+        'insertions': 1, 'deletions': 0,
+    }
+
+    db.set_watermark('/repo', 'main', '0' * 40, since)
+
+    return {
+        'read (get_watermark)': lambda i: db.get_watermark('/repo', 'main'),
+        'write (set_watermark)': lambda i: db.set_watermark('/repo', 'main', f'{i:040x}', since),
+        'write (save_commit_batch)': lambda i: db.save_commit_batch([{**commit, 'hash': f'{i:040x}'}]),
+    }
+
+
+def run_benchmark(calls):
+    """
+    Time common Database calls with both connection strategies
+
+    Args:
+        calls (int): Calls per operation
+
+    Returns:
+        list: Result rows with microseconds per call
+    """
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        per_call = PerCallDatabase(Path(tmp) / 'per_call.db')
+        persistent = Database(Path(tmp) / 'persistent.db')
+
+        before = _operations(per_call)
+        after = _operations(persistent)
+
+        for name in before:
+            before_us = _per_call_us(before[name], calls)
+            after_us = _per_call_us(after[name], calls)
+            rows.append({
+                'operation': name,
+                'per_call_us': round(before_us, 1),
+                'persistent_us': round(after_us, 1),
+                'speedup': round(before_us / after_us, 1) if after_us else 0,
+            })
+
+        persistent.close()
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Database per-call overhead')
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'operation':<28} {'per-call':>10} {'persistent':>11} {'speedup':>8}")
+    for row in run_benchmark(args.calls):
+        print(f"{row['operation']:<28} {row['per_call_us']:>8.1f}us {row['persistent_us']:>9.1f}us "
+              f"{row['speedup']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of a dict-per-line history vs the interned CommandStream
+Usage: python benchmarks/bench_history.py [--lines 1000000] [--distinct 20000]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.history import HistoryTracker
+
+
+def write_history(path, lines, distinct, seed=42):
+    """
+    Write a synthetic history with a long-tailed command distribution
+
+    Args:
+        path (Path): File to write
+        lines (int): Number of history lines
+        distinct (int): Number of distinct commands
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    verbs = ['git status', 'git add .', 'git commit -m "wip"', 'git push', 'make build',
+             'pytest -q', 'npm install', 'npm run dev', 'python manage.py runserver', 'ls -la']
+    commands = verbs + [f'{rng.choice(verbs)} --opt {i}' for i in range(distinct - len(verbs))]
+    weights = [1 / (rank + 1) for rank in range(len(commands))]
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for start in range(0, lines, 100000):
+            batch = rng.choices(commands, weights, k=min(100000, lines - start))
+            f.write('\n'.join(batch) + '\n')
+
+
+def _legacy_entries(path):
+    """The pre-interning representation: one dict per line"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.readlines()
+
+    commands = []
+    for line in content:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        commands.append({'command': line, 'timestamp': None, 'session': None})
+    return commands
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+
+def run_benchmark(lines, distinct):
+    """
+    Measure both representations of one synthetic history
+
+    Args:
+        lines (int): Number of history lines
+        distinct (int): Number of distinct commands
+
+    Returns:
+        list: Result rows with retained/peak MiB and parse seconds
+    """
+    mib = 1024 * 1024
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '.bash_history'
+        write_history(path, lines, distinct)
+
+        entries, retained, peak, elapsed = _measure(lambda: _legacy_entries(path))
+        rows.append({'representation': 'list of dicts', 'retained_mib': retained / mib,
+                     'peak_mib': peak / mib, 'parse_s': elapsed})
+        del entries
+
+        tracker = HistoryTracker()
+        stream, retained, peak, elapsed = _measure(lambda: tracker.parse_shell_history(path))
+        rows.append({'representation': 'CommandStream', 'retained_mib': retained / mib,
+                     'peak_mib': peak / mib, 'parse_s': elapsed})
+
+        start = time.perf_counter()
+        tracker.get_top_commands(limit=20)
+        tracker.find_common_sequences(sequence_length=2, min_frequency=3)
+        tracker.detect_workflow_patterns()
+        tracker.get_statistics()
+        analytics = time.perf_counter() - start
+
+    return rows, len(stream), analytics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shell history memory use')
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--distinct', type=int, default=20000)
+    args = parser.parse_args()
+
+    rows, parsed, analytics = run_benchmark(args.lines, args.distinct)
+
+    print(f"{parsed:,} commands, {args.distinct:,} distinct")
+    print(f"{'representation':<16} {'retained':>10} {'peak':>10} {'parse':>8}")
+    for row in rows:
+        print(f"{row['representation']:<16} {row['retained_mib']:>7.1f}MiB {row['peak_mib']:>7.1f}MiB "
+              f"{row['parse_s']:>7.2f}s")
+    print(f"analytics on CommandStream (top, sequences, patterns, stats): {analytics:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
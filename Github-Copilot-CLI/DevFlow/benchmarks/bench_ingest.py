@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass `git log --numstat` ingestion vs per-commit GitPython stats
+Usage: python benchmarks/bench_ingest.py [--sizes 250 1000 4000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.git_analyzer import GitAnalyzer
+
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run_benchmark(sizes, days=365):
+    """
+    Time get_commit_history and get_hotspot_files for each history size
+
+    Args:
+        sizes (list): Commit counts to benchmark
+        days (int): Analysis window in days
+
+    Returns:
+        list: Result rows
+    """
+    rows = []
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=size, days=days - 1)
+
+            fast = GitAnalyzer(repo_path, use_fast_ingest=True)
+            slow = GitAnalyzer(repo_path, use_fast_ingest=False)
+
+            fast_history, fast_commits = _time(lambda: fast.get_commit_history(days=days))
+            slow_history, slow_commits = _time(lambda: slow.get_commit_history(days=days))
+            fast_hotspots, _ = _time(lambda: fast.get_hotspot_files(days=days))
+            slow_hotspots, _ = _time(lambda: slow.get_hotspot_files(days=days))
+
+            assert len(fast_commits) == len(slow_commits) == size
+
+            rows.append({
+                'commits': size,
+                'gitpython_history_s': round(slow_history, 3),
+                'git_log_history_s': round(fast_history, 3),
+                'history_speedup': round(slow_history / fast_history, 1) if fast_history else 0,
+                'gitpython_hotspots_s': round(slow_hotspots, 3),
+                'git_log_hotspots_s': round(fast_hotspots, 3),
+                'hotspots_speedup': round(slow_hotspots / fast_hotspots, 1) if fast_hotspots else 0,
+            })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark git history ingestion')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 1000, 4000])
+    args = parser.parse_args()
+
+    print(f"{'commits':>8} {'gitpython':>11} {'git log':>9} {'speedup':>8}   "
+          f"{'hotspots gp':>11} {'git log':>9} {'speedup':>8}")
+    for row in run_benchmark(args.sizes):
+        print(f"{row['commits']:>8} {row['gitpython_history_s']:>10.3f}s {row['git_log_history_s']:>8.3f}s "
+              f"{row['history_speedup']:>7.1f}x   {row['gitpython_hotspots_s']:>10.3f}s "
+              f"{row['git_log_hotspots_s']:>8.3f}s {row['hotspots_speedup']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS of list-based vs streaming commit analysis
+Usage: python benchmarks/bench_memory.py [--commits 50000] [--files 2000] [--days 1825]
+
+Each mode runs in a fresh interpreter so the peak resident set size
+(ru_maxrss, Unix only) covers that mode alone; the figure reported is the
+growth over the interpreter's RSS after imports and repository setup.
+
+    list     get_commit_history, then patterns and score over the list (before)
+    records  the same window materialized as slotted CommitRecords
+    stream   analyze_commit_patterns and generate_productivity_score
+             consuming iter_commit_records (after)
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+MODES = ['list', 'records', 'stream']
+
+
+def _peak_rss_mib():
+    # Linux reports kilobytes, macOS bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_mode(mode, repo_path, days):
+    """Run one mode in this process and return its measurements"""
+    from src.git_analyzer import GitAnalyzer
+
+    analyzer = GitAnalyzer(repo_path)
+    baseline = _peak_rss_mib()
+    start = time.perf_counter()
+
+    if mode == 'list':
+        commits = analyzer.get_commit_history(days=days)
+        analyzer._patterns_from_commits(commits)
+        analyzer._productivity_from_commits(commits, days)
+        count = len(commits)
+    elif mode == 'records':
+        records = list(analyzer.iter_commit_records(days=days))
+        analyzer._patterns_from_commits(records)
+        analyzer._productivity_from_commits(records, days)
+        count = len(records)
+    else:
+        count = analyzer.analyze_commit_patterns(days=days)['total_commits']
+        analyzer.generate_productivity_score(days=days)
+
+    return {
+        'mode': mode,
+        'commits': count,
+        'peak_rss_mib': round(_peak_rss_mib() - baseline, 1),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def run_benchmark(commits, files, days):
+    """
+    Measure every mode on one synthetic repository
+
+    Args:
+        commits (int): Commits to generate
+        files (int): Distinct files
+        days (int): Spread of commit dates, also the analysis window
+
+    Returns:
+        list: One result row per mode
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=commits, files=files, days=days)
+
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', mode, str(repo_path), '--days', str(days + 1)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            rows.append(json.loads(output))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark peak RSS of commit analysis')
+    parser.add_argument('--commits', type=int, default=50000)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=5 * 365)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'REPO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if resource is None:
+        sys.exit("Peak RSS needs the resource module (Unix only)")
+
+    if args.child:
+        mode, repo_path = args.child
+        print(json.dumps(_run_mode(mode, repo_path, args.days)))
+        return
+
+    rows = run_benchmark(args.commits, args.files, args.days)
+    print(f"{rows[0]['commits']:,} commits over {args.days} days")
+    print(f"{'mode':<8} {'peak RSS':>12} {'time':>8}")
+    for row in rows:
+        print(f"{row['mode']:<8} {row['peak_rss_mib']:>9.1f}MiB {row['seconds']:>7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FTS5 commit search vs a LIKE scan over commit messages
+Usage: python benchmarks/bench_search.py [--commits 1000000] [--repeat 5]
+
+Synthetic commits (messages drawn from a fixed vocabulary, 1-4 touched
+paths each) are ingested through the normal path, so the index is kept in
+sync by the same triggers and save_file_changes calls as a real sync. The
+report also includes the ingest throughput with the index in place.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import Database
+
+
+VERBS = ['fix', 'add', 'update', 'refactor', 'remove', 'improve', 'document', 'test']
+NOUNS = ['parser', 'login', 'cache', 'export', 'dashboard', 'session', 'hooks', 'query',
+         'migration', 'timeout', 'encoding', 'config', 'daemon', 'sparkline', 'ownership']
+DIRS = ['src', 'src/api', 'src/core', 'tests', 'docs', 'frontend/src', 'benchmarks']
+
+QUERIES = [
+    ('rare word', 'zephyr'),
+    ('common word', 'fix'),
+    ('two words', 'cache timeout'),
+    ('phrase', '"refactor parser"'),
+    ('prefix', 'migrat*'),
+    ('path', 'path:src/core/cache.py'),
+    ('word + author', ('daemon', 'dev3')),
+]
+
+
+def _records(count, seed=7):
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=5 * 365)
+    step = (5 * 365 * 86400) / count
+
+    for i in range(count):
+        words = [rng.choice(VERBS), rng.choice(NOUNS), 'in', rng.choice(NOUNS)]
+        if i % 50000 == 0:
+            words.append('zephyr')
+        author = f'dev{rng.randrange(20)}'
+        yield {
+            'hash': f'{i:040x}',
+            'author': author,
+            'email': f'{author}@example.com',
+            'message': ' '.join(words) + f'\n\nTicket #{i % 997}',
+            'timestamp': start + timedelta(seconds=i * step),
+            'files': {
+                f'{rng.choice(DIRS)}/{rng.choice(NOUNS)}.py': {'insertions': 3, 'deletions': 1}
+                for _ in range(rng.randint(1, 4))
+            },
+        }
+
+
+def _best_ms(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        runs.append((time.perf_counter() - start) * 1000)
+    return min(runs), result
+
+
+def run_benchmark(commits, repeat):
+    """
+    Ingest synthetic commits and time indexed and scanning searches
+
+    Args:
+        commits (int): Commits to ingest
+        repeat (int): Timed runs per query (best reported)
+
+    Returns:
+        dict: 'ingest_s' and per-query rows with 'fts_ms', 'like_ms' and 'hits'
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'search.db')
+
+        start = time.perf_counter()
+        db.ingest_commits(_records(commits), on_chunk=db.save_file_changes)
+        ingest_s = time.perf_counter() - start
+
+        rows = []
+        for label, query in QUERIES:
+            query, author = query if isinstance(query, tuple) else (query, None)
+
+            fts_ms, hits = _best_ms(lambda: db.search_commits(query, author=author), repeat)
+            db.has_search = False
+            like_ms, _ = _best_ms(lambda: db.search_commits(query, author=author), repeat)
+            db.has_search = True
+
+            rows.append({'query': label, 'text': query, 'hits': len(hits),
+                         'fts_ms': round(fts_ms, 2), 'like_ms': round(like_ms, 2)})
+
+    return {'commits': commits, 'ingest_s': round(ingest_s, 2), 'queries': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FTS5 commit search')
+    parser.add_argument('--commits', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    result = run_benchmark(args.commits, args.repeat)
+    print(f"{result['commits']:,} commits ingested with the search index in {result['ingest_s']:.1f}s")
+    print(f"{'query':<16} {'text':<26} {'FTS5':>10} {'LIKE scan':>11} {'hits':>6}")
+    for row in result['queries']:
+        print(f"{row['query']:<16} {row['text']:<26} {row['fts_ms']:>8.2f}ms {row['like_ms']:>9.2f}ms {row['hits']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: DevFlow hot paths on synthetic repositories of growing size
+Usage: python benchmarks/bench_suite.py [--sizes 1000 10000 100000] [--repeat 3]
+                                        [--output results.json] [--compare baseline.json]
+
+Each size gets a generated repository; every case is timed `--repeat`
+times on fresh objects (and a fresh database where the case is "cold").
+Results are written as JSON, and `--compare` reports the ratio of the
+best runs against an earlier results file so regressions show up run to run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.commit_graph import ensure_commit_graph
+from src.database import Database
+from src.exporter import AnalyticsExporter
+from src.file_tracker import FileTracker
+from src.git_analyzer import GitAnalyzer
+from src.git_backend import available_backends, get_backend
+from src.ingest import IncrementalIngestor
+
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Slowdown of the best run versus the baseline reported as a regression
+REGRESSION_THRESHOLD = 1.25
+
+# Path-limited walks are timed before and after writing the commit-graph
+NO_GRAPH = ' (no commit-graph)'
+WITH_GRAPH = ' (commit-graph)'
+
+# Backend cases are named '<operation> [<backend>]'; speedups are versus this one
+BASE_BACKEND = 'gitpython'
+
+# Parallel cases are named '<operation> (jobs=N)'; speedups are versus jobs=1
+PARALLEL_JOBS = sorted({1, 4, os.cpu_count() or 1})
+
+# Fast cases are looped until one sample takes at least this long
+MIN_SAMPLE_S = 0.1
+MAX_LOOPS = 1000
+
+
+def _git_version():
+    try:
+        return subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def _devflow_revision():
+    try:
+        return subprocess.run(
+            ['git', '-C', str(Path(__file__).parent), 'rev-parse', 'HEAD'],
+            capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _cases(repo_path, work_dir, days):
+    """
+    Benchmark cases for one repository
+
+    Args:
+        repo_path (Path): Synthetic repository
+        work_dir (Path): Scratch directory for databases and exports
+        days (int): Analysis window covering the whole history
+
+    Returns:
+        list: (name, setup, run, fresh) tuples; setup's result is passed to
+              run, and fresh cases get a new setup for every timed call.
+              Every installed git backend runs the backend cases, and the
+              parallel cases run at each of PARALLEL_JOBS workers. The
+              commit-graph cases come last, since writing the graph speeds
+              up every later git walk.
+    """
+    since = datetime.now() - timedelta(days=days)
+    fresh = iter(range(1_000_000))
+
+    def fresh_db():
+        return Database(work_dir / f'cold-{next(fresh)}.db')
+
+    # One ingested database shared by the warm cases and the query cases
+    warm_db = Database(work_dir / 'warm.db')
+    analyzer = GitAnalyzer(repo_path)
+    ingestor = IncrementalIngestor(analyzer, warm_db)
+    ingestor.sync(since, analyzer.default_branch)
+    repo_key, branch = ingestor.repo_key, analyzer.default_branch
+    hot_path = analyzer.get_hotspot_files(days=days, limit=1)[0][0]
+
+    recent = [record['hash'] for _, record in zip(range(20), analyzer.backend.iter_commits())]
+
+    def graph_tracker():
+        ensure_commit_graph(repo_path)
+        return FileTracker(repo_path, backend=BASE_BACKEND)
+
+    backend_ops = [
+        ('git_backend.iter_commits',
+         lambda b: sum(1 for _ in b.iter_commits(since=since))),
+        ('git_backend.iter_commits (path)',
+         lambda b: sum(1 for _ in b.iter_commits(paths=[hot_path]))),
+        ('git_backend.numstat (20 commits)',
+         lambda b: [b.numstat(sha) for sha in recent]),
+        ('git_backend.tree',
+         lambda b: b.tree()),
+        ('git_backend.blame',
+         lambda b: b.blame(hot_path)),
+    ]
+
+    path_walks = [
+        ('file_tracker.get_file_churn_rate',
+         lambda t: t.get_file_churn_rate(hot_path, days=days)),
+        ('file_tracker.get_file_change_timeline',
+         lambda t: t.get_file_change_timeline(hot_path)),
+    ]
+
+    return [
+        ('git_analyzer.get_commit_history',
+         lambda: GitAnalyzer(repo_path),
+         lambda a: a.get_commit_history(days=days), True),
+        ('git_analyzer.get_hotspot_files',
+         lambda: GitAnalyzer(repo_path),
+         lambda a: a.get_hotspot_files(days=days, limit=10), True),
+        ('file_tracker.identify_danger_zones (cold db)',
+         lambda: FileTracker(repo_path, db=fresh_db()),
+         lambda t: t.identify_danger_zones(threshold=10, days=days), True),
+        ('file_tracker.identify_danger_zones (warm db)',
+         lambda: FileTracker(repo_path, db=warm_db),
+         lambda t: t.identify_danger_zones(threshold=10, days=days), False),
+        ('exporter.export_all (cold db)',
+         lambda: AnalyticsExporter(output_dir=work_dir / f'export-{next(fresh)}',
+                                   db_path=work_dir / f'export-{next(fresh)}.db', repo_path=repo_path),
+         lambda e: e.export_all(days=30), True),
+        ('database.get_commit_stats',
+         lambda: warm_db,
+         lambda db: db.get_commit_stats(days=days), False),
+        ('database.get_author_stats',
+         lambda: warm_db,
+         lambda db: db.get_author_stats(days=days), False),
+        ('database.get_branch_commits',
+         lambda: warm_db,
+         lambda db: db.get_branch_commits(repo_key, branch, since), False),
+        ('database.get_branch_activity',
+         lambda: warm_db,
+         lambda db: db.get_branch_activity(repo_key, branch, since), False),
+        ('database.get_branch_daily_counts',
+         lambda: warm_db,
+         lambda db: db.get_branch_daily_counts(repo_key, branch, since.date()), False),
+        ('database.get_file_change_counts',
+         lambda: warm_db,
+         lambda db: db.get_file_change_counts(repo_key, branch, since, min_changes=10), False),
+    ] + [
+        (f'{name} [{backend}]', lambda backend=backend: get_backend(repo_path, backend), run, False)
+        for backend in available_backends() for name, run in backend_ops
+    ] + [
+        (f'git_analyzer.get_commit_history [{backend}]',
+         lambda backend=backend: GitAnalyzer(repo_path, backend=backend),
+         lambda a: a.get_commit_history(days=days), True)
+        for backend in available_backends()
+    ] + [
+        case
+        for jobs in PARALLEL_JOBS
+        for case in [
+            (f'git_analyzer.scan_window (jobs={jobs})',
+             lambda jobs=jobs: GitAnalyzer(repo_path, jobs=jobs),
+             lambda a: a.scan_window(days=days), True),
+            (f'ingest.sync (jobs={jobs})',
+             lambda jobs=jobs: IncrementalIngestor(GitAnalyzer(repo_path, jobs=jobs), fresh_db()),
+             lambda i: i.sync(since, branch), True),
+        ]
+    ] + [
+        (name + NO_GRAPH, lambda: FileTracker(repo_path, backend=BASE_BACKEND), run, False)
+        for name, run in path_walks
+    ] + [
+        (name + WITH_GRAPH, graph_tracker, run, False) for name, run in path_walks
+    ]
+
+
+def _graph_speedups(cases):
+    """Best-run speedup of each path-limited walk from the commit-graph"""
+    speedups = {}
+    for name, timing in cases.items():
+        if name.endswith(NO_GRAPH):
+            base = name[:-len(NO_GRAPH)]
+            with_graph = cases.get(base + WITH_GRAPH)
+            if with_graph and with_graph['min_s']:
+                speedups[base] = round(timing['min_s'] / with_graph['min_s'], 2)
+    return speedups
+
+
+def _backend_speedups(cases):
+    """Best-run speedup of each backend operation versus BASE_BACKEND, per backend"""
+    speedups = {}
+    suffix = f' [{BASE_BACKEND}]'
+    for name, timing in cases.items():
+        if name.endswith(']') and ' [' in name:
+            base, backend = name[:-1].rsplit(' [', 1)
+            reference = cases.get(base + suffix)
+            if backend != BASE_BACKEND and reference and timing['min_s']:
+                speedups.setdefault(backend, {})[base] = round(reference['min_s'] / timing['min_s'], 2)
+    return speedups
+
+
+def _parallel_speedups(cases):
+    """Best-run speedup of each parallel case versus its jobs=1 run, per job count"""
+    speedups = {}
+    for name, timing in cases.items():
+        if name.endswith(')') and ' (jobs=' in name:
+            base, jobs = name[:-1].rsplit(' (jobs=', 1)
+            reference = cases.get(f'{base} (jobs=1)')
+            if jobs != '1' and reference and timing['min_s']:
+                speedups.setdefault(base, {})[jobs] = round(reference['min_s'] / timing['min_s'], 2)
+    return speedups
+
+
+def _time_case(setup, run, fresh, repeat):
+    """
+    Time one case
+
+    Fresh cases time a single call per sample. Shared-state cases are
+    calibrated first, then each sample loops the call so it lasts at least
+    MIN_SAMPLE_S, which keeps millisecond queries out of timer noise.
+
+    Returns:
+        dict: 'min_s', 'median_s' and 'runs_s' per call, and 'loops' per sample
+    """
+    if fresh:
+        loops = 1
+    else:
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        first = time.perf_counter() - start
+        loops = max(1, min(MAX_LOOPS, int(MIN_SAMPLE_S / first) if first else MAX_LOOPS))
+
+    runs = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            run(state)
+        runs.append((time.perf_counter() - start) / loops)
+
+    return {
+        'min_s': round(min(runs), 6),
+        'median_s': round(statistics.median(runs), 6),
+        'runs_s': [round(value, 6) for value in runs],
+        'loops': loops,
+    }
+
+
+def run_suite(sizes, repeat=3, files=None, authors=10, days=365, progress=None):
+    """
+    Time every case at every history size
+
+    Args:
+        sizes (list): Commit counts
+        repeat (int): Timed runs per case
+        files (int): Distinct files (default: max(200, commits // 20))
+        authors (int): Distinct authors
+        days (int): Spread of commit dates, also the analysis window
+        progress (callable): Called with a status line before each step
+
+    Returns:
+        dict: {'meta': {...}, 'results': {commits: {'repo': {...}, 'cases': {...},
+              'commit_graph_speedup': {...}, 'backend_speedup': {backend: {...}},
+              'parallel_speedup': {case: {jobs: ...}}}}}
+    """
+    report = progress or (lambda message: None)
+    results = {}
+
+    for size in sizes:
+        file_count = files or max(200, size // 20)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            report(f"{size:,} commits: generating repository ({file_count:,} files)")
+            start = time.perf_counter()
+            repo_path = create_synthetic_repo(tmp / 'repo', commits=size, files=file_count,
+                                              authors=authors, days=days)
+            generate_s = time.perf_counter() - start
+
+            report(f"{size:,} commits: preparing warm database")
+            cases = {}
+            for name, setup, run, fresh in _cases(repo_path, tmp, days + 1):
+                report(f"{size:,} commits: {name}")
+                cases[name] = _time_case(setup, run, fresh, repeat)
+
+        results[str(size)] = {
+            'repo': {'commits': size, 'files': file_count, 'authors': authors, 'days': days,
+                     'generate_s': round(generate_s, 3)},
+            'cases': cases,
+            'commit_graph_speedup': _graph_speedups(cases),
+            'backend_speedup': _backend_speedups(cases),
+            'parallel_speedup': _parallel_speedups(cases),
+        }
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(),
+            'devflow_revision': _devflow_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'git': _git_version(),
+            'git_backends': available_backends(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare two suite results case by case
+
+    Args:
+        current (dict): New results
+        baseline (dict): Earlier results
+        threshold (float): Ratio of best runs above which a case counts as a regression
+
+    Returns:
+        list: Rows with 'commits', 'case', 'baseline_s', 'current_s', 'ratio' and
+              'regression', for cases present in both results
+    """
+    rows = []
+
+    for size, entry in current['results'].items():
+        base_cases = baseline.get('results', {}).get(size, {}).get('cases', {})
+        for name, timing in entry['cases'].items():
+            if name not in base_cases:
+                continue
+
+            # The fastest run is the least disturbed by other load on the machine
+            before = base_cases[name]['min_s']
+            after = timing['min_s']
+            ratio = after / before if before else float('inf')
+            rows.append({
+                'commits': int(size),
+                'case': name,
+                'baseline_s': before,
+                'current_s': after,
+                'ratio': round(ratio, 3),
+                'regression': ratio > threshold,
+            })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DevFlow hot paths on synthetic repositories')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--files', type=int, default=None, help='Distinct files (default: max(200, commits // 20))')
+    parser.add_argument('--authors', type=int, default=10)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Results JSON (default: benchmarks/results/suite-<timestamp>.json)')
+    parser.add_argument('--compare', type=Path, default=None, help='Earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    # Keep the user's shell history and ~/.devflow out of the measurements
+    os.environ['HOME'] = tempfile.mkdtemp(prefix='devflow-bench-home-')
+
+    suite = run_suite(args.sizes, repeat=args.repeat, files=args.files, authors=args.authors,
+                      days=args.days, progress=lambda message: print(f"... {message}", file=sys.stderr))
+
+    output = args.output or RESULTS_DIR / f"suite-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(suite, indent=2))
+
+    print(f"{'commits':>8}  {'case':<46} {'median':>10} {'min':>10}")
+    for size, entry in suite['results'].items():
+        for name, timing in entry['cases'].items():
+            print(f"{int(size):>8}  {name:<46} {timing['median_s']:>9.4f}s {timing['min_s']:>9.4f}s")
+
+    print(f"\n{'commits':>8}  {'path-limited walk':<46} {'commit-graph speedup':>21}")
+    for size, entry in suite['results'].items():
+        for name, speedup in entry['commit_graph_speedup'].items():
+            print(f"{int(size):>8}  {name:<46} {speedup:>20.2f}x")
+
+    for size, entry in suite['results'].items():
+        for backend, speedups in entry['backend_speedup'].items():
+            print(f"\n{'commits':>8}  {'operation':<46} {f'{backend} vs {BASE_BACKEND}':>21}")
+            for name, speedup in speedups.items():
+                print(f"{int(size):>8}  {name:<46} {speedup:>20.2f}x")
+
+    print(f"\n{'commits':>8}  {'parallel case':<46} {'speedup vs jobs=1':>21}")
+    for size, entry in suite['results'].items():
+        for name, speedups in entry['parallel_speedup'].items():
+            for jobs, speedup in speedups.items():
+                print(f"{int(size):>8}  {f'{name} (jobs={jobs})':<46} {speedup:>20.2f}x")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        rows = compare(suite, json.loads(args.compare.read_text()), args.threshold)
+        print(f"\n{'commits':>8}  {'case':<46} {'baseline':>10} {'current':>10} {'ratio':>7}")
+        for row in rows:
+            flag = '  REGRESSION' if row['regression'] else ''
+            print(f"{row['commits']:>8}  {row['case']:<46} {row['baseline_s']:>9.4f}s "
+                  f"{row['current_s']:>9.4f}s {row['ratio']:>6.2f}x{flag}")
+
+        regressions = [row for row in rows if row['regression']]
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
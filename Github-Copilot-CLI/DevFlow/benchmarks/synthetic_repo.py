@@ -0,0 +1,143 @@
+"""
+Synthetic git repository generator for DevFlow benchmarks and tests
+Builds repositories with `git fast-import` so large histories are cheap to create;
+git() and commit() add hand-made commits on top
+"""
+
+import random
+import subprocess
+import time
+from pathlib import Path
+
+
+# Identity used by git() and commit() unless another author is given
+DEFAULT_AUTHOR = ('Tester', 'tester@example.com')
+
+
+def create_synthetic_repo(path, commits=1000, files=200, authors=10, days=365,
+                          files_per_commit=3, seed=42, branch='main'):
+    """
+    Create a git repository with a generated history
+
+    Args:
+        path (str): Directory to create the repository in
+        commits (int): Number of commits to generate
+        files (int): Number of distinct files touched by the history
+        authors (int): Number of distinct authors
+        days (int): Spread commit dates over this many days up to now
+        files_per_commit (int): Maximum files modified per commit
+        seed (int): Random seed for reproducible histories
+        branch (str): Branch name to create
+
+    Returns:
+        Path: Repository path
+    """
+    rng = random.Random(seed)
+    repo_path = Path(path)
+    repo_path.mkdir(parents=True, exist_ok=True)
+
+    subprocess.run(['git', 'init', '-q', '-b', branch, str(repo_path)], check=True)
+
+    extensions = ['.py', '.ts', '.go', '.js', '.md']
+    file_names = [
+        f"src/module_{i % 20}/file_{i}{extensions[i % len(extensions)]}"
+        for i in range(files)
+    ]
+    author_list = [(f"Dev {i}", f"dev{i}@example.com") for i in range(authors)]
+    line_counts = {name: 0 for name in file_names}
+
+    now = int(time.time())
+    start = now - days * 86400
+    step = max(1, (now - start) // max(commits, 1))
+
+    process = subprocess.Popen(
+        ['git', '-C', str(repo_path), 'fast-import', '--quiet'],
+        stdin=subprocess.PIPE,
+    )
+
+    def write(data):
+        process.stdin.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+
+    for index in range(commits):
+        name, email = author_list[rng.randrange(authors)]
+        timestamp = start + index * step + rng.randrange(step)
+        timestamp = min(timestamp, now)
+        message = f"feat(module): change {index}\n"
+
+        write(f"commit refs/heads/{branch}\n")
+        write(f"mark :{index + 1}\n")
+        write(f"author {name} <{email}> {timestamp} +0000\n")
+        write(f"committer {name} <{email}> {timestamp} +0000\n")
+        write(f"data {len(message.encode('utf-8'))}\n{message}\n")
+        if index > 0:
+            write(f"from :{index}\n")
+
+        for file_name in rng.sample(file_names, rng.randint(1, min(files_per_commit, files))):
+            line_counts[file_name] += rng.randint(1, 5)
+            content = ''.join(f"line {n}\n" for n in range(line_counts[file_name]))
+            encoded = content.encode('utf-8')
+            write(f"M 100644 inline {file_name}\n")
+            write(f"data {len(encoded)}\n")
+            write(encoded)
+            write("\n")
+
+        write("\n")
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {repo_path}")
+
+    subprocess.run(
+        ['git', '-C', str(repo_path), 'checkout', '-q', '-f', branch],
+        check=True,
+    )
+    return repo_path
+
+
+def git(repo_path, *args, author=DEFAULT_AUTHOR, env=None):
+    """
+    Run a git command in a repository as a fixed identity
+
+    Args:
+        repo_path (str): Repository working tree
+        *args (str): git arguments
+        author (tuple): (name, email) used for commits and merges
+        env (dict): Process environment (optional)
+
+    Returns:
+        str: Standard output
+    """
+    name, email = author
+    return subprocess.run(
+        ['git', '-C', str(repo_path), '-c', f'user.name={name}', '-c', f'user.email={email}', *args],
+        check=True, capture_output=True, text=True, env=env
+    ).stdout
+
+
+def commit(repo_path, message, files=None, author=DEFAULT_AUTHOR, env=None):
+    """
+    Write files, stage them and commit (with nothing staged, an empty commit)
+
+    Args:
+        repo_path (str): Repository working tree
+        message (str): Commit message
+        files (dict): {repo-relative path: str or bytes content} (optional)
+        author (tuple): (name, email) of the commit
+        env (dict): Process environment, e.g. fixed commit dates (optional)
+
+    Returns:
+        str: SHA of the new commit
+    """
+    repo_path = Path(repo_path)
+    for name, data in (files or {}).items():
+        path = repo_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            path.write_text(data)
+
+    if files:
+        git(repo_path, 'add', '--', *files)
+    git(repo_path, 'commit', '-q', '--allow-empty', '-m', message, author=author, env=env)
+    return git(repo_path, 'rev-parse', 'HEAD').strip()
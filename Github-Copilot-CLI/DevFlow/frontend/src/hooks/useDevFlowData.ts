@@ -7,6 +7,32 @@ import { useState, useEffect } from 'react';
 
 const DATA_BASE_PATH = '/devflow-data';
 
+// Per-file content hashes written by `devflow export` (manifest.json).
+// The hash is used as the URL version, so unchanged files stay cached.
+export interface DataManifest {
+  files: Record<string, {
+    hash: string;
+    bytes: number;
+    encoding: 'indented' | 'compact';
+    gzip: boolean;
+    generated_at: string | null;
+  }>;
+}
+
+export async function loadManifest(): Promise<DataManifest | null> {
+  try {
+    const res = await fetch(`${DATA_BASE_PATH}/manifest.json`, { cache: 'no-cache' });
+    return res.ok ? await res.json() : null;
+  } catch {
+    return null;
+  }
+}
+
+function dataUrl(file: string, manifest: DataManifest | null): string {
+  const hash = manifest?.files?.[file]?.hash;
+  return hash ? `${DATA_BASE_PATH}/${file}?v=${hash.slice(0, 12)}` : `${DATA_BASE_PATH}/${file}`;
+}
+
 // Types matching the exported JSON structures
 export interface ProductivityScore {
   current: number;
@@ -81,10 +107,11 @@ export function useDevFlowData() {
     const loadData = async () => {
       try {
         setLoading(true);
+        const manifest = await loadManifest();
 
         // Load productivity summary
         try {
-          const prodRes = await fetch(`${DATA_BASE_PATH}/productivity-summary.json`);
+          const prodRes = await fetch(dataUrl('productivity-summary.json', manifest));
           if (prodRes.ok) {
             const data = await prodRes.json();
             setProductivityScore(data.productivityScore);
@@ -98,7 +125,7 @@ export function useDevFlowData() {
 
         // Load file hotspots
         try {
-          const hotspotsRes = await fetch(`${DATA_BASE_PATH}/file-hotspots.json`);
+          const hotspotsRes = await fetch(dataUrl('file-hotspots.json', manifest));
           if (hotspotsRes.ok) {
             const data = await hotspotsRes.json();
             setFileRiskData(data.fileRiskData);
@@ -111,7 +138,7 @@ export function useDevFlowData() {
 
         // Load command usage
         try {
-          const cmdRes = await fetch(`${DATA_BASE_PATH}/command-usage.json`);
+          const cmdRes = await fetch(dataUrl('command-usage.json', manifest));
           if (cmdRes.ok) {
             const data = await cmdRes.json();
             setCommandData(data.commandData);
@@ -125,7 +152,7 @@ export function useDevFlowData() {
 
         // Load insights
         try {
-          const insightsRes = await fetch(`${DATA_BASE_PATH}/insights.json`);
+          const insightsRes = await fetch(dataUrl('insights.json', manifest));
           if (insightsRes.ok) {
             const data = await insightsRes.json();
             setInsights(data.insights);
@@ -162,21 +189,21 @@ export function useDevFlowData() {
 // Individual data loaders for specific needs
 
 export async function loadProductivitySummary() {
-  const res = await fetch(`${DATA_BASE_PATH}/productivity-summary.json`);
+  const res = await fetch(dataUrl('productivity-summary.json', await loadManifest()));
   return res.json();
 }
 
 export async function loadFileHotspots() {
-  const res = await fetch(`${DATA_BASE_PATH}/file-hotspots.json`);
+  const res = await fetch(dataUrl('file-hotspots.json', await loadManifest()));
   return res.json();
 }
 
 export async function loadCommandUsage() {
-  const res = await fetch(`${DATA_BASE_PATH}/command-usage.json`);
+  const res = await fetch(dataUrl('command-usage.json', await loadManifest()));
   return res.json();
 }
 
 export async function loadInsights() {
-  const res = await fetch(`${DATA_BASE_PATH}/insights.json`);
+  const res = await fetch(dataUrl('insights.json', await loadManifest()));
   return res.json();
 }
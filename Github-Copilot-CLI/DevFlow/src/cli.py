@@ -7,20 +7,28 @@ import click
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.layout import Layout
 from rich.live import Live
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.text import Text
+from rich.markup import escape
 import os
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 
 from .git_analyzer import GitAnalyzer
 from .database import save_commit_analysis, save_file_hotspots
 from .history import HistoryTracker
-from .exporter import AnalyticsExporter
+from .workflow_patterns import get_workflow_matcher
+from .dashboard import LiveDashboard
+from .daemon import IngestDaemon, BATCH_INTERVAL, install_hooks as install_git_hooks, uninstall_hooks as uninstall_git_hooks
+from .exporter import AnalyticsExporter, MANIFEST_FILE
 from .demo import DemoManager
+from .workspace import discover_repositories, read_repos_file, analyze_workspace
+from .instrumentation import Instrumentation, format_timings
+from .ownership import OwnershipIndex
+from .commit_graph import commit_graph_status, write_commit_graph
 from collections import Counter
 
 console = Console()
@@ -87,13 +95,30 @@ def init(path, force):
 @click.option('--repo', default='.', help='Path to git repository')
 @click.option('--author', help='Filter by author name')
 @click.option('--days', default=30, help='Number of days to analyze')
-@click.option('--limit', default=100, help='Number of commits to analyze')
-def analyze(repo, author, days, limit):
+@click.option('--workspace', type=click.Path(exists=True, file_okay=False), help='Analyze every git repository under this directory')
+@click.option('--repos-file', type=click.Path(exists=True, dir_okay=False), help='Analyze repositories listed in this file (one path per line)')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=None,
+              help='Parallel workers: repositories for multi-repo analysis (default: CPU count), '
+                   'history ranges of a single repository (default: 1; 0: CPU count)')
+@click.option('--timings', is_flag=True, help='Print wall time, git calls and database rows per phase')
+@click.option('--profile', 'profile_path', type=click.Path(dir_okay=False), help='Write cProfile stats of the run to this file')
+def analyze(repo, author, days, workspace, repos_file, jobs, timings, profile_path):
     """Analyze git commit history and patterns"""
     console.print(Panel.fit("📊 [bold cyan]Git Commit Analysis[/bold cyan]", border_style="cyan"))
     
     # Track command in history
-    _track_command('analyze', {'repo': repo, 'author': author, 'days': days, 'limit': limit})
+    args = {'repo': repo, 'author': author, 'days': days,
+            'workspace': workspace, 'repos_file': repos_file, 'jobs': jobs}
+    _track_command('analyze', args)
+    run = Instrumentation('analyze', args, profile_path=profile_path)
+    
+    if workspace or repos_file:
+        run.phase("Analyzing repositories")
+        try:
+            _analyze_many(workspace, repos_file, author, days, jobs)
+        finally:
+            _report_run(run, timings)
+        return
     
     try:
         with Progress(
@@ -103,16 +128,24 @@ def analyze(repo, author, days, limit):
         ) as progress:
             # Initialize GitAnalyzer
             task = progress.add_task("Initializing analyzer...", total=None)
+            run.phase("Initializing analyzer")
             try:
-                analyzer = GitAnalyzer(repo)
+                analyzer = GitAnalyzer(repo, jobs=1 if jobs is None else jobs)
             except ValueError as e:
                 console.print(f"\n[red]Error:[/red] {str(e)}")
                 console.print("\n[yellow]Make sure you're in a git repository or provide a valid path.[/yellow]")
                 return
             
-            # Get commit history
+            from .database import get_database
+            db = get_database()
+            run.attach(db)
+            
+            # Get commit history (new commits are ingested into the database,
+            # the rest of the window is served from it)
             progress.update(task, description=f"Fetching commit history (last {days} days)...")
-            commits = analyzer.get_commit_history(days=days, author=author)
+            run.phase("Fetching commit history")
+            session = analyzer.create_session(days=days, author=author, db=db)
+            commits = analyzer.get_commit_history(session=session)
             
             if not commits:
                 console.print("\n[yellow]No commits found for the specified criteria.[/yellow]")
@@ -121,21 +154,30 @@ def analyze(repo, author, days, limit):
             
             # Save to database
             progress.update(task, description="Saving commits to database...")
-            from .database import Database
-            db = Database()
-            saved = db.save_commit_batch(commits[:limit])
+            run.phase("Saving commits to database")
+            if session.ingest_result is not None:
+                saved = f"Ingested {session.ingest_result['ingested']} new commits ({len(commits)} in window)"
+            else:
+                saved = f"Saved {db.save_commit_batch(commits)} commits to database"
             
             # Get commit patterns
             progress.update(task, description="Analyzing commit patterns...")
-            patterns = analyzer.analyze_commit_patterns(days=days, author=author)
+            run.phase("Analyzing commit patterns")
+            patterns = analyzer.analyze_commit_patterns(session=session)
             
             # Get hotspot files
             progress.update(task, description="Analyzing file hotspots...")
-            hotspots = analyzer.get_hotspot_files(days=days, limit=10, author=author)
+            run.phase("Analyzing file hotspots")
+            hotspots = analyzer.get_hotspot_files(limit=10, session=session)
             
             # Save hotspots to database
             if hotspots:
+                progress.update(task, description="Computing file ownership...")
+                run.phase("Computing file ownership")
+                owners = OwnershipIndex(analyzer, db).ownership([file_path for file_path, _, _ in hotspots])
+                
                 progress.update(task, description="Saving hotspot data...")
+                run.phase("Saving hotspot data")
                 hotspot_data = [
                     {
                         'file': file_path,
@@ -143,8 +185,8 @@ def analyze(repo, author, days, limit):
                         'insertions': 0,
                         'deletions': 0,
                         'risk_level': 'critical' if change_count > 15 else 'high' if change_count > 10 else 'medium' if change_count > 5 else 'low',
-                        'unique_authors': 0,
-                        'authors': []
+                        'unique_authors': owners.get(file_path, {}).get('contributors', 0),
+                        'authors': owners.get(file_path, {}).get('owners', [])
                     }
                     for file_path, change_count, _ in hotspots
                 ]
@@ -152,10 +194,12 @@ def analyze(repo, author, days, limit):
             
             # Generate productivity score
             progress.update(task, description="Calculating productivity score...")
-            productivity = analyzer.generate_productivity_score(days=days)
+            run.phase("Calculating productivity score")
+            productivity = analyzer.generate_productivity_score(session=session)
             db.save_productivity_score({**productivity, 'days_analyzed': days})
         
         # Display results with rich formatting
+        run.phase("Rendering results")
         console.print(f"\n[bold]Repository:[/bold] {os.path.abspath(repo)}")
         if author:
             console.print(f"[bold]Author Filter:[/bold] {author}")
@@ -277,7 +321,14 @@ def analyze(repo, author, days, limit):
         
         console.print(prod_panel)
         
-        console.print(f"\n[green]✓[/green] Analysis complete! Saved {saved} commits to database.")
+        console.print(f"\n[green]✓[/green] Analysis complete! {saved}.")
+        
+        try:
+            if commit_graph_status(analyzer.repo.working_tree_dir or repo)['needs_write']:
+                console.print("[dim]💡 No current commit-graph with changed-path filters: run "
+                              "`devflow maintain` to speed up file history queries[/dim]")
+        except ValueError:
+            pass
         
     except ValueError as e:
         console.print(f"\n[red]Error:[/red] {str(e)}")
@@ -285,44 +336,343 @@ def analyze(repo, author, days, limit):
         console.print(f"\n[red]Unexpected error:[/red] {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        _report_run(run, timings)
+
+
+def _report_run(run, timings):
+    """Finish an instrumented run, store its timings and print them if asked"""
+    result = run.finish()
+    
+    try:
+        from .database import get_database
+        run.save(run.db or get_database())
+    except Exception:
+        pass
+    
+    if run.profile_path:
+        console.print(f"\n[dim]Profile written to {run.profile_path} "
+                      f"(inspect with: python -m pstats {run.profile_path})[/dim]")
+    
+    if not timings:
+        return
+    
+    table = Table(title=f"⏱  Phase Timings ({result['command']})", show_header=True,
+                  header_style="bold cyan", border_style="dim")
+    table.add_column("Phase", style="cyan", no_wrap=True)
+    table.add_column("Wall", justify="right", style="green")
+    table.add_column("%", justify="right", style="magenta")
+    table.add_column("CPU", justify="right")
+    table.add_column("Git Calls", justify="right", style="yellow")
+    table.add_column("Rows Read", justify="right")
+    table.add_column("Rows Written", justify="right")
+    
+    *phases, total = format_timings(result)
+    for row in phases:
+        table.add_row(*row)
+    table.add_section()
+    table.add_row(*(f"[bold]{cell}[/bold]" for cell in total))
+    
+    console.print()
+    console.print(table)
+
+
+def _analyze_many(workspace, repos_file, author, days, jobs):
+    """Analyze several repositories in parallel and print a cross-repo summary"""
+    try:
+        repos = []
+        if workspace:
+            repos.extend(discover_repositories(workspace))
+        if repos_file:
+            repos.extend(read_repos_file(repos_file))
+        repos = list(dict.fromkeys(repos))
+    except (ValueError, OSError) as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+        return
+    
+    if not repos:
+        console.print("\n[yellow]No git repositories found.[/yellow]")
+        return
+    
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(repos)))
+    console.print(f"\n[bold]Repositories:[/bold] {len(repos)}")
+    console.print(f"[bold]Workers:[/bold] {workers}")
+    console.print(f"[bold]Analysis Period:[/bold] Last {days} days\n")
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        task = progress.add_task(f"Analyzing 0/{len(repos)} repositories...", total=len(repos))
+        done = []
+        
+        def on_result(result):
+            done.append(result)
+            progress.update(task, advance=1, description=f"Analyzing {len(done)}/{len(repos)} repositories...")
+        
+        results = analyze_workspace(repos, days=days, author=author, jobs=workers, on_result=on_result)
+    
+    # === CROSS-REPO SUMMARY ===
+    summary_table = Table(title="📦 Workspace Summary", show_header=True, header_style="bold magenta", border_style="cyan")
+    summary_table.add_column("Repository", style="yellow")
+    summary_table.add_column("Branch", style="cyan")
+    summary_table.add_column("Commits", justify="right", style="green")
+    summary_table.add_column("Authors", justify="right")
+    summary_table.add_column("Lines +/-", justify="right")
+    summary_table.add_column("Score", justify="right")
+    summary_table.add_column("Time", justify="right", style="dim")
+    
+    ok_results = [r for r in results if r['status'] == 'ok']
+    failed = [r for r in results if r['status'] != 'ok']
+    
+    for result in sorted(ok_results, key=lambda r: r['commits'], reverse=True):
+        summary_table.add_row(
+            Path(result['repo']).name,
+            result['branch'],
+            f"{result['commits']:,}",
+            str(result['authors']),
+            f"[green]+{result['insertions']:,}[/green] [red]-{result['deletions']:,}[/red]",
+            f"{result['score']:.1f} ({result['grade']})",
+            f"{result['duration']:.1f}s"
+        )
+    
+    if ok_results:
+        summary_table.add_row(
+            "[bold]Total[/bold]",
+            "",
+            f"[bold]{sum(r['commits'] for r in ok_results):,}[/bold]",
+            "",
+            f"[green]+{sum(r['insertions'] for r in ok_results):,}[/green] "
+            f"[red]-{sum(r['deletions'] for r in ok_results):,}[/red]",
+            f"{sum(r['score'] for r in ok_results) / len(ok_results):.1f} avg",
+            ""
+        )
+        console.print(summary_table)
+    
+    if failed:
+        console.print(f"\n[bold red]✗ {len(failed)} repositories failed:[/bold red]")
+        for result in failed:
+            console.print(f"  • {result['repo']}: [red]{result['error']}[/red]")
+    
+    console.print(f"\n[green]✓[/green] Analyzed {len(ok_results)}/{len(results)} repositories. Results saved to database.")
 
 
 @cli.command()
-@click.option('--refresh', default=5, help='Dashboard refresh interval in seconds')
+@click.option('--refresh', default=5, type=click.IntRange(min=1), help='Dashboard refresh interval in seconds')
 @click.option('--mode', type=click.Choice(['live', 'static']), default='static', help='Display mode')
-def dashboard(refresh, mode):
+@click.option('--repo', default='.', help='Path to git repository')
+def dashboard(refresh, mode, repo):
     """Display terminal dashboard with development metrics"""
     console.print(Panel.fit("📈 [bold green]DevFlow Dashboard[/bold green]", border_style="green"))
     
     # Track command in history
-    _track_command('dashboard', {'refresh': refresh, 'mode': mode})
+    _track_command('dashboard', {'refresh': refresh, 'mode': mode, 'repo': repo})
     
-    layout = Layout()
+    try:
+        analyzer = GitAnalyzer(repo)
+    except ValueError as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+        return
     
-    # Create dashboard sections
-    layout.split_column(
-        Layout(name="header", size=3),
-        Layout(name="body"),
-        Layout(name="footer", size=3)
-    )
+    from .database import get_database
+    live_dashboard = LiveDashboard(analyzer, get_database(), refresh=refresh)
     
-    layout["header"].update(Panel("[bold blue]DevFlow Dashboard[/bold blue] - Real-time Development Metrics", style="white on blue"))
+    try:
+        live_dashboard.refresh()
+    except Exception as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+        return
     
-    # Body with metrics
-    body_table = Table(show_header=True, header_style="bold cyan")
-    body_table.add_column("Metric", style="cyan", width=40)
-    body_table.add_column("Value", justify="right", style="green")
+    if mode == 'static':
+        console.print(live_dashboard.render(mode))
+        return
     
-    body_table.add_row("Today's Commits", "0")
-    body_table.add_row("Active Branches", "0")
-    body_table.add_row("Lines of Code", "0")
-    body_table.add_row("Last Commit", "N/A")
+    # Between refreshes only ref files are stat'ed; commits are ingested
+    # when HEAD or a branch ref actually moves
+    try:
+        with Live(live_dashboard.render(mode), console=console, auto_refresh=False, screen=False) as live:
+            while True:
+                time.sleep(refresh)
+                live_dashboard.refresh()
+                live.update(live_dashboard.render(mode), refresh=True)
+    except KeyboardInterrupt:
+        console.print("\n[dim]Dashboard stopped[/dim]")
+
+
+@cli.command()
+@click.option('--install-hooks', is_flag=True, help='Install post-commit/post-merge/post-rewrite hooks into --repo')
+@click.option('--uninstall-hooks', is_flag=True, help='Remove the DevFlow hooks from --repo')
+@click.option('--repo', default='.', help='Path to git repository (for hook installation)')
+@click.option('--force', is_flag=True, help='Replace existing hooks not installed by DevFlow')
+@click.option('--drain', is_flag=True, help='Ingest spooled hook events once and exit')
+@click.option('--batch-interval', default=BATCH_INTERVAL, type=click.FloatRange(min=0.1),
+              help='Seconds between ingestion batches')
+def daemon(install_hooks, uninstall_hooks, repo, force, drain, batch_interval):
+    """Run the background ingestion daemon fed by git hooks"""
+    console.print(Panel.fit("🛰️  [bold cyan]DevFlow Daemon[/bold cyan]", border_style="cyan"))
     
-    layout["body"].update(Panel(body_table, title="Metrics", border_style="cyan"))
-    layout["footer"].update(Panel(f"[dim]Mode: {mode} | Refresh: {refresh}s | Press Ctrl+C to exit[/dim]", style="white on black"))
+    # Track command in history
+    _track_command('daemon', {'install_hooks': install_hooks, 'uninstall_hooks': uninstall_hooks,
+                              'repo': repo, 'drain': drain})
     
-    console.print(layout)
-    console.print("\n[yellow]ℹ  Live dashboard implementation pending[/yellow]")
+    try:
+        if install_hooks:
+            result = install_git_hooks(repo, force=force)
+            for hook in result['installed']:
+                console.print(f"[green]✓[/green] Installed {hook}")
+            for hook in result['skipped']:
+                console.print(f"[yellow]![/yellow] Skipped {hook} (existing hook; use --force to replace)")
+            return
+        if uninstall_hooks:
+            removed = uninstall_git_hooks(repo)
+            for hook in removed:
+                console.print(f"[green]✓[/green] Removed {hook}")
+            if not removed:
+                console.print("[dim]No DevFlow hooks installed[/dim]")
+            return
+    except ValueError as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+        return
+    
+    from .database import get_database
+    ingest_daemon = IngestDaemon(get_database(), batch_interval=batch_interval)
+    
+    def report(summary):
+        console.print(f"[dim]{datetime.now():%H:%M:%S}[/dim] {summary['events']} events from "
+                      f"{summary['repos']} repositories, {summary['ingested']} commits ingested")
+        for error in summary['errors']:
+            console.print(f"  [red]✗[/red] {error}")
+    
+    if drain:
+        report(ingest_daemon.drain())
+        return
+    
+    console.print(f"[dim]Listening on {ingest_daemon.socket_path} (spool: {ingest_daemon.spool_path})[/dim]")
+    console.print("[dim]Press Ctrl+C to stop[/dim]")
+    try:
+        ingest_daemon.serve(on_batch=report)
+    except RuntimeError as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+    except KeyboardInterrupt:
+        console.print("\n[dim]Daemon stopped[/dim]")
+
+
+@cli.command()
+@click.option('--repo', default='.', help='Path to git repository')
+@click.option('--check', is_flag=True, help='Only report the commit-graph state')
+@click.option('--force', is_flag=True, help='Rewrite the commit-graph even if it is current')
+def maintain(repo, check, force):
+    """Keep the commit-graph with changed-path filters current"""
+    console.print(Panel.fit("🧰 [bold cyan]Repository Maintenance[/bold cyan]", border_style="cyan"))
+    
+    # Track command in history
+    _track_command('maintain', {'repo': repo, 'check': check, 'force': force})
+    
+    try:
+        status = commit_graph_status(repo)
+        _print_commit_graph(status)
+        
+        if check:
+            if status['needs_write']:
+                console.print("\n[yellow]Commit-graph needs updating.[/yellow] Run [bold]devflow maintain[/bold] to write it.")
+            return
+        
+        if not status['needs_write'] and not force:
+            console.print("\n[green]✓[/green] Commit-graph is current, nothing to do")
+            return
+        
+        with console.status("Writing commit-graph with changed-path filters..."):
+            status = write_commit_graph(repo)
+        
+        console.print(f"\n[green]✓[/green] Commit-graph written in {status['seconds']:.2f}s")
+        _print_commit_graph(status)
+    except ValueError as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+
+
+def _print_commit_graph(status):
+    """Print the commit-graph state reported by commit_graph_status"""
+    table = Table(show_header=False, border_style="dim")
+    table.add_column("Field", style="cyan")
+    table.add_column("Value")
+    
+    table.add_row("Commit-graph", "[green]present[/green]" if status['exists'] else "[red]missing[/red]")
+    table.add_row("Changed-path filters", "[green]yes[/green]" if status['changed_paths'] else "[yellow]no[/yellow]")
+    table.add_row("Commits covered", f"{status['commits']:,}")
+    table.add_row("Layers", str(status['layers']))
+    table.add_row("Branch tips not covered", str(status['missing_tips']))
+    
+    console.print(table)
+
+
+# Snippet highlight markers, swapped for rich markup after escaping
+_MATCH_START, _MATCH_END = '\x02', '\x03'
+
+
+@cli.command()
+@click.argument('query')
+@click.option('--author', help='Filter by author name or email')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S']),
+              help='Only commits on or after this date (YYYY-MM-DD)')
+@click.option('--limit', default=20, type=click.IntRange(min=1), help='Maximum results to show')
+def search(query, author, since, limit):
+    """Full-text search over ingested commit messages, authors and paths
+    
+    QUERY words must all match; use OR, NOT, "quoted phrases", prefix* and
+    message:, author: or path: to restrict a term to one field.
+    """
+    console.print(Panel.fit("🔎 [bold cyan]Commit Search[/bold cyan]", border_style="cyan"))
+    
+    # Track command in history
+    _track_command('search', {'query': query, 'author': author,
+                              'since': since.isoformat() if since else None, 'limit': limit})
+    
+    try:
+        from .database import get_database
+        db = get_database()
+        
+        start = time.perf_counter()
+        results = db.search_commits(query, author=author, since=since, limit=limit,
+                                    highlight=(_MATCH_START, _MATCH_END))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except ValueError as e:
+        console.print(f"\n[red]Error:[/red] {str(e)}")
+        return
+    
+    if not results:
+        console.print("\n[yellow]No matching commits.[/yellow]")
+        console.print("[dim]Only ingested commits are searched; run `devflow analyze` to ingest a repository.[/dim]")
+        return
+    
+    table = Table(border_style="dim")
+    table.add_column("Commit", style="yellow", no_wrap=True)
+    table.add_column("Date", no_wrap=True)
+    table.add_column("Author", style="cyan")
+    table.add_column("Message")
+    table.add_column("Paths", style="dim")
+    
+    for result in results:
+        table.add_row(
+            result['short_hash'],
+            result['timestamp'].strftime('%Y-%m-%d'),
+            escape(result['author']),
+            _highlight(result['message']),
+            _highlight(result['paths']),
+        )
+    
+    console.print(table)
+    source = "" if db.has_search else " (substring scan: SQLite has no FTS5)"
+    console.print(f"[dim]{len(results)} result(s), best match first, in {elapsed_ms:.1f} ms{source}[/dim]")
+
+
+def _highlight(snippet):
+    """Rich markup for a search snippet with the matched words in bold"""
+    return (
+        escape(' '.join(snippet.split()))
+        .replace(_MATCH_START, '[bold magenta]')
+        .replace(_MATCH_END, '[/bold magenta]')
+    )
 
 
 @cli.command()
@@ -330,7 +680,9 @@ def dashboard(refresh, mode):
 @click.option('--clear', is_flag=True, help='Clear command history')
 @click.option('--suggest-aliases', is_flag=True, help='Show only alias suggestions')
 @click.option('--patterns', is_flag=True, help='Show only workflow patterns')
-def history(limit, clear, suggest_aliases, patterns):
+@click.option('--chain-length', default=2, type=click.IntRange(2, 10),
+              help='Show frequent command chains of length 2 up to this')
+def history(limit, clear, suggest_aliases, patterns, chain_length):
     """View or manage command execution history"""
     
     if clear:
@@ -362,9 +714,7 @@ def history(limit, clear, suggest_aliases, patterns):
                 workflow_patterns = tracker.detect_workflow_patterns(min_frequency=2)
             
             # Display workflow insights
-            if not any([workflow_patterns['build_test_cycles'], 
-                       workflow_patterns['git_workflows'], 
-                       workflow_patterns['install_run_loops']]):
+            if not any(items for family, items in workflow_patterns.items() if family != 'insights'):
                 console.print("\n[yellow]No significant workflow patterns detected.[/yellow]")
                 return
             
@@ -386,6 +736,15 @@ def history(limit, clear, suggest_aliases, patterns):
                 for item in workflow_patterns['install_run_loops'][:5]:
                     console.print(f"  • {item['pattern']} ([bold]{item['count']}x[/bold])")
             
+            # Other families from config/workflow_patterns.json
+            for family in get_workflow_matcher().families:
+                items = workflow_patterns.get(family['name'])
+                if family['name'] in ('build_test_cycles', 'git_workflows', 'install_run_loops') or not items:
+                    continue
+                console.print(f"\n[bold green]🔁 {family.get('title', family['name'])}:[/bold green]")
+                for item in items[:5]:
+                    console.print(f"  • {item['pattern']} ([bold]{item['count']}x[/bold])")
+            
             # Insights panel
             insights_text = "\n".join([f"• {insight}" for insight in workflow_patterns['insights']])
             panel = Panel(
@@ -414,7 +773,7 @@ def history(limit, clear, suggest_aliases, patterns):
                 console=console
             ) as progress:
                 task = progress.add_task("Analyzing shell history...", total=None)
-                tracker.parse_shell_history()
+                tracker.sync_history()
                 progress.update(task, description="Generating suggestions...")
                 suggestions = tracker.suggest_aliases(min_frequency=3, limit=10)
             
@@ -466,7 +825,7 @@ def history(limit, clear, suggest_aliases, patterns):
             
             progress.update(task, description="Analyzing patterns...")
             top_commands = tracker.get_top_commands(limit=limit)
-            sequences = tracker.find_common_sequences(sequence_length=2, min_frequency=2)
+            chains = tracker.mine_sequences(max_length=chain_length, top_k=5, min_frequency=2)
             suggestions = tracker.suggest_aliases(min_frequency=3, limit=5)
             stats = tracker.get_statistics()
         
@@ -499,12 +858,16 @@ def history(limit, clear, suggest_aliases, patterns):
             
             console.print(table)
         
-        # Command sequences
-        if sequences:
-            console.print("\n[bold cyan]🔄 Top 5 Command Sequences:[/bold cyan]")
-            for idx, seq_data in enumerate(sequences[:5], 1):
+        # Command sequences, one section per chain length
+        for length, sequences in chains.items():
+            title = "Command Sequences" if length == 2 else f"{length}-Command Chains"
+            console.print(f"\n[bold cyan]🔄 Top {len(sequences)} {title}:[/bold cyan]")
+            for idx, seq_data in enumerate(sequences, 1):
+                # Approximate counts are upper bounds once the sketch has evicted chains
+                count = f"{seq_data['count']}" if not seq_data['error'] else \
+                    f"~{seq_data['count']} (±{seq_data['error']})"
                 console.print(f"  {idx}. [yellow]{seq_data['display']}[/yellow]")
-                console.print(f"      Repeated [bold]{seq_data['count']}[/bold] times")
+                console.print(f"      Repeated [bold]{count}[/bold] times")
         
         # Alias suggestions panel
         if suggestions:
@@ -540,12 +903,20 @@ def history(limit, clear, suggest_aliases, patterns):
 @click.option('--output', help='Output directory for JSON files')
 @click.option('--days', default=30, help='Number of days to analyze')
 @click.option('--repo', default='.', help='Repository path')
-def export(output, days, repo):
+@click.option('--compact', is_flag=True, help='Write JSON without indentation')
+@click.option('--gzip', 'gzip_sidecar', is_flag=True, help='Also write gzipped .json.gz sidecars')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=1,
+              help='Parallel git log workers over history ranges (0: CPU count)')
+@click.option('--timings', is_flag=True, help='Print wall time, git calls and database rows per phase')
+@click.option('--profile', 'profile_path', type=click.Path(dir_okay=False), help='Write cProfile stats of the run to this file')
+def export(output, days, repo, compact, gzip_sidecar, jobs, timings, profile_path):
     """Export analytics data to JSON files for frontend"""
     console.print(Panel.fit("📤 [bold blue]Export Analytics[/bold blue]", border_style="blue"))
     
     # Track command
-    _track_command('export', {'output': output, 'days': days, 'repo': repo})
+    args = {'output': output, 'days': days, 'repo': repo, 'compact': compact, 'gzip': gzip_sidecar, 'jobs': jobs}
+    _track_command('export', args)
+    run = Instrumentation('export', args, profile_path=profile_path)
     
     try:
         with Progress(
@@ -555,23 +926,33 @@ def export(output, days, repo):
         ) as progress:
             # Initialize exporter
             task = progress.add_task("Initializing exporter...", total=None)
-            exporter = AnalyticsExporter(output_dir=output)
+            run.phase("Initializing exporter")
+            exporter = AnalyticsExporter(output_dir=output, repo_path=repo,
+                                         compact=compact, gzip_sidecar=gzip_sidecar, jobs=jobs)
+            run.attach(exporter.db)
             
             # Run analysis first to ensure data is fresh
-            progress.update(task, description="Analyzing repository...")
+            progress.update(task, description="Scanning repository history...")
+            run.phase("Scanning repository history")
             try:
-                analyzer = GitAnalyzer(repo)
-                from .database import Database
-                db = Database()
+                analyzer = exporter.analyzer
+                db = exporter.db
+                
+                # One scan of the longest window feeds the analysis and every export
+                history_days = max(days, exporter.SPARKLINE_DAYS, exporter.HEATMAP_WEEKS * 7)
+                session = exporter.scan_history(history_days).narrow(days)
                 
                 # Get and save commits
-                commits = analyzer.get_commit_history(days=days)
+                progress.update(task, description="Analyzing repository...")
+                run.phase("Analyzing repository")
+                commits = analyzer.get_commit_history(session=session)
                 if commits:
                     db.save_commit_batch(commits)
                 
                 # Get and save hotspots
-                hotspots = analyzer.get_hotspot_files(days=days, limit=10)
+                hotspots = analyzer.get_hotspot_files(limit=10, session=session)
                 if hotspots:
+                    owners = exporter.ownership([file_path for file_path, _, _ in hotspots])
                     hotspot_data = [
                         {
                             'file': file_path,
@@ -579,15 +960,15 @@ def export(output, days, repo):
                             'insertions': 0,
                             'deletions': 0,
                             'risk_level': 'critical' if change_count > 15 else 'high' if change_count > 10 else 'medium',
-                            'unique_authors': 0,
-                            'authors': []
+                            'unique_authors': owners.get(file_path, {}).get('contributors', 0),
+                            'authors': owners.get(file_path, {}).get('owners', [])
                         }
                         for file_path, change_count, _ in hotspots
                     ]
                     db.save_hotspot_batch(hotspot_data, days_analyzed=days)
                 
                 # Calculate and save productivity score
-                productivity = analyzer.generate_productivity_score(days=days)
+                productivity = analyzer.generate_productivity_score(session=session)
                 db.save_productivity_score({**productivity, 'days_analyzed': days})
             
             except Exception as e:
@@ -595,21 +976,27 @@ def export(output, days, repo):
             
             # Export all analytics
             progress.update(task, description="Exporting productivity summary...")
+            run.phase("Exporting productivity summary")
             exporter.export_productivity_summary_json(days=7)
             
             progress.update(task, description="Exporting file hotspots...")
+            run.phase("Exporting file hotspots")
             exporter.export_file_hotspots_json(days=days)
             
             progress.update(task, description="Exporting commit analytics...")
+            run.phase("Exporting commit analytics")
             exporter.export_commit_analytics_json(days=365)
             
             progress.update(task, description="Exporting command usage...")
+            run.phase("Exporting command usage")
             exporter.export_command_usage_json(limit=10)
             
             progress.update(task, description="Exporting insights...")
+            run.phase("Exporting insights")
             exporter.export_insights_json(days=days)
         
         # Display success
+        run.phase("Rendering results")
         console.print(f"\n[green]✓[/green] Analytics exported successfully!")
         console.print(f"[bold]Output directory:[/bold] {exporter.output_dir}")
         console.print("\n[bold cyan]Files created:[/bold cyan]")
@@ -626,14 +1013,18 @@ def export(output, days, repo):
             file_path = exporter.output_dir / file
             if file_path.exists():
                 size = file_path.stat().st_size
-                console.print(f"  • {file} ([dim]{size:,} bytes[/dim])")
+                status = "unchanged, not rewritten" if file in exporter.unchanged else "written"
+                console.print(f"  • {file} ([dim]{size:,} bytes, {status}[/dim])")
         
-        console.print(f"\n[dim]💡 Frontend can now load data from /devflow-data/*.json[/dim]")
+        console.print(f"\n[dim]💡 Frontend can now load data from /devflow-data/*.json "
+                      f"(versions in {MANIFEST_FILE})[/dim]")
     
     except Exception as e:
         console.print(f"\n[red]Error:[/red] {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        _report_run(run, timings)
 
 
 def _track_command(command_name, args):
@@ -758,18 +1149,22 @@ def demo(refresh, cleanup):
             
             try:
                 analyzer = GitAnalyzer(str(demo_mgr.repo_path))
-                from .database import Database
-                db = Database()
+                from .database import get_database
+                db = get_database()
+                
+                session = analyzer.create_session(days=days, db=db)
                 
                 # Get and save commits
-                commits = analyzer.get_commit_history(days=days)
+                commits = analyzer.get_commit_history(session=session)
                 if commits:
-                    db.save_commit_batch(commits)
+                    if session.ingest_result is None:
+                        db.save_commit_batch(commits)
                     console.print(f"[green]✓[/green] Saved {len(commits)} commits")
                 
                 # Get and save hotspots
-                hotspots = analyzer.get_hotspot_files(days=days, limit=20)
+                hotspots = analyzer.get_hotspot_files(limit=20, session=session)
                 if hotspots:
+                    owners = OwnershipIndex(analyzer, db).ownership([file_path for file_path, _, _ in hotspots])
                     hotspot_data = [
                         {
                             'file': file_path,
@@ -777,8 +1172,8 @@ def demo(refresh, cleanup):
                             'insertions': 0,
                             'deletions': 0,
                             'risk_level': 'critical' if change_count > 15 else 'high' if change_count > 10 else 'medium',
-                            'unique_authors': 0,
-                            'authors': []
+                            'unique_authors': owners.get(file_path, {}).get('contributors', 0),
+                            'authors': owners.get(file_path, {}).get('owners', [])
                         }
                         for file_path, change_count, _ in hotspots
                     ]
@@ -786,7 +1181,7 @@ def demo(refresh, cleanup):
                     console.print(f"[green]✓[/green] Identified {len(hotspots)} hotspot files")
                 
                 # Calculate and save productivity score
-                productivity = analyzer.generate_productivity_score(days=days)
+                productivity = analyzer.generate_productivity_score(session=session)
                 db.save_productivity_score({**productivity, 'days_analyzed': days})
                 console.print(f"[green]✓[/green] Productivity score: {productivity['score']:.1f}/100")
             
@@ -804,7 +1199,13 @@ def demo(refresh, cleanup):
             task = progress.add_task("Exporting analytics...", total=None)
             
             try:
-                exporter = AnalyticsExporter(output_dir=str(demo_mgr.get_frontend_path()))
+                exporter = AnalyticsExporter(
+                    output_dir=str(demo_mgr.get_frontend_path()),
+                    repo_path=str(demo_mgr.repo_path)
+                )
+                
+                progress.update(task, description="Scanning repository history...")
+                exporter.scan_history(max(days, exporter.SPARKLINE_DAYS, exporter.HEATMAP_WEEKS * 7))
                 
                 progress.update(task, description="Exporting productivity summary...")
                 exporter.export_productivity_summary_json(days=7)
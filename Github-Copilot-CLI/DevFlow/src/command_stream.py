@@ -0,0 +1,106 @@
+"""
+Compact interned representation of a shell command history
+
+Each distinct command string is stored once and given an integer ID in
+order of first use. The history itself is an array('I') of IDs with a
+parallel array('q') of epoch timestamps, so a million-line history costs
+a few MB instead of a dict per line.
+"""
+
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+
+
+# Timestamp stored for lines without one
+NO_TIMESTAMP = 0
+
+
+class CommandStream:
+    """Shell commands in history order, interned to integer IDs"""
+
+    def __init__(self):
+        self.commands = []
+        self.ids = array('I')
+        self.timestamps = array('q')
+        self._index = {}
+
+    def append(self, command, timestamp=None):
+        """
+        Add a command to the end of the stream
+
+        Args:
+            command (str): Command line
+            timestamp (datetime): When it ran (optional)
+        """
+        command_id = self._index.get(command)
+        if command_id is None:
+            command_id = self._index[command] = len(self.commands)
+            self.commands.append(command)
+
+        self.ids.append(command_id)
+        self.timestamps.append(int(timestamp.timestamp()) if timestamp else NO_TIMESTAMP)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        """History entry at a position, in the legacy dict shape"""
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+
+        ts = self.timestamps[position]
+        return {
+            'command': self.commands[self.ids[position]],
+            'timestamp': datetime.fromtimestamp(ts) if ts != NO_TIMESTAMP else None,
+            'session': None
+        }
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def strings(self):
+        """
+        Iterate over the command strings in history order
+
+        Yields:
+            str: Command line
+        """
+        commands = self.commands
+        for command_id in self.ids:
+            yield commands[command_id]
+
+    def id_counts(self):
+        """
+        Count occurrences of each command ID
+
+        Returns:
+            Counter: {command_id: count}, in order of first use
+        """
+        return Counter(self.ids)
+
+    def most_common(self, limit=None):
+        """
+        Most used commands; ties in order of first use
+
+        Args:
+            limit (int): Number of commands to return (all when None)
+
+        Returns:
+            list: (command, count) tuples
+        """
+        return [(self.commands[command_id], count) for command_id, count in self.id_counts().most_common(limit)]
+
+    def ngram_counts(self, length):
+        """
+        Count consecutive runs of commands
+
+        Args:
+            length (int): Commands per run
+
+        Returns:
+            Counter: {tuple of command IDs: count}, in order of first occurrence
+        """
+        return Counter(zip(*(islice(self.ids, offset, None) for offset in range(length))))
@@ -0,0 +1,243 @@
+"""
+Commit-graph maintenance for fast path-limited history walks
+
+`git log -- <path>` has to diff every commit's tree against its parent to
+find the commits that touched the path. A commit-graph written with
+`--changed-paths` stores a Bloom filter of changed paths per commit, so git
+can skip the tree diff for almost every commit that did not touch the path.
+This module reads the commit-graph files directly to tell whether they
+exist, carry Bloom filters and still cover every branch tip, and writes them.
+"""
+
+import mmap
+import subprocess
+import time
+from pathlib import Path
+
+
+GRAPH_SIGNATURE = b'CGPH'
+GRAPH_FILE = 'commit-graph'
+CHAIN_FILE = Path('commit-graphs') / 'commit-graph-chain'
+
+# Chunk ids of the commit-graph file format
+CHUNK_OID_FANOUT = b'OIDF'
+CHUNK_OID_LOOKUP = b'OIDL'
+CHUNK_BLOOM_INDEXES = b'BIDX'
+
+HASH_LENGTHS = {1: 20, 2: 32}
+
+
+def _git(repo_path, *args):
+    return subprocess.run(
+        ['git', '-C', str(repo_path), *args],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+
+def _info_dir(repo_path):
+    """objects/info directory of the repository (shared by worktrees)"""
+    result = _git(repo_path, 'rev-parse', '--git-path', 'objects/info')
+    if result.returncode != 0:
+        raise ValueError(f"'{repo_path}' is not a valid git repository")
+
+    path = Path(result.stdout.decode().strip())
+    if not path.is_absolute():
+        path = Path(repo_path) / path
+    return path
+
+
+def graph_files(repo_path):
+    """
+    Commit-graph files of a repository, oldest layer first
+
+    Args:
+        repo_path (str): Path to git repository
+
+    Returns:
+        list: Paths of the single graph file or of every layer in the chain
+    """
+    info = _info_dir(repo_path)
+
+    chain = info / CHAIN_FILE
+    if chain.exists():
+        layers = [line.strip() for line in chain.read_text().splitlines() if line.strip()]
+        return [info / 'commit-graphs' / f'graph-{layer}.graph' for layer in layers]
+
+    single = info / GRAPH_FILE
+    return [single] if single.exists() else []
+
+
+class GraphLayer:
+    """One commit-graph file, memory-mapped"""
+
+    def __init__(self, path):
+        """
+        Open and validate a commit-graph file
+
+        Args:
+            path (Path): Graph file
+
+        Raises:
+            ValueError: If the file is not a commit-graph
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        data = self._map
+        if len(data) < 8 or data[:4] != GRAPH_SIGNATURE:
+            self.close()
+            raise ValueError(f"Not a commit-graph file: {self.path}")
+
+        self.hash_len = HASH_LENGTHS.get(data[5], 20)
+        chunk_count = data[6]
+
+        self.chunks = {}
+        for i in range(chunk_count):
+            entry = 8 + i * 12
+            self.chunks[bytes(data[entry:entry + 4])] = int.from_bytes(data[entry + 4:entry + 12], 'big')
+
+        fanout = self.chunks[CHUNK_OID_FANOUT]
+        self.commits = int.from_bytes(data[fanout + 255 * 4:fanout + 256 * 4], 'big')
+
+    @property
+    def changed_paths(self):
+        """True if the layer stores changed-path Bloom filters"""
+        return CHUNK_BLOOM_INDEXES in self.chunks
+
+    def contains(self, sha):
+        """
+        Whether a commit is in this layer
+
+        Args:
+            sha (str): Full hex commit id
+
+        Returns:
+            bool: True if the commit is stored in the layer
+        """
+        oid = bytes.fromhex(sha)
+        if len(oid) != self.hash_len:
+            return False
+
+        # Binary search the sorted OID lookup chunk within the fanout bucket
+        fanout = self.chunks[CHUNK_OID_FANOUT]
+        first = oid[0]
+        lo = int.from_bytes(self._map[fanout + (first - 1) * 4:fanout + first * 4], 'big') if first else 0
+        hi = int.from_bytes(self._map[fanout + first * 4:fanout + (first + 1) * 4], 'big')
+
+        lookup = self.chunks[CHUNK_OID_LOOKUP]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = lookup + mid * self.hash_len
+            current = self._map[start:start + self.hash_len]
+            if current == oid:
+                return True
+            if current < oid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def close(self):
+        """Release the mapping"""
+        self._map.close()
+
+
+def _ref_tips(repo_path):
+    """Commit ids of HEAD, local branches and remote-tracking branches"""
+    result = _git(repo_path, 'rev-parse', '--branches', '--remotes')
+    tips = set(result.stdout.decode().split()) if result.returncode == 0 else set()
+
+    head = _git(repo_path, 'rev-parse', '--verify', '-q', 'HEAD^{commit}')
+    if head.returncode == 0:
+        tips.add(head.stdout.decode().strip())
+    return tips
+
+
+def commit_graph_status(repo_path='.'):
+    """
+    Describe the repository's commit-graph
+
+    Args:
+        repo_path (str): Path to git repository
+
+    Returns:
+        dict: 'exists', 'changed_paths' (every layer has Bloom filters),
+              'layers', 'commits', 'missing_tips' (branch tips not in the
+              graph), 'stale' and 'needs_write'
+
+    Raises:
+        ValueError: If the path is not a git repository
+    """
+    layers = []
+    try:
+        for path in graph_files(repo_path):
+            try:
+                layers.append(GraphLayer(path))
+            except (OSError, ValueError, KeyError):
+                # An unreadable layer makes the graph as good as missing
+                layers = []
+                break
+
+        tips = _ref_tips(repo_path)
+        missing = [tip for tip in tips if not any(layer.contains(tip) for layer in layers)]
+
+        status = {
+            'exists': bool(layers),
+            'changed_paths': bool(layers) and all(layer.changed_paths for layer in layers),
+            'layers': len(layers),
+            'commits': sum(layer.commits for layer in layers),
+            'missing_tips': len(missing),
+        }
+    finally:
+        for layer in layers:
+            layer.close()
+
+    status['stale'] = status['exists'] and status['missing_tips'] > 0
+    status['needs_write'] = bool(tips) and (
+        not status['changed_paths'] or status['stale']
+    )
+    return status
+
+
+def write_commit_graph(repo_path='.'):
+    """
+    Write a commit-graph of all reachable commits with changed-path filters
+
+    Bloom filters already present in an existing graph are reused by git,
+    so refreshing a current graph only computes filters for new commits.
+
+    Args:
+        repo_path (str): Path to git repository
+
+    Returns:
+        dict: Status after writing (see commit_graph_status) plus 'seconds'
+
+    Raises:
+        ValueError: If the path is not a git repository or git fails
+    """
+    start = time.perf_counter()
+    result = _git(repo_path, 'commit-graph', 'write', '--reachable', '--changed-paths')
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', errors='replace').strip()
+        raise ValueError(f"git commit-graph write failed: {message}")
+
+    seconds = time.perf_counter() - start
+    return {**commit_graph_status(repo_path), 'seconds': round(seconds, 3)}
+
+
+def ensure_commit_graph(repo_path='.'):
+    """
+    Write the commit-graph if it is missing, lacks Bloom filters or is stale
+
+    Args:
+        repo_path (str): Path to git repository
+
+    Returns:
+        dict: Status (see commit_graph_status) with 'written' and, when
+              written, 'seconds'
+    """
+    status = commit_graph_status(repo_path)
+    if not status['needs_write']:
+        return {**status, 'written': False}
+    return {**write_commit_graph(repo_path), 'written': True}
@@ -0,0 +1,92 @@
+"""
+Compact commit records for streaming analysis
+
+A commit dictionary in the get_commit_history schema costs a hash table
+per commit. CommitRecord stores the same fields in __slots__, derives
+short_hash and lines_changed on access and interns author names and
+emails, which repeat across a history. Records also answer `record['key']`
+and `record.get('key')`, so code written against commit dictionaries
+(database ingestion, exports) accepts them unchanged.
+"""
+
+import sys
+
+
+class CommitRecord:
+    """One commit in the get_commit_history schema, without per-file stats"""
+
+    __slots__ = ('hash', 'author', 'email', 'message', 'timestamp',
+                 'files_changed', 'insertions', 'deletions')
+
+    # Field order of the dictionary schema
+    KEYS = ('hash', 'short_hash', 'author', 'email', 'message', 'timestamp',
+            'files_changed', 'insertions', 'deletions', 'lines_changed')
+
+    def __init__(self, hash, author, email, message, timestamp,
+                 files_changed=0, insertions=0, deletions=0):
+        self.hash = hash
+        self.author = sys.intern(author) if author else author
+        self.email = sys.intern(email) if email else email
+        self.message = message
+        self.timestamp = timestamp
+        self.files_changed = files_changed
+        self.insertions = insertions
+        self.deletions = deletions
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Build a record from a commit dictionary (per-file stats are dropped)
+
+        Args:
+            record (dict): Commit in the get_commit_history or ingest schema
+
+        Returns:
+            CommitRecord: Compact record
+        """
+        return cls(
+            record['hash'], record['author'], record['email'], record['message'],
+            record['timestamp'], record['files_changed'], record['insertions'], record['deletions'],
+        )
+
+    @property
+    def short_hash(self):
+        return self.hash[:7]
+
+    @property
+    def lines_changed(self):
+        return self.insertions + self.deletions
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        """Dictionary-style access; unknown keys return the default"""
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        """
+        Convert to a commit dictionary
+
+        Returns:
+            dict: Commit in the get_commit_history schema
+        """
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def __eq__(self, other):
+        if not isinstance(other, CommitRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CommitRecord({self.short_hash} {self.author!r} {self.timestamp:%Y-%m-%d %H:%M})"
@@ -0,0 +1,336 @@
+"""
+Background ingestion daemon fed by git hooks
+
+The installed post-commit/post-merge/post-rewrite hooks are tiny shell
+scripts that start src/hook_client.py in the background and return at
+once. The client sends the new SHAs to the daemon over a Unix socket, or
+appends them to a spool file when the daemon is not running. The daemon
+collects events and ingests them in batches: branches that moved are
+synced through their watermarks, and commits made on a detached HEAD
+are ingested by SHA.
+"""
+
+import json
+import os
+import selectors
+import shlex
+import socket
+import stat
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import git
+
+from .git_analyzer import GitAnalyzer
+from .ingest import IncrementalIngestor, GitLogError
+
+
+DEVFLOW_DIR = Path.home() / '.devflow'
+DAEMON_SOCKET = DEVFLOW_DIR / 'daemon.sock'
+SPOOL_FILE = DEVFLOW_DIR / 'spool.jsonl'
+
+HOOK_EVENTS = ('post-commit', 'post-merge', 'post-rewrite')
+HOOK_MARKER = '# devflow-hook'
+HOOK_CLIENT = Path(__file__).parent / 'hook_client.py'
+
+# Seconds between ingestion batches
+BATCH_INTERVAL = 2.0
+
+# History window kept for a branch the daemon syncs for the first time
+WINDOW_DAYS = 30
+
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+HOOK_TEMPLATE = """#!/bin/sh
+{marker}: installed by `devflow daemon --install-hooks`
+# Hands the event to DevFlow in the background so git never waits on it
+{command} >/dev/null 2>&1 &
+exit 0
+"""
+
+
+def _hooks_dir(repo):
+    """Hooks directory, honouring core.hooksPath"""
+    path = Path(repo.git.rev_parse('--git-path', 'hooks'))
+    if not path.is_absolute():
+        path = Path(repo.working_tree_dir or repo.git_dir) / path
+    return path
+
+
+def install_hooks(repo_path='.', socket_path=None, spool_path=None, force=False):
+    """
+    Install the DevFlow git hooks into a repository
+
+    Args:
+        repo_path (str): Path to git repository
+        socket_path (str): Daemon socket (default: ~/.devflow/daemon.sock)
+        spool_path (str): Spool file (default: ~/.devflow/spool.jsonl)
+        force (bool): Replace hooks that were not installed by DevFlow
+
+    Returns:
+        dict: 'installed' and 'skipped' hook paths
+
+    Raises:
+        ValueError: If the path is not a git repository
+    """
+    repo = GitAnalyzer(repo_path).repo
+    hooks_dir = _hooks_dir(repo)
+    hooks_dir.mkdir(parents=True, exist_ok=True)
+
+    socket_path = Path(socket_path or DAEMON_SOCKET)
+    spool_path = Path(spool_path or SPOOL_FILE)
+    spool_path.parent.mkdir(parents=True, exist_ok=True)
+
+    client = ' '.join(shlex.quote(str(arg)) for arg in (
+        sys.executable, '-S', '-E', HOOK_CLIENT.resolve(), socket_path, spool_path
+    ))
+
+    result = {'installed': [], 'skipped': []}
+    for event in HOOK_EVENTS:
+        hook = hooks_dir / event
+        if hook.exists() and HOOK_MARKER not in hook.read_text(errors='replace') and not force:
+            result['skipped'].append(str(hook))
+            continue
+
+        if event == 'post-rewrite':
+            # Background jobs get /dev/null as stdin, so read the rewritten SHAs first
+            command = f'rewritten=$(cat)\nprintf \'%s\\n\' "$rewritten" | {client} {event} "$@"'
+        else:
+            command = f'{client} {event} "$@" </dev/null'
+
+        hook.write_text(HOOK_TEMPLATE.format(marker=HOOK_MARKER, command=command))
+        hook.chmod(hook.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        result['installed'].append(str(hook))
+
+    return result
+
+
+def uninstall_hooks(repo_path='.'):
+    """
+    Remove the DevFlow git hooks from a repository
+
+    Args:
+        repo_path (str): Path to git repository
+
+    Returns:
+        list: Removed hook paths (hooks not installed by DevFlow are kept)
+
+    Raises:
+        ValueError: If the path is not a git repository
+    """
+    hooks_dir = _hooks_dir(GitAnalyzer(repo_path).repo)
+    removed = []
+
+    for event in HOOK_EVENTS:
+        hook = hooks_dir / event
+        if hook.exists() and HOOK_MARKER in hook.read_text(errors='replace'):
+            hook.unlink()
+            removed.append(str(hook))
+
+    return removed
+
+
+def parse_events(data):
+    """
+    Parse newline-delimited JSON events, skipping malformed lines
+
+    Args:
+        data (bytes): Raw payload
+
+    Returns:
+        list: Event dicts that name a repository
+    """
+    events = []
+    for line in data.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict) and event.get('repo'):
+            events.append(event)
+    return events
+
+
+def read_spool(spool_path=None):
+    """
+    Take all events out of the spool file
+
+    The file is moved aside first, then locked so a hook that opened it
+    before the move finishes its write before we read.
+
+    Args:
+        spool_path (str): Spool file (default: ~/.devflow/spool.jsonl)
+
+    Returns:
+        list: Spooled events, oldest first
+    """
+    spool_path = Path(spool_path or SPOOL_FILE)
+    draining = spool_path.with_name(spool_path.name + f'.{os.getpid()}.draining')
+
+    try:
+        os.replace(spool_path, draining)
+    except FileNotFoundError:
+        return []
+
+    with open(draining, 'rb') as f:
+        try:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            pass
+        data = f.read()
+
+    draining.unlink()
+    return parse_events(data)
+
+
+class IngestDaemon:
+    """Collect hook events and ingest them into the database in batches"""
+
+    def __init__(self, db, socket_path=None, spool_path=None,
+                 batch_interval=BATCH_INTERVAL, window_days=WINDOW_DAYS):
+        """
+        Args:
+            db (Database): Database receiving the commits
+            socket_path (str): Socket to listen on (default: ~/.devflow/daemon.sock)
+            spool_path (str): Spool file drained each batch (default: ~/.devflow/spool.jsonl)
+            batch_interval (float): Seconds between batches
+            window_days (int): History window for branches synced the first time
+        """
+        self.db = db
+        self.socket_path = Path(socket_path or DAEMON_SOCKET)
+        self.spool_path = Path(spool_path or SPOOL_FILE)
+        self.batch_interval = batch_interval
+        self.window_days = window_days
+        self.pending = []
+        self._running = False
+
+    def ingest(self, events):
+        """
+        Ingest a batch of events
+
+        Each branch named in the batch is synced once; SHAs of events on a
+        detached HEAD are ingested directly.
+
+        Args:
+            events (list): Hook events
+
+        Returns:
+            dict: 'events', 'repos', 'ingested' commit count and 'errors'
+        """
+        by_repo = {}
+        for event in events:
+            branches, detached = by_repo.setdefault(event['repo'], (set(), set()))
+            if event.get('branch'):
+                branches.add(event['branch'])
+            else:
+                detached.update(event.get('shas') or [])
+
+        since = datetime.now() - timedelta(days=self.window_days)
+        summary = {'events': len(events), 'repos': len(by_repo), 'ingested': 0, 'errors': []}
+
+        for repo_path, (branches, detached) in by_repo.items():
+            try:
+                ingestor = IncrementalIngestor(GitAnalyzer(repo_path), self.db)
+                for branch in sorted(branches):
+                    summary['ingested'] += ingestor.sync(since, branch)['ingested']
+                summary['ingested'] += ingestor.ingest_shas(sorted(detached))
+            except (ValueError, GitLogError, git.exc.GitError) as e:
+                summary['errors'].append(f"{repo_path}: {str(e)}")
+
+        return summary
+
+    def drain(self):
+        """
+        Ingest everything waiting in the spool file
+
+        Returns:
+            dict: Batch summary (see ingest)
+        """
+        return self.ingest(read_spool(self.spool_path))
+
+    def serve(self, on_batch=None):
+        """
+        Listen for hook events until stop() is called
+
+        Args:
+            on_batch (callable): Called with each non-empty batch summary
+
+        Raises:
+            RuntimeError: If another daemon is listening on the socket
+        """
+        listener = self._bind()
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ)
+        self._running = True
+        next_batch = time.monotonic()
+
+        try:
+            while self._running:
+                timeout = max(0.0, next_batch - time.monotonic())
+                for _ in selector.select(min(timeout, 0.5)):
+                    self._receive(listener)
+
+                if time.monotonic() >= next_batch:
+                    events, self.pending = self.pending + read_spool(self.spool_path), []
+                    if events:
+                        summary = self.ingest(events)
+                        if on_batch:
+                            on_batch(summary)
+                    next_batch = time.monotonic() + self.batch_interval
+        finally:
+            selector.close()
+            listener.close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stop(self):
+        """Ask serve() to return after the current batch"""
+        self._running = False
+
+    def _bind(self):
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+                raise RuntimeError(f"A DevFlow daemon is already listening on {self.socket_path}")
+            except ConnectionRefusedError:
+                # Left over from a daemon that did not shut down cleanly
+                self.socket_path.unlink()
+            finally:
+                probe.close()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(128)
+        listener.setblocking(False)
+        return listener
+
+    def _receive(self, listener):
+        """Read every queued connection; clients send one payload and close"""
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except BlockingIOError:
+                return
+
+            with conn:
+                conn.settimeout(1.0)
+                chunks = []
+                size = 0
+                try:
+                    while size < MAX_MESSAGE_BYTES:
+                        chunk = conn.recv(65536)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                        size += len(chunk)
+                except OSError:
+                    pass
+                self.pending.extend(parse_events(b''.join(chunks)))
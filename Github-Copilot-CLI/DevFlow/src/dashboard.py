@@ -0,0 +1,251 @@
+"""
+Terminal dashboard metrics with incremental refresh
+
+The live dashboard only polls a handful of file stats per interval. When
+HEAD, packed-refs or a branch ref changes, it ingests just the new
+commits and re-reads today's totals from the rollup tables.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import git
+from rich.layout import Layout
+from rich.panel import Panel
+from rich.table import Table
+
+from .ingest import IncrementalIngestor
+
+
+# Branches with a commit this recent count as active
+ACTIVE_BRANCH_DAYS = 7
+
+
+class RefWatcher:
+    """Detect changes to HEAD and branch refs from file metadata alone"""
+
+    def __init__(self, repo):
+        """
+        Args:
+            repo (git.Repo): Repository to watch
+        """
+        self.git_dir = Path(repo.git_dir)
+        self.common_dir = Path(getattr(repo, 'common_dir', repo.git_dir))
+        self._signature = None
+
+    def signature(self):
+        """
+        Stat HEAD, packed-refs and every file under refs/heads
+
+        Returns:
+            tuple: (path, mtime_ns, size, inode) entries; git rewrites refs
+                   through a lock file, so any ref update changes it
+        """
+        entries = []
+        for path in (self.git_dir / 'HEAD', self.common_dir / 'packed-refs'):
+            entries.append(self._stat(path))
+
+        stack = [self.common_dir / 'refs' / 'heads']
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as scan:
+                    for entry in scan:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            entries.append(self._stat(entry.path))
+            except OSError:
+                continue
+
+        return tuple(sorted(entries))
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+            return (str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            return (str(path), 0, 0, 0)
+
+    def changed(self):
+        """
+        Check for ref changes since the previous call
+
+        Returns:
+            bool: True on the first call and whenever a ref file changed
+        """
+        signature = self.signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        return True
+
+
+class LiveDashboard:
+    """Dashboard metrics kept up to date by incremental ingestion"""
+
+    def __init__(self, analyzer, db, refresh=5):
+        """
+        Args:
+            analyzer (GitAnalyzer): Analyzer bound to the repository
+            db (Database): Database holding ingested commits
+            refresh (int): Refresh interval in seconds (shown in the footer)
+        """
+        self.analyzer = analyzer
+        self.db = db
+        self.refresh_interval = refresh
+        self.repo = analyzer.repo
+        self.watcher = RefWatcher(self.repo)
+        self.ingestor = IncrementalIngestor(analyzer, db)
+        self.metrics = {}
+        self.last_sync = None
+        self._day = None
+
+    def current_branch(self):
+        """Checked-out branch, or the analyzer's default for a detached HEAD"""
+        try:
+            return self.repo.active_branch.name
+        except TypeError:
+            return self.analyzer.default_branch
+
+    def refresh(self):
+        """
+        Update metrics if refs changed or the day rolled over
+
+        Returns:
+            bool: True if metrics were recomputed
+        """
+        today = datetime.now().date()
+        refs_changed = self.watcher.changed()
+        if not refs_changed and today == self._day:
+            return False
+
+        start = time.perf_counter()
+        midnight = datetime.combine(today, datetime.min.time())
+        branch = self.current_branch()
+
+        sync = self.ingestor.sync(midnight, branch)
+        self.metrics.update(self._today(branch, midnight))
+        if refs_changed:
+            self.metrics.update(self._branches())
+            self.metrics['last_commit'] = self._last_commit(sync.get('head'))
+
+        self._day = today
+        self.last_sync = {
+            'mode': sync['mode'],
+            'ingested': sync['ingested'],
+            'ms': (time.perf_counter() - start) * 1000,
+            'at': datetime.now(),
+        }
+        return True
+
+    def _today(self, branch, midnight):
+        """Today's totals from the branch rollups"""
+        rows = self.db.get_branch_activity(self.ingestor.repo_key, branch, midnight)
+        return {
+            'branch': branch,
+            'commits_today': sum(row['commits'] for row in rows),
+            'insertions_today': sum(row['insertions'] for row in rows),
+            'deletions_today': sum(row['deletions'] for row in rows),
+            'authors_today': len({row['author'] for row in rows}),
+        }
+
+    def _branches(self):
+        """Local branch counts from one for-each-ref call"""
+        try:
+            output = self.repo.git.for_each_ref('--format=%(committerdate:unix)', 'refs/heads')
+        except git.exc.GitCommandError:
+            return {'active_branches': 0, 'total_branches': 0}
+
+        cutoff = (datetime.now() - timedelta(days=ACTIVE_BRANCH_DAYS)).timestamp()
+        dates = [int(line) for line in output.split() if line.isdigit()]
+        return {
+            'active_branches': sum(1 for date in dates if date >= cutoff),
+            'total_branches': len(dates),
+        }
+
+    def _last_commit(self, sha):
+        """Summary of the branch tip"""
+        if not sha:
+            return None
+
+        commit = self.repo.commit(sha)
+        return {
+            'short_sha': commit.hexsha[:7],
+            'summary': commit.summary,
+            'author': commit.author.name,
+            'date': datetime.fromtimestamp(commit.committed_date),
+        }
+
+    def render(self, mode='live'):
+        """
+        Build the dashboard layout from the current metrics
+
+        Args:
+            mode (str): Display mode shown in the footer
+
+        Returns:
+            Layout: Renderable dashboard
+        """
+        metrics = self.metrics
+        layout = Layout()
+        layout.split_column(
+            Layout(name="header", size=3),
+            Layout(name="body"),
+            Layout(name="footer", size=3)
+        )
+
+        layout["header"].update(Panel(
+            f"[bold blue]DevFlow Dashboard[/bold blue] - Real-time Development Metrics "
+            f"[dim]({metrics.get('branch', '?')})[/dim]",
+            style="white on blue"
+        ))
+
+        body_table = Table(show_header=True, header_style="bold cyan")
+        body_table.add_column("Metric", style="cyan", width=40)
+        body_table.add_column("Value", justify="right", style="green")
+
+        body_table.add_row("Today's Commits", str(metrics.get('commits_today', 0)))
+        body_table.add_row("Authors Today", str(metrics.get('authors_today', 0)))
+        body_table.add_row(
+            "Lines Changed Today",
+            f"+{metrics.get('insertions_today', 0):,} / -{metrics.get('deletions_today', 0):,}"
+        )
+        body_table.add_row(
+            "Active Branches",
+            f"{metrics.get('active_branches', 0)} of {metrics.get('total_branches', 0)} "
+            f"(last {ACTIVE_BRANCH_DAYS} days)"
+        )
+
+        last = metrics.get('last_commit')
+        if last:
+            body_table.add_row(
+                "Last Commit",
+                f"{last['short_sha']} {last['summary'][:40]} - {last['author']}, {_ago(last['date'])}"
+            )
+        else:
+            body_table.add_row("Last Commit", "N/A")
+
+        layout["body"].update(Panel(body_table, title="Metrics", border_style="cyan"))
+
+        status = ''
+        if self.last_sync:
+            status = (f" | Sync {self.last_sync['at']:%H:%M:%S}: {self.last_sync['mode']} "
+                      f"+{self.last_sync['ingested']} ({self.last_sync['ms']:.0f} ms)")
+        layout["footer"].update(Panel(
+            f"[dim]Mode: {mode} | Refresh: {self.refresh_interval}s{status} | Ctrl+C to exit[/dim]",
+            style="white on black"
+        ))
+
+        return layout
+
+
+def _ago(moment):
+    """Human-readable time since a datetime"""
+    seconds = max(0, int((datetime.now() - moment).total_seconds()))
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit} ago"
+    return f"{seconds}s ago"
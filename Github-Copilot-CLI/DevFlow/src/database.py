@@ -2,16 +2,124 @@
 Database module for storing and retrieving git analysis data
 """
 
+import os
+import re
 import sqlite3
 import json
+import threading
+from itertools import islice
 from datetime import datetime, timedelta
 from pathlib import Path
 from contextlib import contextmanager
 
+from .migrations import migrate
+
+
+def _bucket(row):
+    """SQL for the (day, hour) rollup bucket of an ISO commit_date column"""
+    return f"substr({row}.commit_date, 1, 10), CAST(substr({row}.commit_date, 12, 2) AS INTEGER)"
+
+
+# commit_search rowids follow commit time: the epoch second shifted left by
+# SEARCH_SLOT_BITS, plus a sequence number within that second
+SEARCH_SLOT_BITS = 20
+
+
+def _search_slot(ts):
+    """SQL for the first commit_search rowid of an epoch-second expression"""
+    return f'(({ts}) << {SEARCH_SLOT_BITS})'
+
+
+def _search_doc(row):
+    """SQL matching the commit_search document of a commits row"""
+    return (f"rowid >= {_search_slot(f'{row}.ts')} AND rowid < {_search_slot(f'{row}.ts + 1')}"
+            f" AND commit_id = {row}.id")
+
+
+def _search_insert(row):
+    """SQL indexing a commits row in commit_search (append a FROM clause for aliases)"""
+    slot, next_slot = _search_slot(f'{row}.ts'), _search_slot(f'{row}.ts + 1')
+    return f'''
+        INSERT INTO commit_search (rowid, message, author, paths, commit_id)
+        SELECT coalesce((SELECT max(rowid) + 1 FROM commit_search
+                         WHERE rowid >= {slot} AND rowid < {next_slot}), {slot}),
+               {row}.message, {row}.author || ' ' || {row}.email,
+               (SELECT group_concat(path, ' ') FROM file_changes WHERE commit_sha = {row}.sha),
+               {row}.id
+    '''
+
+
+# highlight() marks around matched words in commit_search columns
+_MATCH_START, _MATCH_END = '\x01', '\x02'
+
+
+def _search_snippet(marked, highlight, words):
+    """Cut a highlight()ed column to `words` words from just before its first match"""
+    tokens = marked.split()
+    if len(tokens) > words:
+        first = next((i for i, token in enumerate(tokens) if _MATCH_START in token), 0)
+        start = max(0, min(first - 2, len(tokens) - words))
+        end = start + words
+        tokens = (['…'] if start else []) + tokens[start:end] + (['…'] if end < len(tokens) else [])
+    
+    snippet = ' '.join(tokens)
+    if snippet.count(_MATCH_START) > snippet.count(_MATCH_END):
+        # A matched phrase ran past the cut
+        snippet += _MATCH_END
+    return snippet.replace(_MATCH_START, highlight[0]).replace(_MATCH_END, highlight[1])
+
+
+_BRANCH_ROLLUP_UPSERT = '''
+    ON CONFLICT (repo_path, branch, day, hour, author, email) DO UPDATE SET
+        commits = commits + 1,
+        insertions = insertions + excluded.insertions,
+        deletions = deletions + excluded.deletions,
+        files = files + excluded.files,
+        message_chars = message_chars + excluded.message_chars;
+'''
+
 
 class Database:
     """SQLite database manager for DevFlow"""
     
+    # Seconds to wait for a write lock held by another process
+    BUSY_TIMEOUT = 30
+    
+    # Page cache per connection in KiB
+    CACHE_SIZE_KB = 20000
+    
+    # Compiled statements kept per connection for reuse across calls
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Commits written per transaction by ingest_commits
+    INGEST_CHUNK_SIZE = 1000
+    
+    # Bound parameters per lookup query (stays under SQLite's 999 limit)
+    MAX_QUERY_PARAMS = 500
+    
+    # Author filters resolve against the small authors table, so commit
+    # lookups can use the (author_id, ts) index instead of scanning LIKE
+    AUTHOR_NAME_MATCH = 'SELECT id FROM authors WHERE name_key LIKE ?'
+    AUTHOR_MATCH = 'SELECT id FROM authors WHERE name_key LIKE ? OR email_key LIKE ?'
+    
+    # Relevance of a commit_search hit: matched words per column, message
+    # matches weighing most, then author and touched paths. Counted from the
+    # char(1) marks highlight() puts on matches; bm25() would also count every
+    # match in the index for its term weights, which dominates at 1M commits
+    SEARCH_SCORE = ' + '.join(
+        f"{weight} * (length({column}) - length(replace({column}, char(1), '')))"
+        for column, weight in (('message', 10), ('author', 2), ('paths', 1))
+    )
+    
+    # Newest matches ranked per search; bounds the cost of broad terms
+    SEARCH_CANDIDATES = 1000
+    
+    # Authors matched by --author turned into index phrases, at most
+    SEARCH_AUTHOR_PHRASES = 64
+    
+    # Query prefixes that restrict a term to one commit_search column
+    SEARCH_COLUMNS = {'message': 'message', 'author': 'author', 'path': 'paths', 'paths': 'paths'}
+    
     def __init__(self, db_path=None):
         """
         Initialize database connection
@@ -25,21 +133,106 @@ class Database:
             db_path = config_dir / 'devflow.db'
         
         self.db_path = db_path
+        self._local = threading.local()
+        self._author_ids = {}
+        self._count_reads = False
+        self.has_search = False
         self._init_database()
     
+    def _connect(self):
+        """
+        Open and tune a new SQLite connection
+        
+        WAL journaling lets readers (dashboard, exporter) run while an
+        ingest holds the write lock; synchronous=NORMAL is durable in WAL
+        mode except for the last transactions on power loss.
+        
+        Returns:
+            sqlite3.Connection: Configured connection
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = self._counting_row if self._count_reads else sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{self.CACHE_SIZE_KB}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    @property
+    def connection(self):
+        """Long-lived connection of the calling thread (reopened after fork)"""
+        local = self._local
+        
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+            local.depth = 0
+            local.rows_read = 0
+        
+        return local.conn
+    
+    def _counting_row(self, cursor, row):
+        """Row factory that also counts the rows fetched on this thread"""
+        self._local.rows_read += 1
+        return sqlite3.Row(cursor, row)
+    
+    def track_reads(self, enabled=True):
+        """
+        Count rows fetched through the calling thread's connection
+        
+        Counting goes through a Python row factory, so it is only switched
+        on while a command is being instrumented.
+        
+        Args:
+            enabled (bool): Start or stop counting
+        """
+        self._count_reads = enabled
+        self.connection.row_factory = self._counting_row if enabled else sqlite3.Row
+    
+    def io_counters(self):
+        """
+        Rows read and written so far through the calling thread's connection
+        
+        Returns:
+            dict: 'rows_read' (counted while track_reads is on) and
+                  'rows_written' (SQLite's total_changes)
+        """
+        conn = self.connection
+        return {'rows_read': self._local.rows_read, 'rows_written': conn.total_changes}
+    
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for one transaction on the persistent connection"""
+        conn = self.connection
+        local = self._local
+        local.depth += 1
         try:
             yield conn
-            conn.commit()
+            # Nested blocks join the outermost transaction
+            if local.depth == 1:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if local.depth == 1:
+                conn.rollback()
+                # Ids cached during the transaction may have been rolled back
+                self._author_ids.clear()
             raise
         finally:
+            local.depth -= 1
+    
+    def close(self):
+        """Close the calling thread's connection"""
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        
+        # A connection inherited through fork belongs to the parent process
+        if conn is not None and local.pid == os.getpid():
             conn.close()
+        local.conn = None
     
     def _init_database(self):
         """Initialize database schema"""
@@ -93,15 +286,205 @@ class Database:
                 )
             ''')
             
-            # Create indices for performance
+            # Ingestion watermarks (last ingested SHA per repo/branch)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ingest_watermarks (
+                    repo_path TEXT NOT NULL,
+                    branch TEXT NOT NULL,
+                    last_sha TEXT NOT NULL,
+                    covered_since TIMESTAMP NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (repo_path, branch)
+                )
+            ''')
+            
+            # Which ingested commits belong to which repo/branch
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS branch_commits (
+                    repo_path TEXT NOT NULL,
+                    branch TEXT NOT NULL,
+                    sha TEXT NOT NULL,
+                    commit_date TIMESTAMP NOT NULL,
+                    PRIMARY KEY (repo_path, branch, sha)
+                )
+            ''')
+            
+            # Per-file stats of every ingested commit (file-to-commit edges)
+            cursor.execute('''
+                SELECT name FROM sqlite_master
+                WHERE type = 'table' AND name = 'file_changes'
+            ''')
+            has_file_changes = cursor.fetchone() is not None
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_changes (
+                    commit_sha TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    insertions INTEGER DEFAULT 0,
+                    deletions INTEGER DEFAULT 0,
+                    ts INTEGER NOT NULL,
+                    author TEXT NOT NULL,
+                    PRIMARY KEY (commit_sha, path)
+                )
+            ''')
+            
+            if not has_file_changes:
+                # Commits ingested before file_changes existed have no edges:
+                # drop the watermarks so the next sync re-reads them
+                cursor.execute('DELETE FROM ingest_watermarks')
+            
+            # Shell history tables (written by HistoryTracker)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS command_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    command TEXT NOT NULL,
+                    frequency INTEGER DEFAULT 0,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    shell_type TEXT
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS command_sequences (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sequence TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS alias_suggestions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    alias_name TEXT NOT NULL,
+                    command TEXT NOT NULL,
+                    frequency INTEGER DEFAULT 0,
+                    shell_type TEXT,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Where the last incremental read of each history file stopped
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS history_checkpoints (
+                    history_path TEXT PRIMARY KEY,
+                    inode INTEGER NOT NULL,
+                    byte_offset INTEGER NOT NULL,
+                    encoding TEXT NOT NULL,
+                    tail BLOB NOT NULL,
+                    commands INTEGER DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Running command counts of each history file
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS shell_command_counts (
+                    history_path TEXT NOT NULL,
+                    command TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    first_seen INTEGER NOT NULL,
+                    PRIMARY KEY (history_path, command)
+                )
+            ''')
+            
+            # Line ownership of a file version from `git blame`, keyed by blob SHA
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS blame_cache (
+                    repo_path TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    blob_sha TEXT NOT NULL,
+                    authors TEXT NOT NULL,
+                    blamed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (repo_path, path, blob_sha)
+                )
+            ''')
+            
+            # Per-phase timings of instrumented CLI runs
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS command_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    command TEXT NOT NULL,
+                    args TEXT,
+                    started_at TIMESTAMP NOT NULL,
+                    wall_s REAL,
+                    cpu_s REAL,
+                    git_calls INTEGER DEFAULT 0,
+                    rows_read INTEGER DEFAULT 0,
+                    rows_written INTEGER DEFAULT 0
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS command_phases (
+                    run_id INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    wall_s REAL,
+                    cpu_s REAL,
+                    git_calls INTEGER DEFAULT 0,
+                    rows_read INTEGER DEFAULT 0,
+                    rows_written INTEGER DEFAULT 0,
+                    PRIMARY KEY (run_id, seq),
+                    FOREIGN KEY (run_id) REFERENCES command_runs(id)
+                )
+            ''')
+            
+            # Per-repository results of workspace analysis
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS repo_analyses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    repo_path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    branch TEXT,
+                    commits INTEGER DEFAULT 0,
+                    authors INTEGER DEFAULT 0,
+                    insertions INTEGER DEFAULT 0,
+                    deletions INTEGER DEFAULT 0,
+                    score REAL,
+                    grade TEXT,
+                    hotspots TEXT,
+                    error TEXT,
+                    duration REAL,
+                    analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    days_analyzed INTEGER DEFAULT 30
+                )
+            ''')
+            
+            # Create indices for performance (commit indexes are versioned in migrations)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_branch_commits_date 
+                ON branch_commits(repo_path, branch, commit_date)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_file_changes_path 
+                ON file_changes(path, ts)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_file_changes_ts 
+                ON file_changes(ts)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_repo_analyses_repo 
+                ON repo_analyses(repo_path, analysis_date)
+            ''')
+            
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_commits_date 
-                ON commits(commit_date)
+                CREATE INDEX IF NOT EXISTS idx_command_runs_command 
+                ON command_runs(command, started_at)
             ''')
             
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_commits_author 
-                ON commits(author)
+                CREATE INDEX IF NOT EXISTS idx_command_freq 
+                ON command_history(frequency)
+            ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_shell_command_counts_top 
+                ON shell_command_counts(history_path, count DESC, first_seen)
             ''')
             
             cursor.execute('''
@@ -113,13 +496,242 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_hotspots_changes 
                 ON file_hotspots(change_count)
             ''')
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_branch_commits_sha 
+                ON branch_commits(sha)
+            ''')
+            
+            self._init_rollups(cursor)
+        
+        migrate(self)
+        
+        # SQLite builds without FTS5 skip the index; search falls back to LIKE
+        self.has_search = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'commit_search'"
+        ).fetchone() is not None
+    
+    def _init_rollups(self, cursor):
+        """
+        Create rollup tables and the triggers that keep them current
+        
+        commit_rollups aggregates all stored commits per (day, hour, author);
+        branch_rollups does the same per repository branch from
+        branch_commits. Triggers on commits and branch_commits add and
+        subtract rows, so readers never re-aggregate raw commits.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor inside the schema transaction
+        """
+        cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name IN ('commit_rollups', 'branch_rollups')
+        ''')
+        existing = {row['name'] for row in cursor.fetchall()}
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS commit_rollups (
+                day TEXT NOT NULL,
+                hour INTEGER NOT NULL,
+                author TEXT NOT NULL,
+                commits INTEGER DEFAULT 0,
+                insertions INTEGER DEFAULT 0,
+                deletions INTEGER DEFAULT 0,
+                files INTEGER DEFAULT 0,
+                quality REAL DEFAULT 0,
+                PRIMARY KEY (day, hour, author)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS branch_rollups (
+                repo_path TEXT NOT NULL,
+                branch TEXT NOT NULL,
+                day TEXT NOT NULL,
+                hour INTEGER NOT NULL,
+                author TEXT NOT NULL,
+                email TEXT NOT NULL,
+                commits INTEGER DEFAULT 0,
+                insertions INTEGER DEFAULT 0,
+                deletions INTEGER DEFAULT 0,
+                files INTEGER DEFAULT 0,
+                message_chars INTEGER DEFAULT 0,
+                PRIMARY KEY (repo_path, branch, day, hour, author, email)
+            )
+        ''')
+        
+        # Backfill from rows stored before the rollups existed
+        if 'commit_rollups' not in existing:
+            cursor.execute(f'''
+                INSERT INTO commit_rollups
+                SELECT {_bucket('commits')}, author, COUNT(*),
+                       SUM(insertions), SUM(deletions), SUM(files_changed), SUM(quality_score)
+                FROM commits
+                GROUP BY 1, 2, 3
+            ''')
+        
+        if 'branch_rollups' not in existing:
+            cursor.execute(f'''
+                INSERT INTO branch_rollups
+                SELECT b.repo_path, b.branch, {_bucket('c')}, c.author, c.email, COUNT(*),
+                       SUM(c.insertions), SUM(c.deletions), SUM(c.files_changed), SUM(length(c.message))
+                FROM branch_commits b
+                JOIN commits c ON c.sha = b.sha
+                GROUP BY 1, 2, 3, 4, 5, 6
+            ''')
+        
+        add_commit = f'''
+            INSERT INTO commit_rollups (day, hour, author, commits, insertions, deletions, files, quality)
+            VALUES ({_bucket('NEW')}, NEW.author, 1,
+                    NEW.insertions, NEW.deletions, NEW.files_changed, NEW.quality_score)
+            ON CONFLICT (day, hour, author) DO UPDATE SET
+                commits = commits + 1,
+                insertions = insertions + excluded.insertions,
+                deletions = deletions + excluded.deletions,
+                files = files + excluded.files,
+                quality = quality + excluded.quality;
+        '''
+        
+        remove_commit = f'''
+            UPDATE commit_rollups SET
+                commits = commits - 1,
+                insertions = insertions - OLD.insertions,
+                deletions = deletions - OLD.deletions,
+                files = files - OLD.files_changed,
+                quality = quality - OLD.quality_score
+            WHERE (day, hour) = ({_bucket('OLD')}) AND author = OLD.author;
+            DELETE FROM commit_rollups
+            WHERE (day, hour) = ({_bucket('OLD')}) AND author = OLD.author AND commits <= 0;
+        '''
+        
+        # An edited commit moves between buckets on every branch that links it
+        move_branch_commit = f'''
+            UPDATE branch_rollups SET
+                commits = commits - 1,
+                insertions = insertions - OLD.insertions,
+                deletions = deletions - OLD.deletions,
+                files = files - OLD.files_changed,
+                message_chars = message_chars - length(OLD.message)
+            WHERE (repo_path, branch) IN (SELECT repo_path, branch FROM branch_commits WHERE sha = OLD.sha)
+              AND (day, hour) = ({_bucket('OLD')}) AND author = OLD.author AND email = OLD.email;
+            DELETE FROM branch_rollups
+            WHERE (day, hour) = ({_bucket('OLD')}) AND author = OLD.author AND email = OLD.email
+              AND commits <= 0;
+            INSERT INTO branch_rollups
+            (repo_path, branch, day, hour, author, email, commits, insertions, deletions, files, message_chars)
+            SELECT b.repo_path, b.branch, {_bucket('NEW')}, NEW.author, NEW.email, 1,
+                   NEW.insertions, NEW.deletions, NEW.files_changed, length(NEW.message)
+            FROM branch_commits b
+            WHERE b.sha = NEW.sha
+            {_BRANCH_ROLLUP_UPSERT}
+        '''
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_commits_rollup_insert AFTER INSERT ON commits
+            BEGIN {add_commit} END
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_commits_rollup_delete AFTER DELETE ON commits
+            BEGIN {remove_commit} END
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_commits_rollup_update
+            AFTER UPDATE OF short_sha, author, email, message, commit_date,
+                            files_changed, insertions, deletions, quality_score ON commits
+            BEGIN {remove_commit} {add_commit} {move_branch_commit} END
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_branch_commits_rollup_insert AFTER INSERT ON branch_commits
+            BEGIN
+                INSERT INTO branch_rollups
+                (repo_path, branch, day, hour, author, email, commits, insertions, deletions, files, message_chars)
+                SELECT NEW.repo_path, NEW.branch, {_bucket('c')}, c.author, c.email, 1,
+                       c.insertions, c.deletions, c.files_changed, length(c.message)
+                FROM commits c
+                WHERE c.sha = NEW.sha
+                {_BRANCH_ROLLUP_UPSERT}
+            END
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_branch_commits_rollup_delete AFTER DELETE ON branch_commits
+            BEGIN
+                UPDATE branch_rollups SET
+                    commits = commits - 1,
+                    insertions = insertions - (SELECT insertions FROM commits WHERE sha = OLD.sha),
+                    deletions = deletions - (SELECT deletions FROM commits WHERE sha = OLD.sha),
+                    files = files - (SELECT files_changed FROM commits WHERE sha = OLD.sha),
+                    message_chars = message_chars - (SELECT length(message) FROM commits WHERE sha = OLD.sha)
+                WHERE repo_path = OLD.repo_path AND branch = OLD.branch
+                  AND (day, hour, author, email) = (
+                      SELECT {_bucket('c')}, c.author, c.email FROM commits c WHERE c.sha = OLD.sha
+                  );
+                DELETE FROM branch_rollups
+                WHERE repo_path = OLD.repo_path AND branch = OLD.branch
+                  AND (day, hour) = ({_bucket('OLD')}) AND commits <= 0;
+            END
+        ''')
+    
+    def _init_search(self, cursor):
+        """
+        Create the commit_search full-text index and the triggers that keep it current
+        
+        commit_search is an FTS5 table with one row per commit holding the
+        message, 'author email', the touched paths and the commit's id.
+        Rowids follow commit time (see SEARCH_SLOT_BITS), so the newest
+        matches and --since windows are rowid ranges of the index. Triggers
+        on commits add, edit and remove rows; paths are filled in by
+        save_file_changes once a commit's files are stored.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor inside the schema transaction
+            
+        Returns:
+            bool: False if SQLite was built without FTS5
+        """
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS commit_search USING fts5(
+                    message, author, paths, commit_id UNINDEXED,
+                    tokenize = "unicode61 tokenchars '_'",
+                    prefix = '2 3'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_commits_search_insert AFTER INSERT ON commits
+            BEGIN {_search_insert('NEW')}; END
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_commits_search_delete AFTER DELETE ON commits
+            BEGIN
+                DELETE FROM commit_search WHERE {_search_doc('OLD')};
+            END
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_commits_search_update
+            AFTER UPDATE OF author, email, message, ts ON commits
+            BEGIN
+                DELETE FROM commit_search WHERE {_search_doc('OLD')};
+                {_search_insert('NEW')};
+            END
+        ''')
+        return True
     
     def save_commit_analysis(self, commit_data):
         """
         Store commit analysis results (supports batch)
         
         Args:
-            commit_data (dict or list): Single commit or list of commits
+            commit_data (dict or iterable): Single commit, or commits (dicts or
+                CommitRecords from GitAnalyzer.iter_commit_records), consumed lazily
             
         Returns:
             int: Number of commits saved
@@ -127,47 +739,167 @@ class Database:
         if isinstance(commit_data, dict):
             commit_data = [commit_data]
         
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            saved_count = 0
+        result = self.ingest_commits(commit_data)
+        return result['inserted'] + result['updated'] + result['unchanged']
+    
+    def ingest_commits(self, records, chunk_size=None, on_chunk=None):
+        """
+        Stream commit records into the database in fixed-size transactions
+        
+        Records are consumed lazily, so memory stays bounded by one chunk no
+        matter how long the iterator is. Existing commits keep their row id
+        and are only rewritten when a stored field changed.
+        
+        Args:
+            records (iterable): Commit dictionaries (any iterator)
+            chunk_size (int): Commits per transaction (default: INGEST_CHUNK_SIZE)
+            on_chunk (callable): Called with each chunk's valid records inside
+                                 that chunk's transaction (optional)
             
-            for commit in commit_data:
-                try:
-                    # Handle both 'sha' and 'hash' keys
-                    commit_hash = commit.get('hash') or commit.get('sha')
-                    short_hash = commit.get('short_hash') or commit.get('short_sha')
-                    commit_date = commit.get('timestamp') or commit.get('date')
-                    
-                    # Convert datetime to ISO string if needed
-                    if hasattr(commit_date, 'isoformat'):
-                        commit_date = commit_date.isoformat()
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO commits 
-                        (sha, short_sha, author, email, message, commit_date, 
-                         files_changed, insertions, deletions, quality_score)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        commit_hash,
-                        short_hash,
-                        commit.get('author'),
-                        commit.get('email'),
-                        commit.get('message'),
-                        commit_date,
-                        commit.get('files_changed', 0),
-                        commit.get('insertions', 0),
-                        commit.get('deletions', 0),
-                        commit.get('quality_score', 0)
-                    ))
-                    saved_count += 1
-                except sqlite3.IntegrityError:
-                    # Skip duplicate commits
-                    pass
-                except Exception:
-                    # Skip commits that fail to save
-                    pass
+        Returns:
+            dict: Counts of 'inserted', 'updated' and 'skipped' commits, where
+                  skipped splits into 'unchanged' and 'invalid'
+        """
+        chunk_size = chunk_size or self.INGEST_CHUNK_SIZE
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'unchanged': 0, 'invalid': 0}
+        records = iter(records)
+        
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
             
-            return saved_count
+            rows = {}
+            valid = []
+            for commit in chunk:
+                row = self._commit_row(commit)
+                if row is None:
+                    counts['invalid'] += 1
+                    continue
+                # The last occurrence of a SHA within a chunk wins
+                rows[row[0]] = row
+                valid.append(commit)
+            
+            with self._get_connection() as conn:
+                rows = {
+                    sha: row + (self._author_id(conn, row[2], row[3]),)
+                    for sha, row in rows.items()
+                }
+                existing = self._existing_commit_rows(conn, list(rows))
+                inserts = [row for sha, row in rows.items() if sha not in existing]
+                updates = [
+                    row[1:] + (sha,) for sha, row in rows.items()
+                    if sha in existing and existing[sha] != row
+                ]
+                
+                conn.executemany('''
+                    INSERT INTO commits
+                    (sha, short_sha, author, email, message, commit_date,
+                     files_changed, insertions, deletions, quality_score, ts, author_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', inserts)
+                
+                conn.executemany('''
+                    UPDATE commits SET
+                        short_sha = ?, author = ?, email = ?, message = ?, commit_date = ?,
+                        files_changed = ?, insertions = ?, deletions = ?, quality_score = ?,
+                        ts = ?, author_id = ?
+                    WHERE sha = ?
+                ''', updates)
+                
+                if on_chunk and valid:
+                    on_chunk(valid)
+            
+            counts['inserted'] += len(inserts)
+            counts['updated'] += len(updates)
+            counts['unchanged'] += len(valid) - len(inserts) - len(updates)
+        
+        counts['skipped'] = counts['unchanged'] + counts['invalid']
+        return counts
+    
+    @staticmethod
+    def _commit_row(commit):
+        """
+        Convert a commit dictionary to a commits table row
+        
+        Args:
+            commit (dict): Commit with 'hash'/'sha', author and timestamp/date
+            
+        Returns:
+            tuple: Row values in column order (without author_id), or None if
+                   required fields are missing
+        """
+        # Handle both 'sha' and 'hash' keys
+        commit_hash = commit.get('hash') or commit.get('sha')
+        commit_date = commit.get('timestamp') or commit.get('date')
+        
+        if not commit_hash or commit_date is None or commit.get('author') is None:
+            return None
+        
+        # Store both the ISO string and the epoch seconds
+        if isinstance(commit_date, str):
+            try:
+                commit_date = datetime.fromisoformat(commit_date)
+            except ValueError:
+                return None
+        ts = int(commit_date.timestamp())
+        commit_date = commit_date.isoformat()
+        
+        return (
+            commit_hash,
+            commit.get('short_hash') or commit.get('short_sha') or commit_hash[:7],
+            commit.get('author'),
+            commit.get('email') or '',
+            commit.get('message') or '',
+            commit_date,
+            commit.get('files_changed', 0),
+            commit.get('insertions', 0),
+            commit.get('deletions', 0),
+            float(commit.get('quality_score', 0) or 0),
+            ts,
+        )
+    
+    def _author_id(self, conn, name, email):
+        """
+        Get the authors dimension id for a name/email pair, adding it if new
+        
+        Args:
+            conn (sqlite3.Connection): Connection inside the caller's transaction
+            name (str): Author name
+            email (str): Author email
+            
+        Returns:
+            int: Author id
+        """
+        key = (name, email)
+        if key not in self._author_ids:
+            conn.execute('''
+                INSERT OR IGNORE INTO authors (name, email, name_key, email_key)
+                VALUES (?, ?, ?, ?)
+            ''', (name, email, name.strip().lower(), email.strip().lower()))
+            self._author_ids[key] = conn.execute(
+                'SELECT id FROM authors WHERE name = ? AND email = ?', key
+            ).fetchone()[0]
+        
+        return self._author_ids[key]
+    
+    def _existing_commit_rows(self, conn, shas):
+        """Look up stored rows for SHAs, keyed by SHA"""
+        existing = {}
+        
+        for start in range(0, len(shas), self.MAX_QUERY_PARAMS):
+            part = shas[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(part))
+            cursor = conn.execute(f'''
+                SELECT sha, short_sha, author, email, message, commit_date,
+                       files_changed, insertions, deletions, quality_score, ts, author_id
+                FROM commits WHERE sha IN ({placeholders})
+            ''', part)
+            
+            for row in cursor:
+                existing[row[0]] = tuple(row)
+        
+        return existing
     
     # Alias for batch operations
     def save_commit_batch(self, commit_data):
@@ -185,47 +917,51 @@ class Database:
         Returns:
             dict: Aggregated statistics
         """
-        since_date = (datetime.now() - timedelta(days=days)).isoformat()
+        since = datetime.now() - timedelta(days=days)
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Build query with optional author filter
-            query = '''
+            source, params = self._commit_rollup_window(since, author)
+            cursor.execute(f'''
                 SELECT 
-                    COUNT(*) as total_commits,
+                    SUM(commits) as total_commits,
                     COUNT(DISTINCT author) as unique_authors,
-                    SUM(files_changed) as total_files_changed,
+                    SUM(files) as total_files_changed,
                     SUM(insertions) as total_insertions,
                     SUM(deletions) as total_deletions,
-                    AVG(quality_score) as avg_quality_score,
-                    MIN(commit_date) as earliest_commit,
-                    MAX(commit_date) as latest_commit
-                FROM commits
-                WHERE commit_date >= ?
-            '''
+                    SUM(quality) as total_quality_score
+                FROM ({source})
+            ''', params)
+            row = cursor.fetchone()
             
-            params = [since_date]
+            # First/last commit are single seeks on the ts index
+            bounds = 'FROM commits WHERE ts >= ?'
+            bounds_params = [int(since.timestamp())]
             
             if author:
-                query += ' AND author LIKE ?'
-                params.append(f'%{author}%')
+                bounds += f' AND author_id IN ({self.AUTHOR_NAME_MATCH})'
+                bounds_params.append(f'%{author.lower()}%')
             
-            cursor.execute(query, params)
-            row = cursor.fetchone()
+            cursor.execute(f'''
+                SELECT (SELECT commit_date {bounds} ORDER BY ts LIMIT 1),
+                       (SELECT commit_date {bounds} ORDER BY ts DESC LIMIT 1)
+            ''', bounds_params * 2)
+            earliest_commit, latest_commit = cursor.fetchone()
             
             if row:
+                total_commits = row['total_commits'] or 0
                 stats = {
                     'days_analyzed': days,
-                    'total_commits': row['total_commits'] or 0,
+                    'total_commits': total_commits,
                     'unique_authors': row['unique_authors'] or 0,
                     'total_files_changed': row['total_files_changed'] or 0,
                     'total_insertions': row['total_insertions'] or 0,
                     'total_deletions': row['total_deletions'] or 0,
                     'net_lines': (row['total_insertions'] or 0) - (row['total_deletions'] or 0),
-                    'avg_quality_score': round(row['avg_quality_score'] or 0, 2),
-                    'earliest_commit': row['earliest_commit'],
-                    'latest_commit': row['latest_commit'],
+                    'avg_quality_score': round((row['total_quality_score'] or 0) / total_commits, 2) if total_commits else 0,
+                    'earliest_commit': earliest_commit,
+                    'latest_commit': latest_commit,
                 }
                 
                 # Calculate averages
@@ -246,6 +982,52 @@ class Database:
                 'unique_authors': 0,
             }
     
+    @staticmethod
+    def _next_hour(since):
+        """Start of the first whole rollup hour at or after a window start"""
+        start = since.replace(minute=0, second=0, microsecond=0)
+        return start if start == since else start + timedelta(hours=1)
+    
+    def _commit_rollup_window(self, since, author=None):
+        """
+        Build a row source covering commits since an exact datetime
+        
+        Whole hours come from commit_rollups; the partial first hour is
+        read from raw commits so results match a raw `ts >= since`.
+        
+        Args:
+            since (datetime): Window start
+            author (str): Filter by author name (optional)
+            
+        Returns:
+            tuple: (SQL yielding author, commits, files, insertions, deletions,
+                   quality rows, parameters)
+        """
+        next_hour = self._next_hour(since)
+        
+        rollups = '''
+            SELECT author, commits, files, insertions, deletions, quality
+            FROM commit_rollups WHERE (day, hour) >= (?, ?)
+        '''
+        rollup_params = [next_hour.date().isoformat(), next_hour.hour]
+        
+        raw = '''
+            SELECT a.name, 1, c.files_changed, c.insertions, c.deletions, c.quality_score
+            FROM commits c
+            JOIN authors a ON a.id = c.author_id
+            WHERE c.ts >= ? AND c.ts < ?
+        '''
+        raw_params = [int(since.timestamp()), int(next_hour.timestamp())]
+        
+        if author:
+            pattern = f'%{author.lower()}%'
+            rollups += ' AND author IN (SELECT name FROM authors WHERE name_key LIKE ?)'
+            rollup_params.append(pattern)
+            raw += f' AND c.author_id IN ({self.AUTHOR_NAME_MATCH})'
+            raw_params.append(pattern)
+        
+        return f'{rollups} UNION ALL {raw}', rollup_params + raw_params
+    
     def save_file_hotspots(self, hotspot_data, days_analyzed=30):
         """
         Store frequently changed files (supports batch)
@@ -374,32 +1156,23 @@ class Database:
         Returns:
             list: Author statistics
         """
-        since_date = (datetime.now() - timedelta(days=days)).isoformat()
+        since = datetime.now() - timedelta(days=days)
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            query = '''
+            source, params = self._commit_rollup_window(since, author)
+            cursor.execute(f'''
                 SELECT 
                     author,
-                    COUNT(*) as commit_count,
-                    SUM(files_changed) as files_changed,
+                    SUM(commits) as commit_count,
+                    SUM(files) as files_changed,
                     SUM(insertions) as insertions,
                     SUM(deletions) as deletions,
-                    AVG(quality_score) as avg_quality_score
-                FROM commits
-                WHERE commit_date >= ?
-            '''
-            
-            params = [since_date]
-            
-            if author:
-                query += ' AND author LIKE ?'
-                params.append(f'%{author}%')
-            
-            query += ' GROUP BY author ORDER BY commit_count DESC'
-            
-            cursor.execute(query, params)
+                    SUM(quality) as total_quality_score
+                FROM ({source})
+                GROUP BY author ORDER BY commit_count DESC
+            ''', params)
             rows = cursor.fetchall()
             
             stats = []
@@ -411,32 +1184,1162 @@ class Database:
                     'insertions': row['insertions'],
                     'deletions': row['deletions'],
                     'net_lines': row['insertions'] - row['deletions'],
-                    'avg_quality_score': round(row['avg_quality_score'] or 0, 2),
+                    'avg_quality_score': round((row['total_quality_score'] or 0) / row['commit_count'], 2),
                 })
             
             return stats
     
-    def clear_old_data(self, days=90):
+    def get_watermark(self, repo_path, branch):
         """
-        Clear old analysis data
+        Get the ingestion watermark for a repository branch
         
         Args:
-            days (int): Delete data older than this many days
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            
+        Returns:
+            dict: Watermark with last_sha and covered_since, or None
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT last_sha, covered_since, updated_at
+                FROM ingest_watermarks
+                WHERE repo_path = ? AND branch = ?
+            ''', (str(repo_path), branch))
+            row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            return {
+                'last_sha': row['last_sha'],
+                'covered_since': datetime.fromisoformat(row['covered_since']),
+                'updated_at': row['updated_at'],
+            }
+    
+    def set_watermark(self, repo_path, branch, last_sha, covered_since):
+        """
+        Store the ingestion watermark for a repository branch
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            last_sha (str): SHA of the newest ingested commit (branch tip)
+            covered_since (datetime): Oldest date fully ingested for this branch
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO ingest_watermarks
+                (repo_path, branch, last_sha, covered_since, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                str(repo_path),
+                branch,
+                last_sha,
+                covered_since.isoformat(),
+                datetime.now().isoformat()
+            ))
+    
+    def link_branch_commits(self, repo_path, branch, commit_data):
+        """
+        Record that commits are reachable from a repository branch
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            commit_data (list): Commit dictionaries (need 'hash' and 'timestamp')
+            
+        Returns:
+            int: Number of links written
+        """
+        records = []
+        for commit in commit_data:
+            commit_date = commit.get('timestamp') or commit.get('date')
+            if hasattr(commit_date, 'isoformat'):
+                commit_date = commit_date.isoformat()
+            records.append((str(repo_path), branch, commit.get('hash') or commit.get('sha'), commit_date))
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO branch_commits (repo_path, branch, sha, commit_date)
+                VALUES (?, ?, ?, ?)
+            ''', records)
+            
+            return len(records)
+    
+    def unlink_branch_commits(self, repo_path, branch, after_date=None):
+        """
+        Forget branch membership after history was rewritten
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            after_date (datetime): Only unlink commits newer than this (optional)
+            
+        Returns:
+            int: Number of links removed
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = 'DELETE FROM branch_commits WHERE repo_path = ? AND branch = ?'
+            params = [str(repo_path), branch]
+            
+            if after_date is not None:
+                query += ' AND commit_date > ?'
+                params.append(after_date.isoformat())
+            
+            cursor.execute(query, params)
+            return cursor.rowcount
+    
+    def get_branch_commits(self, repo_path, branch, since, author=None):
+        """
+        Serve a commit window for a repository branch from the database
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            since (datetime): Lower date bound
+            author (str): Filter by author name/email (optional)
+            
+        Returns:
+            list: Commit dictionaries in the GitAnalyzer.get_commit_history schema
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT c.sha, c.short_sha, c.author, c.email, c.message, c.commit_date,
+                       c.files_changed, c.insertions, c.deletions
+                FROM branch_commits b
+                JOIN commits c ON c.sha = b.sha
+                WHERE b.repo_path = ? AND b.branch = ? AND b.commit_date >= ?
+            '''
+            params = [str(repo_path), branch, since.isoformat()]
+            
+            if author:
+                query += f' AND c.author_id IN ({self.AUTHOR_MATCH})'
+                params.extend([f'%{author.lower()}%', f'%{author.lower()}%'])
+            
+            query += ' ORDER BY b.commit_date DESC'
+            
+            cursor.execute(query, params)
+            
+            return [
+                {
+                    'hash': row['sha'],
+                    'short_hash': row['short_sha'],
+                    'author': row['author'],
+                    'email': row['email'],
+                    'message': row['message'],
+                    'timestamp': datetime.fromisoformat(row['commit_date']),
+                    'files_changed': row['files_changed'],
+                    'insertions': row['insertions'],
+                    'deletions': row['deletions'],
+                    'lines_changed': row['insertions'] + row['deletions'],
+                }
+                for row in cursor.fetchall()
+            ]
+    
+    def save_file_changes(self, commit_data):
+        """
+        Store per-file stats of ingested commits as file-to-commit edges
+        
+        Also refreshes the touched paths of those commits in commit_search.
+        
+        Args:
+            commit_data (list): Commit records with per-file stats under 'files'
+        
+        Returns:
+            int: Number of file changes written
+        """
+        records = []
+        shas = []
+        for commit in commit_data:
+            commit_hash = commit.get('hash') or commit.get('sha')
+            shas.append((commit_hash, commit_hash))
+            commit_date = commit.get('timestamp') or commit.get('date')
+            ts = int(commit_date.timestamp()) if hasattr(commit_date, 'timestamp') else int(commit_date)
+            
+            for path, stats in commit.get('files', {}).items():
+                records.append((
+                    commit_hash,
+                    path,
+                    stats.get('insertions', 0),
+                    stats.get('deletions', 0),
+                    ts,
+                    commit.get('author'),
+                ))
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO file_changes
+                (commit_sha, path, insertions, deletions, ts, author)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', records)
+            
+            # One index update per commit rather than one per file
+            if self.has_search:
+                cursor.executemany(f'''
+                    WITH c AS (SELECT id, ts FROM commits WHERE sha = ?)
+                    UPDATE commit_search
+                    SET paths = (SELECT group_concat(path, ' ') FROM file_changes WHERE commit_sha = ?)
+                    WHERE rowid >= {_search_slot('SELECT ts FROM c')}
+                      AND rowid < {_search_slot('(SELECT ts FROM c) + 1')}
+                      AND commit_id = (SELECT id FROM c)
+                ''', shas)
+            
+            return len(records)
+    
+    def get_branch_file_changes(self, repo_path, branch, since):
+        """
+        Get per-file stats for the commits of a repository branch window
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            since (datetime): Lower date bound
+        
+        Returns:
+            dict: {sha: {path: {'insertions', 'deletions', 'lines'}}}
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT f.commit_sha, f.path, f.insertions, f.deletions
+                FROM branch_commits b
+                JOIN file_changes f ON f.commit_sha = b.sha
+                WHERE b.repo_path = ? AND b.branch = ? AND b.commit_date >= ?
+            ''', (str(repo_path), branch, since.isoformat()))
+            
+            files = {}
+            for row in cursor.fetchall():
+                files.setdefault(row['commit_sha'], {})[row['path']] = {
+                    'insertions': row['insertions'],
+                    'deletions': row['deletions'],
+                    'lines': row['insertions'] + row['deletions'],
+                }
+            
+            return files
+    
+    def get_file_churn(self, repo_path, branch, file_path, since):
+        """
+        Aggregate the changes to one file on a repository branch
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            file_path (str): Path relative to the repository root
+            since (datetime): Lower date bound
+        
+        Returns:
+            dict: 'changes', 'insertions', 'deletions' and 'authors'
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT f.insertions, f.deletions, f.author
+                FROM file_changes f
+                JOIN branch_commits b
+                  ON b.sha = f.commit_sha AND b.repo_path = ? AND b.branch = ?
+                WHERE f.path = ? AND f.ts >= ?
+            ''', (str(repo_path), branch, file_path, int(since.timestamp())))
+            rows = cursor.fetchall()
+            
+            return {
+                'changes': len(rows),
+                'insertions': sum(row['insertions'] for row in rows),
+                'deletions': sum(row['deletions'] for row in rows),
+                'authors': sorted({row['author'] for row in rows}),
+            }
+    
+    def get_file_change_counts(self, repo_path, branch, since, min_changes=1, extension=None):
+        """
+        Aggregate changes per file on a repository branch
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            since (datetime): Lower date bound
+            min_changes (int): Only files changed at least this often
+            extension (str): Only paths ending with this suffix (optional)
+        
+        Returns:
+            list: Per-file dicts with 'file', 'changes', 'insertions',
+                  'deletions' and 'authors', most changed first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            window = '''
+                FROM file_changes f
+                JOIN branch_commits b
+                  ON b.sha = f.commit_sha AND b.repo_path = ? AND b.branch = ?
+                WHERE f.ts >= ?
+            '''
+            params = [str(repo_path), branch, int(since.timestamp())]
+            
+            if extension:
+                window += ' AND substr(f.path, -?) = ?'
+                params.extend([len(extension), extension])
+            
+            cursor.execute(f'''
+                SELECT f.path, COUNT(*) AS changes,
+                       SUM(f.insertions) AS insertions, SUM(f.deletions) AS deletions
+                {window}
+                GROUP BY f.path
+                HAVING COUNT(*) >= ?
+                ORDER BY changes DESC, f.path
+            ''', params + [min_changes])
+            
+            files = {
+                row['path']: {
+                    'file': row['path'],
+                    'changes': row['changes'],
+                    'insertions': row['insertions'],
+                    'deletions': row['deletions'],
+                    'authors': [],
+                }
+                for row in cursor.fetchall()
+            }
+            
+            if files:
+                cursor.execute(f'SELECT DISTINCT f.path, f.author {window} ORDER BY f.author', params)
+                for row in cursor.fetchall():
+                    if row['path'] in files:
+                        files[row['path']]['authors'].append(row['author'])
+            
+            return list(files.values())
+    
+    def get_file_timeline(self, repo_path, branch, file_path, limit=None):
+        """
+        List the commits of a repository branch that changed one file
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            file_path (str): Path relative to the repository root
+            limit (int): Maximum number of commits (optional)
+        
+        Returns:
+            list: Commit dicts with the file's stats, newest first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT f.commit_sha, f.insertions, f.deletions, f.ts,
+                       c.author, c.email, c.message
+                FROM file_changes f
+                JOIN branch_commits b
+                  ON b.sha = f.commit_sha AND b.repo_path = ? AND b.branch = ?
+                JOIN commits c ON c.sha = f.commit_sha
+                WHERE f.path = ?
+                ORDER BY f.ts DESC
+            '''
+            params = [str(repo_path), branch, file_path]
+            
+            if limit:
+                query += ' LIMIT ?'
+                params.append(limit)
+            
+            cursor.execute(query, params)
+            
+            return [
+                {
+                    'sha': row['commit_sha'],
+                    'short_sha': row['commit_sha'][:7],
+                    'author': row['author'],
+                    'email': row['email'],
+                    'date': datetime.fromtimestamp(row['ts']),
+                    'timestamp': row['ts'],
+                    'message': row['message'].split('\n')[0],
+                    'insertions': row['insertions'],
+                    'deletions': row['deletions'],
+                    'net_change': row['insertions'] - row['deletions'],
+                }
+                for row in cursor.fetchall()
+            ]
+    
+    def get_recent_files(self, repo_path, branch, since, limit=20):
+        """
+        List files changed on a repository branch, most recently changed first
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            since (datetime): Lower date bound
+            limit (int): Maximum number of files
+        
+        Returns:
+            list: Dicts with 'file', 'last_modified', 'last_author' and 'changes'
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # SQLite takes bare columns from the row that holds MAX(ts)
+            cursor.execute('''
+                SELECT f.path, MAX(f.ts) AS last_ts, f.author, COUNT(*) AS changes
+                FROM file_changes f
+                JOIN branch_commits b
+                  ON b.sha = f.commit_sha AND b.repo_path = ? AND b.branch = ?
+                WHERE f.ts >= ?
+                GROUP BY f.path
+                ORDER BY last_ts DESC, f.path
+                LIMIT ?
+            ''', (str(repo_path), branch, int(since.timestamp()), limit))
+            
+            return [
+                {
+                    'file': row['path'],
+                    'last_modified': datetime.fromtimestamp(row['last_ts']),
+                    'last_author': row['author'],
+                    'changes': row['changes'],
+                }
+                for row in cursor.fetchall()
+            ]
+    
+    def get_branch_activity(self, repo_path, branch, since, author=None):
+        """
+        Aggregate a repository branch's commits per (day, hour, author)
+        
+        Whole hours come from branch_rollups; the partial first hour is read
+        from raw rows so the window starts exactly at `since`.
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            since (datetime): Lower date bound
+            author (str): Filter by author name/email (optional)
+            
+        Returns:
+            list: Dicts with 'day', 'hour', 'author', 'commits', 'insertions',
+                  'deletions', 'files' and 'message_chars'
+        """
+        next_hour = self._next_hour(since)
+        author_filter = ''
+        author_params = []
+        
+        if author:
+            author_filter = ' AND (author LIKE ? OR email LIKE ?)'
+            author_params = [f'%{author}%', f'%{author}%']
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT day, hour, author, SUM(commits) AS commits,
+                       SUM(insertions) AS insertions, SUM(deletions) AS deletions,
+                       SUM(files) AS files, SUM(message_chars) AS message_chars
+                FROM (
+                    SELECT day, hour, author, email, commits, insertions, deletions, files, message_chars
+                    FROM branch_rollups
+                    WHERE repo_path = ? AND branch = ? AND (day, hour) >= (?, ?)
+                    UNION ALL
+                    SELECT {_bucket('c')}, c.author, c.email, 1, c.insertions, c.deletions,
+                           c.files_changed, length(c.message)
+                    FROM branch_commits b
+                    JOIN commits c ON c.sha = b.sha
+                    WHERE b.repo_path = ? AND b.branch = ?
+                      AND b.commit_date >= ? AND b.commit_date < ?
+                )
+                WHERE 1 = 1{author_filter}
+                GROUP BY day, hour, author
+            ''', [
+                str(repo_path), branch, next_hour.date().isoformat(), next_hour.hour,
+                str(repo_path), branch, since.isoformat(), next_hour.isoformat(),
+                *author_params,
+            ])
+            
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_branch_daily_counts(self, repo_path, branch, first_day, author=None):
+        """
+        Count a repository branch's commits per calendar day
+        
+        A single range scan over the branch_rollups primary key.
+        
+        Args:
+            repo_path (str): Repository root path
+            branch (str): Branch name
+            first_day (date): First calendar day to count
+            author (str): Filter by author name/email (optional)
+            
+        Returns:
+            dict: {date: commit count}
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT day, SUM(commits) AS commits
+                FROM branch_rollups
+                WHERE repo_path = ? AND branch = ? AND day >= ?
+            '''
+            params = [str(repo_path), branch, first_day.isoformat()]
+            
+            if author:
+                query += ' AND (author LIKE ? OR email LIKE ?)'
+                params.extend([f'%{author}%', f'%{author}%'])
+            
+            query += ' GROUP BY day'
+            cursor.execute(query, params)
+            
+            return {
+                datetime.strptime(row['day'], '%Y-%m-%d').date(): row['commits']
+                for row in cursor.fetchall()
+            }
+    
+    def search_commits(self, query, author=None, since=None, limit=20, highlight=('[', ']')):
+        """
+        Full-text search over commit messages, authors and touched paths
+        
+        Served by the commit_search FTS5 index. The newest
+        SEARCH_CANDIDATES matches are ranked by SEARCH_SCORE, newest first
+        among equals, so broad terms cost the same at a million commits as
+        at a thousand; add terms or `since` to reach further back. Terms
+        must all match; `OR`, `NOT`, "quoted phrases", `prefix*` and column
+        prefixes (`message:`, `author:`, `path:`) are supported.
+        
+        Args:
+            query (str): Search terms
+            author (str): Filter by author name/email (optional)
+            since (datetime): Only commits at or after this time (optional)
+            limit (int): Maximum results
+            highlight (tuple): Markers placed around matched words in snippets
+            
+        Returns:
+            list: Dicts with 'hash', 'short_hash', 'author', 'email',
+                  'timestamp', 'message' and 'paths' snippets and 'rank',
+                  best match first
+            
+        Raises:
+            ValueError: If the query has no searchable terms or invalid syntax
+        """
+        expression = self._search_expression(query)
+        if not self.has_search:
+            return self._search_commits_like(query, author, since, limit)
+        
+        candidates = f'''
+            SELECT commit_search.rowid AS rowid,
+                   highlight(commit_search, 0, char(1), char(2)) AS message,
+                   highlight(commit_search, 1, char(1), char(2)) AS author,
+                   highlight(commit_search, 2, char(1), char(2)) AS paths
+            FROM commit_search
+            {'JOIN commits c ON c.id = commit_search.commit_id' if author else ''}
+            WHERE commit_search MATCH ?
+        '''
+        params = []
+        
+        if since is not None:
+            candidates += f' AND commit_search.rowid >= {_search_slot("?")}'
+            params.append(int(since.timestamp()))
+        
+        with self._get_connection() as conn:
+            if author:
+                authors = conn.execute(
+                    f'SELECT id, name, email FROM authors WHERE id IN ({self.AUTHOR_MATCH})',
+                    [f'%{author.lower()}%', f'%{author.lower()}%']
+                ).fetchall()
+                
+                if not authors:
+                    return []
+                
+                candidates += f" AND c.author_id IN ({','.join('?' * len(authors))})"
+                params.extend(row['id'] for row in authors)
+                
+                # The author column holds 'name email': matching those phrases
+                # skips other authors' commits before commit_id is read for the
+                # exact check (names without any word would match no phrase)
+                texts = [f"{row['name']} {row['email']}" for row in authors]
+                if len(texts) <= self.SEARCH_AUTHOR_PHRASES and all(re.search(r'\w', text) for text in texts):
+                    phrases = ' OR '.join('"{}"'.format(text.replace('"', '""')) for text in texts)
+                    expression = f'({expression}) AND author : ({phrases})'
+            
+            candidates += ' ORDER BY commit_search.rowid DESC LIMIT ?'
+            params.append(self.SEARCH_CANDIDATES)
+            
+            try:
+                ranked = conn.execute(f'''
+                    SELECT rowid, message, paths, {self.SEARCH_SCORE} AS score FROM ({candidates})
+                    ORDER BY score DESC, rowid DESC
+                    LIMIT ?
+                ''', [expression] + params + [limit]).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query '{query}': {str(e)}")
+            
+            if not ranked:
+                return []
+            
+            # Snippets come from the highlighted candidates: a second MATCH
+            # would re-read the doclists of long prefix terms
+            rowids = [row['rowid'] for row in ranked]
+            commits = {
+                row['rowid']: row
+                for row in conn.execute(f'''
+                    SELECT commit_search.rowid AS rowid, c.sha, c.short_sha, c.author, c.email, c.commit_date
+                    FROM commit_search
+                    JOIN commits c ON c.id = commit_search.commit_id
+                    WHERE commit_search.rowid IN ({','.join('?' * len(rowids))})
+                ''', rowids)
+            }
+        
+        return [
+            {
+                'hash': commits[row['rowid']]['sha'],
+                'short_hash': commits[row['rowid']]['short_sha'],
+                'author': commits[row['rowid']]['author'],
+                'email': commits[row['rowid']]['email'],
+                'timestamp': datetime.fromisoformat(commits[row['rowid']]['commit_date']),
+                'message': _search_snippet(row['message'], highlight, 16),
+                'paths': _search_snippet(row['paths'] or '', highlight, 8),
+                'rank': row['score'],
+            }
+            for row in ranked
+        ]
+    
+    def _search_commits_like(self, query, author, since, limit):
+        """Substring search over messages, newest first (SQLite without FTS5)"""
+        sql = 'SELECT sha, short_sha, author, email, commit_date, message FROM commits WHERE 1 = 1'
+        params = []
+        for term in self._search_terms(query):
+            if term not in ('AND', 'OR', 'NOT'):
+                text = term.rpartition(':')[2].strip('"*').lower()
+                sql += ' AND lower(message) LIKE ?'
+                params.append(f'%{text}%')
+        
+        if since is not None:
+            sql += ' AND ts >= ?'
+            params.append(int(since.timestamp()))
+        
+        if author:
+            sql += f' AND author_id IN ({self.AUTHOR_MATCH})'
+            params.extend([f'%{author.lower()}%', f'%{author.lower()}%'])
+        
+        sql += ' ORDER BY ts DESC LIMIT ?'
+        params.append(limit)
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        return [
+            {
+                'hash': row['sha'],
+                'short_hash': row['short_sha'],
+                'author': row['author'],
+                'email': row['email'],
+                'timestamp': datetime.fromisoformat(row['commit_date']),
+                'message': row['message'].split('\n', 1)[0],
+                'paths': '',
+                'rank': 0,
+            }
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _search_terms(query):
+        """Split a query into words and "quoted phrases" (with any trailing *)"""
+        return re.findall(r'(?:\w+:)?"[^"]*"\*?|\S+', query or '')
+    
+    def _search_expression(self, query):
+        """
+        Build an FTS5 MATCH expression from a user query
+        
+        Every term is quoted, so punctuation in paths and messages
+        ('src/app.py', 'v1.2') is matched literally instead of being
+        parsed as FTS5 syntax.
+        
+        Args:
+            query (str): Search terms
+            
+        Returns:
+            str: MATCH expression
+            
+        Raises:
+            ValueError: If the query has no searchable terms
+        """
+        parts = []
+        for term in self._search_terms(query):
+            if term in ('AND', 'OR', 'NOT'):
+                parts.append(term)
+                continue
+            
+            column = None
+            name, sep, rest = term.partition(':')
+            if sep and name.lower() in self.SEARCH_COLUMNS and rest:
+                column, term = self.SEARCH_COLUMNS[name.lower()], rest
+            
+            prefix = term.endswith('*')
+            text = term.rstrip('*').strip('"')
+            if not re.search(r'\w', text):
+                continue
+            
+            phrase = '"' + text.replace('"', '""') + '"' + ('*' if prefix else '')
+            parts.append(f'{column} : {phrase}' if column else phrase)
+        
+        if not any(part not in ('AND', 'OR', 'NOT') for part in parts):
+            raise ValueError(f"No searchable terms in query '{query}'")
+        return ' '.join(parts)
+    
+    def save_repo_analysis(self, result, days_analyzed=30):
+        """
+        Store the outcome of analyzing one repository in a workspace run
+        
+        Args:
+            result (dict): Per-repository result (see workspace.analyze_repository)
+            days_analyzed (int): Number of days the analysis covered
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO repo_analyses
+                    (repo_path, status, branch, commits, authors, insertions, deletions,
+                     score, grade, hotspots, error, duration, analysis_date, days_analyzed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    result.get('repo'),
+                    result.get('status', 'error'),
+                    result.get('branch'),
+                    result.get('commits', 0),
+                    result.get('authors', 0),
+                    result.get('insertions', 0),
+                    result.get('deletions', 0),
+                    result.get('score'),
+                    result.get('grade'),
+                    json.dumps(result.get('hotspots', [])),
+                    result.get('error'),
+                    result.get('duration'),
+                    datetime.now().isoformat(),
+                    days_analyzed
+                ))
+                return True
+        except Exception:
+            return False
+    
+    def get_repo_analyses(self, repo_path=None, limit=100):
+        """
+        Retrieve the latest workspace analysis result per repository
+        
+        Args:
+            repo_path (str): Only this repository (optional)
+            limit (int): Maximum number of repositories
+            
+        Returns:
+            list: Per-repository results, newest first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT * FROM repo_analyses r
+                WHERE r.id = (
+                    SELECT MAX(id) FROM repo_analyses WHERE repo_path = r.repo_path
+                )
+            '''
+            params = []
+            
+            if repo_path:
+                query += ' AND r.repo_path = ?'
+                params.append(str(repo_path))
+            
+            query += ' ORDER BY r.analysis_date DESC LIMIT ?'
+            params.append(limit)
+            
+            cursor.execute(query, params)
+            
+            return [
+                {
+                    'repo': row['repo_path'],
+                    'status': row['status'],
+                    'branch': row['branch'],
+                    'commits': row['commits'],
+                    'authors': row['authors'],
+                    'insertions': row['insertions'],
+                    'deletions': row['deletions'],
+                    'score': row['score'],
+                    'grade': row['grade'],
+                    'hotspots': json.loads(row['hotspots']) if row['hotspots'] else [],
+                    'error': row['error'],
+                    'duration': row['duration'],
+                    'analysis_date': row['analysis_date'],
+                    'days_analyzed': row['days_analyzed'],
+                }
+                for row in cursor.fetchall()
+            ]
+    
+    def get_blame_cache(self, repo_path, blob_shas):
+        """
+        Look up cached line ownership of file versions
+        
+        Args:
+            repo_path (str): Repository key
+            blob_shas (dict): {path: blob_sha} of the wanted versions
+            
+        Returns:
+            dict: {path: {author: line count}} for versions blamed before
+        """
+        wanted = list(blob_shas.items())
+        found = {}
+        
+        with self._get_connection() as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(wanted), 400):
+                batch = wanted[start:start + 400]
+                rows = conn.execute(f'''
+                    SELECT path, blob_sha, authors FROM blame_cache
+                    WHERE repo_path = ? AND path IN ({','.join('?' * len(batch))})
+                ''', [str(repo_path)] + [path for path, _ in batch]).fetchall()
+                
+                for row in rows:
+                    if blob_shas.get(row['path']) == row['blob_sha']:
+                        found[row['path']] = json.loads(row['authors'])
+        
+        return found
+    
+    def save_blame_cache(self, repo_path, entries):
+        """
+        Cache line ownership of file versions
+        
+        Older versions of the same paths are dropped.
+        
+        Args:
+            repo_path (str): Repository key
+            entries (list): (path, blob_sha, {author: line count}) tuples
+            
+        Returns:
+            int: Number of versions stored
+        """
+        repo_path = str(repo_path)
+        
+        with self._get_connection() as conn:
+            conn.executemany('''
+                DELETE FROM blame_cache WHERE repo_path = ? AND path = ? AND blob_sha != ?
+            ''', [(repo_path, path, sha) for path, sha, _ in entries])
+            conn.executemany('''
+                INSERT OR REPLACE INTO blame_cache (repo_path, path, blob_sha, authors)
+                VALUES (?, ?, ?, ?)
+            ''', [(repo_path, path, sha, json.dumps(dict(authors))) for path, sha, authors in entries])
+        
+        return len(entries)
+    
+    def save_command_timings(self, run):
+        """
+        Store the phase breakdown of one instrumented CLI run
+        
+        Args:
+            run (dict): Run summary (see instrumentation.Instrumentation.finish)
+            
+        Returns:
+            int: Id of the stored run, or None on failure
+        """
+        phases = run.get('phases', [])
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO command_runs
+                    (command, args, started_at, wall_s, cpu_s, git_calls, rows_read, rows_written)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    run['command'],
+                    json.dumps(run.get('args') or {}, default=str),
+                    run['started_at'],
+                    run['wall_s'],
+                    run['cpu_s'],
+                    run['git_calls'],
+                    run['rows_read'],
+                    run['rows_written']
+                ))
+                run_id = cursor.lastrowid
+                
+                cursor.executemany('''
+                    INSERT INTO command_phases
+                    (run_id, seq, name, wall_s, cpu_s, git_calls, rows_read, rows_written)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (run_id, seq, phase['name'], phase['wall_s'], phase['cpu_s'],
+                     phase['git_calls'], phase['rows_read'], phase['rows_written'])
+                    for seq, phase in enumerate(phases)
+                ])
+                return run_id
+        except Exception:
+            return None
+    
+    def get_command_timings(self, command=None, limit=10):
+        """
+        Retrieve recent instrumented runs with their phases
+        
+        Args:
+            command (str): Only runs of this command (optional)
+            limit (int): Maximum number of runs
+            
+        Returns:
+            list: Run summaries, newest first, each with a 'phases' list
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = 'SELECT * FROM command_runs'
+            params = []
+            
+            if command:
+                query += ' WHERE command = ?'
+                params.append(command)
+            
+            query += ' ORDER BY id DESC LIMIT ?'
+            params.append(limit)
+            
+            runs = []
+            for row in cursor.execute(query, params).fetchall():
+                run = dict(row)
+                run['args'] = json.loads(run['args']) if run['args'] else {}
+                run['phases'] = [
+                    dict(phase) for phase in conn.execute('''
+                        SELECT name, wall_s, cpu_s, git_calls, rows_read, rows_written
+                        FROM command_phases WHERE run_id = ? ORDER BY seq
+                    ''', (run['id'],))
+                ]
+                runs.append(run)
+            
+            return runs
+    
+    def save_command_history(self, command_counts, shell_type=None):
+        """
+        Replace stored shell command usage
+        
+        Args:
+            command_counts (dict): {command: frequency}
+            shell_type (str): Shell the history came from (optional)
+            
+        Returns:
+            int: Number of commands saved
+        """
+        now = datetime.now().isoformat()
+        records = [(cmd, count, now, shell_type) for cmd, count in command_counts.items()]
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM command_history')
+            cursor.executemany('''
+                INSERT INTO command_history (command, frequency, last_updated, shell_type)
+                VALUES (?, ?, ?, ?)
+            ''', records)
+            
+            return len(records)
+    
+    def save_command_sequences(self, sequences):
+        """
+        Replace stored command sequences
+        
+        Args:
+            sequences (list): Sequence dicts with 'sequence' (list) and 'count'
+            
+        Returns:
+            int: Number of sequences saved
+        """
+        now = datetime.now().isoformat()
+        records = [(' → '.join(seq['sequence']), seq['count'], now) for seq in sequences]
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM command_sequences')
+            cursor.executemany('''
+                INSERT INTO command_sequences (sequence, count, last_updated)
+                VALUES (?, ?, ?)
+            ''', records)
+            
+            return len(records)
+    
+    def save_alias_suggestions(self, suggestions):
+        """
+        Replace stored alias suggestions
+        
+        Args:
+            suggestions (list): Suggestion dicts with 'alias', 'command',
+                                'frequency' and 'shell'
+            
+        Returns:
+            int: Number of suggestions saved
+        """
+        now = datetime.now().isoformat()
+        records = [
+            (sug['alias'], sug['command'], sug['frequency'], sug['shell'], now)
+            for sug in suggestions
+        ]
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM alias_suggestions')
+            cursor.executemany('''
+                INSERT INTO alias_suggestions (alias_name, command, frequency, shell_type, last_updated)
+                VALUES (?, ?, ?, ?, ?)
+            ''', records)
+            
+            return len(records)
+    
+    def get_history_checkpoint(self, history_path):
+        """
+        Get where the last incremental read of a history file stopped
+        
+        Args:
+            history_path (str): Resolved history file path
+        
+        Returns:
+            dict: inode, offset, encoding, tail and commands, or None
+        """
+        with self._get_connection() as conn:
+            row = conn.execute('''
+                SELECT inode, byte_offset, encoding, tail, commands
+                FROM history_checkpoints WHERE history_path = ?
+            ''', (history_path,)).fetchone()
+            
+            if not row:
+                return None
+            
+            return {
+                'inode': row['inode'],
+                'offset': row['byte_offset'],
+                'encoding': row['encoding'],
+                'tail': bytes(row['tail']),
+                'commands': row['commands'],
+            }
+    
+    def save_history_increment(self, history_path, previous, checkpoint, command_counts, first_seen):
+        """
+        Add newly read history commands to the counts and advance the checkpoint
+        
+        Args:
+            history_path (str): Resolved history file path
+            previous (dict): Checkpoint the read resumed from, or None when
+                             the file was read from the start
+            checkpoint (dict): New checkpoint (inode, offset, encoding, tail, commands)
+            command_counts (dict): {command: occurrences in the new lines}
+            first_seen (dict): {command: position of its first occurrence}
+        
+        Returns:
+            bool: False if another process advanced the checkpoint first
+        """
+        values = (
+            checkpoint['inode'], checkpoint['offset'], checkpoint['encoding'],
+            checkpoint['tail'], checkpoint['commands'], datetime.now().isoformat()
+        )
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            if previous is None:
+                cursor.execute('DELETE FROM shell_command_counts WHERE history_path = ?', (history_path,))
+                cursor.execute('''
+                    INSERT OR REPLACE INTO history_checkpoints
+                    (inode, byte_offset, encoding, tail, commands, updated_at, history_path)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', values + (history_path,))
+            else:
+                # Compare-and-set so concurrent syncs cannot count lines twice
+                cursor.execute('''
+                    UPDATE history_checkpoints
+                    SET inode = ?, byte_offset = ?, encoding = ?, tail = ?, commands = ?, updated_at = ?
+                    WHERE history_path = ? AND inode = ? AND byte_offset = ?
+                ''', values + (history_path, previous['inode'], previous['offset']))
+                if cursor.rowcount == 0:
+                    return False
+            
+            cursor.executemany('''
+                INSERT INTO shell_command_counts (history_path, command, count, first_seen)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (history_path, command) DO UPDATE SET count = count + excluded.count
+            ''', [
+                (history_path, command, count, first_seen[command])
+                for command, count in command_counts.items()
+            ])
+            
+            return True
+    
+    def get_shell_command_counts(self, history_path, limit=20):
+        """
+        Get the most used commands of a history file
+        
+        Args:
+            history_path (str): Resolved history file path
+            limit (int): Number of commands to return
+        
+        Returns:
+            list: (command, count) tuples, most used first; ties in
+                  order of first use
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute('''
+                SELECT command, count FROM shell_command_counts
+                WHERE history_path = ?
+                ORDER BY count DESC, first_seen
+                LIMIT ?
+            ''', (history_path, limit)).fetchall()
+            
+            return [(row['command'], row['count']) for row in rows]
+    
+    def get_shell_history_stats(self, history_path):
+        """
+        Get totals of a history file's stored command counts
+        
+        Args:
+            history_path (str): Resolved history file path
+        
+        Returns:
+            dict: total_commands and unique_commands
+        """
+        with self._get_connection() as conn:
+            row = conn.execute('''
+                SELECT
+                    (SELECT commands FROM history_checkpoints WHERE history_path = ?) AS total,
+                    (SELECT COUNT(*) FROM shell_command_counts WHERE history_path = ?) AS uniq
+            ''', (history_path, history_path)).fetchone()
+            
+            return {
+                'total_commands': row['total'] or 0,
+                'unique_commands': row['uniq'],
+            }
+
+    def clear_old_data(self, days=90):
+        """
+        Clear old analysis data
+        
+        Args:
+            days (int): Delete data older than this many days
             
         Returns:
             dict: Count of deleted records
         """
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff = datetime.now() - timedelta(days=days)
+        cutoff_date = cutoff.isoformat()
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('DELETE FROM commits WHERE commit_date < ?', (cutoff_date,))
+            # Unlink before deleting commits: the branch rollup triggers
+            # read the stats of the commits being unlinked
+            cursor.execute('DELETE FROM branch_commits WHERE commit_date < ?', (cutoff_date,))
+            
+            cursor.execute('DELETE FROM commits WHERE ts < ?', (int(cutoff.timestamp()),))
             commits_deleted = cursor.rowcount
             
             cursor.execute('DELETE FROM file_hotspots WHERE analysis_date < ?', (cutoff_date,))
             hotspots_deleted = cursor.rowcount
             
+            # Ingested windows no longer reach back past the cutoff
+            cursor.execute('DELETE FROM file_changes WHERE ts < ?', (int(cutoff.timestamp()),))
+            cursor.execute('''
+                UPDATE ingest_watermarks SET covered_since = ?
+                WHERE covered_since < ?
+            ''', (cutoff_date, cutoff_date))
+            
             return {
                 'commits_deleted': commits_deleted,
                 'hotspots_deleted': hotspots_deleted,
@@ -490,6 +2393,31 @@ class Database:
 
 # Standalone utility functions
 
+_shared_databases = {}
+_shared_lock = threading.Lock()
+
+
+def get_database(db_path=None):
+    """
+    Get a Database shared by all callers in this process for one path
+    
+    Reusing the instance keeps one long-lived connection per thread instead
+    of re-opening the file and re-running schema setup on every call.
+    
+    Args:
+        db_path (str): Database path (optional)
+        
+    Returns:
+        Database: Shared database instance
+    """
+    key = (os.getpid(), str(db_path) if db_path is not None else None)
+    
+    with _shared_lock:
+        if key not in _shared_databases:
+            _shared_databases[key] = Database(db_path)
+        return _shared_databases[key]
+
+
 def save_commit_analysis(commit_data, db_path=None):
     """
     Standalone function to save commit analysis
@@ -501,10 +2429,25 @@ def save_commit_analysis(commit_data, db_path=None):
     Returns:
         int: Number of commits saved
     """
-    db = Database(db_path)
+    db = get_database(db_path)
     return db.save_commit_analysis(commit_data)
 
 
+def ingest_commits(records, db_path=None):
+    """
+    Standalone function to stream commits into the database
+    
+    Args:
+        records (iterable): Commit dictionaries (any iterator)
+        db_path (str): Database path (optional)
+        
+    Returns:
+        dict: Inserted, updated and skipped counts
+    """
+    db = get_database(db_path)
+    return db.ingest_commits(records)
+
+
 def get_commit_stats(days=30, author=None, db_path=None):
     """
     Standalone function to get commit statistics
@@ -517,7 +2460,7 @@ def get_commit_stats(days=30, author=None, db_path=None):
     Returns:
         dict: Commit statistics
     """
-    db = Database(db_path)
+    db = get_database(db_path)
     return db.get_commit_stats(days, author)
 
 
@@ -533,7 +2476,7 @@ def save_file_hotspots(hotspot_data, days_analyzed=30, db_path=None):
     Returns:
         int: Number of hotspots saved
     """
-    db = Database(db_path)
+    db = get_database(db_path)
     return db.save_file_hotspots(hotspot_data, days_analyzed)
 
 
@@ -549,5 +2492,5 @@ def get_file_hotspots(limit=10, days=30, db_path=None):
     Returns:
         list: File hotspots
     """
-    db = Database(db_path)
+    db = get_database(db_path)
     return db.get_file_hotspots(limit, days)
@@ -173,8 +173,8 @@ class DemoManager:
     def ensure_database(self) -> bool:
         """Ensure database is initialized"""
         try:
-            from .database import Database
-            db = Database()
+            from .database import get_database
+            db = get_database()
             # Database auto-initializes on instantiation
             return True
         except Exception as e:
@@ -3,13 +3,19 @@ DevFlow Analytics JSON Exporter
 Export analytics data from SQLite database to JSON files for frontend consumption
 """
 
+import gzip
+import hashlib
 import json
+import os
+import tempfile
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timedelta
-from .database import Database
+from .database import get_database
 from .git_analyzer import GitAnalyzer
 from .history import HistoryTracker
 from .insight_engine import InsightEngine
+from .ownership import OwnershipIndex
 from .file_filter import (
     is_source_code_file, 
     filter_source_files,
@@ -20,16 +26,26 @@ from .file_filter import (
 )
 
 
+MANIFEST_FILE = 'manifest.json'
+
+
 class AnalyticsExporter:
     """Export DevFlow analytics to JSON for frontend"""
     
-    def __init__(self, output_dir=None, db_path=None):
+    SPARKLINE_DAYS = 14
+    HEATMAP_WEEKS = 52
+    
+    def __init__(self, output_dir=None, db_path=None, repo_path='.', compact=False, gzip_sidecar=False, jobs=1):
         """
         Initialize exporter
         
         Args:
             output_dir (str): Output directory for JSON files
             db_path (str): Path to database (optional)
+            repo_path (str): Repository to read history from
+            compact (bool): Write JSON without indentation
+            gzip_sidecar (bool): Also write a gzipped `<name>.json.gz` next to each file
+            jobs (int): Parallel `git log` workers over history ranges (0: one per CPU)
         """
         if output_dir is None:
             # Default to frontend/public/devflow-data/
@@ -38,7 +54,139 @@ class AnalyticsExporter:
             self.output_dir = Path(output_dir)
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.db = Database(db_path)
+        self.db = get_database(db_path)
+        self.repo_path = repo_path
+        self.compact = compact
+        self.gzip_sidecar = gzip_sidecar
+        self.jobs = jobs
+        self.manifest = self._load_manifest()
+        self.written = []
+        self.unchanged = []
+        self._analyzer = None
+        self._session = None
+        self._ownership_index = None
+    
+    @property
+    def analyzer(self):
+        """GitAnalyzer shared by every export (opened once)"""
+        if self._analyzer is None:
+            self._analyzer = GitAnalyzer(self.repo_path, jobs=self.jobs)
+        return self._analyzer
+    
+    @property
+    def repo_root(self):
+        """Repository root used for path normalization"""
+        try:
+            return self.analyzer.repo.working_tree_dir or '.'
+        except Exception:
+            return '.'
+    
+    def scan_history(self, days):
+        """
+        Walk history once for the longest window any export needs
+        
+        Later calls with a window no longer than the scanned one reuse the
+        same commit records; exports derive shorter windows from them.
+        
+        Args:
+            days (int): Longest window in days
+            
+        Returns:
+            AnalysisSession: Session holding the scanned commit records
+        """
+        if self._session is None or self._session.days < days:
+            self._session = self.analyzer.create_session(days=days, db=self.db)
+        return self._session
+    
+    def _history(self, days):
+        """Session over the last `days` days, derived from the shared scan"""
+        return self.scan_history(days).narrow(days)
+    
+    def ownership(self, paths):
+        """
+        Blame-based line ownership of files at HEAD
+        
+        Args:
+            paths (list): Repo-relative paths
+            
+        Returns:
+            dict: {path: summary} (see ownership.summarize_ownership), empty if
+                  the repository cannot be blamed
+        """
+        try:
+            if self._ownership_index is None:
+                self._ownership_index = OwnershipIndex(self.analyzer, self.db)
+            return self._ownership_index.ownership(paths)
+        except Exception:
+            return {}
+    
+    def _write_json(self, filename, data, hashed=None):
+        """
+        Write one export file atomically, unless its content is unchanged
+        
+        The content hash ignores 'generated_at', so re-exporting identical
+        analytics leaves the file (and the frontend's cache) untouched.
+        
+        Args:
+            filename (str): File name inside the output directory
+            data (dict): Export payload
+            hashed (dict): Payload to hash instead, without other volatile fields (optional)
+            
+        Returns:
+            bool: True if the file was written, False if skipped
+        """
+        path = self.output_dir / filename
+        sidecar = path.with_name(filename + '.gz')
+        digest = content_hash(data if hashed is None else hashed)
+        encoding = 'compact' if self.compact else 'indented'
+        
+        entry = self.manifest['files'].get(filename)
+        if (entry and entry['hash'] == digest and entry['encoding'] == encoding
+                and entry['gzip'] == self.gzip_sidecar
+                and path.exists() and path.stat().st_size == entry['bytes']
+                and (sidecar.exists() or not self.gzip_sidecar)):
+            self.unchanged.append(filename)
+            return False
+        
+        if self.compact:
+            payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        else:
+            payload = json.dumps(data, indent=2).encode('utf-8')
+        
+        atomic_write(path, payload)
+        if self.gzip_sidecar:
+            atomic_write(sidecar, gzip.compress(payload, mtime=0))
+        elif sidecar.exists():
+            # A stale sidecar would be served instead of the new file
+            sidecar.unlink()
+        
+        self.manifest['files'][filename] = {
+            'hash': digest,
+            'bytes': len(payload),
+            'encoding': encoding,
+            'gzip': self.gzip_sidecar,
+            'generated_at': data.get('generated_at'),
+        }
+        self._save_manifest()
+        self.written.append(filename)
+        return True
+    
+    def _load_manifest(self):
+        """Manifest of previously exported files ({'files': {}} if none)"""
+        try:
+            with open(self.output_dir / MANIFEST_FILE, 'r') as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get('files'), dict):
+                return manifest
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {'version': 1, 'files': {}}
+    
+    def _save_manifest(self):
+        """Write the manifest; it only changes when an export file does"""
+        self.manifest['updated_at'] = datetime.now().isoformat()
+        atomic_write(self.output_dir / MANIFEST_FILE,
+                     json.dumps(self.manifest, indent=2, sort_keys=True).encode('utf-8'))
     
     def export_productivity_summary_json(self, days=7):
         """
@@ -59,7 +207,7 @@ class AnalyticsExporter:
             previous_score = max(0, score - 5)  # Mock previous
             
             # Generate sparkline from recent commits
-            sparkline = self._generate_sparkline_data(days=14)
+            sparkline = self._generate_sparkline_data(days=self.SPARKLINE_DAYS)
             
             data = {
                 'productivityScore': {
@@ -73,9 +221,7 @@ class AnalyticsExporter:
                 'generated_at': datetime.now().isoformat()
             }
             
-            output_file = self.output_dir / 'productivity-summary.json'
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_json('productivity-summary.json', data)
             
             return data
         
@@ -100,8 +246,9 @@ class AnalyticsExporter:
             if not hotspots:
                 # Try to generate from git analyzer
                 try:
-                    analyzer = GitAnalyzer('.')
-                    raw_hotspots = analyzer.get_hotspot_files(days=days, limit=limit)
+                    raw_hotspots = self.analyzer.get_hotspot_files(
+                        limit=limit, session=self._history(days)
+                    )
                     hotspots = [
                         {
                             'file': file_path,
@@ -119,12 +266,12 @@ class AnalyticsExporter:
             hotspots = filter_source_files(hotspots)
             
             # Get repo root for path normalization
-            try:
-                import git
-                repo = git.Repo('.', search_parent_directories=True)
-                repo_root = repo.working_dir
-            except:
-                repo_root = '.'
+            repo_root = self.repo_root
+            
+            # Contributor counts come from who owns the lines at HEAD
+            owners = self.ownership([
+                normalize_file_path(hotspot.get('file', ''), repo_root) for hotspot in hotspots
+            ])
             
             # PART 5: Transform to standardized schema
             file_risk_data = []
@@ -142,7 +289,10 @@ class AnalyticsExporter:
                 
                 # Get metrics
                 change_count = hotspot.get('changes', 0)
-                contributors = hotspot.get('unique_authors', 1)
+                if normalized_path in owners:
+                    contributors = owners[normalized_path]['contributors']
+                else:
+                    contributors = hotspot.get('unique_authors') or 1
                 insertions = hotspot.get('insertions', 0)
                 deletions = hotspot.get('deletions', 0)
                 last_modified = hotspot.get('last_modified')
@@ -176,9 +326,7 @@ class AnalyticsExporter:
                 'days_analyzed': days
             }
             
-            output_file = self.output_dir / 'file-hotspots.json'
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_json('file-hotspots.json', data)
             
             return data
         
@@ -197,7 +345,7 @@ class AnalyticsExporter:
         """
         try:
             # Generate heatmap data (52 weeks)
-            heatmap_data = self._generate_heatmap_data(weeks=52)
+            heatmap_data = self._generate_heatmap_data(weeks=self.HEATMAP_WEEKS)
             
             data = {
                 'heatmapData': heatmap_data,
@@ -205,9 +353,7 @@ class AnalyticsExporter:
                 'days_analyzed': days
             }
             
-            output_file = self.output_dir / 'commit-analytics.json'
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_json('commit-analytics.json', data)
             
             return data
         
@@ -227,9 +373,9 @@ class AnalyticsExporter:
         try:
             # Try to get from history tracker
             tracker = HistoryTracker()
-            commands = tracker.parse_shell_history()
+            synced = tracker.sync_history(db_path=self.db.db_path)
             
-            if commands:
+            if synced['total_commands'] or tracker.parse_shell_history():
                 top_commands = tracker.get_top_commands(limit=limit)
                 suggestions = tracker.suggest_aliases(min_frequency=3, limit=5)
                 
@@ -268,9 +414,7 @@ class AnalyticsExporter:
                 'generated_at': datetime.now().isoformat()
             }
             
-            output_file = self.output_dir / 'command-usage.json'
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_json('command-usage.json', data)
             
             return data
         
@@ -298,44 +442,48 @@ class AnalyticsExporter:
             
             # Get file hotspots
             try:
-                analyzer = GitAnalyzer('.')
-                raw_hotspots = analyzer.get_hotspot_files(days=days, limit=50)
+                session = self._history(days)
+                repo_root = self.repo_root
+                raw_hotspots = [
+                    (normalize_file_path(file_path, repo_root), change_count)
+                    for file_path, change_count, _ in self.analyzer.get_hotspot_files(limit=50, session=session)
+                    if is_source_code_file(file_path)
+                ]
+                owners = self.ownership([path for path, _ in raw_hotspots])
                 
-                for file_path, change_count, lines in raw_hotspots:
-                    if is_source_code_file(file_path):
-                        file_hotspots.append({
-                            'path': normalize_file_path(file_path),
-                            'riskScore': calculate_enhanced_risk_score(
-                                change_count=change_count,
-                                contributor_count=1,
-                                last_modified_days=None,
-                                insertions=0,
-                                deletions=0
-                            ),
-                            'changeCount': change_count,
-                            'contributors': 1,
-                            'language': get_file_language(file_path),
-                            'lastModifiedDaysAgo': -1
-                        })
+                for path, change_count in raw_hotspots:
+                    # Files deleted since keep the old single-owner assumption
+                    ownership = owners.get(path, {'contributors': 1, 'bus_factor': 1})
+                    file_hotspots.append({
+                        'path': path,
+                        'riskScore': calculate_enhanced_risk_score(
+                            change_count=change_count,
+                            contributor_count=ownership['contributors'],
+                            last_modified_days=None,
+                            insertions=0,
+                            deletions=0
+                        ),
+                        'changeCount': change_count,
+                        'contributors': ownership['contributors'],
+                        'busFactor': ownership['bus_factor'],
+                        'language': get_file_language(path),
+                        'lastModifiedDaysAgo': -1
+                    })
             except Exception:
                 pass
             
             # Get commits data
             try:
-                import git
-                repo = git.Repo('.', search_parent_directories=True)
-                since_date = datetime.now() - timedelta(days=days)
-                
-                for commit in repo.iter_commits(since=since_date):
+                for commit in self._history(days).commits:
                     commits.append({
-                        'timestamp': commit.committed_datetime.isoformat(),
-                        'date': commit.committed_datetime.date().isoformat(),
-                        'author': commit.author.name,
-                        'message': commit.message
+                        'timestamp': commit['timestamp'].isoformat(),
+                        'date': commit['timestamp'].date().isoformat(),
+                        'author': commit['author'],
+                        'message': commit['message']
                     })
                     
                     # Track contributor stats
-                    author = commit.author.name
+                    author = commit['author']
                     contributor_stats[author] = contributor_stats.get(author, 0) + 1
             except Exception:
                 pass
@@ -343,8 +491,8 @@ class AnalyticsExporter:
             # Get command usage
             try:
                 tracker = HistoryTracker()
-                commands = tracker.parse_shell_history()
-                if commands:
+                synced = tracker.sync_history(db_path=self.db.db_path)
+                if synced['total_commands'] or tracker.parse_shell_history():
                     top_commands = tracker.get_top_commands(limit=20)
                     command_usage = [
                         {'command': cmd['command'], 'count': cmd['count']}
@@ -377,10 +525,11 @@ class AnalyticsExporter:
                 'days_analyzed': days
             }
             
-            # Write to file
-            output_file = self.output_dir / 'insights.json'
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write to file; insight timestamps alone do not make it new
+            self._write_json('insights.json', data, hashed={
+                **data,
+                'insights': [{k: v for k, v in insight.items() if k != 'timestamp'} for insight in insights],
+            })
             
             return data
             
@@ -410,6 +559,12 @@ class AnalyticsExporter:
         Returns:
             dict: Summary of exports
         """
+        # One history walk covers every artifact below
+        try:
+            self.scan_history(max(days, self.SPARKLINE_DAYS, self.HEATMAP_WEEKS * 7))
+        except Exception:
+            pass
+        
         results = {
             'productivity_summary': self.export_productivity_summary_json(days=7),
             'file_hotspots': self.export_file_hotspots_json(days=days),
@@ -428,6 +583,8 @@ class AnalyticsExporter:
                 'command-usage.json',
                 'insights.json'
             ],
+            'files_written': list(self.written),
+            'files_unchanged': list(self.unchanged),
             'generated_at': datetime.now().isoformat()
         }
     
@@ -439,16 +596,7 @@ class AnalyticsExporter:
         day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
         
         try:
-            analyzer = GitAnalyzer('.')
-            commits = analyzer.get_commit_history(days=days)
-            
-            # Count commits per day
-            from collections import defaultdict
-            day_counts = defaultdict(int)
-            
-            for commit in commits:
-                date = commit['timestamp'].date()
-                day_counts[date] += 1
+            day_counts = self._daily_commit_counts(days)
             
             # Generate sparkline for last 14 days
             for i in range(days - 1, -1, -1):
@@ -475,16 +623,7 @@ class AnalyticsExporter:
         heatmap = []
         
         try:
-            analyzer = GitAnalyzer('.')
-            commits = analyzer.get_commit_history(days=weeks * 7)
-            
-            # Count commits per day
-            from collections import defaultdict
-            day_counts = defaultdict(int)
-            
-            for commit in commits:
-                date = commit['timestamp'].date()
-                day_counts[date] += 1
+            day_counts = self._daily_commit_counts(weeks * 7)
             
             # Generate heatmap grid
             now = datetime.now()
@@ -516,6 +655,21 @@ class AnalyticsExporter:
         
         return heatmap
     
+    def _daily_commit_counts(self, days):
+        """Count commits per calendar day over the last N days"""
+        session = self.scan_history(days)
+        first_day = (datetime.now() - timedelta(days=days - 1)).date()
+        
+        # Served by one range scan over the branch rollups when ingested
+        counts = session.daily_counts(first_day)
+        if counts is not None:
+            return Counter(counts)
+        
+        return Counter(
+            commit['timestamp'].date()
+            for commit in self._history(days).records
+        )
+    
     def _format_relative_time(self, timestamp):
         """Format timestamp as relative time (e.g., '2h ago')"""
         if not timestamp:
@@ -598,6 +752,44 @@ class AnalyticsExporter:
 
 # Standalone functions
 
+def content_hash(data):
+    """
+    Hash an export payload independently of its encoding and timestamp
+    
+    Args:
+        data (dict): Export payload
+        
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON without 'generated_at'
+    """
+    content = {key: value for key, value in data.items() if key != 'generated_at'}
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def atomic_write(path, payload):
+    """
+    Replace a file in one step, so readers never see a partial write
+    
+    Args:
+        path (Path): Destination file
+        payload (bytes): New content
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def export_all_analytics(output_dir=None, days=30):
     """
     Standalone function to export all analytics
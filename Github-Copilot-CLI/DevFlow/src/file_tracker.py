@@ -7,16 +7,28 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 from pathlib import Path
 
+from .commit_graph import ensure_commit_graph
+from .git_backend import get_backend
+from .ingest import IncrementalIngestor
+
+
+# Lower bound used when a query needs the whole history of a branch
+HISTORY_START = datetime.fromtimestamp(0)
+
 
 class FileTracker:
     """Track and analyze file changes from git history"""
     
-    def __init__(self, repo_path='.'):
+    def __init__(self, repo_path='.', db=None, maintain_commit_graph=False, backend=None):
         """
         Initialize FileTracker with repository path
         
         Args:
             repo_path (str): Path to git repository
+            db (Database): Answer queries from ingested file changes (optional)
+            maintain_commit_graph (bool): Write or refresh the commit-graph before
+                the first path-limited history walk (see commit_graph)
+            backend (str): Git backend name (default: see git_backend.get_backend)
             
         Raises:
             ValueError: If path is not a valid git repository
@@ -24,12 +36,75 @@ class FileTracker:
         try:
             self.repo_path = Path(repo_path).resolve()
             self.repo = git.Repo(self.repo_path, search_parent_directories=True)
+            self.backend = get_backend(self.repo.working_tree_dir or self.repo.git_dir, backend)
         except git.exc.InvalidGitRepositoryError:
             raise ValueError(f"'{repo_path}' is not a valid git repository")
         except git.exc.NoSuchPathError:
             raise ValueError(f"Path '{repo_path}' does not exist")
         except Exception as e:
             raise ValueError(f"Error accessing repository: {str(e)}")
+        
+        self.db = db
+        self.maintain_commit_graph = maintain_commit_graph
+        self.commit_graph = None
+        self._analyzer = None
+        self._repo_key = None
+    
+    def _sync(self, since):
+        """
+        Ingest new commits of the current branch into the file_changes table
+        
+        Args:
+            since (datetime): Oldest commit date the query needs
+            
+        Returns:
+            bool: True if the query can be answered from the database
+        """
+        if self.db is None:
+            return False
+        
+        try:
+            if self._analyzer is None:
+                from .git_analyzer import GitAnalyzer
+                self._analyzer = GitAnalyzer(self.repo_path)
+            
+            if self._analyzer.is_empty:
+                return False
+            
+            ingestor = IncrementalIngestor(self._analyzer, self.db)
+            result = ingestor.sync(since, self._analyzer.default_branch)
+            self._repo_key = ingestor.repo_key
+            
+            return result['mode'] != 'missing'
+        except Exception:
+            # Fall back to walking git history
+            return False
+    
+    def _path_log(self, file_path, since=None):
+        """
+        Stream the commits of HEAD that touched one file, newest first
+        
+        With the gitpython backend one `git log --numstat -- <path>` process
+        serves the whole walk; with changed-path Bloom filters in the
+        commit-graph git skips the tree diff of nearly every commit that did
+        not touch the file.
+        
+        Args:
+            file_path (str): Relative path to file from repository root
+            since (datetime): Oldest commit date (optional)
+            
+        Yields:
+            dict: Commit records whose 'files' hold the file's stats
+        """
+        root = self.repo.working_tree_dir or self.repo.git_dir
+        
+        if self.maintain_commit_graph and self.commit_graph is None:
+            try:
+                self.commit_graph = ensure_commit_graph(root)
+            except ValueError:
+                self.commit_graph = {'written': False, 'needs_write': True}
+        
+        yield from self.backend.iter_commits(rev='HEAD', since=since, paths=[file_path])
     
     def get_file_churn_rate(self, file_path, days=30):
         """
@@ -49,13 +124,22 @@ class FileTracker:
             total_deletions = 0
             authors = set()
             
-            for commit in self.repo.iter_commits(since=since_date, paths=file_path):
-                if file_path in commit.stats.files:
-                    changes += 1
-                    stats = commit.stats.files[file_path]
-                    total_insertions += stats['insertions']
-                    total_deletions += stats['deletions']
-                    authors.add(commit.author.name)
+            if self._sync(since_date):
+                churn = self.db.get_file_churn(
+                    self._repo_key, self._analyzer.default_branch, file_path, since_date
+                )
+                changes = churn['changes']
+                total_insertions = churn['insertions']
+                total_deletions = churn['deletions']
+                authors = set(churn['authors'])
+            else:
+                for commit in self._path_log(file_path, since=since_date):
+                    if file_path in commit['files']:
+                        changes += 1
+                        stats = commit['files'][file_path]
+                        total_insertions += stats['insertions']
+                        total_deletions += stats['deletions']
+                        authors.add(commit['author'])
             
             churn_rate = changes / days if days > 0 else 0
             
@@ -89,6 +173,27 @@ class FileTracker:
         """
         try:
             since_date = datetime.now() - timedelta(days=days)
+            
+            if self._sync(since_date):
+                rows = self.db.get_file_change_counts(
+                    self._repo_key, self._analyzer.default_branch, since_date,
+                    min_changes=threshold, extension=extension_filter
+                )
+                return [
+                    {
+                        'file': row['file'],
+                        'changes': row['changes'],
+                        'insertions': row['insertions'],
+                        'deletions': row['deletions'],
+                        'net_lines': row['insertions'] - row['deletions'],
+                        'churn_rate': round(row['changes'] / days, 2),
+                        'unique_authors': len(row['authors']),
+                        'authors': row['authors'],
+                        'risk_level': self._calculate_risk_level(row['changes'], days),
+                    }
+                    for row in rows
+                ]
+            
             file_changes = defaultdict(lambda: {
                 'count': 0,
                 'insertions': 0,
@@ -96,8 +201,8 @@ class FileTracker:
                 'authors': set()
             })
             
-            for commit in self.repo.iter_commits(since=since_date):
-                for file_path, stats in commit.stats.files.items():
+            for commit in self.backend.iter_commits(rev='HEAD', since=since_date):
+                for file_path, stats in commit['files'].items():
                     # Apply extension filter if specified
                     if extension_filter and not file_path.endswith(extension_filter):
                         continue
@@ -105,7 +210,7 @@ class FileTracker:
                     file_changes[file_path]['count'] += 1
                     file_changes[file_path]['insertions'] += stats['insertions']
                     file_changes[file_path]['deletions'] += stats['deletions']
-                    file_changes[file_path]['authors'].add(commit.author.name)
+                    file_changes[file_path]['authors'].add(commit['author'])
             
             # Filter files exceeding threshold
             danger_zones = []
@@ -143,23 +248,27 @@ class FileTracker:
             list: List of commits with timestamps and change details
         """
         try:
-            timeline = []
+            if self._sync(HISTORY_START):
+                return self.db.get_file_timeline(
+                    self._repo_key, self._analyzer.default_branch, file_path, limit
+                )
             
-            commits_iter = self.repo.iter_commits(paths=file_path)
-            if limit:
-                commits_iter = list(commits_iter)[:limit]
+            timeline = []
             
-            for commit in commits_iter:
-                if file_path in commit.stats.files:
-                    stats = commit.stats.files[file_path]
+            for index, commit in enumerate(self._path_log(file_path)):
+                if limit and index >= limit:
+                    break
+                
+                if file_path in commit['files']:
+                    stats = commit['files'][file_path]
                     timeline.append({
-                        'sha': commit.hexsha,
-                        'short_sha': commit.hexsha[:7],
-                        'author': commit.author.name,
-                        'email': commit.author.email,
-                        'date': datetime.fromtimestamp(commit.committed_date),
-                        'timestamp': commit.committed_date,
-                        'message': commit.message.strip().split('\n')[0],  # First line only
+                        'sha': commit['hash'],
+                        'short_sha': commit['short_hash'],
+                        'author': commit['author'],
+                        'email': commit['email'],
+                        'date': commit['timestamp'],
+                        'timestamp': int(commit['timestamp'].timestamp()),
+                        'message': commit['message'].split('\n')[0],  # First line only
                         'insertions': stats['insertions'],
                         'deletions': stats['deletions'],
                         'net_change': stats['insertions'] - stats['deletions'],
@@ -183,19 +292,25 @@ class FileTracker:
         """
         try:
             since_date = datetime.now() - timedelta(days=days)
+            
+            if self._sync(since_date):
+                return self.db.get_recent_files(
+                    self._repo_key, self._analyzer.default_branch, since_date, limit
+                )
+            
             file_data = defaultdict(lambda: {
                 'last_modified': None,
                 'changes': 0,
                 'last_author': None
             })
             
-            for commit in self.repo.iter_commits(since=since_date):
-                commit_date = datetime.fromtimestamp(commit.committed_date)
-                for file_path in commit.stats.files.keys():
+            for commit in self.backend.iter_commits(rev='HEAD', since=since_date):
+                commit_date = commit['timestamp']
+                for file_path in commit['files']:
                     if not file_data[file_path]['last_modified'] or \
                        commit_date > file_data[file_path]['last_modified']:
                         file_data[file_path]['last_modified'] = commit_date
-                        file_data[file_path]['last_author'] = commit.author.name
+                        file_data[file_path]['last_author'] = commit['author']
                     file_data[file_path]['changes'] += 1
             
             # Convert to list and sort by last modified date
@@ -7,8 +7,12 @@ from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 import re
 from pathlib import Path
-import statistics
+from .commit_record import CommitRecord
 from .file_filter import is_source_code_file, filter_source_files
+from .git_backend import get_backend
+from .ingest import GitLogError
+from .parallel_ingest import parallel_records, resolve_jobs, scan_window
+from .session import AnalysisSession
 
 
 class GitAnalyzer:
@@ -16,13 +20,20 @@ class GitAnalyzer:
     
     CONVENTIONAL_COMMIT_PATTERN = r'^(feat|fix|docs|style|refactor|test|chore|perf|ci|build|revert)(\(.+\))?!?:\s.+'
     TICKET_PATTERN = r'(#\d+|[A-Z]+-\d+|JIRA-\d+)'
+    WORK_HOURS = range(9, 18)  # 9 AM - 5 PM
     
-    def __init__(self, repo_path='.'):
+    def __init__(self, repo_path='.', use_fast_ingest=True, backend=None, jobs=1):
         """
         Initialize GitAnalyzer with comprehensive validation
         
         Args:
             repo_path (str): Path to git repository
+            use_fast_ingest (bool): Read history through the git backend
+                instead of per-commit GitPython stats
+            backend (str): Git backend name, 'gitpython' or 'pygit2'
+                (default: see git_backend.get_backend)
+            jobs (int): Parallel `git log` workers over contiguous history
+                ranges (0: one per CPU; see parallel_ingest)
             
         Raises:
             ValueError: If repository validation fails
@@ -51,6 +62,14 @@ class GitAnalyzer:
             # Detect HEAD state
             self.is_detached = self._is_detached_head()
             
+            self.use_fast_ingest = use_fast_ingest
+            self.backend = get_backend(self.repo.working_tree_dir or self.repo.git_dir, backend)
+            # Commit source of the fast path and of incremental ingestion
+            self.ingestor = self.backend
+            self.jobs = resolve_jobs(jobs)
+            self._sessions = {}
+            self._aggregates = {}
+            
         except git.exc.GitError as e:
             raise ValueError(f"Git error: {str(e)}")
         except Exception as e:
@@ -89,105 +108,347 @@ class GitAnalyzer:
         except TypeError:
             return True
     
-    def get_commit_history(self, days=30, author=None, branch=None):
+    def create_session(self, days=30, author=None, branch=None, db=None):
+        """
+        Get a shared analysis session for a commit window
+        
+        Sessions are cached per (branch, days, author), so every analysis
+        requested through the same session reuses one history walk.
+        
+        Args:
+            days (int): Number of days to look back
+            author (str): Filter by author name/email (optional)
+            branch (str): Branch name (default: auto-detected)
+            db (Database): Ingest incrementally and serve commits from this
+                database instead of re-reading the window (optional)
+            
+        Returns:
+            AnalysisSession: Session serving the window from memory
+        """
+        cache_key = (branch or self.default_branch, days, author)
+        
+        if cache_key not in self._sessions:
+            self._sessions[cache_key] = AnalysisSession(
+                self, days=days, author=author, branch=branch, db=db
+            )
+        
+        return self._sessions[cache_key]
+    
+    def get_commit_history(self, days=30, author=None, branch=None, session=None):
         """
         Get comprehensive commit history with error handling
         
+        Holds the whole window in memory; prefer iter_commit_records for
+        long windows.
+        
         Args:
             days (int): Number of days to look back
             author (str): Filter by author name/email (optional)
             branch (str): Branch name (default: auto-detected)
+            session (AnalysisSession): Serve the window from this session (optional)
             
         Returns:
             list: List of commit dictionaries with metadata
         """
-        if self.is_empty:
-            return []
+        if session is not None:
+            return list(session.commits)
         
         try:
-            since_date = datetime.now() - timedelta(days=days)
-            commits = []
+            return [
+                record.to_dict()
+                for record in self.iter_commit_records(days=days, author=author, branch=branch)
+            ]
+        
+        except git.exc.GitCommandError:
+            return []
+        except Exception:
+            return []
+    
+    def iter_commit_records(self, days=30, author=None, branch=None):
+        """
+        Stream the commit window lazily, newest first
+        
+        Only the commit being processed is held in memory, so callers that
+        aggregate (pattern analysis, scoring, database ingestion) run in
+        constant memory regardless of the window length.
+        
+        Args:
+            days (int): Number of days to look back
+            author (str): Filter by author name/email (optional)
+            branch (str): Branch name (default: auto-detected)
+            
+        Yields:
+            CommitRecord: Commits in the get_commit_history schema
+            
+        Raises:
+            GitLogError: If git log fails after commits were yielded
+        """
+        if self.is_empty:
+            return
+        
+        since_date = datetime.now() - timedelta(days=days)
+        for record in self._iter_commit_records(since_date, branch or self.default_branch, author):
+            yield CommitRecord.from_record(record)
+    
+    def iter_history(self, rev, since=None):
+        """
+        Stream commit records of a walk through the backend
+        
+        With jobs > 1 the walk is split into contiguous ranges read
+        concurrently; records still arrive in walk order.
+        
+        Args:
+            rev (str|list): Revision, range or list of revisions
+            since (datetime): Only commits newer than this (optional)
+            
+        Returns:
+            iterator: Commit records with a 'files' mapping of path -> stats
+        """
+        if self.jobs > 1:
+            return parallel_records(self.ingestor, rev, since, self.jobs)
+        return self.ingestor.iter_commits(rev=rev, since=since)
+    
+    def scan_window(self, days=30, author=None, branch=None):
+        """
+        Aggregate a commit window across worker processes
+        
+        Each of `jobs` processes reads one contiguous range of the window
+        and returns partial totals, which are merged in range order.
+        Aggregates are cached per (branch, days, author) like sessions.
+        
+        Args:
+            days (int): Number of days to look back
+            author (str): Filter by author name/email (optional)
+            branch (str): Branch name (default: auto-detected)
+            
+        Returns:
+            WindowAggregate: Totals for hotspots, patterns, productivity and
+                per-day counts
             
-            # Determine branch to analyze
-            target_branch = branch or self.default_branch
+        Raises:
+            GitLogError: If the history cannot be read
+        """
+        cache_key = (branch or self.default_branch, days, author)
+        
+        if cache_key not in self._aggregates:
+            since_date = datetime.now() - timedelta(days=days)
+            self._aggregates[cache_key] = scan_window(
+                self.backend.repo_path, cache_key[0], since_date, author,
+                jobs=self.jobs, backend=self.backend.name
+            )
+        
+        return self._aggregates[cache_key]
+    
+    def _iter_commit_records(self, since_date, branch, author=None):
+        """
+        Stream commit records (including per-file stats) for a history window
+        
+        Uses the single-pass `git log --numstat` engine and falls back to the
+        GitPython walk if git log cannot be used before any commit was read.
+        
+        Args:
+            since_date (datetime): Lower date bound
+            branch (str): Branch or revision to walk
+            author (str): Filter by author name/email (optional)
             
+        Yields:
+            dict: Commit record with a 'files' mapping of path -> stats
+        """
+        if self.use_fast_ingest:
+            yielded = 0
             try:
-                commit_iter = self.repo.iter_commits(target_branch, since=since_date)
-            except git.exc.GitCommandError:
-                # Branch doesn't exist or no commits
-                return []
-            
-            for commit in commit_iter:
-                # Apply author filter
-                if author:
-                    author_lower = author.lower()
-                    if (author_lower not in commit.author.name.lower() and 
-                        author_lower not in commit.author.email.lower()):
-                        continue
-                
-                try:
-                    commits.append({
-                        'hash': commit.hexsha,
-                        'short_hash': commit.hexsha[:7],
-                        'author': commit.author.name,
-                        'email': commit.author.email,
-                        'message': commit.message.strip(),
-                        'timestamp': datetime.fromtimestamp(commit.committed_date),
-                        'files_changed': len(commit.stats.files),
-                        'insertions': commit.stats.total['insertions'],
-                        'deletions': commit.stats.total['deletions'],
-                        'lines_changed': commit.stats.total['insertions'] + commit.stats.total['deletions'],
-                    })
-                except Exception:
-                    # Skip commits that fail to parse
-                    continue
-            
-            return commits
+                for record in self.iter_history(branch, since_date):
+                    if self._matches_author(record['author'], record['email'], author):
+                        yielded += 1
+                        yield record
+                return
+            except GitLogError:
+                if yielded:
+                    raise
+        
+        yield from self._iter_commit_records_gitpython(since_date, branch, author)
+    
+    def _iter_commit_records_gitpython(self, since_date, branch, author=None):
+        """
+        Stream commit records using GitPython (one `git diff` per commit)
         
+        Args:
+            since_date (datetime): Lower date bound
+            branch (str): Branch or revision to walk
+            author (str): Filter by author name/email (optional)
+            
+        Yields:
+            dict: Commit record with a 'files' mapping of path -> stats
+        """
+        try:
+            # rev-list streams lazily, so a bad revision only fails while iterating
+            for commit in self.repo.iter_commits(branch, since=since_date):
+                record = self._gitpython_record(commit, author)
+                if record is not None:
+                    yield record
         except git.exc.GitCommandError:
-            return []
+            # Branch doesn't exist or no commits
+            return
+    
+    def _gitpython_record(self, commit, author=None):
+        """
+        Build a commit record from a GitPython commit
+        
+        Args:
+            commit (git.Commit): Commit to convert
+            author (str): Filter by author name/email (optional)
+            
+        Returns:
+            dict: Commit record, or None if filtered out or unparseable
+        """
+        # Apply author filter
+        if not self._matches_author(commit.author.name, commit.author.email, author):
+            return None
+        
+        try:
+            stats = commit.stats
+            return {
+                'hash': commit.hexsha,
+                'short_hash': commit.hexsha[:7],
+                'author': commit.author.name,
+                'email': commit.author.email,
+                'message': commit.message.strip(),
+                'timestamp': datetime.fromtimestamp(commit.committed_date),
+                'files_changed': len(stats.files),
+                'insertions': stats.total['insertions'],
+                'deletions': stats.total['deletions'],
+                'lines_changed': stats.total['insertions'] + stats.total['deletions'],
+                'files': stats.files,
+            }
         except Exception:
-            return []
+            # Skip commits that fail to parse
+            return None
     
-    def analyze_commit_patterns(self, days=30, author=None):
+    @staticmethod
+    def _matches_author(name, email, author):
+        """Case-insensitive substring match on author name or email"""
+        if not author:
+            return True
+        
+        author_lower = author.lower()
+        return author_lower in (name or '').lower() or author_lower in (email or '').lower()
+    
+    @staticmethod
+    def _public_commit(record):
+        """Strip per-file stats from a commit record"""
+        return {key: value for key, value in record.items() if key != 'files'}
+    
+    def analyze_commit_patterns(self, days=30, author=None, session=None):
         """
         Analyze comprehensive commit patterns
         
         Args:
             days (int): Number of days to analyze
             author (str): Filter by author (optional)
+            session (AnalysisSession): Serve the window from this session (optional)
             
         Returns:
             dict: Detailed pattern analysis
         """
-        commits = self.get_commit_history(days=days, author=author)
+        if session is not None:
+            activity = session.activity()
+            if activity is not None:
+                return self._patterns_from_activity(activity)
+            return self._patterns_from_commits(session.commits)
         
-        if not commits:
-            return {
-                'total_commits': 0,
-                'commits_per_day': {},
-                'commits_per_hour': {},
-                'top_authors': [],
-                'average_commit_message_length': 0,
-                'workday_vs_weekend_ratio': 0,
-            }
+        try:
+            if self.jobs > 1 and self.use_fast_ingest and not self.is_empty:
+                return self._patterns_from_activity(self.scan_window(days, author).activity_rows())
+            return self._patterns_from_commits(self.iter_commit_records(days=days, author=author))
+        except Exception:
+            return self._patterns_from_commits([])
+    
+    def _patterns_from_activity(self, activity):
+        """
+        Compute commit pattern analysis from (day, hour, author) rollup rows
+        
+        Args:
+            activity (list): Rollup rows from Database.get_branch_activity
+            
+        Returns:
+            dict: Detailed pattern analysis (same schema as _patterns_from_commits)
+        """
+        total = sum(row['commits'] for row in activity)
+        if not total:
+            return self._patterns_from_commits([])
+        
+        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        day_counts = defaultdict(int)
+        hour_counts = defaultdict(int)
+        author_counts = Counter()
+        author_latest = {}
+        message_chars = 0
+        weekday_commits = 0
+        
+        for row in activity:
+            weekday = datetime.strptime(row['day'], '%Y-%m-%d').weekday()
+            day_counts[day_names[weekday]] += row['commits']
+            hour_counts[row['hour']] += row['commits']
+            author_counts[row['author']] += row['commits']
+            author_latest[row['author']] = max(author_latest.get(row['author'], ('', 0)), (row['day'], row['hour']))
+            message_chars += row['message_chars']
+            if weekday < 5:
+                weekday_commits += row['commits']
+        
+        # Break count ties like the commit walk does: most recently active first
+        top_authors = sorted(
+            author_counts.items(),
+            key=lambda item: (item[1], author_latest[item[0]]),
+            reverse=True
+        )
+        
+        workday_ratio = weekday_commits / total * 100
+        weekend_ratio = (total - weekday_commits) / total * 100
         
+        return {
+            'total_commits': total,
+            'commits_per_day': dict(sorted(
+                day_counts.items(),
+                key=lambda x: day_names.index(x[0])
+            )),
+            'commits_per_hour': dict(sorted(hour_counts.items())),
+            'top_authors': [
+                {'name': name, 'commits': count, 'percentage': round(count/total*100, 1)}
+                for name, count in top_authors[:10]
+            ],
+            'average_commit_message_length': round(message_chars / total, 1),
+            'workday_percentage': round(workday_ratio, 1),
+            'weekend_percentage': round(weekend_ratio, 1),
+            'workday_vs_weekend_ratio': round(workday_ratio / weekend_ratio, 2) if weekend_ratio > 0 else 0,
+        }
+    
+    def _patterns_from_commits(self, commits):
+        """
+        Compute commit pattern analysis in one pass over commits
+        
+        Args:
+            commits (iterable): Commit dictionaries or CommitRecords (any iterator)
+            
+        Returns:
+            dict: Detailed pattern analysis
+        """
         # Initialize counters
         day_counts = defaultdict(int)
         hour_counts = defaultdict(int)
         author_counts = Counter()
-        message_lengths = []
+        total = 0
+        message_chars = 0
         weekday_commits = 0
-        weekend_commits = 0
         
         day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         
         for commit in commits:
             timestamp = commit['timestamp']
+            weekday = timestamp.weekday()
+            total += 1
             
             # Day of week distribution
-            day_name = day_names[timestamp.weekday()]
-            day_counts[day_name] += 1
+            day_counts[day_names[weekday]] += 1
             
             # Hour distribution
             hour_counts[timestamp.hour] += 1
@@ -196,28 +457,36 @@ class GitAnalyzer:
             author_counts[commit['author']] += 1
             
             # Message length
-            message_lengths.append(len(commit['message']))
+            message_chars += len(commit['message'])
             
             # Workday vs weekend
-            if timestamp.weekday() < 5:  # Monday-Friday
+            if weekday < 5:  # Monday-Friday
                 weekday_commits += 1
-            else:
-                weekend_commits += 1
+        
+        if not total:
+            return {
+                'total_commits': 0,
+                'commits_per_day': {},
+                'commits_per_hour': {},
+                'top_authors': [],
+                'average_commit_message_length': 0,
+                'workday_vs_weekend_ratio': 0,
+            }
         
         # Calculate ratios and averages
-        avg_msg_length = statistics.mean(message_lengths) if message_lengths else 0
-        workday_ratio = (weekday_commits / len(commits) * 100) if commits else 0
-        weekend_ratio = (weekend_commits / len(commits) * 100) if commits else 0
+        avg_msg_length = message_chars / total
+        workday_ratio = weekday_commits / total * 100
+        weekend_ratio = (total - weekday_commits) / total * 100
         
         return {
-            'total_commits': len(commits),
+            'total_commits': total,
             'commits_per_day': dict(sorted(
                 day_counts.items(),
                 key=lambda x: day_names.index(x[0])
             )),
             'commits_per_hour': dict(sorted(hour_counts.items())),
             'top_authors': [
-                {'name': name, 'commits': count, 'percentage': round(count/len(commits)*100, 1)}
+                {'name': name, 'commits': count, 'percentage': round(count/total*100, 1)}
                 for name, count in author_counts.most_common(10)
             ],
             'average_commit_message_length': round(avg_msg_length, 1),
@@ -226,7 +495,7 @@ class GitAnalyzer:
             'workday_vs_weekend_ratio': round(workday_ratio / weekend_ratio, 2) if weekend_ratio > 0 else 0,
         }
     
-    def get_hotspot_files(self, days=30, limit=10, author=None):
+    def get_hotspot_files(self, days=30, limit=10, author=None, session=None):
         """
         Get most frequently changed files using git log stats
         
@@ -234,6 +503,7 @@ class GitAnalyzer:
             days (int): Number of days to analyze
             limit (int): Maximum files to return
             author (str): Filter by author (optional)
+            session (AnalysisSession): Serve the window from this session (optional)
             
         Returns:
             list: Tuples of (filepath, change_count, lines_changed)
@@ -242,46 +512,67 @@ class GitAnalyzer:
             return []
         
         try:
-            since_date = datetime.now() - timedelta(days=days)
-            file_stats = defaultdict(lambda: {'count': 0, 'lines': 0})
+            if session is not None:
+                records = session.records
+            elif self.jobs > 1 and self.use_fast_ingest:
+                return self._hotspots_from_file_stats(self.scan_window(days, author).files, limit)
+            else:
+                since_date = datetime.now() - timedelta(days=days)
+                records = self._iter_commit_records(since_date, self.default_branch, author)
             
-            try:
-                commit_iter = self.repo.iter_commits(self.default_branch, since=since_date)
-            except git.exc.GitCommandError:
-                return []
-            
-            for commit in commit_iter:
-                # Apply author filter
-                if author:
-                    author_lower = author.lower()
-                    if (author_lower not in commit.author.name.lower() and 
-                        author_lower not in commit.author.email.lower()):
-                        continue
-                
-                try:
-                    for filepath, stats in commit.stats.files.items():
-                        # PHASE 4: Apply source code filter
-                        if not is_source_code_file(filepath):
-                            continue
-                        
-                        file_stats[filepath]['count'] += 1
-                        file_stats[filepath]['lines'] += stats['insertions'] + stats['deletions']
-                except Exception:
-                    continue
-            
-            # Sort by change count
-            hotspots = sorted(
-                [(path, data['count'], data['lines']) for path, data in file_stats.items()],
-                key=lambda x: x[1],
-                reverse=True
-            )[:limit]
-            
-            return hotspots
+            return self._hotspots_from_records(records, limit)
         
         except Exception:
             return []
     
-    def calculate_commit_quality_score(self, commit_message):
+    def _hotspots_from_records(self, records, limit=10):
+        """
+        Aggregate per-file change counts from commit records
+        
+        Args:
+            records (iterable): Commit records with a 'files' mapping
+            limit (int): Maximum files to return
+            
+        Returns:
+            list: Tuples of (filepath, change_count, lines_changed)
+        """
+        file_stats = defaultdict(lambda: [0, 0])
+        
+        for commit in records:
+            for filepath, stats in commit['files'].items():
+                file_stats[filepath][0] += 1
+                file_stats[filepath][1] += stats['insertions'] + stats['deletions']
+        
+        return self._hotspots_from_file_stats(file_stats, limit)
+    
+    @staticmethod
+    def _hotspots_from_file_stats(file_stats, limit=10):
+        """
+        Rank files by change count
+        
+        Args:
+            file_stats (dict): {path: (change_count, lines_changed)} in the
+                order files were first seen walking newest first
+            limit (int): Maximum files to return
+            
+        Returns:
+            list: Tuples of (filepath, change_count, lines_changed)
+        """
+        # Sort by change count (ties keep first-seen order)
+        hotspots = sorted(
+            [
+                (path, count, lines) for path, (count, lines) in file_stats.items()
+                # PHASE 4: Apply source code filter
+                if is_source_code_file(path)
+            ],
+            key=lambda x: x[1],
+            reverse=True
+        )[:limit]
+        
+        return hotspots
+    
+    @classmethod
+    def calculate_commit_quality_score(cls, commit_message):
         """
         Calculate quality score for a commit message
         
@@ -313,11 +604,11 @@ class GitAnalyzer:
             score += 15
         
         # Conventional commit format
-        if re.match(self.CONVENTIONAL_COMMIT_PATTERN, subject, re.IGNORECASE):
+        if re.match(cls.CONVENTIONAL_COMMIT_PATTERN, subject, re.IGNORECASE):
             score += 30
         
         # Ticket reference
-        if re.search(self.TICKET_PATTERN, commit_message):
+        if re.search(cls.TICKET_PATTERN, commit_message):
             score += 20
         
         # Not single word
@@ -330,7 +621,7 @@ class GitAnalyzer:
         
         return min(score, 100)
     
-    def generate_productivity_score(self, days=30):
+    def generate_productivity_score(self, days=30, session=None):
         """
         Generate comprehensive productivity score
         
@@ -341,13 +632,66 @@ class GitAnalyzer:
         
         Args:
             days (int): Analysis period in days
+            session (AnalysisSession): Serve the window from this session (optional)
+            
+        Returns:
+            dict: Productivity metrics and score
+        """
+        if session is not None:
+            return self._productivity_from_commits(session.commits, session.days)
+        
+        try:
+            if self.jobs > 1 and self.use_fast_ingest and not self.is_empty:
+                aggregate = self.scan_window(days)
+                return self._productivity_from_totals(
+                    aggregate.commits, aggregate.quality_total, aggregate.work_hour_commits, days
+                )
+            return self._productivity_from_commits(self.iter_commit_records(days=days), days)
+        except Exception:
+            return self._productivity_from_commits([], days)
+    
+    def _productivity_from_commits(self, commits, days):
+        """
+        Compute productivity score in one pass over commits
+        
+        Args:
+            commits (iterable): Commit dictionaries or CommitRecords (any iterator)
+            days (int): Analysis period in days
             
         Returns:
             dict: Productivity metrics and score
         """
-        commits = self.get_commit_history(days=days)
+        total = 0
+        quality_total = 0
+        work_hour_commits = 0
+        
+        for commit in commits:
+            total += 1
+            quality_total += self.calculate_commit_quality_score(commit['message'])
+            if self.in_work_hours(commit['timestamp']):
+                work_hour_commits += 1
         
-        if not commits:
+        return self._productivity_from_totals(total, quality_total, work_hour_commits, days)
+    
+    @classmethod
+    def in_work_hours(cls, timestamp):
+        """Whether a commit time falls in weekday working hours"""
+        return timestamp.hour in cls.WORK_HOURS and timestamp.weekday() < 5
+    
+    def _productivity_from_totals(self, total, quality_total, work_hour_commits, days):
+        """
+        Compute productivity score from window totals
+        
+        Args:
+            total (int): Commits in the window
+            quality_total (int): Sum of commit message quality scores
+            work_hour_commits (int): Commits made in weekday working hours
+            days (int): Analysis period in days
+            
+        Returns:
+            dict: Productivity metrics and score
+        """
+        if not total:
             return {
                 'score': 0,
                 'grade': 'N/A',
@@ -358,13 +702,7 @@ class GitAnalyzer:
             }
         
         # 1. Commit frequency consistency (40 points)
-        daily_commits = defaultdict(int)
-        for commit in commits:
-            date_key = commit['timestamp'].date()
-            daily_commits[date_key] += 1
-        
-        commit_counts = list(daily_commits.values())
-        avg_daily = len(commits) / days
+        avg_daily = total / days
         
         # Score based on consistency and volume
         if avg_daily >= 3:
@@ -377,21 +715,11 @@ class GitAnalyzer:
             frequency_score = 10
         
         # 2. Average commit quality (30 points)
-        quality_scores = [
-            self.calculate_commit_quality_score(commit['message'])
-            for commit in commits
-        ]
-        avg_quality = statistics.mean(quality_scores) if quality_scores else 0
+        avg_quality = quality_total / total
         quality_score = (avg_quality / 100) * 30
         
         # 3. Working hours distribution (30 points)
-        work_hours = [9, 10, 11, 12, 13, 14, 15, 16, 17]  # 9 AM - 5 PM
-        work_hour_commits = sum(
-            1 for commit in commits
-            if commit['timestamp'].hour in work_hours and commit['timestamp'].weekday() < 5
-        )
-        
-        work_hour_ratio = work_hour_commits / len(commits) if commits else 0
+        work_hour_ratio = work_hour_commits / total
         
         # Balanced work-life: 50-80% during work hours is good
         if 0.5 <= work_hour_ratio <= 0.8:
@@ -0,0 +1,417 @@
+"""
+Pluggable git backends
+
+Every backend offers the same four operations and returns the same shapes:
+
+    iter_commits(rev, since, until, walk, paths) -> commit records with 'files'
+    numstat(sha)                                 -> {path: {'insertions', 'deletions', 'lines'}}
+    tree(rev, paths)                             -> {path: blob_sha}
+    blame(path, rev)                             -> Counter({author: lines})
+
+GitPythonBackend drives the git command line: one streaming `git log
+--numstat` per walk (which uses commit-graph Bloom filters for path walks)
+and `git blame --porcelain`. Pygit2Backend reads objects and computes diffs
+and blame in-process through libgit2, so no git processes are forked.
+
+Both backends pass the same conformance tests (test_git_backend.py) and
+run in the benchmark suite. Because one streaming `git log` outpaces
+per-commit libgit2 diffs driven from Python, 'auto' prefers gitpython and
+falls back to pygit2 when the git executable cannot be run; set
+DEVFLOW_GIT_BACKEND=pygit2 (or gitpython) to choose explicitly.
+"""
+
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import git
+
+from .ingest import GitLogIngestor, GitLogError
+from .ownership import parse_blame
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+
+BACKEND_ENV = 'DEVFLOW_GIT_BACKEND'
+
+# Commits older than --since tolerated before a walk stops (git uses the same slop)
+SINCE_SLOP = 5
+
+
+class GitBackend(ABC):
+    """Interface shared by the git backends"""
+
+    name = None
+
+    def __init__(self, repo_path):
+        """
+        Args:
+            repo_path (str): Repository working tree (or git dir of a bare repository)
+        """
+        self.repo_path = Path(repo_path)
+
+    @abstractmethod
+    def iter_commits(self, rev='HEAD', since=None, until=None, walk=True, paths=None):
+        """
+        Stream commit records, newest first
+
+        Args:
+            rev (str|list): Revision, range ('a..b') or list of revisions
+            since (datetime): Only commits newer than this (optional)
+            until (datetime): Only commits older than this (optional)
+            walk (bool): Follow parents (False: only the given commits)
+            paths (list): Only commits touching these paths; 'files' then holds
+                          just those paths (optional)
+
+        Yields:
+            dict: Commit record (see ingest.parse_record)
+
+        Raises:
+            GitLogError: If the history cannot be read
+        """
+
+    @abstractmethod
+    def numstat(self, sha):
+        """
+        Per-file line counts of one commit against its first parent
+
+        Args:
+            sha (str): Commit id
+
+        Returns:
+            dict: {path: {'insertions', 'deletions', 'lines'}}
+        """
+
+    @abstractmethod
+    def tree(self, rev='HEAD', paths=None):
+        """
+        Files of the tree at a revision
+
+        Args:
+            rev (str): Revision
+            paths (list): Only these paths (optional)
+
+        Returns:
+            dict: {path: blob_sha} of regular files and symlinks
+        """
+
+    @abstractmethod
+    def blame(self, path, rev='HEAD'):
+        """
+        Lines of a file owned by each author
+
+        Args:
+            path (str): Repo-relative path
+            rev (str): Revision to blame
+
+        Returns:
+            Counter: {author: line count}, or None if the file cannot be blamed
+        """
+
+
+class GitPythonBackend(GitBackend):
+    """Backend driving the git command line through GitPython"""
+
+    name = 'gitpython'
+
+    def __init__(self, repo_path, git_binary='git'):
+        super().__init__(repo_path)
+        self.repo = git.Repo(self.repo_path)
+        self.log = GitLogIngestor(self.repo_path, git_binary=git_binary)
+
+    def iter_commits(self, rev='HEAD', since=None, until=None, walk=True, paths=None):
+        return self.log.iter_commits(rev=rev, since=since, until=until, walk=walk, paths=paths)
+
+    def numstat(self, sha):
+        for record in self.log.iter_commits(rev=[sha], walk=False):
+            return record['files']
+        return {}
+
+    def tree(self, rev='HEAD', paths=None):
+        args = ['-r', '-z', '--full-tree', rev]
+        if paths:
+            args.append('--')
+            args.extend(paths)
+
+        try:
+            output = self.repo.git.ls_tree(*args, stdout_as_string=False)
+        except git.exc.GitCommandError:
+            return {}
+
+        files = {}
+        for entry in output.split(b'\0'):
+            if not entry:
+                continue
+            meta, path = entry.split(b'\t', 1)
+            _, kind, sha = meta.split()
+            if kind == b'blob':
+                files[path.decode('utf-8', errors='replace')] = sha.decode()
+        return files
+
+    def blame(self, path, rev='HEAD'):
+        try:
+            output = self.repo.git.blame('--porcelain', rev, '--', path, stdout_as_string=False)
+        except git.exc.GitCommandError:
+            return None
+        return parse_blame(output)
+
+
+class Pygit2Backend(GitBackend):
+    """Backend reading objects and computing diffs in-process with libgit2"""
+
+    name = 'pygit2'
+
+    def __init__(self, repo_path):
+        if pygit2 is None:
+            raise ValueError("pygit2 is not installed (pip install pygit2)")
+        super().__init__(repo_path)
+        self._local = threading.local()
+        self._authors = {}
+        self.repo  # Fail early on an unreadable repository
+
+    @property
+    def repo(self):
+        """Repository handle of the calling thread (libgit2 objects are not shared)"""
+        repo = getattr(self._local, 'repo', None)
+        if repo is None:
+            try:
+                repo = pygit2.Repository(str(self.repo_path))
+            except pygit2.GitError as e:
+                raise ValueError(f"Not a valid git repository: {self.repo_path} ({str(e)})")
+            self._local.repo = repo
+        return repo
+
+    def _resolve(self, rev):
+        try:
+            return self.repo.revparse_single(rev).peel(pygit2.Commit)
+        except (KeyError, ValueError, pygit2.GitError) as e:
+            raise GitLogError(f"Unknown revision '{rev}': {str(e)}")
+
+    def _walker(self, revs):
+        walker = self.repo.walk(None, pygit2.enums.SortMode.TIME)
+        for rev in revs:
+            if '..' in rev:
+                left, right = rev.split('..', 1)
+                walker.hide(self._resolve(left or 'HEAD').id)
+                walker.push(self._resolve(right or 'HEAD').id)
+            elif rev.startswith('^'):
+                walker.hide(self._resolve(rev[1:]).id)
+            else:
+                walker.push(self._resolve(rev).id)
+        return walker
+
+    def iter_commits(self, rev='HEAD', since=None, until=None, walk=True, paths=None):
+        revs = [rev] if isinstance(rev, str) else list(rev)
+        since_ts = since.timestamp() if since is not None else None
+        until_ts = until.timestamp() if until is not None else None
+
+        if walk:
+            commits = self._walker(revs)
+        else:
+            commits = (self._resolve(r) for r in revs)
+
+        old = 0
+        for commit in commits:
+            if since_ts is not None and commit.commit_time < since_ts:
+                old += 1
+                if walk and old > SINCE_SLOP:
+                    return
+                continue
+            old = 0
+            if until_ts is not None and commit.commit_time > until_ts:
+                continue
+
+            if paths:
+                files = self._path_stats(commit, paths)
+                if not files:
+                    continue
+            else:
+                files = self._commit_stats(commit)
+
+            yield self._record(commit, files)
+
+    def numstat(self, sha):
+        return self._commit_stats(self._resolve(sha))
+
+    def tree(self, rev='HEAD', paths=None):
+        try:
+            root = self._resolve(rev).tree
+        except GitLogError:
+            return {}
+
+        files = {}
+        if paths:
+            for path in paths:
+                try:
+                    entry = root[path]
+                except KeyError:
+                    continue
+                if entry.type_str == 'blob':
+                    files[path] = str(entry.id)
+            return files
+
+        pending = [(root, '')]
+        while pending:
+            tree, prefix = pending.pop()
+            for entry in tree:
+                if entry.type_str == 'tree':
+                    pending.append((self.repo[entry.id], f'{prefix}{entry.name}/'))
+                elif entry.type_str == 'blob':
+                    files[prefix + entry.name] = str(entry.id)
+        return files
+
+    def blame(self, path, rev='HEAD'):
+        try:
+            commit = self._resolve(rev)
+            hunks = self.repo.blame(path, newest_commit=commit.id)
+        except (GitLogError, KeyError, ValueError, pygit2.GitError):
+            return None
+
+        owners = Counter()
+        for hunk in hunks:
+            owners[self._author(hunk.final_commit_id)] += hunk.lines_in_hunk
+        return owners
+
+    def _author(self, commit_id):
+        """Author name of a commit (cached; blame hunks repeat commits)"""
+        name = self._authors.get(commit_id)
+        if name is None:
+            name = self._authors[commit_id] = self.repo[commit_id].author.name
+        return name
+
+    def _commit_stats(self, commit):
+        """Per-file numstat of a commit against its first parent"""
+        if commit.parents:
+            diff = self.repo.diff(commit.parents[0], commit, context_lines=0)
+        else:
+            diff = commit.tree.diff_to_tree(context_lines=0, swap=True)
+
+        files = {}
+        for patch in diff:
+            delta = patch.delta
+            _, added, removed = patch.line_stats
+            files[delta.new_file.path if delta.status_char() != 'D' else delta.old_file.path] = {
+                'insertions': added,
+                'deletions': removed,
+                'lines': added + removed,
+            }
+        return files
+
+    def _path_stats(self, commit, paths):
+        """Numstat of the given paths whose blob differs from the first parent"""
+        parent_tree = commit.parents[0].tree if commit.parents else None
+        files = {}
+
+        for path in paths:
+            new = _tree_entry(commit.tree, path)
+            old = _tree_entry(parent_tree, path) if parent_tree is not None else None
+            if (new.id if new else None) == (old.id if old else None):
+                continue
+
+            patch = pygit2.Patch.create_from(
+                self.repo[old.id] if old else None,
+                self.repo[new.id] if new else None,
+                context_lines=0
+            )
+            _, added, removed = patch.line_stats
+            files[path] = {'insertions': added, 'deletions': removed, 'lines': added + removed}
+        return files
+
+    @staticmethod
+    def _record(commit, files):
+        sha = str(commit.id)
+        insertions = sum(stats['insertions'] for stats in files.values())
+        deletions = sum(stats['deletions'] for stats in files.values())
+        return {
+            'hash': sha,
+            'short_hash': sha[:7],
+            'author': commit.author.name,
+            'email': commit.author.email,
+            'message': commit.message.strip(),
+            'timestamp': datetime.fromtimestamp(commit.commit_time),
+            'files_changed': len(files),
+            'insertions': insertions,
+            'deletions': deletions,
+            'lines_changed': insertions + deletions,
+            'files': files,
+        }
+
+
+BACKENDS = {
+    GitPythonBackend.name: GitPythonBackend,
+    Pygit2Backend.name: Pygit2Backend,
+}
+
+
+# Standalone functions
+
+def _tree_entry(tree, path):
+    """Blob entry at a path of a tree, or None"""
+    try:
+        entry = tree[path]
+    except KeyError:
+        return None
+    return entry if entry.type_str == 'blob' else None
+
+
+def available_backends():
+    """
+    Names of the backends usable in this environment
+
+    Returns:
+        list: Backend names, preferred first
+    """
+    names = []
+    if shutil.which('git'):
+        names.append(GitPythonBackend.name)
+    if pygit2 is not None:
+        names.append(Pygit2Backend.name)
+    return names
+
+
+def backend_name(name=None):
+    """
+    Resolve the backend to use
+
+    Args:
+        name (str): 'gitpython', 'pygit2' or 'auto' (default: $DEVFLOW_GIT_BACKEND,
+                    else 'auto': the first of available_backends())
+
+    Returns:
+        str: Backend name
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    name = (name or os.environ.get(BACKEND_ENV) or 'auto').lower()
+    if name == 'auto':
+        # Without either, GitPython reports the missing git executable
+        name = (available_backends() or [GitPythonBackend.name])[0]
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown git backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return name
+
+
+def get_backend(repo_path, name=None):
+    """
+    Open a repository with the requested or preferred backend
+
+    Args:
+        repo_path (str): Repository working tree
+        name (str): Backend name (see backend_name)
+
+    Returns:
+        GitBackend: Backend bound to the repository
+
+    Raises:
+        ValueError: If the backend is unknown or unavailable
+    """
+    return BACKENDS[backend_name(name)](repo_path)
@@ -6,11 +6,19 @@ import os
 import platform
 import subprocess
 from pathlib import Path
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime
-import sqlite3
 import re
 
+from .command_stream import CommandStream
+from .database import get_database
+from .history_reader import HistoryReader
+from .sequence_miner import DEFAULT_CAPACITY, mine_sequences
+from .workflow_patterns import get_workflow_matcher
+
+# Zsh extended history format: ": 1234567890:0;command"
+ZSH_EXTENDED_LINE = re.compile(r': (\d+):\d+;(.+)')
+
 
 class HistoryTracker:
     """Intelligent shell command analytics for PowerShell and Bash"""
@@ -28,9 +36,13 @@ class HistoryTracker:
         self.system = platform.system()
         self.is_windows = self.system == 'Windows'
         self.history_path = None
-        self.history_data = []
+        self.history_data = CommandStream()
         self.shell_type = 'PowerShell' if self.is_windows else 'Bash'
         
+        # Set by sync_history: counts are then read from the database
+        self._history_db = None
+        self._history_key = None
+        
         # Resolve history file path
         try:
             self.history_path = self._resolve_history_path()
@@ -114,66 +126,124 @@ class HistoryTracker:
             custom_path (str): Custom history file path (optional)
             
         Returns:
-            list: Structured command history
+            CommandStream: Interned command history; indexing or iterating
+                           yields {'command', 'timestamp', 'session'} entries
         """
         if custom_path:
             self.history_path = Path(custom_path)
         
         if not self.history_path or not self.history_path.exists():
-            return []
+            return CommandStream()
         
-        commands = []
+        commands = CommandStream()
+        self._history_db = None
         
         try:
-            # Read with multiple encoding fallbacks
-            encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(self.history_path, 'r', encoding=encoding, errors='ignore') as f:
-                        content = f.readlines()
-                    break
-                except Exception:
-                    continue
-            
-            if not content:
-                return []
-            
-            # Parse based on shell type
-            for line in content:
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Basic command structure
-                command_entry = {
-                    'command': line,
-                    'timestamp': None,
-                    'session': None
-                }
-                
-                # Try to extract timestamp from zsh history format
-                if self.shell_type == 'Zsh' and line.startswith(':'):
-                    # Zsh format: : 1234567890:0;command
-                    match = re.match(r': (\d+):\d+;(.+)', line)
-                    if match:
-                        command_entry['timestamp'] = datetime.fromtimestamp(int(match.group(1)))
-                        command_entry['command'] = match.group(2)
-                
-                commands.append(command_entry)
+            with HistoryReader(self.history_path, fallback_encoding=self._fallback_encoding()) as reader:
+                for line in reader.lines(include_partial=True):
+                    parsed = self._parse_line(line)
+                    if parsed:
+                        commands.append(*parsed)
             
             self.history_data = commands
             return commands
         
         except FileNotFoundError:
-            return []
+            return CommandStream()
         except PermissionError:
-            return []
+            return CommandStream()
         except Exception:
-            return []
+            return CommandStream()
+    
+    def sync_history(self, custom_path=None, db_path=None):
+        """
+        Incrementally update stored command counts from shell history
+        
+        Only lines appended since the last sync are parsed. The byte offset,
+        inode and encoding of the last sync are kept in the database; a
+        rotated or rewritten history file is counted again from the start.
+        After a sync, top commands and statistics are read from the database.
+        
+        Args:
+            custom_path (str): Custom history file path (optional)
+            db_path (str): Database path (optional)
+            
+        Returns:
+            dict: new_commands, total_commands and whether the file was re-read
+        """
+        result = {'new_commands': 0, 'total_commands': 0, 'reset': False}
+        
+        if custom_path:
+            self.history_path = Path(custom_path)
+        
+        if not self.history_path or not self.history_path.exists():
+            return result
+        
+        try:
+            db = get_database(db_path)
+            key = str(self.history_path.resolve())
+            previous = db.get_history_checkpoint(key)
+            
+            with HistoryReader(self.history_path, previous, self._fallback_encoding()) as reader:
+                position = previous['commands'] if reader.resumed else 0
+                counts = Counter()
+                first_seen = {}
+                
+                for line in reader.lines():
+                    parsed = self._parse_line(line)
+                    if not parsed:
+                        continue
+                    
+                    command = parsed[0]
+                    if command not in first_seen:
+                        first_seen[command] = position
+                    counts[command] += 1
+                    position += 1
+                
+                checkpoint = reader.checkpoint()
+                checkpoint['commands'] = position
+                resumed = reader.resumed
+            
+            if not resumed or checkpoint['offset'] != previous['offset']:
+                if db.save_history_increment(key, previous if resumed else None, checkpoint, counts, first_seen):
+                    result['new_commands'] = sum(counts.values())
+                    result['reset'] = not resumed and bool(previous and previous['offset'])
+            
+            self._history_db = db
+            self._history_key = key
+            result['total_commands'] = db.get_shell_history_stats(key)['total_commands']
+            return result
+        
+        except Exception:
+            return result
+    
+    def _fallback_encoding(self):
+        """Encoding for history files that are not UTF-8/UTF-16"""
+        return 'cp1252' if self.is_windows else 'latin-1'
+    
+    def _parse_line(self, line):
+        """
+        Parse one history line
+        
+        Args:
+            line (str): Raw history line
+            
+        Returns:
+            tuple: (command, timestamp or None), or None for blank/comment lines
+        """
+        line = line.strip()
+        
+        # Skip empty lines and comments
+        if not line or line.startswith('#'):
+            return None
+        
+        # Try to extract timestamp from zsh history format
+        if self.shell_type == 'Zsh' and line.startswith(':'):
+            match = ZSH_EXTENDED_LINE.match(line)
+            if match:
+                return match.group(2), datetime.fromtimestamp(int(match.group(1)))
+        
+        return line, None
     
     def get_top_commands(self, limit=20):
         """
@@ -185,21 +255,21 @@ class HistoryTracker:
         Returns:
             list: Top commands with counts and percentages
         """
-        if not self.history_data:
-            self.parse_shell_history()
-        
-        if not self.history_data:
-            return []
-        
-        # Extract just command strings
-        command_strings = [entry['command'] for entry in self.history_data]
-        
-        # Count frequencies
-        command_counter = Counter(command_strings)
-        total_commands = len(command_strings)
+        if self._history_db is not None:
+            most_common = self._history_db.get_shell_command_counts(self._history_key, limit)
+            total_commands = self._history_db.get_shell_history_stats(self._history_key)['total_commands']
+        else:
+            if not self.history_data:
+                self.parse_shell_history()
+            
+            if not self.history_data:
+                return []
+            
+            most_common = self.history_data.most_common(limit)
+            total_commands = len(self.history_data)
         
         top_commands = []
-        for command, count in command_counter.most_common(limit):
+        for command, count in most_common:
             top_commands.append({
                 'command': command,
                 'count': count,
@@ -213,41 +283,66 @@ class HistoryTracker:
         Detect frequent command chains
         
         Args:
-            sequence_length (int): Length of sequences (2 or 3)
+            sequence_length (int): Length of sequences
             min_frequency (int): Minimum occurrence count
             
         Returns:
             list: Ranked sequences with counts
         """
-        if not self.history_data:
-            self.parse_shell_history()
-        
-        if not self.history_data or len(self.history_data) < sequence_length:
-            return []
+        chains = self.mine_sequences(
+            min_length=sequence_length,
+            max_length=sequence_length,
+            min_frequency=min_frequency
+        )
+        return chains.get(sequence_length, [])
+    
+    def mine_sequences(self, min_length=2, max_length=5, top_k=None, min_frequency=2,
+                       capacity=DEFAULT_CAPACITY):
+        """
+        Find frequent command chains of every length in one pass
         
-        sequences = defaultdict(int)
-        commands = [entry['command'] for entry in self.history_data]
+        Memory is bounded by `capacity` chains per length. Counts are exact
+        until a length sees more than 2 * capacity distinct chains; after
+        that they are upper bounds and `count - error` is a lower bound.
         
-        # Generate sequences
-        for i in range(len(commands) - sequence_length + 1):
-            sequence = tuple(commands[i:i + sequence_length])
-            sequences[sequence] += 1
+        Args:
+            min_length (int): Shortest chain length
+            max_length (int): Longest chain length
+            top_k (int): Chains to return per length (all when None)
+            min_frequency (int): Minimum estimated occurrence count
+            capacity (int): Chains tracked per length
+            
+        Returns:
+            dict: {length: ranked chains with sequence, count, error and display}
+        """
+        if not self.history_data:
+            self.parse_shell_history()
         
-        # Filter by frequency and sort
-        common_sequences = [
-            {
-                'sequence': list(seq),
-                'count': count,
-                'display': ' → '.join([cmd[:40] + '...' if len(cmd) > 40 else cmd for cmd in seq])
-            }
-            for seq, count in sequences.items()
-            if count >= min_frequency
-        ]
+        if len(self.history_data) < min_length:
+            return {}
         
-        # Sort by count descending
-        common_sequences.sort(key=lambda x: x['count'], reverse=True)
+        commands = self.history_data.commands
+        sketches = mine_sequences(self.history_data.ids, min_length, max_length, capacity)
         
-        return common_sequences
+        chains = {}
+        for length, sketch in sketches.items():
+            ranked = []
+            for key, count, error in sketch.top():
+                if count < min_frequency or (top_k is not None and len(ranked) >= top_k):
+                    break
+                
+                seq = [commands[command_id] for command_id in sketch.labels[key]]
+                ranked.append({
+                    'sequence': seq,
+                    'count': count,
+                    'error': error,
+                    'display': ' → '.join([cmd[:40] + '...' if len(cmd) > 40 else cmd for cmd in seq])
+                })
+            
+            if ranked:
+                chains[length] = ranked
+        
+        return chains
     
     def suggest_aliases(self, min_frequency=5, limit=15):
         """
@@ -260,9 +355,6 @@ class HistoryTracker:
         Returns:
             list: Alias suggestions with shell syntax
         """
-        if not self.history_data:
-            self.parse_shell_history()
-        
         top_commands = self.get_top_commands(limit=50)
         suggestions = []
         used_aliases = set()
@@ -421,87 +513,29 @@ class HistoryTracker:
         
         return None
     
-    def detect_workflow_patterns(self, min_frequency=3):
+    def detect_workflow_patterns(self, min_frequency=3, patterns_file=None):
         """
         Identify common workflow patterns
         
+        Pattern families come from config/workflow_patterns.json (or
+        patterns_file); each distinct command is classified once.
+        
         Args:
             min_frequency (int): Minimum pattern frequency
+            patterns_file (str): Custom pattern table (optional)
             
         Returns:
             dict: Workflow insights
         """
+        matcher = get_workflow_matcher(patterns_file)
+        
         if not self.history_data:
             self.parse_shell_history()
         
         if not self.history_data:
-            return {
-                'build_test_cycles': [],
-                'git_workflows': [],
-                'install_run_loops': [],
-                'insights': []
-            }
+            return matcher.empty_result()
         
-        commands = [entry['command'] for entry in self.history_data]
-        
-        # Detect patterns
-        build_test = []
-        git_flow = []
-        install_run = []
-        insights = []
-        
-        # Find build/test cycles
-        for i in range(len(commands) - 1):
-            curr = commands[i].lower()
-            next_cmd = commands[i + 1].lower()
-            
-            # Build then test
-            if any(b in curr for b in ['build', 'compile', 'make']) and \
-                any(t in next_cmd for t in ['test', 'pytest', 'jest', 'mocha']):
-                pattern = f"{commands[i]} → {commands[i + 1]}"
-                build_test.append(pattern)
-            
-            # Git workflow
-            if 'git add' in curr and 'git commit' in next_cmd:
-                pattern = "git add → git commit"
-                git_flow.append(pattern)
-            elif 'git commit' in curr and 'git push' in next_cmd:
-                pattern = "git commit → git push"
-                git_flow.append(pattern)
-            
-            # Install then run
-            if any(inst in curr for inst in ['install', 'pip install', 'npm install']) and \
-                any(run in next_cmd for run in ['run', 'start', 'python', 'node']):
-                pattern = f"{commands[i][:50]} → {commands[i + 1][:50]}"
-                install_run.append(pattern)
-        
-        # Count patterns
-        build_test_counter = Counter(build_test)
-        git_flow_counter = Counter(git_flow)
-        install_run_counter = Counter(install_run)
-        
-        # Generate insights
-        if build_test_counter:
-            most_common = build_test_counter.most_common(1)[0]
-            insights.append(f"Build-test cycle detected {most_common[1]} times - consider creating a combined script")
-        
-        if git_flow_counter.get("git add → git commit", 0) > min_frequency:
-            count = git_flow_counter["git add → git commit"]
-            insights.append(f"Frequent git add→commit sequence ({count}x) - consider using 'git commit -am' or create alias")
-        
-        if git_flow_counter.get("git commit → git push", 0) > min_frequency:
-            count = git_flow_counter["git commit → git push"]
-            insights.append(f"Frequent commit→push sequence ({count}x) - consider creating a combined alias")
-        
-        if not insights:
-            insights.append("No repetitive workflow patterns detected")
-        
-        return {
-            'build_test_cycles': [{'pattern': k, 'count': v} for k, v in build_test_counter.most_common(5)],
-            'git_workflows': [{'pattern': k, 'count': v} for k, v in git_flow_counter.most_common(5)],
-            'install_run_loops': [{'pattern': k, 'count': v} for k, v in install_run_counter.most_common(5)],
-            'insights': insights
-        }
+        return matcher.detect(self.history_data, min_frequency)
     
     def get_statistics(self):
         """
@@ -510,6 +544,20 @@ class HistoryTracker:
         Returns:
             dict: Statistics summary
         """
+        if self._history_db is not None:
+            totals = self._history_db.get_shell_history_stats(self._history_key)
+            most_common = self._history_db.get_shell_command_counts(self._history_key, 1)
+            total, unique = totals['total_commands'], totals['unique_commands']
+            
+            return {
+                'total_commands': total,
+                'unique_commands': unique,
+                'most_common': most_common[0] if most_common else None,
+                'shell_type': self.shell_type,
+                'history_path': str(self.history_path),
+                'repetition_rate': round((1 - unique / total) * 100, 2) if total else 0
+            }
+        
         if not self.history_data:
             self.parse_shell_history()
         
@@ -521,16 +569,17 @@ class HistoryTracker:
                 'history_path': str(self.history_path) if self.history_path else 'Not found'
             }
         
-        commands = [entry['command'] for entry in self.history_data]
-        command_counter = Counter(commands)
+        total = len(self.history_data)
+        unique = len(self.history_data.commands)
+        most_common = self.history_data.most_common(1)
         
         return {
-            'total_commands': len(commands),
-            'unique_commands': len(command_counter),
-            'most_common': command_counter.most_common(1)[0] if command_counter else None,
+            'total_commands': total,
+            'unique_commands': unique,
+            'most_common': most_common[0] if most_common else None,
             'shell_type': self.shell_type,
             'history_path': str(self.history_path) if self.history_path else 'Unknown',
-            'repetition_rate': round((1 - len(command_counter) / len(commands)) * 100, 2) if commands else 0
+            'repetition_rate': round((1 - unique / total) * 100, 2) if total else 0
         }
     
     def save_to_database(self, db_path=None):
@@ -546,71 +595,9 @@ class HistoryTracker:
         if not self.history_data:
             return 0
         
-        if db_path is None:
-            config_dir = Path.home() / '.devflow'
-            config_dir.mkdir(exist_ok=True)
-            db_path = config_dir / 'devflow.db'
-        
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Create command_history table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS command_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    command TEXT NOT NULL,
-                    frequency INTEGER DEFAULT 0,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    shell_type TEXT
-                )
-            ''')
-            
-            # Create command_sequences table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS command_sequences (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sequence TEXT NOT NULL,
-                    count INTEGER DEFAULT 0,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create alias_suggestions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS alias_suggestions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    alias_name TEXT NOT NULL,
-                    command TEXT NOT NULL,
-                    frequency INTEGER DEFAULT 0,
-                    shell_type TEXT,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_command_freq ON command_history(frequency)')
-            
-            # Clear old data
-            cursor.execute('DELETE FROM command_history')
-            
-            # Save command usage
-            commands = [entry['command'] for entry in self.history_data]
-            command_counter = Counter(commands)
-            
-            records = [
-                (cmd, count, datetime.now().isoformat(), self.shell_type)
-                for cmd, count in command_counter.items()
-            ]
-            
-            cursor.executemany(
-                'INSERT INTO command_history (command, frequency, last_updated, shell_type) VALUES (?, ?, ?, ?)',
-                records
-            )
-            
-            conn.commit()
-            conn.close()
-            
-            return len(records)
+            command_counts = dict(self.history_data.most_common())
+            return get_database(db_path).save_command_history(command_counts, self.shell_type)
         
         except Exception:
             return 0
@@ -636,31 +623,8 @@ class HistoryTracker:
         if not sequences:
             return 0
         
-        if db_path is None:
-            config_dir = Path.home() / '.devflow'
-            config_dir.mkdir(exist_ok=True)
-            db_path = config_dir / 'devflow.db'
-        
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM command_sequences')
-            
-            records = [
-                (' → '.join(seq['sequence']), seq['count'], datetime.now().isoformat())
-                for seq in sequences
-            ]
-            
-            cursor.executemany(
-                'INSERT INTO command_sequences (sequence, count, last_updated) VALUES (?, ?, ?)',
-                records
-            )
-            
-            conn.commit()
-            conn.close()
-            
-            return len(records)
+            return get_database(db_path).save_command_sequences(sequences)
         
         except Exception:
             return 0
@@ -682,31 +646,8 @@ class HistoryTracker:
         if not suggestions:
             return 0
         
-        if db_path is None:
-            config_dir = Path.home() / '.devflow'
-            config_dir.mkdir(exist_ok=True)
-            db_path = config_dir / 'devflow.db'
-        
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM alias_suggestions')
-            
-            records = [
-                (sug['alias'], sug['command'], sug['frequency'], sug['shell'], datetime.now().isoformat())
-                for sug in suggestions
-            ]
-            
-            cursor.executemany(
-                'INSERT INTO alias_suggestions (alias_name, command, frequency, shell_type, last_updated) VALUES (?, ?, ?, ?, ?)',
-                records
-            )
-            
-            conn.commit()
-            conn.close()
-            
-            return len(records)
+            return get_database(db_path).save_alias_suggestions(suggestions)
         
         except Exception:
             return 0
@@ -717,7 +658,7 @@ class HistoryTracker:
 def parse_shell_history(custom_path=None):
     """Parse shell history"""
     tracker = HistoryTracker()
-    return [entry['command'] for entry in tracker.parse_shell_history(custom_path)]
+    return list(tracker.parse_shell_history(custom_path).strings())
 
 
 def find_common_sequences(min_frequency=2):
@@ -0,0 +1,202 @@
+"""
+Incremental shell history reader
+
+Maps the history file with mmap and decodes it block by block with an
+encoding sniffed once from the start of the file. A checkpoint (byte
+offset, inode and the bytes just before the offset) lets later reads
+start where the previous one stopped.
+"""
+
+import codecs
+import mmap
+import os
+from pathlib import Path
+
+
+# Bytes decoded at a time
+READ_BLOCK_SIZE = 1 << 20
+
+# Bytes inspected when sniffing the encoding
+SNIFF_SIZE = 1 << 16
+
+# Bytes before a checkpoint offset compared to detect rewritten files
+TAIL_SIZE = 64
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+
+def sniff_encoding(head, fallback='latin-1'):
+    """
+    Guess the encoding of a history file from its first bytes
+
+    Args:
+        head (bytes): Start of the file
+        fallback (str): Encoding for files that are not valid UTF-8/UTF-16
+
+    Returns:
+        tuple: (encoding, BOM length in bytes)
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    sample = head[:SNIFF_SIZE]
+
+    # UTF-16 without a BOM: ASCII commands leave every other byte zero
+    zeros_even = sample[0::2].count(0)
+    zeros_odd = sample[1::2].count(0)
+    if max(zeros_even, zeros_odd) > len(sample) // 4:
+        return ('utf-16-le' if zeros_odd > zeros_even else 'utf-16-be'), 0
+
+    try:
+        # Incremental so a character cut at the sample boundary is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        return fallback, 0
+
+
+class HistoryReader:
+    """Read the lines of a shell history file appended since a checkpoint"""
+
+    def __init__(self, path, checkpoint=None, fallback_encoding='latin-1'):
+        """
+        Args:
+            path (str): History file path
+            checkpoint (dict): Checkpoint of a previous read (optional)
+            fallback_encoding (str): Encoding when sniffing finds no UTF
+        """
+        self.path = Path(path)
+        self.previous = checkpoint
+        self.fallback_encoding = fallback_encoding
+        self.encoding = None
+        self.resumed = False
+        self.start = 0
+        self.end = 0
+        self._file = None
+        self._map = None
+        self._inode = None
+        self._size = 0
+
+    def __enter__(self):
+        self._file = open(self.path, 'rb')
+        try:
+            stat = os.fstat(self._file.fileno())
+            self._inode = stat.st_ino
+            self._size = stat.st_size
+            if self._size:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if self._can_resume(self.previous):
+                self.encoding = self.previous['encoding']
+                self.start = self.previous['offset']
+                self.resumed = True
+            else:
+                self.encoding, self.start = sniff_encoding(self._bytes(0, SNIFF_SIZE), self.fallback_encoding)
+
+            self._newline = '\n'.encode(self.encoding)
+            end = self._last_line_end(self.start, self._size)
+            self.end = end if end >= 0 else self.start
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
+
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return False
+
+    def _bytes(self, start, stop):
+        if self._map is None:
+            return b''
+        return self._map[max(start, 0):min(stop, self._size)]
+
+    def _can_resume(self, checkpoint):
+        """Whether the file is the one the checkpoint was taken from, only appended to"""
+        if not checkpoint or checkpoint['offset'] <= 0:
+            return False
+
+        offset = checkpoint['offset']
+        return (
+            checkpoint['inode'] == self._inode
+            and offset <= self._size
+            and self._bytes(offset - TAIL_SIZE, offset) == checkpoint['tail']
+        )
+
+    def _aligned(self, pos):
+        # UTF-16 newlines must start on a code unit boundary
+        return pos % len(self._newline) == 0
+
+    def _last_line_end(self, lo, hi):
+        """Offset just past the last newline in [lo, hi), or -1"""
+        if self._map is None:
+            return -1
+
+        pos = self._map.rfind(self._newline, lo, hi)
+        while pos >= lo and not self._aligned(pos):
+            pos = self._map.rfind(self._newline, lo, pos + len(self._newline) - 1)
+
+        return pos + len(self._newline) if pos >= lo else -1
+
+    def _next_line_end(self, lo, hi):
+        """Offset just past the first newline in [lo, hi), or hi"""
+        pos = self._map.find(self._newline, lo, hi)
+        while pos >= 0 and not self._aligned(pos):
+            pos = self._map.find(self._newline, pos + 1, hi)
+
+        return pos + len(self._newline) if pos >= 0 else hi
+
+    def _decode(self, start, stop):
+        text = self._map[start:stop].decode(self.encoding, errors='ignore')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text.split('\n')
+
+    def lines(self, include_partial=False):
+        """
+        Iterate over the complete lines between the checkpoint and the end
+
+        Args:
+            include_partial (bool): Also yield a trailing line without a
+                                    newline (it is not covered by the checkpoint)
+
+        Yields:
+            str: Decoded line without its line terminator
+        """
+        pos = self.start
+        while pos < self.end:
+            stop = min(pos + READ_BLOCK_SIZE, self.end)
+            if stop < self.end:
+                block_end = self._last_line_end(pos, stop)
+                stop = block_end if block_end > pos else self._next_line_end(stop, self.end)
+
+            # Every block ends with a newline, so the last piece is empty
+            yield from self._decode(pos, stop)[:-1]
+            pos = stop
+
+        if include_partial and self.end < self._size:
+            yield from self._decode(self.end, self._size)
+
+    def checkpoint(self):
+        """
+        Checkpoint covering everything up to the last complete line
+
+        Returns:
+            dict: inode, offset, encoding and tail bytes
+        """
+        return {
+            'inode': self._inode,
+            'offset': self.end,
+            'encoding': self.encoding,
+            'tail': self._bytes(self.end - TAIL_SIZE, self.end),
+        }
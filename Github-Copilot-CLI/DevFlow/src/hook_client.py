@@ -0,0 +1,109 @@
+"""
+Git hook client that hands new commits to the DevFlow daemon
+
+Run by the installed post-commit/post-merge/post-rewrite hooks (in the
+background, with `python -S`), so it uses the standard library only and
+never imports the rest of DevFlow.
+
+Usage: hook_client.py SOCKET SPOOL EVENT [HOOK ARGS...] < hook stdin
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+
+SEND_TIMEOUT = 0.5
+
+
+def build_event(event, stdin_text=''):
+    """
+    Describe the hook invocation as a daemon event
+
+    Args:
+        event (str): Hook name
+        stdin_text (str): Hook stdin (post-rewrite lists "<old> <new>" pairs)
+
+    Returns:
+        dict: Event with 'repo', 'event', 'branch', 'head', 'shas' and 'time'
+    """
+    output = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel', 'HEAD', '--abbrev-ref', 'HEAD'],
+        capture_output=True, text=True, check=True
+    ).stdout.split('\n')
+    repo, head, branch = output[0], output[1], output[2]
+
+    shas = [head]
+    if event == 'post-rewrite':
+        for line in stdin_text.splitlines():
+            fields = line.split()
+            if len(fields) >= 2 and fields[1] not in shas:
+                shas.append(fields[1])
+
+    return {
+        'repo': repo,
+        'event': event,
+        'branch': None if branch == 'HEAD' else branch,
+        'head': head,
+        'shas': shas,
+        'time': time.time(),
+    }
+
+
+def send(socket_path, payload):
+    """Send one payload over the daemon socket; raises OSError if nobody listens"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(SEND_TIMEOUT)
+        client.connect(socket_path)
+        client.sendall(payload)
+    finally:
+        client.close()
+
+
+def spool(spool_path, payload):
+    """
+    Append one payload to the spool file
+
+    The lock keeps the daemon from draining the file mid-write; if the
+    daemon moved the file away while we waited, append to the new one.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+
+    while True:
+        fd = os.open(spool_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_ino != os.stat(spool_path).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+            os.write(fd, payload)
+            return
+        finally:
+            os.close(fd)
+
+
+def main(argv):
+    socket_path, spool_path, event = argv[1], argv[2], argv[3]
+    stdin_text = sys.stdin.read() if event == 'post-rewrite' else ''
+
+    payload = (json.dumps(build_event(event, stdin_text)) + '\n').encode('utf-8')
+    try:
+        send(socket_path, payload)
+    except (OSError, AttributeError):
+        # Daemon not running (or no AF_UNIX on this platform)
+        spool(spool_path, payload)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
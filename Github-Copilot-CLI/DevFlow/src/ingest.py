@@ -0,0 +1,398 @@
+"""
+Single-pass git history ingestion using one streaming `git log --numstat` call
+"""
+
+import secrets
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import git
+
+
+# Record layout emitted by `git log -z`:
+#   \x1e<marker><sha>\x1f<author>\x1f<email>\x1f<epoch>\x1f<body>\x1f\0
+#   \n<insertions>\t<deletions>\t<path>\0 ...
+# <marker> is a random nonce drawn per git log run, so no commit message can
+# contain the record separator
+RECORD_SEPARATOR = b'\x1e'
+FIELD_SEPARATOR = b'\x1f'
+HEADER_TERMINATOR = b'\x1f\x00'
+LOG_FORMAT = '%x1e{marker}%H%x1f%an%x1f%ae%x1f%ct%x1f%B%x1f'
+
+READ_CHUNK_SIZE = 64 * 1024
+INGEST_BATCH_SIZE = 1000
+
+# Revision lists longer than this are passed on stdin (command lines are limited)
+STDIN_REVS = 64
+
+
+class GitLogError(Exception):
+    """Raised when the streaming git log process cannot be used"""
+    pass
+
+
+class GitLogIngestor:
+    """Stream commits and per-file numstat from a single `git log` process"""
+
+    def __init__(self, repo_path='.', git_binary='git'):
+        """
+        Initialize ingestor
+
+        Args:
+            repo_path (str): Path to git repository working tree
+            git_binary (str): Git executable to invoke
+        """
+        self.repo_path = Path(repo_path)
+        self.git_binary = git_binary
+
+    def build_command(self, rev='HEAD', since=None, until=None, walk=True, paths=None, stdin=False, marker=''):
+        """
+        Build the git log command line for a history window
+
+        Args:
+            rev (str|list): Revision or range to walk (e.g. 'main', 'abc..HEAD'),
+                            or several revisions
+            since (datetime): Only commits newer than this date (optional)
+            until (datetime): Only commits older than this date (optional)
+            walk (bool): Follow parents; False lists exactly the given commits
+            paths (list): Only commits touching these repo-relative paths; git
+                          answers these from commit-graph Bloom filters when present
+            stdin (bool): Read the revisions from stdin instead of the command line
+            marker (str): Nonce written after each record separator (see LOG_FORMAT)
+
+        Returns:
+            list: Command arguments
+        """
+        cmd = [
+            self.git_binary, '-C', str(self.repo_path),
+            'log', '--numstat', '-z', '--no-renames', '--no-color',
+            # Match GitPython's commit.stats, which diffs merges against their first parent
+            '--diff-merges=first-parent',
+            f'--format={LOG_FORMAT.format(marker=marker)}',
+        ]
+
+        if since is not None:
+            cmd.append(f'--since={since}')
+        if until is not None:
+            cmd.append(f'--until={until}')
+        if not walk:
+            cmd.append('--no-walk=unsorted')
+
+        if stdin:
+            cmd.append('--stdin')
+        else:
+            cmd.extend([rev] if isinstance(rev, str) else list(rev))
+        cmd.append('--')
+        if paths:
+            # Literal pathspecs keep the Bloom filter lookup usable
+            cmd.extend(f':(literal){path}' for path in paths)
+        return cmd
+
+    def iter_commits(self, rev='HEAD', since=None, until=None, walk=True, paths=None):
+        """
+        Stream parsed commits as git produces them
+
+        Args:
+            rev (str|list): Revision, range or list of revisions to walk
+            since (datetime): Lower date bound (optional)
+            until (datetime): Upper date bound (optional)
+            walk (bool): Follow parents (False: only the given commits)
+            paths (list): Only commits touching these paths (optional); merges
+                          that left them as in their first parent are skipped
+
+        Yields:
+            dict: Commit record with per-file stats under 'files'
+
+        Raises:
+            GitLogError: If git cannot be started or exits with an error
+        """
+        revs = None if isinstance(rev, str) else list(rev)
+        stdin = revs is not None and len(revs) > STDIN_REVS
+        marker = secrets.token_hex(16)
+        separator = RECORD_SEPARATOR + marker.encode('ascii')
+        cmd = self.build_command(rev=rev, since=since, until=until, walk=walk, paths=paths,
+                                 stdin=stdin, marker=marker)
+
+        # stderr goes to a file: an unread pipe would block git once warnings
+        # fill it while stdout is still being streamed
+        errors = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if stdin else None,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+            )
+            if stdin:
+                # git reads every revision before it writes any output
+                process.stdin.write(''.join(f'{r}\n' for r in revs).encode())
+                process.stdin.close()
+        except OSError as e:
+            errors.close()
+            raise GitLogError(f"Failed to start git: {str(e)}")
+
+        buffer = b''
+        try:
+            while True:
+                chunk = process.stdout.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                buffer += chunk
+                records = buffer.split(separator)
+
+                # The last piece may be an incomplete record
+                buffer = records.pop()
+                for raw in records:
+                    if raw:
+                        record = parse_record(raw)
+                        if record['files'] or not paths:
+                            yield record
+
+            if buffer:
+                record = parse_record(buffer)
+                if record['files'] or not paths:
+                    yield record
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            errors.seek(0)
+            stderr = errors.read()
+            errors.close()
+
+        if returncode != 0:
+            message = stderr.decode('utf-8', errors='replace').strip()
+            raise GitLogError(f"git log exited with {returncode}: {message}")
+
+
+class IncrementalIngestor:
+    """Keep the database in sync with a branch using per-branch SHA watermarks"""
+
+    def __init__(self, analyzer, db):
+        """
+        Initialize incremental ingestor
+
+        Args:
+            analyzer (GitAnalyzer): Analyzer bound to the repository
+            db (Database): Database receiving the commits
+        """
+        self.analyzer = analyzer
+        self.db = db
+        self.repo = analyzer.repo
+        self.repo_key = str(Path(self.repo.working_tree_dir or self.repo.git_dir).resolve())
+
+    def sync(self, since, branch=None):
+        """
+        Bring the stored commit window for a branch up to date
+
+        Only `watermark..HEAD` is read from git when the branch moved forward.
+        If the watermark is no longer an ancestor of HEAD (force-push, rebase),
+        branch links newer than the merge base are dropped and `base..HEAD`
+        is re-ingested; without a merge base the whole window is re-read.
+
+        Args:
+            since (datetime): Oldest commit date the caller needs
+            branch (str): Branch name (default: analyzer's default branch)
+
+        Returns:
+            dict: Sync summary with 'mode' and 'ingested' commit count
+
+        Raises:
+            GitLogError: If git log cannot be used for ingestion
+        """
+        branch = branch or self.analyzer.default_branch
+
+        try:
+            head = self.repo.rev_parse(branch).hexsha
+        except (git.exc.BadName, ValueError):
+            return {'mode': 'missing', 'ingested': 0, 'head': None}
+
+        watermark = self.db.get_watermark(self.repo_key, branch)
+
+        if watermark is None or watermark['covered_since'] > since:
+            mode = 'full'
+        elif watermark['last_sha'] == head:
+            return {'mode': 'noop', 'ingested': 0, 'head': head}
+        elif self._is_ancestor(watermark['last_sha'], head):
+            mode = 'incremental'
+        else:
+            mode = 'rewrite'
+
+        if mode == 'full':
+            covered_since = since
+            self.db.unlink_branch_commits(self.repo_key, branch)
+            ingested = self._ingest(head, since, branch)
+        elif mode == 'incremental':
+            covered_since = watermark['covered_since']
+            ingested = self._ingest(f"{watermark['last_sha']}..{head}", covered_since, branch)
+        else:
+            covered_since = watermark['covered_since']
+            base = self._merge_base(watermark['last_sha'], head)
+
+            if base is None:
+                # Nothing in common with what we ingested: start over
+                mode = 'full'
+                covered_since = min(covered_since, since)
+                self.db.unlink_branch_commits(self.repo_key, branch)
+                ingested = self._ingest(head, covered_since, branch)
+            else:
+                base_date = datetime.fromtimestamp(base.committed_date)
+                self.db.unlink_branch_commits(self.repo_key, branch, after_date=base_date)
+                ingested = self._ingest(f"{base.hexsha}..{head}", covered_since, branch)
+
+        self.db.set_watermark(self.repo_key, branch, head, covered_since)
+
+        return {'mode': mode, 'ingested': ingested, 'head': head}
+
+    def _ingest(self, rev, since, branch):
+        """
+        Stream commits from git log into the database in chunked transactions
+
+        Args:
+            rev (str): Revision or range to walk
+            since (datetime): Lower date bound
+            branch (str): Branch the commits are linked to
+
+        Returns:
+            int: Number of commits ingested
+        """
+        def link(chunk):
+            # Runs inside the chunk's transaction
+            self.db.save_file_changes(chunk)
+            self.db.link_branch_commits(self.repo_key, branch, chunk)
+
+        counts = self.db.ingest_commits(
+            self._scored(self.analyzer.iter_history(rev, since)),
+            chunk_size=INGEST_BATCH_SIZE,
+            on_chunk=link,
+        )
+
+        return counts['inserted'] + counts['updated'] + counts['unchanged']
+
+    def ingest_shas(self, shas):
+        """
+        Ingest specific commits without linking them to a branch
+
+        Used for commits made on a detached HEAD, which no branch sync sees.
+
+        Args:
+            shas (list): Commit SHAs
+
+        Returns:
+            int: Number of commits ingested
+
+        Raises:
+            GitLogError: If git log cannot be used for ingestion
+        """
+        if not shas:
+            return 0
+
+        counts = self.db.ingest_commits(
+            self._scored(self.analyzer.ingestor.iter_commits(rev=list(shas), walk=False)),
+            chunk_size=INGEST_BATCH_SIZE,
+            on_chunk=self.db.save_file_changes,
+        )
+
+        return counts['inserted'] + counts['updated'] + counts['unchanged']
+
+    def _scored(self, records):
+        for record in records:
+            record['quality_score'] = self.analyzer.calculate_commit_quality_score(record['message'])
+            yield record
+
+    def _is_ancestor(self, ancestor_sha, head_sha):
+        """Check ancestry, treating unknown (garbage-collected) SHAs as rewritten"""
+        try:
+            return self.repo.is_ancestor(ancestor_sha, head_sha)
+        except (git.exc.GitCommandError, ValueError):
+            return False
+
+    def _merge_base(self, old_sha, head_sha):
+        """Find the merge base of the old watermark and HEAD, or None"""
+        try:
+            bases = self.repo.merge_base(old_sha, head_sha)
+        except (git.exc.GitCommandError, ValueError):
+            return None
+
+        return bases[0] if bases else None
+
+
+def parse_record(raw):
+    """
+    Parse one raw `git log -z --numstat` record
+
+    Args:
+        raw (bytes): Record bytes without the leading separator and marker
+
+    Returns:
+        dict: Commit record in the GitAnalyzer commit schema plus 'files'
+
+    Raises:
+        GitLogError: If the record is malformed
+    """
+    header, terminator, numstat = raw.partition(HEADER_TERMINATOR)
+    fields = header.split(FIELD_SEPARATOR, 4)
+    if not terminator or len(fields) != 5 or not fields[3].isdigit():
+        raise GitLogError(f"Malformed git log record: {raw[:80]!r}")
+    sha, author, email, epoch, message = fields
+
+    files = {}
+    insertions = 0
+    deletions = 0
+
+    for entry in numstat.lstrip(b'\n').split(b'\x00'):
+        if not entry:
+            continue
+
+        parts = entry.split(b'\t', 2)
+        if len(parts) != 3:
+            continue
+
+        added, removed, path = parts
+        # Binary files report '-' for both counts
+        try:
+            added = int(added) if added != b'-' else 0
+            removed = int(removed) if removed != b'-' else 0
+        except ValueError:
+            raise GitLogError(f"Malformed numstat entry: {entry[:80]!r}")
+
+        files[path.decode('utf-8', errors='replace')] = {
+            'insertions': added,
+            'deletions': removed,
+            'lines': added + removed,
+        }
+        insertions += added
+        deletions += removed
+
+    sha = sha.decode('ascii')
+    return {
+        'hash': sha,
+        'short_hash': sha[:7],
+        'author': author.decode('utf-8', errors='replace'),
+        'email': email.decode('utf-8', errors='replace'),
+        'message': message.decode('utf-8', errors='replace').strip(),
+        'timestamp': datetime.fromtimestamp(int(epoch)),
+        'files_changed': len(files),
+        'insertions': insertions,
+        'deletions': deletions,
+        'lines_changed': insertions + deletions,
+        'files': files,
+    }
+
+
+def iter_git_log(repo_path='.', rev='HEAD', since=None, until=None):
+    """
+    Standalone function to stream commits from git log
+
+    Args:
+        repo_path (str): Repository path
+        rev (str): Revision or range to walk
+        since (datetime): Lower date bound (optional)
+        until (datetime): Upper date bound (optional)
+
+    Returns:
+        generator: Commit records
+    """
+    return GitLogIngestor(repo_path).iter_commits(rev=rev, since=since, until=until)
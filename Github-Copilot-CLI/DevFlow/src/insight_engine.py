@@ -185,17 +185,18 @@ class InsightEngine:
         commits = self.data.get('commits', [])
         contributor_stats = self.data.get('contributor_stats', {})
         
-        # Low Bus Factor Areas
+        # Low Bus Factor Areas (one developer owns most of the lines; without
+        # blame data, fall back to files with a single contributor)
         critical_single_owner = [
             f for f in file_hotspots 
-            if f.get('contributors', 0) == 1 and f.get('riskScore', 0) > 50
+            if f.get('busFactor', f.get('contributors', 0)) == 1 and f.get('riskScore', 0) > 50
         ]
         if critical_single_owner:
             self._add_insight(
                 type_=self.TYPE_HEALTH,
                 severity=self.SEVERITY_HIGH,
                 title="Low Bus Factor Warning",
-                description=f"{len(critical_single_owner)} critical file(s) have only one contributor. Knowledge is concentrated in single developers.",
+                description=f"{len(critical_single_owner)} critical file(s) have a bus factor of one: a single developer owns most of their code.",
                 recommendation="Implement mandatory code reviews and encourage pair programming to distribute knowledge across the team."
             )
         
@@ -0,0 +1,209 @@
+"""
+Per-phase instrumentation of CLI commands
+
+A command marks where each of its phases starts; every phase records its
+wall and CPU time, how many git subprocesses it spawned and how many
+database rows it read and wrote. Git processes are counted with an audit
+hook on subprocess.Popen, so GitPython calls and the ingestor's own
+`git log` pipes are both seen without changing either.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+
+_git_calls = 0
+_hook_lock = threading.Lock()
+_hook_installed = False
+
+
+def _audit(event, args):
+    global _git_calls
+    if event != 'subprocess.Popen':
+        return
+
+    executable, argv = args[0], args[1]
+    if not executable:
+        if isinstance(argv, (str, bytes, os.PathLike)):
+            executable = (os.fsdecode(argv).split() or [''])[0]
+        elif argv:
+            executable = argv[0]
+    name = os.path.basename(os.fsdecode(executable or ''))
+    if name in ('git', 'git.exe'):
+        _git_calls += 1
+
+
+def _install_hook():
+    """Install the audit hook once per process (audit hooks cannot be removed)"""
+    global _hook_installed
+    with _hook_lock:
+        if not _hook_installed:
+            sys.addaudithook(_audit)
+            _hook_installed = True
+
+
+def git_call_count():
+    """
+    Git subprocesses spawned since instrumentation was first used
+
+    Returns:
+        int: Process-wide count
+    """
+    return _git_calls
+
+
+class Instrumentation:
+    """Record per-phase timings of one command run"""
+
+    COUNTERS = ('wall_s', 'cpu_s', 'git_calls', 'rows_read', 'rows_written')
+
+    def __init__(self, command, args=None, profile_path=None):
+        """
+        Start timing a command run
+
+        Args:
+            command (str): Command name
+            args (dict): Command arguments, stored with the run
+            profile_path (str): Write cProfile stats of the run here (optional)
+        """
+        _install_hook()
+        self.command = command
+        self.args = args or {}
+        self.profile_path = profile_path
+        self.db = None
+        self._io_base = {'rows_read': 0, 'rows_written': 0}
+        self.phases = []
+        self.started_at = datetime.now().isoformat()
+        self._current = None
+        self._result = None
+
+        self._profiler = None
+        if profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def attach(self, db):
+        """
+        Count rows read and written through a database from now on
+
+        Args:
+            db (Database): Database the command works on
+        """
+        if self.db is not None or db is None:
+            return
+        self.db = db
+        db.track_reads(True)
+        # Rows touched before attaching (schema setup) belong to no phase
+        self._io_base = db.io_counters()
+
+    def _snapshot(self):
+        io = self.db.io_counters() if self.db is not None else self._io_base
+        return {
+            'wall_s': time.perf_counter(),
+            'cpu_s': time.process_time(),
+            'git_calls': _git_calls,
+            'rows_read': io['rows_read'] - self._io_base['rows_read'],
+            'rows_written': io['rows_written'] - self._io_base['rows_written'],
+        }
+
+    def phase(self, name):
+        """
+        End the current phase and start the next one
+
+        Args:
+            name (str): Phase name (usually the progress description)
+        """
+        self._close_phase()
+        self._current = (name, self._snapshot())
+
+    def _close_phase(self):
+        if self._current is None:
+            return
+        name, start = self._current
+        end = self._snapshot()
+        phase = {'name': name}
+        for key in self.COUNTERS:
+            phase[key] = end[key] - start[key]
+        self.phases.append(phase)
+        self._current = None
+
+    def finish(self):
+        """
+        End the last phase, stop profiling and summarize the run
+
+        Calling it again returns the same summary.
+
+        Returns:
+            dict: 'command', 'args', 'started_at', run totals and 'phases'
+        """
+        if self._result is not None:
+            return self._result
+
+        self._close_phase()
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_path)
+
+        if self.db is not None:
+            self.db.track_reads(False)
+
+        result = {
+            'command': self.command,
+            'args': self.args,
+            'started_at': self.started_at,
+            'phases': self.phases,
+        }
+        for key in self.COUNTERS:
+            result[key] = sum(phase[key] for phase in self.phases)
+
+        self._result = result
+        return result
+
+    def save(self, db=None):
+        """
+        Finish the run and store it
+
+        Args:
+            db (Database): Where to store it (default: the attached database)
+
+        Returns:
+            int: Stored run id, or None without a database
+        """
+        result = self.finish()
+        db = db or self.db
+        if db is None:
+            return None
+        return db.save_command_timings(result)
+
+
+# Standalone functions
+
+def format_timings(run):
+    """
+    Rows for a phase breakdown table
+
+    Args:
+        run (dict): Run summary (see Instrumentation.finish)
+
+    Returns:
+        list: (phase, wall, share, cpu, git calls, rows read, rows written) string tuples,
+              ending with a total row
+    """
+    total = run['wall_s'] or 1e-9
+    rows = []
+    for phase in run['phases'] + [{**run, 'name': 'Total'}]:
+        rows.append((
+            phase['name'],
+            f"{phase['wall_s'] * 1000:,.1f} ms",
+            f"{phase['wall_s'] / total * 100:.0f}%",
+            f"{phase['cpu_s'] * 1000:,.1f} ms",
+            f"{phase['git_calls']:,}",
+            f"{phase['rows_read']:,}",
+            f"{phase['rows_written']:,}",
+        ))
+    return rows
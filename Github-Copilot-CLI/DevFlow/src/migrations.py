@@ -0,0 +1,204 @@
+"""
+Versioned schema migrations for the DevFlow database
+
+The schema version is stored in SQLite's `PRAGMA user_version`. Each
+migration is idempotent and runs its backfills in small transactions, so
+an existing database can be upgraded while other processes keep reading
+it, and an interrupted upgrade resumes where it stopped.
+"""
+
+from datetime import datetime
+
+
+# Latest schema version understood by this code
+SCHEMA_VERSION = 3
+
+# Rows updated per transaction while backfilling new columns
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def get_schema_version(conn):
+    """
+    Read the schema version of a database
+
+    Args:
+        conn (sqlite3.Connection): Open connection
+
+    Returns:
+        int: Schema version (0 for databases created before versioning)
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db, target=SCHEMA_VERSION):
+    """
+    Apply pending migrations in order
+
+    Args:
+        db (Database): Database to upgrade
+        target (int): Version to migrate to
+
+    Returns:
+        int: Schema version after migrating
+    """
+    conn = db.connection
+    version = get_schema_version(conn)
+
+    for step_version, step in MIGRATIONS:
+        if version >= step_version or step_version > target:
+            continue
+
+        step(db, conn)
+
+        # Another process may have finished the same step concurrently
+        conn.execute('BEGIN IMMEDIATE')
+        if get_schema_version(conn) < step_version:
+            conn.execute(f'PRAGMA user_version = {step_version}')
+        conn.commit()
+        version = step_version
+
+    return version
+
+
+def _columns(conn, table):
+    """Column names of a table"""
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def _v1_baseline(db, conn):
+    """
+    v1: schema created by Database._init_database, plus the original
+    commit indexes that v2 replaces
+    """
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_commits_date ON commits(commit_date)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_commits_author ON commits(author)')
+    conn.commit()
+
+
+def _v2_epoch_and_authors(db, conn):
+    """
+    v2: integer epoch timestamps, an authors dimension table and covering
+    indexes for window and window-plus-author queries
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                name_key TEXT NOT NULL,
+                email_key TEXT NOT NULL,
+                UNIQUE (name, email)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_authors_name_key ON authors(name_key)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_authors_email_key ON authors(email_key)')
+
+        columns = _columns(conn, 'commits')
+        if 'ts' not in columns:
+            conn.execute('ALTER TABLE commits ADD COLUMN ts INTEGER')
+        if 'author_id' not in columns:
+            conn.execute('ALTER TABLE commits ADD COLUMN author_id INTEGER REFERENCES authors(id)')
+
+        # Backfilling ts/author_id must not re-aggregate the rollups
+        conn.execute('DROP TRIGGER IF EXISTS trg_commits_rollup_update')
+        db._init_rollups(conn.cursor())
+
+        conn.execute('''
+            INSERT OR IGNORE INTO authors (name, email, name_key, email_key)
+            SELECT DISTINCT author, email, lower(trim(author)), lower(trim(email))
+            FROM commits
+        ''')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    _backfill_commits(conn)
+
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_commits_ts_cover '
+                 'ON commits(ts, author_id, insertions, deletions, files_changed, quality_score)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_commits_author_ts '
+                 'ON commits(author_id, ts, insertions, deletions, files_changed, quality_score)')
+    conn.execute('DROP INDEX IF EXISTS idx_commits_date')
+    conn.execute('DROP INDEX IF EXISTS idx_commits_author')
+    conn.commit()
+
+
+def _backfill_commits(conn):
+    """Fill ts and author_id for pre-v2 commits, one chunk per transaction"""
+    last_id = 0
+
+    while True:
+        rows = conn.execute('''
+            SELECT c.id, c.commit_date, a.id AS author_id
+            FROM commits c
+            JOIN authors a ON a.name = c.author AND a.email = c.email
+            WHERE c.id > ? AND (c.ts IS NULL OR c.author_id IS NULL)
+            ORDER BY c.id
+            LIMIT ?
+        ''', (last_id, BACKFILL_CHUNK_SIZE)).fetchall()
+
+        if not rows:
+            break
+
+        conn.executemany(
+            'UPDATE commits SET ts = ?, author_id = ? WHERE id = ?',
+            [
+                (int(datetime.fromisoformat(row[1]).timestamp()), row[2], row[0])
+                for row in rows
+            ]
+        )
+        conn.commit()
+        last_id = rows[-1][0]
+
+
+def _v3_commit_search(db, conn):
+    """
+    v3: FTS5 index over commit messages, authors and touched paths
+    (skipped when SQLite lacks FTS5; Database.search_commits then uses LIKE)
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        available = db._init_search(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if available:
+        _backfill_search(conn)
+
+
+def _backfill_search(conn):
+    """Index commits stored before v3, one chunk per transaction"""
+    from .database import _search_doc, _search_insert
+
+    # Commits indexed by the triggers (or an interrupted run) are skipped
+    insert = f'''
+        {_search_insert('c')}
+        FROM commits c
+        WHERE c.id = ? AND NOT EXISTS (SELECT 1 FROM commit_search WHERE {_search_doc('c')})
+    '''
+    last_id = 0
+
+    while True:
+        ids = [row[0] for row in conn.execute(
+            'SELECT id FROM commits WHERE id > ? ORDER BY id LIMIT ?',
+            (last_id, BACKFILL_CHUNK_SIZE)
+        )]
+
+        if not ids:
+            break
+
+        conn.executemany(insert, [(commit_id,) for commit_id in ids])
+        conn.commit()
+        last_id = ids[-1]
+
+
+MIGRATIONS = [
+    (1, _v1_baseline),
+    (2, _v2_epoch_and_authors),
+    (3, _v3_commit_search),
+]
@@ -0,0 +1,175 @@
+"""
+Per-file line ownership from `git blame`
+
+Each file is blamed at HEAD through the analyzer's git backend and its lines
+are attributed to commit authors. Results are cached in the database under
+the file's blob SHA (and path), so a file whose content has not changed since
+the last run is never blamed again; the remaining files are blamed in a thread pool
+(a separate git process or a GIL-free libgit2 call per blame, so threads overlap them).
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+BLAME_WORKERS = min(8, os.cpu_count() or 1)
+
+# Paths passed to one `git ls-tree` call
+LS_TREE_BATCH = 500
+
+
+class OwnershipIndex:
+    """Line ownership of files at a revision, backed by a blob-SHA cache"""
+
+    def __init__(self, analyzer, db=None, workers=None, rev='HEAD'):
+        """
+        Initialize index
+
+        Args:
+            analyzer (GitAnalyzer): Analyzer bound to the repository
+            db (Database): Cache blame results here (optional)
+            workers (int): Parallel blame processes (default: BLAME_WORKERS)
+            rev (str): Revision whose files are blamed
+        """
+        self.analyzer = analyzer
+        self.backend = analyzer.backend
+        self.db = db
+        self.workers = max(1, workers or BLAME_WORKERS)
+        self.rev = rev
+        self.root = Path(analyzer.repo.working_tree_dir or analyzer.repo.git_dir).resolve()
+        self.repo_key = str(self.root)
+        self.blamed = 0
+        self.cached = 0
+        self._memo = {}
+
+    def blob_shas(self, paths):
+        """
+        Blob SHAs of files at the index revision
+
+        Args:
+            paths (list): Repo-relative paths
+
+        Returns:
+            dict: {path: blob_sha} for paths that exist as files at the revision
+        """
+        shas = {}
+        for start in range(0, len(paths), LS_TREE_BATCH):
+            shas.update(self.backend.tree(self.rev, paths[start:start + LS_TREE_BATCH]))
+        return shas
+
+    def blame(self, path):
+        """
+        Lines of a file owned by each author
+
+        Args:
+            path (str): Repo-relative path
+
+        Returns:
+            Counter: {author: line count}, or None if the file cannot be blamed
+        """
+        return self.backend.blame(path, self.rev)
+
+    def ownership(self, paths):
+        """
+        Ownership summary of each file
+
+        Args:
+            paths (iterable): Repo-relative paths
+
+        Returns:
+            dict: {path: summary} (see summarize_ownership) for files present at
+                  the revision; deleted and unblameable files are left out
+        """
+        requested = list(dict.fromkeys(paths))
+        paths = [path for path in requested if path not in self._memo]
+        shas = self.blob_shas(paths) if paths else {}
+
+        cached = {}
+        if self.db is not None and shas:
+            cached = self.db.get_blame_cache(self.repo_key, shas)
+        self.cached += len(cached)
+        for path, authors in cached.items():
+            self._memo[path] = summarize_ownership(authors)
+
+        missing = [path for path in shas if path not in cached]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                blamed = dict(zip(missing, pool.map(self.blame, missing)))
+
+            fresh = [(path, shas[path], authors) for path, authors in blamed.items() if authors is not None]
+            self.blamed += len(fresh)
+            if self.db is not None and fresh:
+                self.db.save_blame_cache(self.repo_key, fresh)
+            for path, _, authors in fresh:
+                self._memo[path] = summarize_ownership(authors)
+
+        return {path: self._memo[path] for path in requested if path in self._memo}
+
+
+# Standalone functions
+
+def parse_blame(output):
+    """
+    Count lines per author in `git blame --porcelain` output
+
+    Args:
+        output (bytes): Porcelain output
+
+    Returns:
+        Counter: {author: line count}
+    """
+    authors = {}
+    lines = Counter()
+    current = None
+
+    for line in output.split(b'\n'):
+        if line.startswith(b'\t'):
+            # Content line, owned by the commit of the preceding header
+            lines[current] += 1
+        elif line.startswith(b'author '):
+            authors[current] = line[7:].decode('utf-8', errors='replace')
+        else:
+            fields = line.split(b' ')
+            if len(fields) in (3, 4) and len(fields[0]) in (40, 64):
+                current = fields[0]
+
+    owners = Counter()
+    for sha, count in lines.items():
+        owners[authors.get(sha, 'Unknown')] += count
+    return owners
+
+
+def summarize_ownership(authors):
+    """
+    Contributor count and bus factor of one file
+
+    The bus factor is the fewest authors who together own more than half
+    of the file's lines.
+
+    Args:
+        authors (dict): {author: line count}
+
+    Returns:
+        dict: 'lines', 'contributors', 'bus_factor', 'owners' (authors by lines owned)
+              and 'top_share' of the largest owner
+    """
+    owners = sorted(authors.items(), key=lambda item: (-item[1], item[0]))
+    total = sum(count for _, count in owners)
+
+    bus_factor = 0
+    covered = 0
+    for _, count in owners:
+        if covered * 2 > total:
+            break
+        covered += count
+        bus_factor += 1
+
+    return {
+        'lines': total,
+        'contributors': len(owners),
+        'bus_factor': bus_factor,
+        'owners': [name for name, _ in owners],
+        'top_share': round(owners[0][1] / total, 3) if total else 0.0,
+    }
@@ -0,0 +1,288 @@
+"""
+Parallel history reading over contiguous commit ranges
+
+`git log --numstat` diffs every commit on a single core. For long windows
+the commit list is taken from `git rev-list` (no diffs, so it is cheap),
+split into contiguous ranges, and each range is read by its own
+`git log --no-walk --stdin` process:
+
+- parallel_records streams the commit records in walk order. Ranges are
+  read on worker threads (git does the diffing in its own processes), and
+  only a few ranges are in flight at once, so memory stays bounded. Database
+  ingestion consumes this stream.
+- scan_window folds each range into a WindowAggregate in a process pool, so
+  numstat parsing runs on every core too, and merges the partial
+  aggregates for hotspots, commit patterns, productivity and per-day counts.
+"""
+
+import os
+import subprocess
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from .git_backend import get_backend
+from .ingest import GitLogError
+
+
+# Commits per range of the record stream (scan_window uses one range per job)
+RANGE_SIZE = 2000
+
+# Ranges read ahead of the consumer per worker
+READ_AHEAD = 2
+
+
+class WindowAggregate:
+    """Mergeable per-window totals that the analyses are computed from"""
+
+    def __init__(self):
+        self.commits = 0
+        # (day, hour, author) -> [commits, message_chars]
+        self.activity = {}
+        # path -> [changes, lines], in the order files were first seen
+        self.files = {}
+        # date -> commits
+        self.daily = Counter()
+        self.quality_total = 0
+        self.work_hour_commits = 0
+
+    def add(self, record, quality, work_hours):
+        """
+        Count one commit
+
+        Args:
+            record (dict): Commit record with 'files'
+            quality (int): Commit message quality score
+            work_hours (bool): Whether the commit was made in working hours
+        """
+        timestamp = record['timestamp']
+        key = (timestamp.strftime('%Y-%m-%d'), timestamp.hour, record['author'])
+        bucket = self.activity.setdefault(key, [0, 0])
+        bucket[0] += 1
+        bucket[1] += len(record['message'])
+
+        for path, stats in record['files'].items():
+            entry = self.files.setdefault(path, [0, 0])
+            entry[0] += 1
+            entry[1] += stats['insertions'] + stats['deletions']
+
+        self.commits += 1
+        self.daily[timestamp.date()] += 1
+        self.quality_total += quality
+        self.work_hour_commits += work_hours
+
+    def merge(self, other):
+        """
+        Add the totals of an older range
+
+        Ranges must be merged newest first so files keep first-seen order.
+
+        Args:
+            other (WindowAggregate): Aggregate of the next range
+        """
+        self.commits += other.commits
+        self.daily.update(other.daily)
+        self.quality_total += other.quality_total
+        self.work_hour_commits += other.work_hour_commits
+
+        for key, (commits, chars) in other.activity.items():
+            bucket = self.activity.setdefault(key, [0, 0])
+            bucket[0] += commits
+            bucket[1] += chars
+
+        for path, (changes, lines) in other.files.items():
+            entry = self.files.setdefault(path, [0, 0])
+            entry[0] += changes
+            entry[1] += lines
+
+    def activity_rows(self):
+        """
+        Activity in the Database.get_branch_activity row format
+
+        Returns:
+            list: Dicts with 'day', 'hour', 'author', 'commits' and 'message_chars'
+        """
+        return [
+            {'day': day, 'hour': hour, 'author': author, 'commits': commits, 'message_chars': chars}
+            for (day, hour, author), (commits, chars) in self.activity.items()
+        ]
+
+    def daily_counts(self, first_day):
+        """
+        Commits per calendar day from `first_day`
+
+        Args:
+            first_day (date): First calendar day to count
+
+        Returns:
+            dict: {date: commit count}
+        """
+        return {day: count for day, count in self.daily.items() if day >= first_day}
+
+
+def resolve_jobs(jobs):
+    """
+    Number of workers to use
+
+    Args:
+        jobs (int): Requested workers; 0 or None means one per CPU
+
+    Returns:
+        int: Worker count, at least 1
+    """
+    if not jobs:
+        jobs = os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def rev_list(repo_path, rev='HEAD', since=None):
+    """
+    Commit ids of a window, newest first, without computing any diff
+
+    Args:
+        repo_path (str): Repository working tree
+        rev (str|list): Revision, range or list of revisions
+        since (datetime): Only commits newer than this (optional)
+
+    Returns:
+        list: Full commit ids in `git log` order
+
+    Raises:
+        GitLogError: If git fails
+    """
+    cmd = ['git', '-C', str(repo_path), 'rev-list']
+    if since is not None:
+        cmd.append(f'--since={since}')
+    cmd.extend([rev] if isinstance(rev, str) else list(rev))
+    cmd.append('--')
+
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        raise GitLogError(f"Failed to start git: {str(e)}")
+
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', errors='replace').strip()
+        raise GitLogError(f"git rev-list exited with {result.returncode}: {message}")
+    return result.stdout.decode('ascii').split()
+
+
+def split_ranges(shas, parts=None, size=None):
+    """
+    Split a commit list into contiguous ranges
+
+    Args:
+        shas (list): Commit ids in walk order
+        parts (int): Number of ranges of near-equal length
+        size (int): Commits per range (used when parts is not given)
+
+    Returns:
+        list: Non-empty lists of commit ids, in walk order
+    """
+    if not shas:
+        return []
+
+    if parts:
+        parts = min(parts, len(shas))
+        step, extra = divmod(len(shas), parts)
+        bounds = [i * step + min(i, extra) for i in range(parts + 1)]
+        return [shas[bounds[i]:bounds[i + 1]] for i in range(parts)]
+
+    size = size or RANGE_SIZE
+    return [shas[start:start + size] for start in range(0, len(shas), size)]
+
+
+def parallel_records(backend, rev='HEAD', since=None, jobs=None, range_size=RANGE_SIZE):
+    """
+    Stream commit records of a window, reading ranges concurrently
+
+    Args:
+        backend (GitBackend): Backend reading each range
+        rev (str|list): Revision, range or list of revisions
+        since (datetime): Only commits newer than this (optional)
+        jobs (int): Concurrent range readers (see resolve_jobs)
+        range_size (int): Commits per range
+
+    Yields:
+        dict: Commit records in the same order as a single walk
+
+    Raises:
+        GitLogError: If git fails
+    """
+    jobs = resolve_jobs(jobs)
+    ranges = iter(split_ranges(rev_list(backend.repo_path, rev, since), size=range_size))
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = deque(
+            pool.submit(_read_range, backend, shas)
+            for shas in islice(ranges, jobs * READ_AHEAD)
+        )
+        try:
+            while pending:
+                records = pending.popleft().result()
+                for shas in islice(ranges, 1):
+                    pending.append(pool.submit(_read_range, backend, shas))
+                yield from records
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def scan_window(repo_path, rev='HEAD', since=None, author=None, jobs=None, backend=None):
+    """
+    Aggregate a window with one worker process per contiguous range
+
+    Args:
+        repo_path (str): Repository working tree
+        rev (str|list): Revision, range or list of revisions
+        since (datetime): Only commits newer than this (optional)
+        author (str): Filter by author name/email (optional)
+        jobs (int): Worker processes (see resolve_jobs)
+        backend (str): Git backend name used by the workers (optional)
+
+    Returns:
+        WindowAggregate: Totals of the whole window
+
+    Raises:
+        GitLogError: If git fails
+    """
+    jobs = resolve_jobs(jobs)
+    tasks = [
+        (str(repo_path), backend, shas, author)
+        for shas in split_ranges(rev_list(repo_path, rev, since), parts=jobs)
+    ]
+
+    aggregate = WindowAggregate()
+    if len(tasks) <= 1:
+        for part in map(_scan_range, tasks):
+            aggregate.merge(part)
+        return aggregate
+
+    with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+        # map returns results in range order, which merge relies on
+        for part in pool.map(_scan_range, tasks):
+            aggregate.merge(part)
+    return aggregate
+
+
+# Standalone functions
+
+def _read_range(backend, shas):
+    return list(backend.iter_commits(rev=shas, walk=False))
+
+
+def _scan_range(task):
+    """Worker: aggregate one range of commits"""
+    from .git_analyzer import GitAnalyzer
+
+    repo_path, backend, shas, author = task
+    aggregate = WindowAggregate()
+
+    for record in get_backend(repo_path, backend).iter_commits(rev=shas, walk=False):
+        if GitAnalyzer._matches_author(record['author'], record['email'], author):
+            aggregate.add(
+                record,
+                GitAnalyzer.calculate_commit_quality_score(record['message']),
+                GitAnalyzer.in_work_hours(record['timestamp']),
+            )
+    return aggregate
@@ -0,0 +1,141 @@
+"""
+Bounded-memory mining of frequent command chains
+
+Windows of command IDs are identified by polynomial rolling hashes, so
+every length from 2 to N is hashed in one pass without building a tuple
+per window. Each length feeds a SpaceSaving heavy-hitters summary that
+tracks at most twice its capacity, whatever the history size.
+"""
+
+import heapq
+
+
+# Rolling hash modulus (Mersenne prime 2^61 - 1) and base
+HASH_MODULUS = (1 << 61) - 1
+HASH_BASE = 1000003
+
+# Default number of chains tracked per length
+DEFAULT_CAPACITY = 1000
+
+
+class SpaceSaving:
+    """
+    SpaceSaving heavy-hitters summary
+
+    Estimated counts never undercount: for every tracked key
+    `count - error <= true count <= count`. Any key not tracked occurred
+    at most `floor` times. Instead of evicting on every miss, the summary
+    grows to twice its capacity and then drops to the `capacity` largest
+    counts at once, which keeps insertion amortized O(log capacity).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity (int): Keys kept after each compaction
+        """
+        self.capacity = capacity
+        self.floor = 0
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        self.labels = {}
+
+    def add(self, key, label=None):
+        """
+        Count one occurrence of a key
+
+        Args:
+            key: Hashable key
+            label: Stored with the key if it is not tracked yet (optional)
+        """
+        self.total += 1
+        count = self.counts.get(key)
+        if count is not None:
+            self.counts[key] = count + 1
+            return
+
+        # An untracked key may have been evicted with up to `floor` occurrences
+        self.counts[key] = self.floor + 1
+        self.errors[key] = self.floor
+        if label is not None:
+            self.labels[key] = label
+
+        if len(self.counts) > 2 * self.capacity:
+            self._compact()
+
+    def _compact(self):
+        # Everything evicted has at most the (capacity + 1)-th largest count
+        floor = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.floor = max(self.floor, floor)
+
+        # Keys tied at the floor fill the remaining slots in insertion order
+        ties = self.capacity - sum(1 for count in self.counts.values() if count > floor)
+        counts, errors, labels = {}, {}, {}
+        for key, count in self.counts.items():
+            if count < floor or (count == floor and ties <= 0):
+                continue
+            if count == floor:
+                ties -= 1
+
+            counts[key] = count
+            errors[key] = self.errors[key]
+            if key in self.labels:
+                labels[key] = self.labels[key]
+
+        self.counts, self.errors, self.labels = counts, errors, labels
+
+    def top(self, k=None):
+        """
+        Keys with the largest estimated counts; ties in order of first tracking
+
+        Args:
+            k (int): Number of keys to return (all when None)
+
+        Returns:
+            list: (key, count, error) tuples
+        """
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        if k is not None:
+            ranked = ranked[:k]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+
+def mine_sequences(ids, min_length=2, max_length=5, capacity=DEFAULT_CAPACITY):
+    """
+    Count frequent chains of every length in one pass over a command stream
+
+    Args:
+        ids (array): Command IDs in history order
+        min_length (int): Shortest chain length
+        max_length (int): Longest chain length
+        capacity (int): Chains tracked per length
+
+    Returns:
+        dict: {length: SpaceSaving} keyed by rolling hash, labelled with
+              the tuple of command IDs
+    """
+    sketches = {length: SpaceSaving(capacity) for length in range(min_length, max_length + 1)}
+    by_length = [sketches.get(length) for length in range(max_length + 1)]
+
+    # hashes[length] is the hash of the window of that length ending here
+    hashes = [0] * (max_length + 1)
+
+    for position, command_id in enumerate(ids):
+        token = command_id + 1
+        for length in range(min(position + 1, max_length), 1, -1):
+            key = hashes[length] = (hashes[length - 1] * HASH_BASE + token) % HASH_MODULUS
+            sketch = by_length[length]
+            if sketch is None:
+                continue
+
+            # Hits are the common case: count them without a method call
+            count = sketch.counts.get(key)
+            if count is not None:
+                sketch.counts[key] = count + 1
+                sketch.total += 1
+            else:
+                sketch.add(key, tuple(ids[position - length + 1:position + 1]))
+        hashes[1] = token
+
+    return sketches
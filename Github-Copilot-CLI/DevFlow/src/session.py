@@ -0,0 +1,184 @@
+"""
+Analysis session: load one commit window once and share it across analyses
+"""
+
+from datetime import datetime, timedelta
+
+from .ingest import IncrementalIngestor
+
+
+class AnalysisSession:
+    """In-memory commit set for one (repo, branch, since, author) window"""
+
+    def __init__(self, analyzer, days=30, author=None, branch=None, db=None):
+        """
+        Initialize session (history is loaded lazily on first use)
+
+        Args:
+            analyzer (GitAnalyzer): Analyzer bound to the repository
+            days (int): Number of days to look back
+            author (str): Filter by author name/email (optional)
+            branch (str): Branch name (default: analyzer's default branch)
+            db (Database): Serve commits incrementally from this database (optional)
+        """
+        self.analyzer = analyzer
+        self.days = days
+        self.author = author
+        self.branch = branch or analyzer.default_branch
+        self.since = datetime.now() - timedelta(days=days)
+        self.db = db
+        self.ingest_result = None
+        self.repo_key = None
+        self._synced = None
+        self._records = None
+        self._commits = None
+
+    @property
+    def key(self):
+        """Tuple identifying the commit window served by this session"""
+        return (str(self.analyzer.repo_path), self.branch, self.since, self.author)
+
+    @property
+    def records(self):
+        """Commit records including per-file stats (walks history on first access)"""
+        if self._records is None:
+            if self.db is not None:
+                self._records = self._load_from_database()
+
+            if self._records is None:
+                self.load()
+        return self._records
+
+    @property
+    def commits(self):
+        """Commit dictionaries in the get_commit_history schema"""
+        if self._commits is None:
+            self._commits = [self.analyzer._public_commit(record) for record in self.records]
+        return self._commits
+
+    def _load_from_database(self):
+        """
+        Sync new commits into the database and serve the window from it
+
+        Returns:
+            list: Commit records with per-file stats, or None if incremental
+                  ingestion failed
+        """
+        if self.analyzer.is_empty:
+            return []
+
+        if not self.sync():
+            return None
+
+        try:
+            commits = self.db.get_branch_commits(self.repo_key, self.branch, self.since, self.author)
+            files = self.db.get_branch_file_changes(self.repo_key, self.branch, self.since)
+        except Exception:
+            return None
+
+        for commit in commits:
+            commit['files'] = files.get(commit['hash'], {})
+        return commits
+
+    def sync(self):
+        """
+        Ingest new commits into the database (once per session)
+
+        Returns:
+            bool: True if the database serves this session's window
+        """
+        if self.db is None or self.analyzer.is_empty:
+            return False
+
+        if self._synced is None:
+            try:
+                ingestor = IncrementalIngestor(self.analyzer, self.db)
+                self.ingest_result = ingestor.sync(self.since, self.branch)
+                self.repo_key = ingestor.repo_key
+                self._synced = True
+            except Exception:
+                self.ingest_result = None
+                self._synced = False
+
+        return self._synced
+
+    def activity(self):
+        """
+        Per (day, hour, author) rollup of the window, served from the database
+
+        Returns:
+            list: Rollup rows (see Database.get_branch_activity), or None if
+                  the session is not backed by a database
+        """
+        if not self.sync():
+            return None
+
+        try:
+            return self.db.get_branch_activity(self.repo_key, self.branch, self.since, self.author)
+        except Exception:
+            return None
+
+    def daily_counts(self, first_day):
+        """
+        Commits per calendar day from `first_day`, served from the database
+
+        Args:
+            first_day (date): First calendar day to count
+
+        Returns:
+            dict: {date: commit count}, or None without a database
+        """
+        if not self.sync():
+            return None
+
+        try:
+            return self.db.get_branch_daily_counts(self.repo_key, self.branch, first_day, self.author)
+        except Exception:
+            return None
+
+    @property
+    def is_loaded(self):
+        """Whether the commit window has been loaded (from git or the database)"""
+        return self._records is not None
+
+    def load(self):
+        """
+        Walk the commit window from git
+
+        Returns:
+            AnalysisSession: self, for chaining
+        """
+        if self.analyzer.is_empty:
+            self._records = []
+        else:
+            try:
+                self._records = list(
+                    self.analyzer._iter_commit_records(self.since, self.branch, self.author)
+                )
+            except Exception:
+                self._records = []
+
+        self._commits = None
+        return self
+
+    def narrow(self, days):
+        """
+        Derive a session for a shorter window from this session's records
+
+        Args:
+            days (int): Number of days to look back (at most self.days)
+
+        Returns:
+            AnalysisSession: Session over the most recent `days` days
+        """
+        if days >= self.days:
+            return self
+
+        child = AnalysisSession(self.analyzer, days=days, author=self.author, branch=self.branch, db=self.db)
+        child._records = [record for record in self.records if record['timestamp'] >= child.since]
+
+        # The parent's ingestion already covers the shorter window
+        child.ingest_result = self.ingest_result
+        child.repo_key = self.repo_key
+        child._synced = self._synced
+        return child
@@ -0,0 +1,226 @@
+"""
+Declarative workflow-pattern detection for shell history
+
+Pattern families are read from config/workflow_patterns.json. The
+keywords of every command class are compiled into one Aho-Corasick
+automaton, so each distinct command is classified in a single scan;
+patterns are then matched over runs of consecutive classified commands.
+"""
+
+import json
+import threading
+from collections import Counter, deque
+from pathlib import Path
+
+
+DEFAULT_PATTERNS_FILE = Path(__file__).parent.parent / 'config' / 'workflow_patterns.json'
+
+# Patterns listed per family in the result
+TOP_PATTERNS = 5
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keywords occur in a text"""
+
+    def __init__(self, keywords):
+        """
+        Args:
+            keywords (dict): {keyword: bitmask reported when it occurs}
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [0]
+
+        for keyword, mask in keywords.items():
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(0)
+                state = self._goto[state][char]
+            self._output[state] |= mask
+
+        # Failure links breadth-first; a state also reports its fallback's keywords
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] |= self._output[self._fail[child]]
+
+    def match(self, text):
+        """
+        Scan a text once
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            int: OR of the bitmasks of all keywords occurring in the text
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        mask = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            mask |= output[state]
+
+        return mask
+
+
+def load_workflow_patterns(path=None):
+    """
+    Load a workflow pattern table
+
+    Args:
+        path (str): Pattern table JSON (default: config/workflow_patterns.json)
+
+    Returns:
+        dict: Pattern table with 'classes' and 'families'
+    """
+    with open(path or DEFAULT_PATTERNS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class WorkflowMatcher:
+    """Workflow pattern table compiled for matching command streams"""
+
+    def __init__(self, table):
+        """
+        Args:
+            table (dict): Pattern table (see config/workflow_patterns.json)
+
+        Raises:
+            ValueError: If a pattern uses an undefined command class
+        """
+        self.class_bits = {name: 1 << index for index, name in enumerate(table['classes'])}
+        self.families = table['families']
+
+        keywords = {}
+        for name, words in table['classes'].items():
+            for word in words:
+                keywords[word.lower()] = keywords.get(word.lower(), 0) | self.class_bits[name]
+        self.automaton = KeywordAutomaton(keywords)
+
+        # {run length: {family: [(class masks, pattern)]}}, in table order
+        self.rules = {}
+        for family in self.families:
+            for pattern in family['patterns']:
+                unknown = [name for name in pattern['sequence'] if name not in self.class_bits]
+                if unknown:
+                    raise ValueError(f"Unknown command class {unknown[0]!r} in family {family['name']!r}")
+
+                masks = tuple(self.class_bits[name] for name in pattern['sequence'])
+                self.rules.setdefault(len(masks), {}).setdefault(family['name'], []).append((masks, pattern))
+
+    def classify(self, command):
+        """
+        Classify one command
+
+        Args:
+            command (str): Command line
+
+        Returns:
+            int: Bitmask of the command classes it belongs to
+        """
+        return self.automaton.match(command.lower())
+
+    def empty_result(self):
+        """Result for an empty history"""
+        result = {family['name']: [] for family in self.families}
+        result['insights'] = []
+        return result
+
+    def detect(self, stream, min_frequency=3):
+        """
+        Detect workflow patterns in a command stream
+
+        Args:
+            stream (CommandStream): Interned command history
+            min_frequency (int): Count insights marked above_min_frequency must exceed
+
+        Returns:
+            dict: Top patterns per family and 'insights'
+        """
+        commands = stream.commands
+        classes = [self.classify(command) for command in commands]
+        family_counts = {family['name']: Counter() for family in self.families}
+        pattern_counts = {}
+
+        # Each distinct run is classified once, weighted by its count; runs
+        # come in order of first occurrence, as a scan of the stream would
+        for length, by_family in self.rules.items():
+            for run, count in stream.ngram_counts(length).items():
+                run_classes = [classes[command_id] for command_id in run]
+                if not all(run_classes):
+                    continue
+
+                for family, rules in by_family.items():
+                    for masks, pattern in rules:
+                        if all(found & wanted for found, wanted in zip(run_classes, masks)):
+                            label = self._label(pattern, [commands[command_id] for command_id in run])
+                            family_counts[family][label] += count
+                            pattern_counts.setdefault(id(pattern), Counter())[label] += count
+                            break
+
+        insights = []
+        for family in self.families:
+            for pattern in family['patterns']:
+                counts = pattern_counts.get(id(pattern))
+                if 'insight' not in pattern or not counts:
+                    continue
+
+                count = counts.most_common(1)[0][1]
+                if count > (min_frequency if pattern.get('above_min_frequency') else 0):
+                    insights.append(pattern['insight'].replace('{count}', str(count)))
+
+        if not insights:
+            insights.append("No repetitive workflow patterns detected")
+
+        result = {
+            name: [{'pattern': k, 'count': v} for k, v in counts.most_common(TOP_PATTERNS)]
+            for name, counts in family_counts.items()
+        }
+        result['insights'] = insights
+        return result
+
+    @staticmethod
+    def _label(pattern, run):
+        label = pattern['label']
+        if '{commands}' not in label:
+            return label
+
+        truncate = pattern.get('truncate')
+        joined = ' → '.join(command[:truncate] if truncate else command for command in run)
+        return label.replace('{commands}', joined)
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def get_workflow_matcher(path=None):
+    """
+    Get a compiled matcher for a pattern table, compiling it once per file
+
+    Args:
+        path (str): Pattern table JSON (default: config/workflow_patterns.json)
+
+    Returns:
+        WorkflowMatcher: Compiled matcher
+    """
+    key = str(Path(path or DEFAULT_PATTERNS_FILE).resolve())
+
+    with _matchers_lock:
+        if key not in _matchers:
+            _matchers[key] = WorkflowMatcher(load_workflow_patterns(key))
+        return _matchers[key]
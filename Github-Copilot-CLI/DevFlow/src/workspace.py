@@ -0,0 +1,185 @@
+"""
+Multi-repository workspace analysis using a process pool
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .database import get_database
+from .git_analyzer import GitAnalyzer
+
+
+# Directories never worth descending into while discovering repositories
+SKIP_DIRS = {'node_modules', '.venv', 'venv', '__pycache__', '.tox', 'dist', 'build'}
+
+
+def discover_repositories(workspace, max_depth=3):
+    """
+    Find git repositories below a workspace directory
+
+    Repositories are not searched for nested repositories.
+
+    Args:
+        workspace (str): Directory to search
+        max_depth (int): Maximum directory depth below the workspace
+
+    Returns:
+        list: Sorted repository paths
+    """
+    root = Path(workspace).resolve()
+    if not root.is_dir():
+        raise ValueError(f"Workspace is not a directory: {workspace}")
+
+    repos = []
+    pending = [(root, 0)]
+
+    while pending:
+        directory, depth = pending.pop()
+
+        if (directory / '.git').exists():
+            repos.append(str(directory))
+            continue
+
+        if depth >= max_depth:
+            continue
+
+        try:
+            children = sorted(directory.iterdir())
+        except (PermissionError, OSError):
+            continue
+
+        for child in children:
+            if child.is_dir() and not child.is_symlink() and \
+               child.name not in SKIP_DIRS and not child.name.startswith('.'):
+                pending.append((child, depth + 1))
+
+    return sorted(repos)
+
+
+def read_repos_file(repos_file):
+    """
+    Read repository paths from a file (one per line, '#' comments allowed)
+
+    Relative paths are resolved against the file's directory.
+
+    Args:
+        repos_file (str): Path to the list file
+
+    Returns:
+        list: Repository paths
+    """
+    base = Path(repos_file).resolve().parent
+    repos = []
+
+    with open(repos_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            path = Path(os.path.expanduser(line))
+            if not path.is_absolute():
+                path = base / path
+            repos.append(str(path.resolve()))
+
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(repos))
+
+
+def analyze_repository(repo_path, days=30, author=None, db_path=None):
+    """
+    Analyze one repository and store its commits (process pool worker)
+
+    Never raises: failures are returned as an error result so one bad
+    repository cannot abort a batch.
+
+    Args:
+        repo_path (str): Repository path
+        days (int): Number of days to analyze
+        author (str): Filter by author (optional)
+        db_path (str): Database path (optional)
+
+    Returns:
+        dict: Per-repository summary with 'status' of 'ok' or 'error'
+    """
+    started = time.perf_counter()
+
+    try:
+        analyzer = GitAnalyzer(repo_path)
+        db = get_database(db_path)
+
+        session = analyzer.create_session(days=days, author=author, db=db)
+        commits = analyzer.get_commit_history(session=session)
+        patterns = analyzer.analyze_commit_patterns(session=session)
+        hotspots = analyzer.get_hotspot_files(limit=5, session=session)
+        productivity = analyzer.generate_productivity_score(session=session)
+
+        ingested = session.ingest_result['ingested'] if session.ingest_result else db.save_commit_batch(commits)
+
+        return {
+            'repo': repo_path,
+            'status': 'ok',
+            'branch': analyzer.default_branch,
+            'commits': len(commits),
+            'ingested': ingested,
+            'authors': len(patterns['top_authors']),
+            'insertions': sum(c['insertions'] for c in commits),
+            'deletions': sum(c['deletions'] for c in commits),
+            'score': productivity['score'],
+            'grade': productivity['grade'],
+            'hotspots': [{'file': path, 'changes': count} for path, count, _ in hotspots],
+            'duration': round(time.perf_counter() - started, 3),
+            'error': None,
+        }
+
+    except Exception as e:
+        return {
+            'repo': repo_path,
+            'status': 'error',
+            'error': str(e) or e.__class__.__name__,
+            'duration': round(time.perf_counter() - started, 3),
+        }
+
+
+def analyze_workspace(repos, days=30, author=None, jobs=None, db_path=None, on_result=None):
+    """
+    Analyze many repositories in parallel and record per-repo results
+
+    Args:
+        repos (list): Repository paths
+        days (int): Number of days to analyze
+        author (str): Filter by author (optional)
+        jobs (int): Worker processes (default: CPU count)
+        db_path (str): Database path (optional)
+        on_result (callable): Called with each result as it completes (optional)
+
+    Returns:
+        list: Per-repository results in input order
+    """
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(repos) or 1))
+    db = get_database(db_path)
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(analyze_repository, repo, days, author, db_path): repo
+            for repo in repos
+        }
+
+        for future in as_completed(futures):
+            repo = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker process died (e.g. killed or out of memory)
+                result = {'repo': repo, 'status': 'error', 'error': str(e) or e.__class__.__name__, 'duration': 0}
+
+            db.save_repo_analysis(result, days_analyzed=days)
+            results[repo] = result
+
+            if on_result:
+                on_result(result)
+
+    return [results[repo] for repo in repos]
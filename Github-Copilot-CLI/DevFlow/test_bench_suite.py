@@ -0,0 +1,82 @@
+"""
+Test suite for the benchmark harness
+Verifies a small suite run produces complete JSON results and comparisons flag regressions
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.bench_suite import run_suite, compare
+
+
+def test_small_suite_run():
+    """Test that every case is timed and the results serialize"""
+    print("TEST: Small Suite Run")
+    print("-" * 60)
+
+    suite = run_suite([60], repeat=2, files=10, authors=3, days=30)
+    entry = suite['results']['60']
+    assert entry['repo']['commits'] == 60 and entry['repo']['files'] == 10
+
+    cases = entry['cases']
+    assert 'git_analyzer.get_commit_history' in cases and 'exporter.export_all (cold db)' in cases
+    assert any(name.startswith('database.') for name in cases)
+    for timing in cases.values():
+        assert len(timing['runs_s']) == 2 and timing['min_s'] <= timing['median_s']
+    assert cases['git_analyzer.get_commit_history']['loops'] == 1
+    assert cases['database.get_commit_stats']['loops'] >= 1
+    print(f"✓ {len(cases)} cases timed")
+
+    speedups = entry['commit_graph_speedup']
+    assert set(speedups) == {'file_tracker.get_file_churn_rate', 'file_tracker.get_file_change_timeline'}
+    assert all(value > 0 for value in speedups.values())
+    print("✓ Path-limited walks timed with and without the commit-graph")
+
+    backends = suite['meta']['git_backends']
+    for backend in backends:
+        assert f'git_backend.blame [{backend}]' in cases
+        assert f'git_analyzer.get_commit_history [{backend}]' in cases
+    assert set(entry['backend_speedup']) == set(backends) - {'gitpython'}
+    for speedups in entry['backend_speedup'].values():
+        assert len(speedups) == 6 and all(value > 0 for value in speedups.values())
+    print(f"✓ Backend cases timed for {', '.join(backends)}")
+
+    assert 'ingest.sync (jobs=1)' in cases and 'git_analyzer.scan_window (jobs=4)' in cases
+    assert set(entry['parallel_speedup']) == {'git_analyzer.scan_window', 'ingest.sync'}
+    assert all('4' in speedups for speedups in entry['parallel_speedup'].values())
+    print("✓ Parallel cases timed at 1 and 4 jobs")
+
+    assert json.loads(json.dumps(suite)) == suite
+    assert suite['meta']['repeat'] == 2 and suite['meta']['python']
+    print("✓ Results are plain JSON with run metadata")
+
+    print("✅ Small suite run test passed\n")
+
+
+def test_compare_flags_regressions():
+    """Test that comparisons use the best run and respect the threshold"""
+    print("TEST: Compare Results")
+    print("-" * 60)
+
+    def result(min_s):
+        return {'results': {'1000': {'cases': {
+            'case.fast': {'min_s': min_s, 'median_s': min_s * 2},
+            'case.same': {'min_s': 0.5, 'median_s': 0.5},
+        }}}}
+
+    rows = {row['case']: row for row in compare(result(0.2), result(0.1), threshold=1.5)}
+    assert rows['case.fast']['ratio'] == 2.0 and rows['case.fast']['regression'] is True
+    assert rows['case.same']['regression'] is False
+    assert compare(result(0.2), {'results': {}}) == []
+    print("✓ 2x slowdown flagged, unchanged case and missing baseline are not")
+
+    print("✅ Compare results test passed\n")
+
+
+if __name__ == '__main__':
+    test_small_suite_run()
+    test_compare_flags_regressions()
@@ -0,0 +1,92 @@
+"""
+Test suite for the streaming bulk-ingest API
+Verifies inserted/updated/skipped counts and bounded memory use
+"""
+
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.database import Database
+
+BASE_DATE = datetime.now() - timedelta(days=1)
+
+
+def _commits(count, start=0, message='feat: change'):
+    for i in range(start, start + count):
+        yield {
+            'hash': f'{i:040x}',
+            'author': f'Dev {i % 7}',
+            'email': f'dev{i % 7}@example.com',
+            'message': message,
+            'timestamp': BASE_DATE + timedelta(seconds=i),
+            'files_changed': 1,
+            'insertions': i % 50,
+            'deletions': i % 11,
+        }
+
+
+def test_ingest_counts():
+    """Test inserted, updated and skipped counts across re-ingests"""
+    print("TEST: Ingest Counts")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+
+        result = db.ingest_commits(_commits(2500), chunk_size=1000)
+        assert (result['inserted'], result['updated'], result['skipped']) == (2500, 0, 0), result
+        print("✓ New commits are inserted across chunks")
+
+        ids = dict(db.connection.execute('SELECT sha, id FROM commits').fetchall())
+
+        changed = list(_commits(100, message='fix: reworded'))
+        bad = [{'message': 'no hash'}, {'hash': 'f' * 40}]
+        result = db.ingest_commits(iter(list(_commits(200, start=100)) + changed + bad), chunk_size=64)
+        assert result['inserted'] == 0 and result['updated'] == 100, result
+        assert result['unchanged'] == 200 and result['invalid'] == 2 and result['skipped'] == 202, result
+        print("✓ Changed commits are updated, identical and invalid ones skipped")
+
+        assert dict(db.connection.execute('SELECT sha, id FROM commits').fetchall()) == ids
+        assert db.connection.execute(
+            "SELECT COUNT(*) FROM commits WHERE message = 'fix: reworded'"
+        ).fetchone()[0] == 100
+        print("✓ Updates keep row ids")
+
+        assert db.save_commit_batch(list(_commits(3, start=5000))) == 3
+        print("✓ save_commit_batch reports saved commits")
+
+    print("✅ Ingest counts test passed\n")
+
+
+def test_streaming_memory():
+    """Test that memory stays bounded by one chunk while streaming"""
+    print("TEST: Streaming Memory")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        peaks = {}
+
+        for count in (5000, 50000):
+            tracemalloc.start()
+            result = db.ingest_commits(_commits(count, start=count * 10), chunk_size=500)
+            peaks[count] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert result['inserted'] == count
+
+        # Ten times the commits must not need anywhere near ten times the memory
+        assert peaks[50000] < peaks[5000] * 2, peaks
+        print(f"✓ Peak memory {peaks[5000] // 1024} KiB for 5k vs {peaks[50000] // 1024} KiB for 50k commits")
+
+    print("✅ Streaming memory test passed\n")
+
+
+if __name__ == '__main__':
+    test_ingest_counts()
+    test_streaming_memory()
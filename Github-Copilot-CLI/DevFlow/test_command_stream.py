@@ -0,0 +1,119 @@
+"""
+Test suite for the interned command stream
+Verifies interning, the legacy entry view and analytics on the stream
+"""
+
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.bench_history import write_history
+from src.command_stream import CommandStream
+from src.history import HistoryTracker
+
+HISTORY = [
+    'git add .', 'git commit -m "wip"', 'git push',
+    'make build', 'pytest -q',
+    'git add .', 'git commit -m "wip"', 'git push',
+    'npm install', 'npm run dev',
+    'make build', 'pytest -q',
+    'git add .', 'git commit -m "fix"',
+    'ls',
+]
+
+
+def test_interning():
+    """Test IDs, timestamps and the legacy entry view"""
+    print("TEST: Interning")
+    print("-" * 60)
+
+    stream = CommandStream()
+    when = datetime(2026, 1, 2, 3, 4, 5)
+    for command in HISTORY:
+        stream.append(command, when if command == 'ls' else None)
+
+    assert stream.ids.typecode == 'I' and len(stream) == len(HISTORY)
+    assert stream.commands[:3] == HISTORY[:3] and len(stream.commands) == 9
+    assert list(stream.ids[:6]) == [0, 1, 2, 3, 4, 0]
+    print("✓ Distinct commands get IDs in order of first use")
+
+    assert list(stream.strings()) == HISTORY
+    assert stream[-1] == {'command': 'ls', 'timestamp': when, 'session': None}
+    assert stream[0]['timestamp'] is None and [e['command'] for e in stream[1:3]] == HISTORY[1:3]
+    print("✓ Entries keep the {'command', 'timestamp', 'session'} shape")
+
+    assert stream.most_common(3) == [('git add .', 3), ('git commit -m "wip"', 2), ('git push', 2)]
+    assert stream.ngram_counts(2)[(0, 1)] == 2
+    print("✓ Counts break ties by first use")
+
+    print("✅ Interning test passed\n")
+
+
+def test_analytics_on_stream():
+    """Test that HistoryTracker analytics run on the interned stream"""
+    print("TEST: Stream Analytics")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '.bash_history'
+        path.write_text('\n'.join(HISTORY) + '\n', encoding='utf-8')
+
+        tracker = HistoryTracker()
+        stream = tracker.parse_shell_history(path)
+        assert isinstance(stream, CommandStream) and len(stream) == len(HISTORY)
+
+        top = tracker.get_top_commands(limit=2)
+        assert top == [{'command': 'git add .', 'count': 3, 'percentage': 20.0},
+                       {'command': 'git commit -m "wip"', 'count': 2, 'percentage': 13.33}]
+
+        sequences = tracker.find_common_sequences(sequence_length=3, min_frequency=2)
+        assert [s['sequence'] for s in sequences] == [['git add .', 'git commit -m "wip"', 'git push'],
+                                                      ['make build', 'pytest -q', 'git add .']]
+        print("✓ Top commands and sequences")
+
+        patterns = tracker.detect_workflow_patterns(min_frequency=1)
+        assert patterns['git_workflows'] == [{'pattern': 'git add → git commit', 'count': 3},
+                                             {'pattern': 'git commit → git push', 'count': 2}]
+        assert patterns['build_test_cycles'] == [{'pattern': 'make build → pytest -q', 'count': 2}]
+        assert patterns['install_run_loops'] == [{'pattern': 'npm install → npm run dev', 'count': 1}]
+        print("✓ Workflow patterns")
+
+        stats = tracker.get_statistics()
+        assert (stats['total_commands'], stats['unique_commands']) == (15, 9)
+        assert stats['most_common'] == ('git add .', 3) and stats['repetition_rate'] == 40.0
+        print("✓ Statistics")
+
+    print("✅ Stream analytics test passed\n")
+
+
+def test_stream_memory():
+    """Test that the stream stays a few bytes per line"""
+    print("TEST: Stream Memory")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '.bash_history'
+        write_history(path, lines=200000, distinct=2000)
+
+        tracemalloc.start()
+        stream = HistoryTracker().parse_shell_history(path)
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        assert len(stream) == 200000
+        # A dict per line costs well over 200 bytes
+        assert retained / len(stream) < 32, retained
+        print(f"✓ {retained / len(stream):.1f} bytes per history line")
+
+    print("✅ Stream memory test passed\n")
+
+
+if __name__ == '__main__':
+    test_interning()
+    test_analytics_on_stream()
+    test_stream_memory()
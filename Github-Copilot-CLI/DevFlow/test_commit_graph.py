@@ -0,0 +1,81 @@
+"""
+Test suite for commit-graph maintenance
+Verifies graph detection, staleness, writing and Bloom-filter-backed path walks
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo, git
+from src.commit_graph import commit_graph_status, ensure_commit_graph, graph_files
+from src.file_tracker import FileTracker
+
+
+def test_graph_status():
+    """Test that missing, current and stale graphs are told apart"""
+    print("TEST: Graph Status")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=50, files=8, days=20)
+
+        status = commit_graph_status(repo_path)
+        assert not status['exists'] and status['needs_write'] and graph_files(repo_path) == []
+        print("✓ Missing graph detected")
+
+        written = ensure_commit_graph(repo_path)
+        assert written['written'] and written['changed_paths'] and written['commits'] == 50
+        assert not ensure_commit_graph(repo_path)['written']
+        print("✓ Graph written with changed-path filters, then left alone")
+
+        git(repo_path, 'commit', '-q', '--allow-empty', '-m', 'feat: after graph')
+        stale = commit_graph_status(repo_path)
+        assert stale['stale'] and stale['missing_tips'] == 1 and stale['needs_write']
+        print("✓ New branch tip makes the graph stale")
+
+        git(repo_path, 'commit-graph', 'write', '--reachable', '--split')
+        layered = commit_graph_status(repo_path)
+        assert layered['layers'] == 2 and layered['commits'] == 51 and not layered['stale']
+        print("✓ Split graph chains are read layer by layer")
+
+        git(repo_path, 'commit-graph', 'write', '--reachable', '--no-changed-paths')
+        plain = commit_graph_status(repo_path)
+        assert plain['exists'] and not plain['changed_paths'] and plain['needs_write']
+        print("✓ Graph without Bloom filters is flagged for rewrite")
+
+    print("✅ Graph status test passed\n")
+
+
+def test_path_walks():
+    """Test that path-limited walks match git and can maintain the graph"""
+    print("TEST: Path Walks")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=80, files=6, days=30)
+        path = git(repo_path, 'ls-files').split()[0]
+        expected = git(repo_path, 'log', '--format=%H', '--', path).split()
+
+        plain = FileTracker(repo_path)
+        timeline = plain.get_file_change_timeline(path)
+        assert [entry['sha'] for entry in timeline] == expected
+        assert len(plain.get_file_change_timeline(path, limit=3)) == min(3, len(expected))
+        assert plain.get_file_churn_rate(path, days=40)['total_changes'] == len(expected)
+        assert plain.commit_graph is None and not commit_graph_status(repo_path)['exists']
+        print(f"✓ {len(expected)} commits found for {path} without a graph")
+
+        maintained = FileTracker(repo_path, maintain_commit_graph=True)
+        assert maintained.get_file_change_timeline(path) == timeline
+        assert maintained.commit_graph['written'] and commit_graph_status(repo_path)['changed_paths']
+        print("✓ maintain_commit_graph writes the graph; results are unchanged")
+
+    print("✅ Path walks test passed\n")
+
+
+if __name__ == '__main__':
+    test_graph_status()
+    test_path_walks()
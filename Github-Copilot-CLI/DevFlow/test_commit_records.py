@@ -0,0 +1,107 @@
+"""
+Test suite for streaming commit records
+Verifies iter_commit_records, the slotted CommitRecord and one-pass analyses
+"""
+
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.commit_record import CommitRecord
+from src.database import Database
+from src.git_analyzer import GitAnalyzer
+
+
+def _one_shot(records):
+    """Iterator that fails if an analysis tries to walk it twice"""
+    consumed = []
+
+    def stream():
+        assert not consumed, "Commits iterated twice"
+        consumed.append(True)
+        yield from records
+
+    return stream()
+
+
+def test_streaming_records():
+    """Test that records stream lazily and match get_commit_history"""
+    print("TEST: Streaming Records")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=60, files=8, authors=3, days=40)
+        analyzer = GitAnalyzer(repo_path)
+
+        stream = analyzer.iter_commit_records(days=41)
+        assert isinstance(stream, types.GeneratorType)
+        first = next(stream)
+        assert isinstance(first, CommitRecord) and not hasattr(first, '__dict__')
+        print("✓ iter_commit_records is a generator of slotted records")
+
+        records = [first] + list(stream)
+        history = analyzer.get_commit_history(days=41)
+        assert [record.to_dict() for record in records] == history
+        assert list(history[0]) == list(CommitRecord.KEYS)
+        print(f"✓ {len(records)} records match get_commit_history field for field")
+
+        record = records[0]
+        assert record['short_hash'] == record.short_hash == record.hash[:7]
+        assert record.get('lines_changed') == record.insertions + record.deletions
+        assert record.get('files') is None and 'files' not in record and 'hash' in record
+        try:
+            record['files']
+            assert False, "Unknown key accepted"
+        except KeyError:
+            pass
+        assert all(r.author is records[0].author for r in records if r.author == records[0].author)
+        print("✓ Dictionary-style access, derived fields and interned authors")
+
+        author = records[0].author
+        assert all(r.author == author for r in analyzer.iter_commit_records(days=41, author=author))
+        assert list(GitAnalyzer(repo_path).iter_commit_records(days=41, branch='missing')) == []
+        print("✓ Author and branch filters honoured")
+
+    print("✅ Streaming records test passed\n")
+
+
+def test_one_pass_consumers():
+    """Test that analyses and ingestion consume a single iterator"""
+    print("TEST: One Pass Consumers")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = create_synthetic_repo(tmp / 'repo', commits=80, files=8, authors=4, days=30)
+        analyzer = GitAnalyzer(repo_path)
+        history = analyzer.get_commit_history(days=31)
+        records = list(analyzer.iter_commit_records(days=31))
+
+        assert analyzer._patterns_from_commits(_one_shot(records)) == analyzer._patterns_from_commits(history)
+        assert analyzer.analyze_commit_patterns(days=31) == analyzer._patterns_from_commits(history)
+        print("✓ Pattern analysis streams and matches the list result")
+
+        assert (analyzer._productivity_from_commits(_one_shot(records), 31)
+                == analyzer._productivity_from_commits(history, 31))
+        assert analyzer.generate_productivity_score(days=31)['score'] > 0
+        empty = analyzer._productivity_from_commits(iter(()), 31)
+        assert empty['grade'] == 'N/A' and analyzer._patterns_from_commits(iter(()))['total_commits'] == 0
+        print("✓ Productivity score streams; empty iterators handled")
+
+        db = Database(tmp / 'devflow.db')
+        result = db.ingest_commits(analyzer.iter_commit_records(days=31), chunk_size=25)
+        assert result['inserted'] == len(history) and result['invalid'] == 0
+        assert db.get_commit_stats(days=31)['total_commits'] == len(history)
+        print(f"✓ {len(history)} records ingested straight from the generator")
+
+    print("✅ One pass consumers test passed\n")
+
+
+if __name__ == '__main__':
+    test_streaming_records()
+    test_one_pass_consumers()
@@ -0,0 +1,171 @@
+"""
+Test suite for the hook-fed ingestion daemon
+Verifies hook installation, the spool fallback, socket delivery and hook latency
+"""
+
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, create_synthetic_repo, git
+from src.daemon import IngestDaemon, install_hooks, uninstall_hooks, read_spool, HOOK_MARKER
+from src.database import Database
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _stored_shas(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {row[0] for row in conn.execute('SELECT sha FROM commits')}
+
+
+def _setup(tmp):
+    tmp = Path(tmp)
+    repo_path = create_synthetic_repo(tmp / 'repo', commits=10, files=4, days=5)
+    paths = {'socket_path': tmp / 'daemon.sock', 'spool_path': tmp / 'spool.jsonl'}
+    return repo_path, paths
+
+
+def test_hook_installation():
+    """Test that hooks are installed, kept apart from foreign hooks and removed"""
+    print("TEST: Hook Installation")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path, paths = _setup(tmp)
+        hooks = repo_path / '.git' / 'hooks'
+        (hooks / 'post-merge').write_text('#!/bin/sh\necho mine\n')
+
+        result = install_hooks(repo_path, **paths)
+        assert [Path(p).name for p in result['installed']] == ['post-commit', 'post-rewrite']
+        assert [Path(p).name for p in result['skipped']] == ['post-merge']
+        assert HOOK_MARKER in (hooks / 'post-commit').read_text()
+        assert (hooks / 'post-commit').stat().st_mode & 0o111
+        print("✓ Hooks installed; an existing hook is left alone")
+
+        assert len(install_hooks(repo_path, force=True, **paths)['installed']) == 3
+        assert len(uninstall_hooks(repo_path)) == 3 and not (hooks / 'post-merge').exists()
+        print("✓ --force replaces, uninstall removes only DevFlow hooks")
+
+    print("✅ Hook installation test passed\n")
+
+
+def test_spool_fallback():
+    """Test that events are spooled without a daemon and drained later"""
+    print("TEST: Spool Fallback")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path, paths = _setup(tmp)
+        install_hooks(repo_path, **paths)
+        db = Database(Path(tmp) / 'devflow.db')
+
+        commit(repo_path, 'feat: spooled')
+        git(repo_path, 'commit', '-q', '--allow-empty', '--amend', '-m', 'feat: spooled again')
+        amended = git(repo_path, 'rev-parse', 'HEAD').strip()
+        git(repo_path, 'checkout', '-q', '--detach')
+        detached = commit(repo_path, 'chore: detached work')
+
+        spool = paths['spool_path']
+        assert _wait_for(lambda: spool.exists() and len(spool.read_text().splitlines()) == 4)
+        print("✓ post-commit and post-rewrite events spooled while no daemon runs")
+
+        daemon = IngestDaemon(db, **paths)
+        summary = daemon.drain()
+        assert summary['events'] == 4 and summary['errors'] == []
+        stored = _stored_shas(Path(tmp) / 'devflow.db')
+        assert amended in stored and detached in stored
+        assert not spool.exists() and read_spool(spool) == []
+        print(f"✓ Drained {summary['ingested']} commits, including the detached-HEAD commit")
+
+    print("✅ Spool fallback test passed\n")
+
+
+def test_socket_delivery():
+    """Test that a running daemon receives events and ingests them in batches"""
+    print("TEST: Socket Delivery")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path, paths = _setup(tmp)
+        install_hooks(repo_path, **paths)
+        db_path = Path(tmp) / 'devflow.db'
+        daemon = IngestDaemon(Database(db_path), batch_interval=0.2, **paths)
+        batches = []
+
+        thread = threading.Thread(target=daemon.serve, kwargs={'on_batch': batches.append})
+        thread.start()
+        try:
+            assert _wait_for(paths['socket_path'].exists)
+            try:
+                IngestDaemon(Database(db_path), **paths).serve()
+                assert False, "second daemon started"
+            except RuntimeError:
+                pass
+            print("✓ A second daemon refuses to take over the socket")
+
+            shas = [commit(repo_path, f'feat: live {i}') for i in range(3)]
+            # A branch sync may pick up later commits before their own events arrive
+            assert _wait_for(lambda: sum(batch['events'] for batch in batches) == 3)
+            assert set(shas) <= _stored_shas(db_path)
+            assert not paths['spool_path'].exists()
+            print(f"✓ 3 commits delivered over the socket in {len(batches)} batch(es)")
+
+            watermark = Database(db_path).get_watermark(str(repo_path.resolve()), 'main')
+            assert watermark['last_sha'] == shas[-1]
+            assert watermark['covered_since'] <= datetime.now() - timedelta(days=29)
+            print("✓ Branch watermark advanced to the new HEAD")
+        finally:
+            daemon.stop()
+            thread.join(5)
+
+        assert not paths['socket_path'].exists()
+
+    print("✅ Socket delivery test passed\n")
+
+
+def test_hook_latency():
+    """Test that a hook hands off its event in well under 20 ms"""
+    print("TEST: Hook Latency")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path, paths = _setup(tmp)
+        install_hooks(repo_path, **paths)
+        hook = repo_path / '.git' / 'hooks' / 'post-commit'
+
+        timings = []
+        for _ in range(7):
+            start = time.perf_counter()
+            subprocess.run([str(hook)], cwd=repo_path, check=True)
+            timings.append((time.perf_counter() - start) * 1000)
+            # Let the background client finish before the next run
+            time.sleep(0.3)
+
+        assert statistics.median(timings) < 20, timings
+        print(f"✓ Median hook time {statistics.median(timings):.1f} ms")
+
+    print("✅ Hook latency test passed\n")
+
+
+if __name__ == '__main__':
+    test_hook_installation()
+    test_spool_fallback()
+    test_socket_delivery()
+    test_hook_latency()
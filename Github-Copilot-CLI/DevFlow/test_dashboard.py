@@ -0,0 +1,90 @@
+"""
+Test suite for the live dashboard
+Verifies ref watching, incremental refresh and rendered metrics
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from rich.console import Console
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, create_synthetic_repo, git
+from src.dashboard import LiveDashboard, RefWatcher
+from src.database import Database
+from src.git_analyzer import GitAnalyzer
+
+
+def test_ref_watcher():
+    """Test that only ref updates are reported as changes"""
+    print("TEST: Ref Watcher")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=5, files=3, days=2)
+        watcher = RefWatcher(GitAnalyzer(repo_path).repo)
+
+        assert watcher.changed() is True
+        assert watcher.changed() is False
+        (repo_path / 'untracked.txt').write_text('not a ref\n')
+        assert watcher.changed() is False
+        print("✓ Working tree edits do not trigger a refresh")
+
+        commit(repo_path, 'new commit', {'new.txt': 'new commit\nsecond line\n'})
+        assert watcher.changed() is True
+        git(repo_path, 'branch', 'feature/nested')
+        assert watcher.changed() is True
+        git(repo_path, 'pack-refs', '--all')
+        assert watcher.changed() is True and watcher.changed() is False
+        print("✓ Commits, nested branches and packed refs are detected")
+
+    print("✅ Ref watcher test passed\n")
+
+
+def test_incremental_refresh():
+    """Test that refreshes ingest only new commits and update today's metrics"""
+    print("TEST: Incremental Refresh")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=40, files=10, authors=3, days=10)
+        db = Database(Path(tmp) / 'devflow.db')
+        dashboard = LiveDashboard(GitAnalyzer(repo_path), db, refresh=1)
+
+        assert dashboard.refresh() is True
+        assert dashboard.last_sync['mode'] == 'full'
+        before = dict(dashboard.metrics)
+        assert before['branch'] == 'main' and before['total_branches'] == 1
+        assert dashboard.refresh() is False
+        print(f"✓ Initial snapshot ({before['commits_today']} commits today); idle refresh does no work")
+
+        commit(repo_path, 'feat: live update', {'live.txt': 'feat: live update\nsecond line\n'})
+        assert dashboard.refresh() is True
+        assert dashboard.last_sync['mode'] == 'incremental' and dashboard.last_sync['ingested'] == 1
+        assert dashboard.metrics['commits_today'] == before['commits_today'] + 1
+        assert dashboard.metrics['insertions_today'] == before['insertions_today'] + 2
+        assert dashboard.metrics['last_commit']['summary'] == 'feat: live update'
+        print("✓ New commit ingested incrementally and counted")
+
+        git(repo_path, 'checkout', '-q', '-b', 'feature')
+        assert dashboard.refresh() is True
+        assert dashboard.metrics['branch'] == 'feature'
+        assert dashboard.metrics['total_branches'] == 2 and dashboard.metrics['active_branches'] == 2
+        print("✓ Branch switch and new branch picked up")
+
+        console = Console(record=True, width=120)
+        console.print(dashboard.render())
+        text = console.export_text()
+        assert "Today's Commits" in text and str(dashboard.metrics['commits_today']) in text
+        assert 'feat: live update' in text and '2 of 2' in text and 'Mode: live' in text
+        print("✓ Rendered layout shows the metrics")
+
+    print("✅ Incremental refresh test passed\n")
+
+
+if __name__ == '__main__':
+    test_ref_watcher()
+    test_incremental_refresh()
@@ -0,0 +1,94 @@
+"""
+Test suite for the persistent database connection
+Verifies WAL tuning, transaction nesting and reads during an open write
+"""
+
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.database import Database, get_database
+from src.history import HistoryTracker
+
+
+def test_connection_tuning():
+    """Test that one tuned connection is reused per thread"""
+    print("TEST: Connection Tuning")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        conn = db.connection
+
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        assert conn.execute('PRAGMA cache_size').fetchone()[0] == -Database.CACHE_SIZE_KB
+        print("✓ WAL, synchronous=NORMAL and page cache applied")
+
+        db.get_commit_stats()
+        assert db.connection is conn
+        print("✓ Connection reused across calls")
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db.connection))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+        print("✓ Each thread gets its own connection")
+
+        assert get_database(Path(tmp) / 'devflow.db') is get_database(Path(tmp) / 'devflow.db')
+        print("✓ Shared instance per database path")
+
+        db.close()
+
+    print("✅ Connection tuning test passed\n")
+
+
+def test_transactions_and_concurrent_reads():
+    """Test nested rollback and readers while a write is open"""
+    print("TEST: Transactions and Concurrent Reads")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'devflow.db'
+        writer = Database(db_path)
+        reader = Database(db_path)
+        since = datetime(2024, 1, 1)
+
+        try:
+            with writer._get_connection():
+                writer.set_watermark('/repo', 'main', 'a' * 40, since)
+                raise RuntimeError('abort')
+        except RuntimeError:
+            pass
+        assert writer.get_watermark('/repo', 'main') is None
+        print("✓ Nested calls roll back with the outer transaction")
+
+        writer.set_watermark('/repo', 'main', 'a' * 40, since)
+
+        with writer._get_connection():
+            writer.set_watermark('/repo', 'main', 'b' * 40, since)
+            # The write lock is held; WAL still lets readers see the last commit
+            assert reader.get_watermark('/repo', 'main')['last_sha'] == 'a' * 40
+        assert reader.get_watermark('/repo', 'main')['last_sha'] == 'b' * 40
+        print("✓ Readers are not blocked by an open write")
+
+        tracker = HistoryTracker()
+        for command in ['git status', 'git status', 'ls']:
+            tracker.history_data.append(command)
+        assert tracker.save_to_database(db_path) == 2
+        rows = reader.connection.execute('SELECT command, frequency FROM command_history').fetchall()
+        assert dict((row['command'], row['frequency']) for row in rows) == {'git status': 2, 'ls': 1}
+        print("✓ Shell history is saved through the shared connection")
+
+    print("✅ Transaction test passed\n")
+
+
+if __name__ == '__main__':
+    test_connection_tuning()
+    test_transactions_and_concurrent_reads()
@@ -4,6 +4,7 @@ Test script for DevFlow export functionality
 """
 
 import sys
+import tempfile
 from pathlib import Path
 
 # Add parent directory to path
@@ -16,10 +17,13 @@ def test_export():
     print("DevFlow Export Test")
     print("=" * 50)
     
+    # Write to a scratch directory so the committed sample data stays untouched
+    output_dir = tempfile.TemporaryDirectory()
+    
     try:
         # Initialize exporter
         print("\n1. Initializing exporter...")
-        exporter = AnalyticsExporter()
+        exporter = AnalyticsExporter(output_dir=output_dir.name)
         print(f"   Output directory: {exporter.output_dir}")
         
         # Create output directory
@@ -67,7 +71,6 @@ def test_export():
         
         print("\n" + "=" * 50)
         print("✓ Export test completed successfully!")
-        print(f"\nFiles are in: {exporter.output_dir}")
         
         return True
     
@@ -76,6 +79,9 @@ def test_export():
         import traceback
         traceback.print_exc()
         return False
+    
+    finally:
+        output_dir.cleanup()
 
 if __name__ == '__main__':
     success = test_export()
@@ -0,0 +1,85 @@
+"""
+Test suite for the one-pass export pipeline
+Verifies export_all walks history once and matches per-export results
+"""
+
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.exporter import AnalyticsExporter
+from src.git_analyzer import GitAnalyzer
+from src.git_backend import BACKENDS, backend_name
+
+
+def test_export_all_single_walk():
+    """Test that all JSON artifacts come from one history walk"""
+    print("TEST: Single Walk Export")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = create_synthetic_repo(tmp / 'repo', commits=80, files=12, authors=3, days=300)
+
+        walks = []
+        backend = BACKENDS[backend_name()]
+        original_iter = backend.iter_commits
+
+        def counting_iter(self, *args, **kwargs):
+            walks.append(kwargs)
+            return original_iter(self, *args, **kwargs)
+
+        backend.iter_commits = counting_iter
+        try:
+            exporter = AnalyticsExporter(output_dir=tmp / 'out', db_path=tmp / 'devflow.db', repo_path=repo_path)
+            exporter.export_all(days=30)
+        finally:
+            backend.iter_commits = original_iter
+
+        assert len(walks) == 1, f"Expected 1 history walk, got {len(walks)}"
+        print(f"✓ Five artifacts exported from one {backend.name} history walk")
+
+        heatmap = json.loads((tmp / 'out' / 'commit-analytics.json').read_text())['heatmapData']
+        expected = len(GitAnalyzer(repo_path).get_commit_history(days=364))
+        assert sum(cell['count'] for cell in heatmap) == expected
+        print(f"✓ Heatmap counts all {expected} commits of the 52-week window")
+
+        sparkline = json.loads((tmp / 'out' / 'productivity-summary.json').read_text())['sparklineData']
+        first_day = (datetime.now() - timedelta(days=13)).date()
+        expected = sum(
+            1 for commit in GitAnalyzer(repo_path).get_commit_history(days=14)
+            if commit['timestamp'].date() >= first_day
+        )
+        assert sum(point['commits'] for point in sparkline) == expected
+        print(f"✓ Sparkline counts all {expected} commits of the 14-day window")
+
+    print("✅ Single walk export test passed\n")
+
+
+def test_narrowed_session_matches_direct_walk():
+    """Test that narrowing a long scan equals walking the short window"""
+    print("TEST: Narrowed Session")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=60, files=10, days=120)
+        analyzer = GitAnalyzer(repo_path)
+
+        narrowed = analyzer.create_session(days=364).narrow(30)
+        assert narrowed.days == 30
+        assert analyzer.get_commit_history(session=narrowed) == analyzer.get_commit_history(days=30)
+        assert analyzer.get_hotspot_files(session=narrowed) == analyzer.get_hotspot_files(days=30)
+        print("✓ 30-day window derived from 364-day scan")
+
+    print("✅ Narrowed session test passed\n")
+
+
+if __name__ == '__main__':
+    test_export_all_single_walk()
+    test_narrowed_session_matches_direct_walk()
@@ -0,0 +1,116 @@
+"""
+Test suite for export file writes
+Verifies content-hash skipping, atomic writes, compact/gzip output and the manifest
+"""
+
+import gzip
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, create_synthetic_repo
+from src.exporter import AnalyticsExporter, MANIFEST_FILE, atomic_write, content_hash
+
+
+EXPORT_FILES = [
+    'productivity-summary.json',
+    'file-hotspots.json',
+    'commit-analytics.json',
+    'command-usage.json',
+    'insights.json',
+]
+
+
+def _snapshot(out):
+    return {path.name: (path.stat().st_ino, path.stat().st_mtime_ns) for path in out.iterdir()}
+
+
+def test_content_hash_skip():
+    """Test that unchanged exports are not rewritten and changed ones are"""
+    print("TEST: Content Hash Skip")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = create_synthetic_repo(tmp / 'repo', commits=40, files=8, authors=2, days=60)
+        out = tmp / 'out'
+
+        first = AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path)
+        result = first.export_all(days=30)
+        assert sorted(result['files_written']) == sorted(EXPORT_FILES)
+        manifest = json.loads((out / MANIFEST_FILE).read_text())
+        assert sorted(manifest['files']) == sorted(EXPORT_FILES)
+        for name in EXPORT_FILES:
+            data = json.loads((out / name).read_text())
+            assert manifest['files'][name]['bytes'] == (out / name).stat().st_size
+            if name != 'insights.json':
+                assert manifest['files'][name]['hash'] == content_hash(data)
+        print("✓ First export writes every file and records its hash")
+
+        # The first run also fills the database the productivity summary reads
+        AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path).export_all(days=30)
+        before = _snapshot(out)
+        second = AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path)
+        result = second.export_all(days=30)
+        assert result['files_written'] == [] and sorted(result['files_unchanged']) == sorted(EXPORT_FILES)
+        assert _snapshot(out) == before
+        print("✓ Re-export with identical analytics touches no file, manifest included")
+
+        commit(repo_path, 'feat: new work', author=('New', 'new@example.com'))
+        third = AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path)
+        third.export_all(days=30)
+        assert 'commit-analytics.json' in third.written and 'manifest.json' not in third.written
+        assert _snapshot(out)[MANIFEST_FILE] != before[MANIFEST_FILE]
+        assert not [path for path in out.iterdir() if path.name.endswith('.tmp')]
+        print(f"✓ New commit rewrites {len(third.written)} files atomically, no temp files left")
+
+    print("✅ Content hash skip test passed\n")
+
+
+def test_compact_and_gzip():
+    """Test compact encoding, gzip sidecars and switching modes"""
+    print("TEST: Compact And Gzip")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = create_synthetic_repo(tmp / 'repo', commits=30, files=6, days=30)
+        out = tmp / 'out'
+
+        indented = AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path)
+        indented.export_commit_analytics_json()
+        indented_size = (out / 'commit-analytics.json').stat().st_size
+
+        compact = AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path,
+                                    compact=True, gzip_sidecar=True)
+        data = compact.export_commit_analytics_json()
+        raw = (out / 'commit-analytics.json').read_bytes()
+        assert compact.written == ['commit-analytics.json']
+        assert b'\n' not in raw and len(raw) < indented_size
+        assert gzip.decompress((out / 'commit-analytics.json.gz').read_bytes()) == raw
+        assert json.loads(raw)['heatmapData'] == data['heatmapData']
+        entry = json.loads((out / MANIFEST_FILE).read_text())['files']['commit-analytics.json']
+        assert entry['encoding'] == 'compact' and entry['gzip'] is True
+        print(f"✓ Compact file {len(raw):,} bytes (indented {indented_size:,}), gzip sidecar matches")
+
+        back = AnalyticsExporter(output_dir=out, db_path=tmp / 'devflow.db', repo_path=repo_path)
+        back.export_commit_analytics_json()
+        assert back.written == ['commit-analytics.json']
+        assert not (out / 'commit-analytics.json.gz').exists()
+        print("✓ Switching encoding rewrites the file and drops the stale sidecar")
+
+        atomic_write(out / 'plain.txt', b'one')
+        atomic_write(out / 'plain.txt', b'two')
+        assert (out / 'plain.txt').read_bytes() == b'two'
+        print("✓ atomic_write replaces file content")
+
+    print("✅ Compact and gzip test passed\n")
+
+
+if __name__ == '__main__':
+    test_content_hash_skip()
+    test_compact_and_gzip()
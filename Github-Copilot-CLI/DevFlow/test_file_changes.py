@@ -0,0 +1,102 @@
+"""
+Test suite for the file_changes edge table
+Verifies FileTracker answers from SQL match the git-walking implementation
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.database import Database
+from src.file_tracker import FileTracker
+from src.git_analyzer import GitAnalyzer
+
+
+def _normalized(rows):
+    # Ties in change count have no defined order in the git implementation
+    rows = [{**row, 'authors': sorted(row['authors'])} for row in rows]
+    return sorted(rows, key=lambda row: (-row['changes'], row['file']))
+
+
+def test_file_tracker_parity():
+    """Test that SQL-backed FileTracker queries match git history walks"""
+    print("TEST: FileTracker Parity")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=80, files=12, authors=4, days=20)
+        db = Database(Path(tmp) / 'devflow.db')
+
+        git_tracker = FileTracker(repo_path)
+        sql_tracker = FileTracker(repo_path, db=db)
+
+        hot = git_tracker.identify_danger_zones(threshold=1, days=30)
+        assert hot, "synthetic repo should have changed files"
+        path = hot[0]['file']
+
+        assert _normalized(sql_tracker.identify_danger_zones(threshold=5, days=30)) == \
+            _normalized(git_tracker.identify_danger_zones(threshold=5, days=30))
+        assert _normalized(sql_tracker.identify_danger_zones(threshold=1, days=30, extension_filter='.py')) == \
+            _normalized(git_tracker.identify_danger_zones(threshold=1, days=30, extension_filter='.py'))
+        print(f"✓ Danger zones match ({len(hot)} files)")
+
+        sql_churn = sql_tracker.get_file_churn_rate(path, days=30)
+        git_churn = git_tracker.get_file_churn_rate(path, days=30)
+        assert sorted(sql_churn.pop('authors')) == sorted(git_churn.pop('authors'))
+        assert sql_churn == git_churn
+        print(f"✓ Churn rate matches for {path}")
+
+        sql_timeline = sql_tracker.get_file_change_timeline(path)
+        assert [e['sha'] for e in sql_timeline] == [e['sha'] for e in git_tracker.get_file_change_timeline(path)]
+        assert sql_tracker.get_file_change_timeline(path, limit=3) == sql_timeline[:3]
+        sql_stats = sql_tracker.get_file_statistics(path)
+        git_stats = git_tracker.get_file_statistics(path)
+        assert sorted(sql_stats.pop('authors')) == sorted(git_stats.pop('authors'))
+        assert sql_stats == git_stats
+        print(f"✓ Timeline matches ({len(sql_timeline)} commits)")
+
+        sql_recent = sql_tracker.get_recently_changed_files(days=30, limit=50)
+        git_recent = git_tracker.get_recently_changed_files(days=30, limit=50)
+        assert {r['file']: r['changes'] for r in sql_recent} == {r['file']: r['changes'] for r in git_recent}
+        print(f"✓ Recently changed files match ({len(sql_recent)} files)")
+
+    print("✅ FileTracker parity test passed\n")
+
+
+def test_hotspots_served_from_database():
+    """Test that session hotspots come from stored file changes"""
+    print("TEST: Database Hotspots")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=40, files=10, days=10)
+        db_path = Path(tmp) / 'devflow.db'
+        db = Database(db_path)
+
+        analyzer = GitAnalyzer(repo_path)
+        expected = analyzer.get_hotspot_files(days=30, limit=10)
+
+        GitAnalyzer(repo_path).create_session(days=30, db=db).commits
+        session = GitAnalyzer(repo_path).create_session(days=30, db=db)
+        assert analyzer.get_hotspot_files(limit=10, session=session) == expected
+        assert session.ingest_result['mode'] == 'noop'
+        print("✓ Hotspots served from file_changes without reading git")
+
+        with sqlite3.connect(db_path) as conn:
+            plan = conn.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM file_changes WHERE path = ? AND ts >= ?', ('a', 0)
+            ).fetchall()
+        assert any('idx_file_changes_path' in row[-1] for row in plan), plan
+        print("✓ Path lookups use the (path, ts) index")
+
+    print("✅ Database hotspots test passed\n")
+
+
+if __name__ == '__main__':
+    test_file_tracker_parity()
+    test_hotspots_served_from_database()
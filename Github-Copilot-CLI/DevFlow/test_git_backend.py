@@ -0,0 +1,153 @@
+"""
+Test suite for the pluggable git backends
+Runs the gitpython and pygit2 backends through the same conformance checks
+"""
+
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, create_synthetic_repo, git
+from src.git_backend import BACKEND_ENV, GitBackend, GitPythonBackend, backend_name, get_backend, pygit2
+
+
+_CLOCK = itertools.count()
+
+
+def _dated():
+    """Environment with a fresh commit date (git and libgit2 break same-second ties differently)"""
+    date = (datetime.now() - timedelta(days=30, minutes=-next(_CLOCK))).strftime('%Y-%m-%dT%H:%M:%S')
+    return {**os.environ, 'GIT_AUTHOR_DATE': date, 'GIT_COMMITTER_DATE': date}
+
+
+def _make_edge_repo(path):
+    """Binary file, deletion, rename and a merge commit"""
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(path)], check=True)
+    commit(path, 'feat: start', {'app.py': 'a\n' * 5, 'logo.png': b'\x89PNG\0\1\2', 'old.txt': 'x\n'}, env=_dated())
+    git(path, 'mv', 'old.txt', 'new.txt')
+    commit(path, 'chore: rename and binary', {'logo.png': b'\x89PNG\0\3'}, env=_dated())
+    git(path, 'checkout', '-q', '-b', 'side')
+    commit(path, 'feat: side', {'side.py': 's\n' * 3}, env=_dated())
+    git(path, 'checkout', '-q', 'main')
+    commit(path, 'feat: main', {'app.py': 'a\n' * 5 + 'b\n'}, env=_dated())
+    git(path, 'merge', '-q', '--no-ff', '-m', 'merge side', 'side', env=_dated())
+    git(path, 'rm', '-q', 'new.txt')
+    commit(path, 'chore: delete', {}, env=_dated())
+    return path
+
+
+def _assert_same(repo_path, label):
+    """Compare every backend operation of gitpython and pygit2 on one repository"""
+    cli, lib = get_backend(repo_path, 'gitpython'), get_backend(repo_path, 'pygit2')
+
+    tree = cli.tree()
+    assert tree and lib.tree() == tree
+    some = sorted(tree)[:3]
+    assert lib.tree('HEAD', some + ['missing.py']) == cli.tree('HEAD', some + ['missing.py'])
+
+    shas = git(repo_path, 'rev-list', 'HEAD').split()
+    walks = [
+        {},
+        {'rev': f'{shas[len(shas) // 2]}..HEAD'},
+        {'rev': [shas[0], shas[-1]], 'walk': False},
+        {'since': datetime.now() - timedelta(days=20)},
+        {'until': datetime.now() - timedelta(days=20)},
+    ] + [{'paths': [path]} for path in some]
+
+    for kwargs in walks:
+        expected = list(cli.iter_commits(**kwargs))
+        assert list(lib.iter_commits(**kwargs)) == expected, f"{label}: iter_commits({kwargs})"
+    print(f"✓ {label}: {len(walks)} walks, {len(shas)} commits identical")
+
+    for sha in shas[:10]:
+        assert lib.numstat(sha) == cli.numstat(sha)
+    for path in tree:
+        assert lib.blame(path) == cli.blame(path), f"{label}: blame {path}"
+    assert lib.blame('missing.py') is None and cli.blame('missing.py') is None
+    print(f"✓ {label}: numstat, tree and blame of {len(tree)} files identical")
+
+
+def test_conformance():
+    """Test that both backends return identical results"""
+    print("TEST: Backend Conformance")
+    print("-" * 60)
+
+    if pygit2 is None:
+        print("⚠ pygit2 not installed; only the gitpython backend is available")
+        print("✅ Backend conformance test passed\n")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = create_synthetic_repo(Path(tmp) / 'synthetic', commits=120, files=15, days=60)
+        _assert_same(synthetic, 'synthetic')
+
+        edge = _make_edge_repo(Path(tmp) / 'edge')
+        _assert_same(edge, 'edge cases')
+
+        merge = git(edge, 'rev-parse', 'HEAD~1').strip()
+        assert get_backend(edge, 'pygit2').numstat(merge) == {'side.py': {'insertions': 3, 'deletions': 0, 'lines': 3}}
+        print("✓ Merges are diffed against their first parent")
+
+    print("✅ Backend conformance test passed\n")
+
+
+def test_backend_selection():
+    """Test explicit, environment and automatic backend selection"""
+    print("TEST: Backend Selection")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=5, files=3, days=5)
+        saved = os.environ.pop(BACKEND_ENV, None)
+        try:
+            assert backend_name() == 'gitpython'
+            assert get_backend(repo_path).name == 'gitpython'
+            print("✓ auto prefers the streaming git log backend")
+
+            os.environ[BACKEND_ENV] = 'GitPython'
+            assert backend_name() == 'gitpython'
+            assert backend_name('auto') == 'gitpython'
+            print(f"✓ {BACKEND_ENV} and explicit names are honoured")
+        finally:
+            os.environ.pop(BACKEND_ENV, None)
+            if saved is not None:
+                os.environ[BACKEND_ENV] = saved
+
+        try:
+            get_backend(repo_path, 'hg')
+            assert False, "Unknown backend accepted"
+        except ValueError:
+            print("✓ Unknown backend rejected")
+
+        class PartialBackend(GitBackend):
+            name = 'partial'
+
+            def iter_commits(self, rev='HEAD', since=None, until=None, walk=True, paths=None):
+                return GitPythonBackend(self.repo_path).iter_commits(rev, since, until, walk, paths)
+
+        try:
+            PartialBackend(repo_path)
+            assert False, "Backend without numstat, tree and blame accepted"
+        except TypeError:
+            print("✓ Backends missing an operation fail on creation")
+
+        if pygit2 is not None:
+            try:
+                get_backend(Path(tmp), 'pygit2')
+                assert False, "Non-repository accepted"
+            except ValueError:
+                print("✓ Non-repository rejected")
+
+    print("✅ Backend selection test passed\n")
+
+
+if __name__ == '__main__':
+    test_conformance()
+    test_backend_selection()
@@ -0,0 +1,138 @@
+"""
+Test suite for the incremental shell history reader
+Verifies encoding sniffing, checkpointed syncs and parity with a full parse
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import history_reader
+from src.history import HistoryTracker
+from src.history_reader import HistoryReader, sniff_encoding
+
+COMMANDS = ['git status', 'git add .', 'git commit -m "wip"', 'git push', 'ls -la', 'pytest -q']
+
+
+def _history_lines(count, start=0):
+    return [COMMANDS[(i * 7 + i // 3) % len(COMMANDS)] for i in range(start, start + count)]
+
+
+def _append(path, lines, encoding='utf-8'):
+    with open(path, 'ab') as f:
+        f.write(''.join(line + '\n' for line in lines).encode(encoding))
+
+
+def test_sniff_encoding():
+    """Test BOM and heuristic encoding detection"""
+    print("TEST: Encoding Sniffing")
+    print("-" * 60)
+
+    text = 'git status\necho café\n'
+    assert sniff_encoding(b'\xef\xbb\xbf' + text.encode('utf-8')) == ('utf-8', 3)
+    assert sniff_encoding(b'\xff\xfe' + text.encode('utf-16-le')) == ('utf-16-le', 2)
+    assert sniff_encoding(b'\xfe\xff' + text.encode('utf-16-be')) == ('utf-16-be', 2)
+    print("✓ Byte order marks detected")
+
+    assert sniff_encoding(text.encode('utf-16-le')) == ('utf-16-le', 0)
+    assert sniff_encoding(text.encode('utf-16-be')) == ('utf-16-be', 0)
+    assert sniff_encoding(text.encode('utf-8')) == ('utf-8', 0)
+    assert sniff_encoding(text.encode('cp1252'), fallback='cp1252') == ('cp1252', 0)
+    print("✓ BOM-less UTF-16, UTF-8 and legacy encodings detected")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'ConsoleHost_history.txt'
+        path.write_bytes(b'\xff\xfe' + text.encode('utf-16-le') + 'partial'.encode('utf-16-le'))
+        with HistoryReader(path) as reader:
+            assert list(reader.lines()) == ['git status', 'echo café']
+            assert list(reader.lines(include_partial=True))[-1] == 'partial'
+        print("✓ UTF-16 file decoded; unterminated line kept out of the checkpoint")
+
+    print("✅ Encoding sniffing test passed\n")
+
+
+def test_incremental_sync():
+    """Test that later syncs parse only appended lines"""
+    print("TEST: Incremental Sync")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '.bash_history'
+        db_path = Path(tmp) / 'devflow.db'
+        lines = _history_lines(5000)
+        _append(path, lines)
+
+        original_block = history_reader.READ_BLOCK_SIZE
+        history_reader.READ_BLOCK_SIZE = 4096
+        try:
+            tracker = HistoryTracker()
+            result = tracker.sync_history(path, db_path=db_path)
+            assert result == {'new_commands': 5000, 'total_commands': 5000, 'reset': False}, result
+            print("✓ First sync counts the whole file in blocks")
+
+            assert HistoryTracker().sync_history(path, db_path=db_path)['new_commands'] == 0
+            _append(path, _history_lines(300, start=5000) + ['#1700000000', 'make build'])
+            with open(path, 'ab') as f:
+                f.write(b'git sta')
+            result = HistoryTracker().sync_history(path, db_path=db_path)
+            assert result['new_commands'] == 301 and result['total_commands'] == 5301, result
+            print("✓ Later syncs parse only appended lines")
+
+            with open(path, 'ab') as f:
+                f.write(b'tus\n')
+            synced = HistoryTracker()
+            assert synced.sync_history(path, db_path=db_path)['new_commands'] == 1
+            print("✓ A line still being written is counted once complete")
+        finally:
+            history_reader.READ_BLOCK_SIZE = original_block
+
+        parsed = HistoryTracker()
+        assert len(parsed.parse_shell_history(path)) == 5302
+        assert synced.get_top_commands(limit=10) == parsed.get_top_commands(limit=10)
+        assert synced.get_statistics() == parsed.get_statistics()
+        assert synced.suggest_aliases(min_frequency=2) == parsed.suggest_aliases(min_frequency=2)
+        print("✓ Stored counts match a full parse")
+
+    print("✅ Incremental sync test passed\n")
+
+
+def test_rewritten_history():
+    """Test that rotated or rewritten history files are counted again"""
+    print("TEST: Rewritten History")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '.bash_history'
+        db_path = Path(tmp) / 'devflow.db'
+        _append(path, _history_lines(200))
+        HistoryTracker().sync_history(path, db_path=db_path)
+
+        # Same inode, truncated and rewritten (e.g. HISTFILESIZE trimming)
+        with open(path, 'r+b') as f:
+            f.truncate(0)
+        _append(path, ['make build'] * 150 + ['ls -la'] * 60)
+        tracker = HistoryTracker()
+        result = tracker.sync_history(path, db_path=db_path)
+        assert result == {'new_commands': 210, 'total_commands': 210, 'reset': True}, result
+        assert tracker.get_top_commands(limit=2)[0] == {'command': 'make build', 'count': 150, 'percentage': 71.43}
+        print("✓ In-place rewrite detected from the checkpoint tail")
+
+        # Rotated: a new file renamed over the old one
+        rotated = Path(tmp) / 'history.new'
+        _append(rotated, ['pytest -q'] * 40)
+        os.replace(rotated, path)
+        result = HistoryTracker().sync_history(path, db_path=db_path)
+        assert result['reset'] and result['total_commands'] == 40, result
+        print("✓ Rotation detected from the inode")
+
+    print("✅ Rewritten history test passed\n")
+
+
+if __name__ == '__main__':
+    test_sniff_encoding()
+    test_incremental_sync()
+    test_rewritten_history()
@@ -0,0 +1,99 @@
+"""
+Test suite for incremental commit ingestion
+Verifies watermarks, partial re-ingest after rewrites and DB-served windows
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, create_synthetic_repo, git
+from src.database import Database
+from src.git_analyzer import GitAnalyzer
+from src.ingest import IncrementalIngestor
+
+
+def _shas(commits):
+    return sorted(c['hash'] for c in commits)
+
+
+def test_incremental_sync():
+    """Test full, incremental, no-op and rewrite sync modes"""
+    print("TEST: Incremental Sync")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=30, files=10, days=10)
+        db = Database(Path(tmp) / 'devflow.db')
+        since = datetime.now() - timedelta(days=30)
+
+        analyzer = GitAnalyzer(repo_path)
+        ingestor = IncrementalIngestor(analyzer, db)
+
+        result = ingestor.sync(since)
+        assert result['mode'] == 'full' and result['ingested'] == 30, result
+        print("✓ First sync ingests the whole window")
+
+        result = ingestor.sync(since)
+        assert result['mode'] == 'noop' and result['ingested'] == 0, result
+        print("✓ Unchanged branch is a no-op")
+
+        commit(repo_path, 'feat: new a', {'new_a.py': 'feat: new a\n'})
+        commit(repo_path, 'feat: new b', {'new_b.py': 'feat: new b\n'})
+        result = IncrementalIngestor(GitAnalyzer(repo_path), db).sync(since)
+        assert result['mode'] == 'incremental' and result['ingested'] == 2, result
+        print("✓ Only watermark..HEAD ingested after new commits")
+
+        # Rewrite history: drop the two new commits and add a different one
+        git(repo_path, 'reset', '-q', '--hard', 'HEAD~2')
+        commit(repo_path, 'fix: rewritten history', {'rewritten.py': 'fix: rewritten history\n'})
+        analyzer = GitAnalyzer(repo_path)
+        result = IncrementalIngestor(analyzer, db).sync(since)
+        assert result['mode'] == 'rewrite' and result['ingested'] == 1, result
+        print("✓ Rewritten history detected and partially re-ingested")
+
+        served = db.get_branch_commits(ingestor.repo_key, analyzer.default_branch, since)
+        assert _shas(served) == _shas(analyzer.get_commit_history(days=30)), "DB window differs from git"
+        print(f"✓ Database serves the same {len(served)} commits as git")
+
+        result = IncrementalIngestor(analyzer, db).sync(datetime.now() - timedelta(days=60))
+        assert result['mode'] == 'full', result
+        print("✓ Larger window than covered triggers a full re-read")
+
+    print("✅ Incremental sync test passed\n")
+
+
+def test_session_served_from_database():
+    """Test that a database-backed session matches a git-backed one"""
+    print("TEST: Session Served From Database")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=25, files=8, authors=3, days=10)
+        db = Database(Path(tmp) / 'devflow.db')
+
+        analyzer = GitAnalyzer(repo_path)
+        session = analyzer.create_session(days=30, author='dev1', db=db)
+        commits = analyzer.get_commit_history(session=session)
+
+        assert session.ingest_result['mode'] == 'full'
+        assert _shas(commits) == _shas(analyzer.get_commit_history(days=30, author='dev1'))
+        assert analyzer.analyze_commit_patterns(session=session) == \
+            analyzer.analyze_commit_patterns(days=30, author='dev1')
+        print(f"✓ {len(commits)} author-filtered commits served from database")
+
+        second = GitAnalyzer(repo_path).create_session(days=30, author='dev1', db=db)
+        assert _shas(second.commits) == _shas(commits)
+        assert second.ingest_result['mode'] == 'noop'
+        print("✓ Repeat analysis reads nothing from git")
+
+    print("✅ Database session test passed\n")
+
+
+if __name__ == '__main__':
+    test_incremental_sync()
+    test_session_served_from_database()
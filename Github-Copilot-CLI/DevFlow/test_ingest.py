@@ -0,0 +1,151 @@
+"""
+Test suite for single-pass git log ingestion
+Verifies the streaming engine matches the GitPython walk
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, create_synthetic_repo, git
+from src.git_analyzer import GitAnalyzer
+from src.ingest import GitLogIngestor, GitLogError, parse_record
+
+
+def test_parse_record():
+    """Test parsing of a raw git log -z record"""
+    print("TEST: Record Parsing")
+    print("-" * 60)
+
+    raw = (
+        b'abcdef1234567890\x1fJane Doe\x1fjane@example.com\x1f1700000000\x1f'
+        b'feat: add parser\n\nBody text\n\x1f\x00'
+        b'\n3\t1\tsrc/app.py\x00-\t-\tlogo.png\x002\t0\tdir/with space.ts\x00'
+    )
+    record = parse_record(raw)
+
+    assert record['hash'] == 'abcdef1234567890'
+    assert record['short_hash'] == 'abcdef1'
+    assert record['author'] == 'Jane Doe'
+    assert record['message'] == 'feat: add parser\n\nBody text'
+    assert record['files_changed'] == 3
+    assert record['insertions'] == 5
+    assert record['deletions'] == 1
+    assert record['files']['logo.png'] == {'insertions': 0, 'deletions': 0, 'lines': 0}
+    assert 'dir/with space.ts' in record['files']
+    print("✓ Header, body and numstat entries parsed")
+
+    for malformed in (b'abcdef1234567890\x1fJane Doe', raw.replace(b'1700000000', b'soon'),
+                      raw.replace(b'3\t1\t', b'x\t1\t')):
+        try:
+            parse_record(malformed)
+            assert False, "Expected GitLogError"
+        except GitLogError:
+            pass
+    print("✓ Malformed records raise GitLogError")
+
+    print("✅ Record parsing test passed\n")
+
+
+def test_separators_in_message():
+    """Test that record and field separator bytes in a message are kept as text"""
+    print("TEST: Separators In Message")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=5, files=3, days=5)
+        messages = [
+            'msg with \x1e record and \x1f field separators\n\n\x1e' + 'a' * 40 + ' in the body',
+            # A forged record start: separator, full SHA and field separator
+            'forged \x1e' + 'b' * 40 + '\x1fMallory\x1fm@example.com\x1f1700000000\x1fbody',
+        ]
+        for i, message in enumerate(messages):
+            commit(repo_path, message, {f'odd{i}.py': 'print("odd")\n'}, author=('Odd', 'odd@example.com'))
+
+        records = list(GitLogIngestor(repo_path).iter_commits())
+        assert len(records) == 7
+        for i, message in enumerate(messages):
+            record = records[len(messages) - 1 - i]
+            assert record['message'] == message
+            assert record['files'] == {f'odd{i}.py': {'insertions': 1, 'deletions': 0, 'lines': 1}}
+        print("✓ Separator bytes stay inside the message; numstat intact")
+
+        fast = GitAnalyzer(repo_path, use_fast_ingest=True)
+        slow = GitAnalyzer(repo_path, use_fast_ingest=False)
+        assert len(fast.get_commit_history(days=30)) == 7
+        assert fast.get_commit_history(days=30) == slow.get_commit_history(days=30)
+        assert fast.get_hotspot_files(days=30) == slow.get_hotspot_files(days=30)
+        print("✓ Commit history and hotspots identical to the GitPython walk")
+
+    print("✅ Separators in message test passed\n")
+
+
+def test_matches_gitpython():
+    """Test that git log ingestion returns the same data as GitPython"""
+    print("TEST: Parity With GitPython")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=60, files=15, authors=4, days=20)
+
+        # Add a merge commit so first-parent diff handling is covered
+        side = ('Side', 'side@example.com')
+        git(repo_path, 'checkout', '-q', '-b', 'side', 'HEAD~5')
+        commit(repo_path, 'side change', {'side.py': 'print("side")\n'}, author=side)
+        git(repo_path, 'checkout', '-q', 'main')
+        git(repo_path, 'merge', '-q', '--no-edit', 'side', author=side)
+
+        fast = GitAnalyzer(repo_path, use_fast_ingest=True)
+        slow = GitAnalyzer(repo_path, use_fast_ingest=False)
+
+        fast_commits = fast.get_commit_history(days=30)
+        slow_commits = slow.get_commit_history(days=30)
+        assert len(fast_commits) == 62, f"Expected 62 commits, got {len(fast_commits)}"
+        assert fast_commits == slow_commits, "Commit histories differ"
+        print(f"✓ {len(fast_commits)} commits identical")
+
+        assert fast.get_hotspot_files(days=30, limit=20) == slow.get_hotspot_files(days=30, limit=20)
+        print("✓ Hotspot aggregation identical")
+
+        author_commits = fast.get_commit_history(days=30, author='DEV1@')
+        assert author_commits == slow.get_commit_history(days=30, author='DEV1@')
+        assert all(c['email'] == 'dev1@example.com' for c in author_commits)
+        print("✓ Author filter identical")
+
+    print("✅ Parity test passed\n")
+
+
+def test_fallback_to_gitpython():
+    """Test that a failing git log falls back to the GitPython walk"""
+    print("TEST: GitPython Fallback")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=10, files=5, days=5)
+
+        analyzer = GitAnalyzer(repo_path)
+        analyzer.ingestor = GitLogIngestor(repo_path, git_binary='git-does-not-exist')
+
+        try:
+            list(analyzer.ingestor.iter_commits())
+            assert False, "Expected GitLogError"
+        except GitLogError:
+            print("✓ Missing git binary raises GitLogError")
+
+        commits = analyzer.get_commit_history(days=10)
+        assert len(commits) == 10, f"Expected 10 commits, got {len(commits)}"
+        print("✓ History served by GitPython fallback")
+
+    print("✅ Fallback test passed\n")
+
+
+if __name__ == '__main__':
+    test_parse_record()
+    test_separators_in_message()
+    test_matches_gitpython()
+    test_fallback_to_gitpython()
+    print("=" * 60)
+    print("✅ ALL INGEST TESTS PASSED")
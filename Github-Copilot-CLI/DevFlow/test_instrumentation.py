@@ -0,0 +1,123 @@
+"""
+Test suite for per-phase command instrumentation
+Verifies phase counters, stored timings, profiles and the --timings/--profile CLI flags
+"""
+
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.database import Database
+from src.instrumentation import Instrumentation, format_timings
+
+
+def test_phase_counters():
+    """Test that each phase gets its own git calls and database rows"""
+    print("TEST: Phase Counters")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        run = Instrumentation('test', {'flag': True})
+        run.attach(db)
+
+        run.phase('Spawning processes')
+        subprocess.run(['git', '--version'], capture_output=True)
+        subprocess.run([shutil.which('git'), 'version'], capture_output=True)
+        subprocess.run([sys.executable, '-c', 'pass'])
+
+        run.phase('Writing rows')
+        for repo in ('a', 'b', 'c'):
+            db.save_repo_analysis({'repo': repo, 'status': 'ok'})
+
+        run.phase('Reading rows')
+        assert len(db.get_repo_analyses()) == 3
+
+        result = run.finish()
+        spawn, write, read = result['phases']
+        assert spawn['git_calls'] == 2 and write['git_calls'] == 0
+        assert write['rows_written'] == 3 and write['rows_read'] == 0
+        assert read['rows_read'] == 3 and read['rows_written'] == 0
+        print("✓ Git spawns and row counts land in the phase that caused them")
+
+        assert result['rows_written'] == 3 and result['wall_s'] >= spawn['wall_s']
+        assert run.finish() is result
+        assert [row[0] for row in format_timings(result)][-1] == 'Total'
+        print("✓ Run totals sum the phases; finishing twice is harmless")
+
+    print("✅ Phase counters test passed\n")
+
+
+def test_saved_timings_and_profile():
+    """Test that runs are stored with their phases and profiles are loadable"""
+    print("TEST: Saved Timings And Profile")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db = Database(tmp / 'devflow.db')
+        profile = tmp / 'run.prof'
+
+        run = Instrumentation('analyze', {'days': 30}, profile_path=str(profile))
+        run.attach(db)
+        for name in ('First', 'Second'):
+            run.phase(name)
+            sum(range(10000))
+        run_id = run.save()
+        assert run_id is not None
+
+        stored = db.get_command_timings('analyze')
+        assert len(stored) == 1 and stored[0]['id'] == run_id
+        assert stored[0]['args'] == {'days': 30}
+        assert [phase['name'] for phase in stored[0]['phases']] == ['First', 'Second']
+        assert db.get_command_timings('export') == []
+        print("✓ Run and phases stored in order and filtered by command")
+
+        stats = pstats.Stats(str(profile))
+        assert stats.total_calls > 0
+        print(f"✓ Profile written with {stats.total_calls} calls")
+
+    print("✅ Saved timings and profile test passed\n")
+
+
+def test_cli_flags():
+    """Test that export prints the breakdown and writes a profile"""
+    print("TEST: CLI Flags")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = create_synthetic_repo(tmp / 'repo', commits=30, files=6, days=20)
+        profile = tmp / 'export.prof'
+
+        output = subprocess.run(
+            [sys.executable, 'run.py', 'export', '--repo', str(repo_path), '--output', str(tmp / 'out'),
+             '--timings', '--profile', str(profile)],
+            cwd=Path(__file__).parent, env={**os.environ, 'HOME': str(tmp), 'COLUMNS': '200'},
+            capture_output=True, text=True, check=True
+        ).stdout
+
+        assert 'Phase Timings' in output and 'Scanning repository history' in output
+        assert 'Exporting insights' in output and 'Total' in output
+        assert profile.exists()
+        print("✓ --timings prints every phase, --profile writes the stats file")
+
+        stored = Database(tmp / '.devflow' / 'devflow.db').get_command_timings('export')
+        assert len(stored) == 1 and stored[0]['git_calls'] >= 1
+        print(f"✓ Export run stored with {len(stored[0]['phases'])} phases")
+
+    print("✅ CLI flags test passed\n")
+
+
+if __name__ == '__main__':
+    test_phase_counters()
+    test_saved_timings_and_profile()
+    test_cli_flags()
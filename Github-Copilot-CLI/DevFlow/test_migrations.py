@@ -0,0 +1,134 @@
+"""
+Test suite for versioned schema migrations
+Verifies the online v0 -> v2 upgrade and index use of the v2 queries
+"""
+
+import sys
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import migrations
+from src.database import Database
+
+
+def _create_legacy_database(db_path, count):
+    """Create a pre-versioning devflow.db with ISO-string commit dates"""
+    base = datetime.now() - timedelta(days=10)
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE commits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sha TEXT UNIQUE NOT NULL,
+            short_sha TEXT NOT NULL,
+            author TEXT NOT NULL,
+            email TEXT NOT NULL,
+            message TEXT NOT NULL,
+            commit_date TIMESTAMP NOT NULL,
+            files_changed INTEGER DEFAULT 0,
+            insertions INTEGER DEFAULT 0,
+            deletions INTEGER DEFAULT 0,
+            quality_score REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_commits_date ON commits(commit_date)')
+    conn.execute('CREATE INDEX idx_commits_author ON commits(author)')
+    conn.executemany('''
+        INSERT INTO commits (sha, short_sha, author, email, message, commit_date,
+                             files_changed, insertions, deletions, quality_score)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (f'{i:040x}', f'{i:07x}', f'Dev {i % 3}', f'DEV{i % 3}@Example.com', 'feat: legacy',
+         (base + timedelta(minutes=37 * i)).isoformat(), 1, i % 9, i % 4, 50.0)
+        for i in range(count)
+    ])
+    conn.commit()
+    conn.close()
+    return base
+
+
+def test_online_migration():
+    """Test upgrading a legacy database in chunks, including resuming"""
+    print("TEST: Online Migration")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'devflow.db'
+        _create_legacy_database(db_path, 300)
+
+        original_chunk = migrations.BACKFILL_CHUNK_SIZE
+        migrations.BACKFILL_CHUNK_SIZE = 64
+        try:
+            db = Database(db_path)
+        finally:
+            migrations.BACKFILL_CHUNK_SIZE = original_chunk
+
+        conn = db.connection
+        assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+        assert conn.execute('SELECT COUNT(*) FROM commits WHERE ts IS NULL OR author_id IS NULL').fetchone()[0] == 0
+        for commit_date, ts in conn.execute('SELECT commit_date, ts FROM commits'):
+            assert int(datetime.fromisoformat(commit_date).timestamp()) == ts
+        print("✓ Epoch timestamps and author ids backfilled in chunks")
+
+        authors = conn.execute('SELECT name, email_key FROM authors ORDER BY name').fetchall()
+        assert [tuple(row) for row in authors] == [(f'Dev {i}', f'dev{i}@example.com') for i in range(3)]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert 'idx_commits_date' not in indexes and 'idx_commits_author' not in indexes
+        print("✓ Authors normalized and superseded indexes dropped")
+
+        stats = db.get_commit_stats(days=30)
+        assert stats['total_commits'] == 300 and stats['unique_authors'] == 3
+        assert db.get_commit_stats(days=30, author='dev 1')['total_commits'] == 100
+        print("✓ Readers work on the migrated database")
+
+        # Simulate an upgrade interrupted half-way through the backfill
+        conn.execute('UPDATE commits SET ts = NULL WHERE id % 2 = 0')
+        conn.execute('PRAGMA user_version = 1')
+        conn.commit()
+
+        Database(db_path)
+        assert conn.execute('SELECT COUNT(*) FROM commits WHERE ts IS NULL').fetchone()[0] == 0
+        assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+        print("✓ Interrupted migration resumes")
+
+    print("✅ Online migration test passed\n")
+
+
+def test_query_plans_use_indexes():
+    """Test that window and window-plus-author queries use covering indexes"""
+    print("TEST: Query Plans")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        since = datetime.now() - timedelta(days=30, minutes=17)
+
+        def plan(sql, params):
+            rows = db.connection.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+            return ' | '.join(row[-1] for row in rows)
+
+        details = plan(*db._commit_rollup_window(since))
+        assert 'USING COVERING INDEX idx_commits_ts_cover' in details, details
+        assert 'SCAN commits' not in details, details
+        print("✓ Window query uses the (ts, ...) covering index")
+
+        details = plan(*db._commit_rollup_window(since, author='dev'))
+        assert 'USING COVERING INDEX idx_commits_author_ts' in details, details
+        assert 'SCAN commits' not in details, details
+        print("✓ Window-plus-author query uses the (author_id, ts, ...) covering index")
+
+        details = plan('SELECT commit_date FROM commits WHERE ts >= ? ORDER BY ts LIMIT 1', [0])
+        assert 'idx_commits_ts_cover' in details and 'TEMP B-TREE' not in details, details
+        print("✓ First/last commit lookups are index seeks")
+
+    print("✅ Query plan test passed\n")
+
+
+if __name__ == '__main__':
+    test_online_migration()
+    test_query_plans_use_indexes()
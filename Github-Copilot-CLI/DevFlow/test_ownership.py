@@ -0,0 +1,125 @@
+"""
+Test suite for the blame-based ownership index
+Verifies porcelain parsing, bus factor, the blob-SHA cache and exported contributor counts
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import commit, git
+from src.database import Database
+from src.exporter import AnalyticsExporter
+from src.git_analyzer import GitAnalyzer
+from src.ownership import OwnershipIndex, parse_blame, summarize_ownership
+
+
+ALICE = ('Alice', 'alice@example.com')
+BOB = ('Bob', 'bob@example.com')
+CAROL = ('Carol', 'carol@example.com')
+
+
+def _make_repo(path):
+    """Shared file written by Alice and Bob, solo file written by Alice only"""
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(path)], check=True)
+    commit(path, 'feat: start', {'src/shared.py': 'a\n' * 6, 'src/solo.py': 'x\n' * 4}, author=ALICE)
+    commit(path, 'feat: extend', {'src/shared.py': 'a\n' * 6 + 'b\n' * 4}, author=BOB)
+    commit(path, 'feat: temp', {'src/gone.py': 'g\n'}, author=ALICE)
+    git(path, 'rm', '-q', 'src/gone.py')
+    commit(path, 'chore: remove temp', {}, author=ALICE)
+    return path
+
+
+def test_parse_and_summarize():
+    """Test porcelain parsing and the bus factor definition"""
+    print("TEST: Parse And Summarize")
+    print("-" * 60)
+
+    sha_a, sha_b = 'a' * 40, 'b' * 40
+    output = (
+        f"{sha_a} 1 1 2\nauthor Alice\nauthor-mail <a@x>\nsummary one\nfilename f.py\n\tline 1\n"
+        f"{sha_a} 2 2\n\tline 2\n"
+        f"{sha_b} 1 3 1\nauthor Bob\nsummary two\nfilename f.py\n\tauthor line content\n"
+        f"{sha_a} 3 4 1\n\tline 4\n"
+    ).encode()
+    assert parse_blame(output) == {'Alice': 3, 'Bob': 1}
+    print("✓ Lines counted per author, repeated commits reuse their header")
+
+    assert summarize_ownership({'Alice': 3, 'Bob': 1})['bus_factor'] == 1
+    assert summarize_ownership({'Alice': 5, 'Bob': 5})['bus_factor'] == 2
+    assert summarize_ownership({'A': 4, 'B': 3, 'C': 3})['bus_factor'] == 2
+    empty = summarize_ownership({})
+    assert empty['contributors'] == 0 and empty['bus_factor'] == 0
+    print("✓ Bus factor is the fewest authors owning more than half the lines")
+
+    print("✅ Parse and summarize test passed\n")
+
+
+def test_blob_sha_cache():
+    """Test that unchanged files are served from the cache and changed ones re-blamed"""
+    print("TEST: Blob SHA Cache")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = _make_repo(tmp / 'repo')
+        db = Database(tmp / 'devflow.db')
+        paths = ['src/shared.py', 'src/solo.py', 'src/gone.py']
+
+        first = OwnershipIndex(GitAnalyzer(repo_path), db, workers=2)
+        owners = first.ownership(paths)
+        assert first.blamed == 2 and first.cached == 0
+        assert 'src/gone.py' not in owners
+        assert owners['src/shared.py']['contributors'] == 2 and owners['src/shared.py']['bus_factor'] == 1
+        assert owners['src/shared.py']['owners'] == ['Alice', 'Bob']
+        assert owners['src/solo.py']['contributors'] == 1
+        print("✓ Cold run blames present files; deleted file left out")
+
+        second = OwnershipIndex(GitAnalyzer(repo_path), db)
+        assert second.ownership(paths) == owners
+        assert second.blamed == 0 and second.cached == 2
+        print("✓ Warm run is served entirely from the cache")
+
+        commit(repo_path, 'feat: carol', {'src/solo.py': 'x\n' * 4 + 'c\n' * 8}, author=CAROL)
+        third = OwnershipIndex(GitAnalyzer(repo_path), db)
+        updated = third.ownership(paths)
+        assert third.blamed == 1 and third.cached == 1
+        assert updated['src/solo.py']['owners'] == ['Carol', 'Alice']
+        print("✓ Only the file whose blob changed is blamed again")
+
+    print("✅ Blob SHA cache test passed\n")
+
+
+def test_exported_contributors():
+    """Test that exports and insights carry blame-based contributor counts"""
+    print("TEST: Exported Contributors")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = _make_repo(tmp / 'repo')
+        exporter = AnalyticsExporter(output_dir=tmp / 'out', db_path=tmp / 'devflow.db', repo_path=repo_path)
+
+        hotspots = exporter.export_file_hotspots_json(days=30)
+        contributors = {f['path']: f['contributors'] for f in hotspots['fileRiskData']}
+        assert contributors['src/shared.py'] == 2 and contributors['src/solo.py'] == 1
+        print("✓ file-hotspots.json contributors come from blame")
+
+        exporter.export_insights_json(days=30)
+        written = json.loads((tmp / 'out' / 'file-hotspots.json').read_text())
+        assert written['fileRiskData'] == hotspots['fileRiskData']
+        assert exporter._ownership_index.blamed == 2
+        print("✓ Insights reuse the same index without re-blaming")
+
+    print("✅ Exported contributors test passed\n")
+
+
+if __name__ == '__main__':
+    test_parse_and_summarize()
+    test_blob_sha_cache()
+    test_exported_contributors()
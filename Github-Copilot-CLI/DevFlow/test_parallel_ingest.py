@@ -0,0 +1,137 @@
+"""
+Test suite for parallel ingestion over commit ranges
+Verifies range splitting and that parallel results equal the serial walk
+"""
+
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo, git
+from src.database import Database
+from src.git_analyzer import GitAnalyzer
+from src.ingest import GitLogError, IncrementalIngestor
+from src.parallel_ingest import parallel_records, rev_list, split_ranges
+
+
+def test_commit_ranges():
+    """Test rev-list ordering and contiguous range splitting"""
+    print("TEST: Commit Ranges")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=90, files=10, authors=3, days=30)
+        analyzer = GitAnalyzer(repo_path)
+
+        shas = rev_list(repo_path)
+        walk = list(analyzer.ingestor.iter_commits())
+        assert shas == [record['hash'] for record in walk]
+        print(f"✓ rev-list returns the {len(shas)} commits in walk order")
+
+        for parts in (1, 4, 7, 200):
+            ranges = split_ranges(shas, parts=parts)
+            assert [sha for part in ranges for sha in part] == shas
+            assert len(ranges) == min(parts, len(shas))
+            assert max(map(len, ranges)) - min(map(len, ranges)) <= 1
+        assert [len(part) for part in split_ranges(shas, size=40)] == [40, 40, 10]
+        assert split_ranges([], parts=4) == []
+        print("✓ Ranges are contiguous, near-equal and cover every commit")
+
+        # Long revision lists go to git on stdin
+        assert list(analyzer.ingestor.iter_commits(rev=shas, walk=False)) == walk
+        print("✓ Range of 90 revisions read through --stdin")
+
+        try:
+            rev_list(repo_path, 'missing-branch')
+            assert False, "Expected GitLogError"
+        except GitLogError:
+            print("✓ Unknown revision raises GitLogError")
+
+    print("✅ Commit ranges test passed\n")
+
+
+def test_parallel_records():
+    """Test that the parallel record stream and ingestion match a single walk"""
+    print("TEST: Parallel Records")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_path = create_synthetic_repo(tmp / 'repo', commits=120, files=12, authors=4, days=60)
+        serial = GitAnalyzer(repo_path)
+        parallel = GitAnalyzer(repo_path, jobs=3)
+        since = datetime.now() - timedelta(days=40)
+
+        expected = list(serial.ingestor.iter_commits(since=since))
+        assert list(parallel_records(serial.ingestor, since=since, jobs=3, range_size=7)) == expected
+        assert list(parallel.iter_history('HEAD', since)) == expected
+        print(f"✓ {len(expected)} records from 3 workers arrive in walk order")
+
+        assert parallel.get_commit_history(days=61) == serial.get_commit_history(days=61)
+        assert list(GitAnalyzer(repo_path, jobs=3).iter_commit_records(days=61, branch='missing')) == []
+        print("✓ Commit history identical; missing branch handled")
+
+        results = {}
+        window = datetime.now() - timedelta(days=61)
+        for name, analyzer in (('serial', serial), ('parallel', parallel)):
+            db = Database(tmp / f'{name}.db')
+            ingestor = IncrementalIngestor(analyzer, db)
+            result = ingestor.sync(window)
+            results[name] = (
+                result['ingested'],
+                db.get_branch_commits(ingestor.repo_key, 'main', window),
+                db.get_branch_file_changes(ingestor.repo_key, 'main', window),
+            )
+        assert results['parallel'] == results['serial']
+        print(f"✓ Incremental ingestion with jobs=3 stores the same {results['serial'][0]} commits")
+
+    print("✅ Parallel records test passed\n")
+
+
+def test_scan_window():
+    """Test that merged range aggregates equal the serial analyses"""
+    print("TEST: Scan Window")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=150, files=15, authors=4, days=45)
+        git(repo_path, 'branch', 'old', 'HEAD~100')
+        serial = GitAnalyzer(repo_path)
+        parallel = GitAnalyzer(repo_path, jobs=4)
+
+        aggregate = parallel.scan_window(days=46)
+        assert aggregate.commits == 150
+        assert parallel.scan_window(days=46) is aggregate
+        print("✓ Four worker processes aggregate all 150 commits (cached per window)")
+
+        for author in (None, 'dev2'):
+            assert (parallel.analyze_commit_patterns(days=46, author=author)
+                    == serial.analyze_commit_patterns(days=46, author=author))
+            assert (parallel.get_hotspot_files(days=46, limit=20, author=author)
+                    == serial.get_hotspot_files(days=46, limit=20, author=author))
+        assert parallel.generate_productivity_score(days=46) == serial.generate_productivity_score(days=46)
+        print("✓ Patterns, hotspots and productivity equal the serial walk")
+
+        first_day = (datetime.now() - timedelta(days=10)).date()
+        expected = Counter(
+            commit['timestamp'].date() for commit in serial.get_commit_history(days=46)
+            if commit['timestamp'].date() >= first_day
+        )
+        assert aggregate.daily_counts(first_day) == expected
+        assert parallel.scan_window(days=46, branch='old').commits == 50
+        print("✓ Per-day counts merged; branch windows scanned separately")
+
+    print("✅ Scan window test passed\n")
+
+
+if __name__ == '__main__':
+    test_commit_ranges()
+    test_parallel_records()
+    test_scan_window()
+    print("=" * 60)
+    print("✅ ALL PARALLEL INGEST TESTS PASSED")
@@ -0,0 +1,133 @@
+"""
+Test suite for the day/hour/author rollup tables
+Verifies trigger maintenance and rollup-served readers against raw rows
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.database import Database
+from src.git_analyzer import GitAnalyzer
+
+
+def _regrouped(db):
+    """Rollups recomputed from raw rows, for comparison with the triggers"""
+    conn = db.connection
+    commit_rollups = conn.execute('''
+        SELECT substr(commit_date, 1, 10), CAST(substr(commit_date, 12, 2) AS INTEGER), author,
+               COUNT(*), SUM(insertions), SUM(deletions), SUM(files_changed)
+        FROM commits GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+    ''').fetchall()
+    branch_rollups = conn.execute('''
+        SELECT b.repo_path, b.branch, substr(c.commit_date, 1, 10), CAST(substr(c.commit_date, 12, 2) AS INTEGER),
+               c.author, c.email, COUNT(*), SUM(c.insertions), SUM(c.deletions), SUM(length(c.message))
+        FROM branch_commits b JOIN commits c ON c.sha = b.sha
+        GROUP BY 1, 2, 3, 4, 5, 6 ORDER BY 1, 2, 3, 4, 5, 6
+    ''').fetchall()
+    return [tuple(r) for r in commit_rollups], [tuple(r) for r in branch_rollups]
+
+
+def _stored(db):
+    conn = db.connection
+    commit_rollups = conn.execute('''
+        SELECT day, hour, author, commits, insertions, deletions, files
+        FROM commit_rollups ORDER BY 1, 2, 3
+    ''').fetchall()
+    branch_rollups = conn.execute('''
+        SELECT repo_path, branch, day, hour, author, email, commits, insertions, deletions, message_chars
+        FROM branch_rollups ORDER BY 1, 2, 3, 4, 5, 6
+    ''').fetchall()
+    return [tuple(r) for r in commit_rollups], [tuple(r) for r in branch_rollups]
+
+
+def test_rollups_maintained_by_triggers():
+    """Test that inserts, updates and deletes keep rollups equal to raw aggregates"""
+    print("TEST: Rollup Maintenance")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=120, files=10, authors=4, days=60)
+        db = Database(Path(tmp) / 'devflow.db')
+
+        session = GitAnalyzer(repo_path).create_session(days=90, db=db)
+        assert len(session.commits) == 120
+        assert _stored(db) == _regrouped(db)
+        print("✓ Ingest fills commit and branch rollups")
+
+        changed = [{**c, 'message': c['message'] + ' (edited)', 'insertions': c['insertions'] + 5}
+                   for c in session.commits[:10]]
+        assert db.ingest_commits(changed)['updated'] == 10
+        assert _stored(db) == _regrouped(db)
+        print("✓ Updated commits move between rollup buckets")
+
+        db.unlink_branch_commits(session.repo_key, session.branch,
+                                 after_date=datetime.now() - timedelta(days=20))
+        db.clear_old_data(days=40)
+        assert _stored(db) == _regrouped(db)
+        assert db.connection.execute('SELECT COUNT(*) FROM commit_rollups WHERE commits <= 0').fetchone()[0] == 0
+        print("✓ Unlinked and deleted commits are subtracted")
+
+        reopened = Database(Path(tmp) / 'devflow.db')
+        assert _stored(reopened) == _regrouped(reopened)
+        print("✓ Reopening the database keeps rollups intact")
+
+    print("✅ Rollup maintenance test passed\n")
+
+
+def test_readers_served_from_rollups():
+    """Test that rollup-served readers match raw computations"""
+    print("TEST: Rollup Readers")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=150, files=10, authors=5, days=45)
+        db = Database(Path(tmp) / 'devflow.db')
+        analyzer = GitAnalyzer(repo_path)
+
+        session = analyzer.create_session(days=30, db=db)
+        assert analyzer.analyze_commit_patterns(session=session) == analyzer.analyze_commit_patterns(days=30)
+        assert session.activity() is not None
+        print("✓ Commit patterns from rollups match the git walk")
+
+        commits = analyzer.get_commit_history(days=30)
+        stats = db.get_commit_stats(days=30)
+        assert stats['total_commits'] == len(commits)
+        assert stats['total_insertions'] == sum(c['insertions'] for c in commits)
+        assert stats['unique_authors'] == len({c['author'] for c in commits})
+        assert stats['latest_commit'] == max(c['timestamp'] for c in commits).isoformat()
+        print(f"✓ Commit stats match raw history ({stats['total_commits']} commits)")
+
+        authors = {row['author']: row['commits'] for row in db.get_author_stats(days=30)}
+        expected = {}
+        for commit in commits:
+            expected[commit['author']] = expected.get(commit['author'], 0) + 1
+        assert authors == expected
+        assert db.get_author_stats(author='Dev 1', days=30)[0]['commits'] == expected['Dev 1']
+        print("✓ Author stats match raw history")
+
+        first_day = (datetime.now() - timedelta(days=29)).date()
+        daily = session.daily_counts(first_day)
+        assert sum(daily.values()) == sum(1 for c in commits if c['timestamp'].date() >= first_day)
+
+        plan = db.connection.execute('''
+            EXPLAIN QUERY PLAN
+            SELECT day, SUM(commits) FROM branch_rollups
+            WHERE repo_path = ? AND branch = ? AND day >= ? GROUP BY day
+        ''', (session.repo_key, session.branch, first_day.isoformat())).fetchall()
+        details = ' '.join(row[-1] for row in plan)
+        assert 'SEARCH branch_rollups' in details and 'day>?' in details, details
+        assert 'TEMP B-TREE' not in details, details
+        print("✓ Daily counts are one primary-key range scan")
+
+    print("✅ Rollup readers test passed\n")
+
+
+if __name__ == '__main__':
+    test_rollups_maintained_by_triggers()
+    test_readers_served_from_rollups()
@@ -0,0 +1,184 @@
+"""
+Test suite for full-text commit search
+Verifies the FTS5 index stays in sync with ingestion and the query options
+"""
+
+import sys
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import migrations
+from src.database import Database
+
+
+def _record(i, message, author='Alice', paths=('src/app.py',), days_ago=0):
+    return {
+        'hash': f'{i:040x}',
+        'author': author,
+        'email': f'{author.lower()}@example.com',
+        'message': message,
+        'timestamp': datetime.now() - timedelta(days=days_ago, minutes=i),
+        'files': {path: {'insertions': 2, 'deletions': 1} for path in paths},
+    }
+
+
+def _sample_records():
+    return [
+        _record(1, 'Fix login timeout on slow networks', paths=('src/auth/login.py',)),
+        _record(2, 'Add export of hotspots to CSV', author='Bob', paths=('src/exporter.py', 'docs/export.md')),
+        _record(3, 'Refactor session cache', author='Bob', days_ago=40),
+        _record(4, 'Fix cache invalidation in exporter', paths=('src/cache.py',), days_ago=100),
+        _record(5, 'Document login flow', author='Carol', paths=('docs/login.md',), days_ago=5),
+    ]
+
+
+def test_search_index():
+    """Test ranked matches, snippets and the query syntax"""
+    print("TEST: Search Index")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        if not db.has_search:
+            print("✓ SQLite without FTS5: skipped")
+            return
+        db.ingest_commits(_sample_records(), on_chunk=db.save_file_changes)
+
+        results = db.search_commits('login')
+        assert {r['hash'][-1] for r in results} == {'1', '5'}
+        assert results[0]['rank'] >= results[1]['rank'] > 0
+        print("✓ Messages and paths matched, best rank first")
+
+        result = db.search_commits('timeout', highlight=('<', '>'))[0]
+        assert result['message'] == 'Fix login <timeout> on slow networks'
+        assert result['paths'] == 'src/auth/login.py'
+        assert result['author'] == 'Alice' and isinstance(result['timestamp'], datetime)
+        assert 'src/[exporter.py]' in db.search_commits('exporter.py')[0]['paths']
+        print("✓ Snippets highlight matched words in messages and paths")
+
+        assert {r['hash'][-1] for r in db.search_commits('fix cache')} == {'4'}
+        assert {r['hash'][-1] for r in db.search_commits('fix OR refactor')} == {'1', '3', '4'}
+        assert {r['hash'][-1] for r in db.search_commits('cache NOT fix')} == {'3'}
+        assert {r['hash'][-1] for r in db.search_commits('"login flow"')} == {'5'}
+        assert {r['hash'][-1] for r in db.search_commits('invalid*')} == {'4'}
+        assert {r['hash'][-1] for r in db.search_commits('path:exporter')} == {'2'}
+        assert {r['hash'][-1] for r in db.search_commits('message:exporter')} == {'4'}
+        assert {r['hash'][-1] for r in db.search_commits('author:bob')} == {'2', '3'}
+        print("✓ AND, OR, NOT, phrases, prefixes and column filters")
+
+        assert {r['hash'][-1] for r in db.search_commits('fix', author='alice')} == {'1', '4'}
+        assert db.search_commits('cache', author='carol') == []
+        since = datetime.now() - timedelta(days=30)
+        assert {r['hash'][-1] for r in db.search_commits('cache OR login', since=since)} == {'1', '5'}
+        assert len(db.search_commits('fix OR cache OR login', limit=2)) == 2
+        print("✓ --author, --since and limit filters")
+
+        for query in ('', '   ', '!!', 'AND OR'):
+            try:
+                db.search_commits(query)
+                assert False, f"Expected ValueError for {query!r}"
+            except ValueError:
+                pass
+        print("✓ Queries without terms raise ValueError")
+
+    print("✅ Search index test passed\n")
+
+
+def test_search_sync():
+    """Test that edits and deletions of commits reach the index"""
+    print("TEST: Search Sync")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        if not db.has_search:
+            print("✓ SQLite without FTS5: skipped")
+            return
+        db.ingest_commits(_sample_records(), on_chunk=db.save_file_changes)
+        count = lambda: db.connection.execute('SELECT COUNT(*) FROM commit_search').fetchone()[0]
+        assert count() == 5
+
+        db.ingest_commits([_record(1, 'Fix login retry on slow networks', paths=('src/auth/retry.py',))],
+                          on_chunk=db.save_file_changes)
+        assert db.search_commits('timeout') == []
+        result = db.search_commits('retry', highlight=('<', '>'))
+        assert len(result) == 1 and 'src/auth/<retry>.py' in result[0]['paths']
+        assert count() == 5
+        print("✓ Re-ingested commits replace their message and paths")
+
+        db.clear_old_data(days=60)
+        assert db.search_commits('invalidation') == [] and count() == 4
+        print("✓ Cleared commits leave the index")
+
+    print("✅ Search sync test passed\n")
+
+
+def test_search_migration():
+    """Test that upgrading a v2 database backfills the index"""
+    print("TEST: Search Migration")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'devflow.db'
+        db = Database(db_path)
+        if not db.has_search:
+            print("✓ SQLite without FTS5: skipped")
+            return
+        db.ingest_commits(_sample_records(), on_chunk=db.save_file_changes)
+
+        # Roll back to v2: no index, no triggers
+        conn = sqlite3.connect(db_path)
+        for name in ('trg_commits_search_insert', 'trg_commits_search_delete', 'trg_commits_search_update'):
+            conn.execute(f'DROP TRIGGER {name}')
+        conn.execute('DROP TABLE commit_search')
+        conn.execute('PRAGMA user_version = 2')
+        conn.commit()
+        conn.close()
+
+        original_chunk = migrations.BACKFILL_CHUNK_SIZE
+        migrations.BACKFILL_CHUNK_SIZE = 2
+        try:
+            db = Database(db_path)
+        finally:
+            migrations.BACKFILL_CHUNK_SIZE = original_chunk
+
+        assert migrations.get_schema_version(db.connection) == migrations.SCHEMA_VERSION == 3
+        assert db.connection.execute('SELECT COUNT(*) FROM commit_search').fetchone()[0] == 5
+        assert {r['hash'][-1] for r in db.search_commits('login')} == {'1', '5'}
+        assert db.search_commits('exporter.py')[0]['hash'][-1] == '2'
+        print("✓ Existing commits and paths indexed in chunks")
+
+    print("✅ Search migration test passed\n")
+
+
+def test_search_fallback():
+    """Test the substring scan used when SQLite has no FTS5"""
+    print("TEST: Search Fallback")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / 'devflow.db')
+        db.ingest_commits(_sample_records(), on_chunk=db.save_file_changes)
+        db.has_search = False
+
+        results = db.search_commits('fix')
+        assert [r['hash'][-1] for r in results] == ['1', '4']
+        assert {r['hash'][-1] for r in db.search_commits('LOGIN', author='carol')} == {'5'}
+        assert db.search_commits('cache', since=datetime.now() - timedelta(days=30)) == []
+        print("✓ Substring matches, newest first, with the same filters")
+
+    print("✅ Search fallback test passed\n")
+
+
+if __name__ == '__main__':
+    test_search_index()
+    test_search_sync()
+    test_search_migration()
+    test_search_fallback()
+    print("=" * 60)
+    print("✅ ALL SEARCH TESTS PASSED")
@@ -0,0 +1,117 @@
+"""
+Test suite for bounded-memory command sequence mining
+Verifies SpaceSaving error bounds and exact results on small histories
+"""
+
+import random
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.history import HistoryTracker
+from src.sequence_miner import SpaceSaving, mine_sequences
+
+
+def _skewed_ids(count, distinct, seed=7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return array('I', rng.choices(range(distinct), weights, k=count))
+
+
+def _exact_ngrams(ids, length):
+    return Counter(zip(*(ids[offset:] for offset in range(length))))
+
+
+def test_space_saving_bounds():
+    """Test that estimates bracket true counts and no heavy hitter is lost"""
+    print("TEST: SpaceSaving Bounds")
+    print("-" * 60)
+
+    ids = _skewed_ids(50000, distinct=3000)
+    exact = Counter(ids)
+    sketch = SpaceSaving(capacity=100)
+    for command_id in ids:
+        sketch.add(command_id)
+
+    assert len(sketch.counts) <= 200 and sketch.total == len(ids)
+    assert sketch.floor > 0
+    for key, count, error in sketch.top():
+        assert count - error <= exact[key] <= count, (key, count, error, exact[key])
+    print(f"✓ count - error <= true <= count for {len(sketch.counts)} tracked keys")
+
+    assert all(key in sketch.counts for key, count in exact.items() if count > sketch.floor)
+    assert [key for key, _, _ in sketch.top(10)] == [key for key, _ in exact.most_common(10)]
+    print(f"✓ Every key seen more than {sketch.floor} times is tracked; top 10 exact")
+
+    print("✅ SpaceSaving bounds test passed\n")
+
+
+def test_mine_all_lengths():
+    """Test one-pass mining of chains of length 2..N"""
+    print("TEST: Multi-Length Mining")
+    print("-" * 60)
+
+    ids = _skewed_ids(20000, distinct=12)
+    sketches = mine_sequences(ids, min_length=2, max_length=5, capacity=100000)
+    assert sorted(sketches) == [2, 3, 4, 5]
+
+    for length, sketch in sketches.items():
+        exact = _exact_ngrams(ids, length)
+        mined = {sketch.labels[key]: count for key, count, error in sketch.top()}
+        assert mined == dict(exact), length
+        assert all(error == 0 for _, _, error in sketch.top())
+    print("✓ Exact counts for every length while under capacity")
+
+    bounded = mine_sequences(ids, min_length=2, max_length=5, capacity=50)
+    for length, sketch in bounded.items():
+        exact = _exact_ngrams(ids, length)
+        assert len(sketch.counts) <= 100
+        for key, count, error in sketch.top():
+            assert count - error <= exact[sketch.labels[key]] <= count
+        tracked = set(sketch.labels.values())
+        assert all(chain in tracked for chain, count in exact.items() if count > sketch.floor), length
+    print("✓ Bounded sketches track every chain above the floor, with valid error bounds")
+
+    print("✅ Multi-length mining test passed\n")
+
+
+def test_history_tracker_chains():
+    """Test HistoryTracker chain mining and find_common_sequences"""
+    print("TEST: HistoryTracker Chains")
+    print("-" * 60)
+
+    workflow = ['git add .', 'git commit -m "wip"', 'git push']
+    lines = []
+    for i in range(40):
+        lines += workflow + ['ls', f'echo {i % 7}']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '.bash_history'
+        path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        tracker = HistoryTracker()
+        tracker.parse_shell_history(path)
+
+        chains = tracker.mine_sequences(max_length=4, top_k=2, min_frequency=2)
+        assert sorted(chains) == [2, 3, 4] and all(len(top) == 2 for top in chains.values())
+        assert chains[3][0]['sequence'] == workflow and chains[3][0]['count'] == 40
+        assert chains[4][0]['sequence'] == workflow + ['ls'] and chains[4][0]['error'] == 0
+        print("✓ Top chains per length")
+
+        pairs = tracker.find_common_sequences(sequence_length=2, min_frequency=2)
+        exact = _exact_ngrams(list(tracker.history_data.strings()), 2)
+        assert {tuple(p['sequence']): p['count'] for p in pairs} == {k: v for k, v in exact.items() if v >= 2}
+        assert pairs[0]['display'] == 'git add . → git commit -m "wip"'
+        print("✓ find_common_sequences keeps its result shape")
+
+    print("✅ HistoryTracker chains test passed\n")
+
+
+if __name__ == '__main__':
+    test_space_saving_bounds()
+    test_mine_all_lengths()
+    test_history_tracker_chains()
@@ -0,0 +1,62 @@
+"""
+Test suite for AnalysisSession
+Verifies one history walk serves patterns, hotspots and productivity
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.git_analyzer import GitAnalyzer
+
+
+def test_session_walks_history_once():
+    """Test that all session-backed analyses share a single walk"""
+    print("TEST: Single History Walk")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(Path(tmp) / 'repo', commits=40, files=10, authors=3, days=20)
+        analyzer = GitAnalyzer(repo_path)
+
+        walks = []
+        original_iter = analyzer._iter_commit_records
+
+        def counting_iter(*args, **kwargs):
+            walks.append(args)
+            return original_iter(*args, **kwargs)
+
+        analyzer._iter_commit_records = counting_iter
+
+        session = analyzer.create_session(days=30)
+        commits = analyzer.get_commit_history(session=session)
+        patterns = analyzer.analyze_commit_patterns(session=session)
+        hotspots = analyzer.get_hotspot_files(limit=5, session=session)
+        productivity = analyzer.generate_productivity_score(session=session)
+
+        assert len(walks) == 1, f"Expected 1 history walk, got {len(walks)}"
+        print("✓ History walked once for four analyses")
+
+        assert analyzer.create_session(days=30) is session
+        print("✓ Session cached per window")
+
+        # Results must match the standalone (non-session) paths
+        analyzer._iter_commit_records = original_iter
+        assert commits == analyzer.get_commit_history(days=30)
+        assert patterns == analyzer.analyze_commit_patterns(days=30)
+        assert hotspots == analyzer.get_hotspot_files(days=30, limit=5)
+        assert productivity == analyzer.generate_productivity_score(days=30)
+        print("✓ Session results match standalone results")
+
+        assert session.key == (str(analyzer.repo_path), analyzer.default_branch, session.since, None)
+        print(f"✓ Session key: {session.key[1]}, author={session.key[3]}")
+
+    print("✅ Session test passed\n")
+
+
+if __name__ == '__main__':
+    test_session_walks_history_once()
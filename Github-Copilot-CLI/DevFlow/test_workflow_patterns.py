@@ -0,0 +1,129 @@
+"""
+Test suite for declarative workflow-pattern detection
+Verifies the keyword automaton, the default table and custom tables
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.command_stream import CommandStream
+from src.history import HistoryTracker
+from src.workflow_patterns import KeywordAutomaton, WorkflowMatcher, get_workflow_matcher
+
+
+def _stream(commands):
+    stream = CommandStream()
+    for command in commands:
+        stream.append(command)
+    return stream
+
+
+def test_keyword_automaton():
+    """Test that one scan finds every (overlapping) keyword"""
+    print("TEST: Keyword Automaton")
+    print("-" * 60)
+
+    keywords = {'test': 1, 'pytest': 1, 'start': 2, 'run': 4, 'git add': 8, 'he': 16, 'she': 32, 'hers': 64}
+    automaton = KeywordAutomaton(keywords)
+    assert automaton.match('pytestart') == 1 | 2
+    assert automaton.match('ushers') == 16 | 32 | 64
+    assert automaton.match('git addrun') == 8 | 4 and automaton.match('ls -la') == 0
+    print("✓ Overlapping and nested keywords found")
+
+    rng = random.Random(3)
+    for _ in range(2000):
+        text = ''.join(rng.choice('aehprstu ') for _ in range(rng.randint(0, 20)))
+        expected = 0
+        for keyword, mask in keywords.items():
+            if keyword in text:
+                expected |= mask
+        assert automaton.match(text) == expected, text
+    print("✓ Matches substring search on random texts")
+
+    print("✅ Keyword automaton test passed\n")
+
+
+def test_default_patterns():
+    """Test the default table on a classified stream"""
+    print("TEST: Default Patterns")
+    print("-" * 60)
+
+    matcher = get_workflow_matcher()
+    assert matcher.classify('PIP INSTALL -r requirements.txt') == matcher.class_bits['install']
+    assert matcher.classify('git add . && git commit -m x') == \
+        matcher.class_bits['git_add'] | matcher.class_bits['git_commit']
+    print("✓ Commands are classified case-insensitively")
+
+    history = ['git add .', 'git commit -m x', 'git push'] * 4 + \
+        ['npm install', 'npm run dev', 'make', 'pytest -q', 'git add . && git commit -m y', 'git commit -am z && git push']
+    result = matcher.detect(_stream(history), min_frequency=3)
+
+    assert result['git_workflows'] == [{'pattern': 'git add → git commit', 'count': 5},
+                                       {'pattern': 'git commit → git push', 'count': 4}]
+    assert result['git_cycles'] == [{'pattern': 'git add → git commit → git push', 'count': 4}]
+    assert result['build_test_cycles'] == [{'pattern': 'make → pytest -q', 'count': 1}]
+    assert result['install_run_loops'] == [{'pattern': 'npm install → npm run dev', 'count': 1}]
+    print("✓ Pair and triple patterns; first match wins within a family")
+
+    assert result['insights'][0] == 'Build-test cycle detected 1 times - consider creating a combined script'
+    assert any('(5x)' in insight for insight in result['insights'])
+    assert not any('(4x)' in insight for insight in matcher.detect(_stream(history), 4)['insights'])
+    print("✓ Insights follow the table thresholds")
+
+    print("✅ Default patterns test passed\n")
+
+
+def test_custom_table():
+    """Test a pattern table loaded from a custom file"""
+    print("TEST: Custom Table")
+    print("-" * 60)
+
+    table = {
+        'classes': {'docker_build': ['docker build'], 'docker_run': ['docker run', 'docker compose up']},
+        'families': [{
+            'name': 'container_loops',
+            'patterns': [{
+                'sequence': ['docker_build', 'docker_run'],
+                'label': '{commands}',
+                'truncate': 12,
+                'insight': 'Rebuilt and ran containers {count}x',
+            }],
+        }],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'patterns.json'
+        path.write_text(json.dumps(table), encoding='utf-8')
+        history = Path(tmp) / '.bash_history'
+        history.write_text('docker build -t app .\ndocker run app\n' * 3, encoding='utf-8')
+
+        tracker = HistoryTracker()
+        tracker.parse_shell_history(history)
+        result = tracker.detect_workflow_patterns(patterns_file=path)
+        assert result == {
+            'container_loops': [{'pattern': 'docker build → docker run a', 'count': 3}],
+            'insights': ['Rebuilt and ran containers 3x'],
+        }, result
+        print("✓ New families need only a table entry")
+
+    table['families'][0]['patterns'][0]['sequence'] = ['docker_build', 'deploy']
+    try:
+        WorkflowMatcher(table)
+        assert False, "unknown class accepted"
+    except ValueError as e:
+        assert 'deploy' in str(e)
+    print("✓ Unknown command classes are rejected")
+
+    print("✅ Custom table test passed\n")
+
+
+if __name__ == '__main__':
+    test_keyword_automaton()
+    test_default_patterns()
+    test_custom_table()
@@ -0,0 +1,74 @@
+"""
+Test suite for multi-repository workspace analysis
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.synthetic_repo import create_synthetic_repo
+from src.database import Database
+from src.workspace import discover_repositories, read_repos_file, analyze_workspace
+
+
+def test_discover_and_read_repos():
+    """Test repository discovery and repos-file parsing"""
+    print("TEST: Repository Discovery")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        create_synthetic_repo(tmp / 'svc-a', commits=3, files=2, days=2)
+        create_synthetic_repo(tmp / 'team' / 'svc-b', commits=3, files=2, days=2)
+        (tmp / 'node_modules' / 'pkg' / '.git').mkdir(parents=True)
+        (tmp / 'plain').mkdir()
+
+        repos = discover_repositories(tmp)
+        assert [Path(r).name for r in repos] == ['svc-a', 'svc-b'], repos
+        print(f"✓ Discovered {len(repos)} repositories, skipped node_modules")
+
+        repos_file = tmp / 'repos.txt'
+        repos_file.write_text("# services\nsvc-a\n\nteam/svc-b\nsvc-a\n")
+        assert [Path(r).name for r in read_repos_file(repos_file)] == ['svc-a', 'svc-b']
+        print("✓ Repos file parsed (comments, blanks, duplicates)")
+
+    print("✅ Discovery test passed\n")
+
+
+def test_analyze_workspace_isolates_failures():
+    """Test parallel analysis with one failing repository"""
+    print("TEST: Parallel Workspace Analysis")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        repo_a = create_synthetic_repo(tmp / 'svc-a', commits=12, files=4, days=5)
+        repo_b = create_synthetic_repo(tmp / 'svc-b', commits=7, files=4, days=5)
+        missing = tmp / 'missing'
+        db_path = str(tmp / 'devflow.db')
+
+        seen = []
+        results = analyze_workspace(
+            [str(repo_a), str(missing), str(repo_b)],
+            days=30, jobs=2, db_path=db_path, on_result=seen.append
+        )
+
+        assert [r['status'] for r in results] == ['ok', 'error', 'ok'], results
+        assert results[0]['commits'] == 12 and results[2]['commits'] == 7
+        assert len(seen) == 3
+        print("✓ Failing repository reported without aborting the batch")
+
+        stored = {Path(r['repo']).name: r for r in Database(db_path).get_repo_analyses()}
+        assert stored['svc-a']['commits'] == 12
+        assert stored['missing']['status'] == 'error'
+        print("✓ Per-repository results stored in database")
+
+    print("✅ Workspace analysis test passed\n")
+
+
+if __name__ == '__main__':
+    test_discover_and_read_repos()
+    test_analyze_workspace_isolates_failures()